@@ -2,13 +2,23 @@
 """
 Script to add US IPA pronunciations to vocabulary items in all-episodes-mapped.json
 Uses the Free Dictionary API to fetch pronunciation data.
+
+With --estimate, words the dictionary does not know (and all multi-word
+phrases, which it never has) get a rule-based estimate from g2p.py instead,
+marked with "pronunciationEstimated": true. --offline skips the dictionary
+entirely and estimates everything still missing in one pass. Later runs
+that use the dictionary try estimated words again and replace the estimate,
+dropping the flag, once the dictionary knows them.
 """
 
-import json
-import requests
+import shutil
 import time
 import re
 from pathlib import Path
+from catalogue_stream import iter_episodes, CatalogueWriter
+from vocab_table import enrich_pronunciations, is_vocab_table, save_document
+from instrumentation import add_instrumentation_arguments, start_instrumentation, timer, observe
+from g2p import G2P
 
 # API endpoint for dictionary lookups
 DICTIONARY_API = "https://api.dictionaryapi.dev/api/v2/entries/en/{word}"
@@ -29,6 +39,8 @@ def get_pronunciation(word):
     Fetch US IPA pronunciation from Free Dictionary API.
     Returns the IPA string or None if not found.
     """
+    import requests
+    
     try:
         # Clean the word first
         clean = clean_word(word)
@@ -74,7 +86,21 @@ def get_pronunciation(word):
         print(f"  ❌ Unexpected error for '{clean}': {e}")
         return None
 
-def add_pronunciations_to_json(json_path, dry_run=True, delay=0.5):
+def make_estimator(json_path):
+    """G2P engine that already knows every dictionary pronunciation in the catalogue"""
+    g2p = G2P()
+    if is_vocab_table(json_path):
+        import json
+        with open(json_path, 'r', encoding='utf-8') as f:
+            g2p.learn_items(json.load(f)['vocabulary'], clean_word)
+    else:
+        for episode in iter_episodes(json_path):
+            transcript = episode.get('transcript', {})
+            for key in ('vocabulary', 'supplementaryVocabulary'):
+                g2p.learn_items(transcript.get(key) or [], clean_word)
+    return g2p
+
+def add_pronunciations_to_json(json_path, dry_run=True, delay=0.5, g2p=None, offline=False):
     """
     Add pronunciations to all vocabulary items in the JSON file.
     
@@ -82,74 +108,80 @@ def add_pronunciations_to_json(json_path, dry_run=True, delay=0.5):
         json_path: Path to all-episodes-mapped.json
         dry_run: If True, don't save changes (default: True)
         delay: Delay between API calls in seconds (default: 0.5)
+        g2p: G2P estimator for words the dictionary can't resolve (default: none)
+        offline: Don't call the dictionary at all, only estimate (needs g2p)
     """
     print(f"\n{'='*60}")
     print(f"Adding pronunciations to: {json_path}")
     print(f"Mode: {'DRY RUN (no changes will be saved)' if dry_run else 'LIVE (will update file)'}")
     print(f"{'='*60}\n")
     
-    # Load JSON
-    with open(json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    # Episodes are streamed one at a time; in live mode they are written
+    # straight to a temporary file that replaces the catalogue at the end
+    writer = None
+    if not dry_run:
+        backup_path = json_path.with_suffix('.json.backup')
+        print(f"💾 Creating backup: {backup_path}")
+        shutil.copy2(json_path, backup_path)
+        writer = CatalogueWriter(json_path)
     
     total_words = 0
     words_with_pronunciation = 0
     words_added = 0
+    words_estimated = 0
     words_failed = 0
     
-    # Process each episode
-    for episode_idx, episode in enumerate(data):
-        print(f"\n📚 Episode {episode.get('id', episode_idx)}: {episode.get('title', 'Unknown')}")
+    # An error or Ctrl-C mid-run must not leave the temporary file behind
+    try:
+        for episode_idx, episode in enumerate(iter_episodes(json_path)):
+            print(f"\n📚 Episode {episode.get('id', episode_idx)}: {episode.get('title', 'Unknown')}")
         
-        # Process vocabulary
-        if 'transcript' in episode and 'vocabulary' in episode['transcript']:
-            for vocab_item in episode['transcript']['vocabulary']:
-                total_words += 1
-                word = vocab_item.get('word', '')
+            # Process vocabulary and supplementary vocabulary
+            for key in ('vocabulary', 'supplementaryVocabulary'):
+                for vocab_item in episode.get('transcript', {}).get(key) or []:
+                    total_words += 1
+                    word = vocab_item.get('word', '')
+                    # The dictionary has no entries for phrases: estimate those directly
+                    use_dictionary = not (g2p and (offline or ' ' in clean_word(word)))
+                    estimated = vocab_item.get('pronunciationEstimated')
                 
-                # Skip if already has pronunciation
-                if 'pronunciation' in vocab_item and vocab_item['pronunciation']:
-                    words_with_pronunciation += 1
-                    print(f"  ⏭️  '{clean_word(word)}' already has pronunciation")
-                    continue
+                    # Skip if already has pronunciation (estimates get another dictionary try)
+                    if vocab_item.get('pronunciation') and not (estimated and use_dictionary):
+                        words_with_pronunciation += 1
+                        print(f"  ⏭️  '{clean_word(word)}' already has pronunciation")
+                        continue
                 
-                # Fetch pronunciation
-                print(f"  🔍 Fetching pronunciation for '{clean_word(word)}'...")
-                pronunciation = get_pronunciation(word)
+                    pronunciation = None
+                    if use_dictionary:
+                        print(f"  🔍 Fetching pronunciation for '{clean_word(word)}'...")
+                        lookup_started = time.perf_counter()
+                        pronunciation = get_pronunciation(word)
+                        observe('dictionary_lookup', time.perf_counter() - lookup_started)
+                    
+                        # Rate limiting
+                        time.sleep(delay)
                 
-                if pronunciation:
-                    vocab_item['pronunciation'] = pronunciation
-                    words_added += 1
-                else:
-                    words_failed += 1
-                
-                # Rate limiting
-                time.sleep(delay)
+                    if pronunciation:
+                        vocab_item['pronunciation'] = pronunciation
+                        vocab_item.pop('pronunciationEstimated', None)
+                        words_added += 1
+                        if g2p:
+                            g2p.learn(clean_word(word), pronunciation)
+                    elif estimated:
+                        # Still unknown to the dictionary: the estimate stays
+                        words_with_pronunciation += 1
+                    elif g2p and g2p.fill(vocab_item, clean_word):
+                        print(f"  ≈ Estimated: /{vocab_item['pronunciation']}/")
+                        words_estimated += 1
+                    else:
+                        words_failed += 1
         
-        # Process supplementary vocabulary
-        if 'transcript' in episode and 'supplementaryVocabulary' in episode['transcript']:
-            for vocab_item in episode['transcript']['supplementaryVocabulary']:
-                total_words += 1
-                word = vocab_item.get('word', '')
-                
-                # Skip if already has pronunciation
-                if 'pronunciation' in vocab_item and vocab_item['pronunciation']:
-                    words_with_pronunciation += 1
-                    print(f"  ⏭️  '{clean_word(word)}' already has pronunciation")
-                    continue
-                
-                # Fetch pronunciation
-                print(f"  🔍 Fetching pronunciation for '{clean_word(word)}'...")
-                pronunciation = get_pronunciation(word)
-                
-                if pronunciation:
-                    vocab_item['pronunciation'] = pronunciation
-                    words_added += 1
-                else:
-                    words_failed += 1
-                
-                # Rate limiting
-                time.sleep(delay)
+            if writer:
+                writer.write(episode)
+    except BaseException:
+        if writer:
+            writer.abort()
+        raise
     
     # Summary
     print(f"\n{'='*60}")
@@ -158,24 +190,79 @@ def add_pronunciations_to_json(json_path, dry_run=True, delay=0.5):
     print(f"Total vocabulary words: {total_words}")
     print(f"Already had pronunciation: {words_with_pronunciation}")
     print(f"Pronunciations added: {words_added}")
+    if g2p:
+        print(f"Estimated (rule-based): {words_estimated}")
     print(f"Failed to fetch: {words_failed}")
     print(f"{'='*60}\n")
     
     # Save if not dry run
-    if not dry_run:
-        backup_path = json_path.with_suffix('.json.backup')
-        print(f"💾 Creating backup: {backup_path}")
-        with open(backup_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        
+    if writer:
         print(f"💾 Saving updated JSON: {json_path}")
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        with timer('save'):
+            writer.close()
         
         print("✅ File updated successfully!")
     else:
         print("ℹ️  DRY RUN - No changes saved. Run with --live to save changes.")
 
+def add_pronunciations_to_table(json_path, dry_run=True, delay=0.5, g2p=None, offline=False):
+    """
+    Same as add_pronunciations_to_json for a vocab-table file: every distinct
+    vocabulary item is enriched once, and each distinct word looked up once.
+    """
+    import json
+    
+    print(f"\n{'='*60}")
+    print(f"Adding pronunciations to vocabulary table: {json_path}")
+    print(f"Mode: {'DRY RUN (no changes will be saved)' if dry_run else 'LIVE (will update file)'}")
+    print(f"{'='*60}\n")
+    
+    with open(json_path, 'r', encoding='utf-8') as f:
+        document = json.load(f)
+    
+    def lookup(word):
+        # The dictionary has no entries for phrases: leave those to the estimator
+        if g2p and ' ' in clean_word(word):
+            return None
+        print(f"  🔍 Fetching pronunciation for '{clean_word(word)}'...")
+        lookup_started = time.perf_counter()
+        pronunciation = get_pronunciation(word)
+        observe('dictionary_lookup', time.perf_counter() - lookup_started)
+        time.sleep(delay)
+        if pronunciation and g2p:
+            g2p.learn(clean_word(word), pronunciation)
+        return pronunciation
+    
+    def estimate(word):
+        return g2p.estimate(clean_word(word))
+    
+    stats = enrich_pronunciations(document['vocabulary'], None if offline else lookup,
+                                  lambda w: clean_word(w).lower(), estimate=estimate if g2p else None)
+    
+    # Summary
+    print(f"\n{'='*60}")
+    print(f"SUMMARY")
+    print(f"{'='*60}")
+    print(f"Distinct vocabulary items: {stats['entries']}")
+    print(f"Already had pronunciation: {stats['already_had']}")
+    print(f"Dictionary lookups: {stats['lookups']}")
+    print(f"Pronunciations added: {stats['added']}")
+    if g2p:
+        print(f"Estimated (rule-based): {stats['estimated']}")
+    print(f"Failed to fetch: {stats['failed']}")
+    print(f"{'='*60}\n")
+    
+    if dry_run:
+        print("ℹ️  DRY RUN - No changes saved. Run with --live to save changes.")
+        return
+    
+    backup_path = json_path.with_suffix('.json.backup')
+    print(f"💾 Creating backup: {backup_path}")
+    shutil.copy2(json_path, backup_path)
+    with timer('save'):
+        save_document(document, json_path)
+    print("✅ File updated successfully!")
+
 def main():
     import argparse
     
@@ -184,8 +271,15 @@ def main():
     parser.add_argument('--delay', type=float, default=0.5, help='Delay between API calls in seconds (default: 0.5)')
     parser.add_argument('--file', type=str, default='src/data/all-episodes-mapped.json', 
                        help='Path to JSON file (default: src/data/all-episodes-mapped.json)')
+    parser.add_argument('--estimate', action='store_true',
+                       help='Estimate pronunciations the dictionary lacks (phrases are never looked up)')
+    parser.add_argument('--offline', action='store_true',
+                       help='Skip the dictionary and estimate every missing pronunciation (implies --estimate)')
+    
+    add_instrumentation_arguments(parser)
     
     args = parser.parse_args()
+    start_instrumentation(args)
     
     json_path = Path(args.file)
     
@@ -193,7 +287,18 @@ def main():
         print(f"❌ Error: File not found: {json_path}")
         return
     
-    add_pronunciations_to_json(json_path, dry_run=not args.live, delay=args.delay)
+    g2p = None
+    if args.estimate or args.offline:
+        with timer('learn_lexicon'):
+            g2p = make_estimator(json_path)
+    
+    with timer('add_pronunciations'):
+        if is_vocab_table(json_path):
+            add_pronunciations_to_table(json_path, dry_run=not args.live, delay=args.delay,
+                                        g2p=g2p, offline=args.offline)
+        else:
+            add_pronunciations_to_json(json_path, dry_run=not args.live, delay=args.delay,
+                                       g2p=g2p, offline=args.offline)
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Incremental Visitor Log Aggregator
+
+Tails resources/visitors.log from the byte offset reached on the previous
+run, folds the new lines into rolled-up counters (per day, path, IP and
+user agent family) and regenerates resources/visitor-stats.json - a small
+summary the admin page loads instead of the raw, ever-growing log.
+
+State (offset + counters) lives in resources/visitor-stats.state.json. If
+the log shrinks or is replaced (rotation), aggregation restarts from the
+beginning of the new file while keeping the counters collected so far.
+
+Usage:
+    python3 aggregate_visitors.py                 # one incremental pass
+    python3 aggregate_visitors.py --interval 60   # keep running, every 60 s
+    python3 aggregate_visitors.py --rebuild       # forget state, start over
+"""
+
+import json
+import os
+import sys
+import time
+from collections import deque
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from visitor_log import VISITORS_LOG, VISITOR_STATS, parse_log_line, client_ip, ua_family, entry_day
+
+STATE_VERSION = 1
+RECENT_LIMIT = 50
+TOP_LIMIT = 20
+
+
+def empty_state() -> Dict:
+    return {
+        'version': STATE_VERSION,
+        'offset': 0,
+        'inode': None,
+        'total': 0,
+        'invalid': 0,
+        'days': {},       # day -> {'requests': n, 'ips': [unique ips]}
+        'paths': {},
+        'ips': {},
+        'ua_families': {},
+        'statuses': {},
+        'recent': [],
+    }
+
+
+def load_state(state_path: Path) -> Dict:
+    if state_path.exists():
+        with open(state_path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        if state.get('version') == STATE_VERSION:
+            return state
+        print("⚠️  State file has an old format, rebuilding from scratch")
+    return empty_state()
+
+
+def write_json_atomic(path: Path, data: Dict, indent: Optional[int] = None):
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=indent, separators=None if indent else (',', ':'))
+    os.replace(tmp_path, path)
+
+
+def bump(counter: Dict[str, int], key: str):
+    counter[key] = counter.get(key, 0) + 1
+
+
+def aggregate(log_path: Path, state: Dict) -> int:
+    """Fold new complete lines of the log into state; returns lines read"""
+    stat = log_path.stat()
+    if state['inode'] != stat.st_ino or stat.st_size < state['offset']:
+        if state['offset']:
+            print("🔄 Log was rotated or truncated, reading new file from the start")
+        state['offset'] = 0
+        state['inode'] = stat.st_ino
+
+    day_ips = {day: set(info['ips']) for day, info in state['days'].items()}
+    recent = deque(state['recent'], maxlen=RECENT_LIMIT)
+    lines = 0
+
+    with open(log_path, 'rb') as f:
+        f.seek(state['offset'])
+        for raw in f:
+            if not raw.endswith(b'\n'):
+                # nginx is mid-write; pick this line up on the next run
+                break
+            state['offset'] += len(raw)
+            lines += 1
+
+            entry = parse_log_line(raw.decode('utf-8', errors='replace'))
+            if entry is None:
+                state['invalid'] += 1
+                continue
+
+            day = entry_day(entry)
+            ip = client_ip(entry)
+            info = state['days'].setdefault(day, {'requests': 0, 'ips': []})
+            info['requests'] += 1
+            day_ips.setdefault(day, set()).add(ip)
+
+            state['total'] += 1
+            bump(state['paths'], entry.get('path', ''))
+            bump(state['ips'], ip)
+            bump(state['ua_families'], ua_family(entry.get('ua', '')))
+            bump(state['statuses'], str(entry.get('status', '')))
+            recent.append({'timestamp': entry.get('timestamp'), 'ip': ip, 'path': entry.get('path', '')})
+
+    for day, ips in day_ips.items():
+        state['days'][day]['ips'] = sorted(ips)
+    state['recent'] = list(recent)
+    return lines
+
+
+def top(counter: Dict[str, int], limit: int = TOP_LIMIT) -> List[Dict]:
+    ranked = sorted(counter.items(), key=lambda item: (-item[1], item[0]))[:limit]
+    return [{'key': key, 'count': count} for key, count in ranked]
+
+
+def build_stats(state: Dict) -> Dict:
+    """The compact summary the admin page loads"""
+    days = [
+        {'day': day, 'requests': info['requests'], 'uniqueIps': len(info['ips'])}
+        for day, info in sorted(state['days'].items())
+    ]
+    return {
+        'generatedAt': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'totalRequests': state['total'],
+        'uniqueIps': len(state['ips']),
+        'days': days,
+        'topPaths': top(state['paths']),
+        'topIps': top(state['ips']),
+        'uaFamilies': top(state['ua_families']),
+        'statuses': top(state['statuses']),
+        'recent': list(reversed(state['recent'])),
+    }
+
+
+def run_once(log_path: Path, stats_path: Path, state_path: Path) -> bool:
+    if not log_path.exists():
+        print(f"❌ Error: Log file not found: {log_path}")
+        return False
+
+    started = time.perf_counter()
+    state = load_state(state_path)
+    lines = aggregate(log_path, state)
+    write_json_atomic(state_path, state)
+    write_json_atomic(stats_path, build_stats(state), indent=2)
+    elapsed = time.perf_counter() - started
+
+    print(f"✅ {lines} new lines aggregated in {elapsed:.3f}s "
+          f"(total {state['total']} requests, offset {state['offset']:,} bytes)")
+    return True
+
+
+def main(argv: Optional[List[str]] = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Incrementally aggregate the nginx visitors log')
+    parser.add_argument('--log', type=str, default=VISITORS_LOG, help=f'Log file (default: {VISITORS_LOG})')
+    parser.add_argument('--stats', type=str, default=VISITOR_STATS, help=f'Summary output (default: {VISITOR_STATS})')
+    parser.add_argument('--state', type=str, default=None,
+                        help='State file (default: <stats>.state.json next to the summary)')
+    parser.add_argument('--interval', type=float, default=0, help='Repeat every N seconds (default: run once)')
+    parser.add_argument('--rebuild', action='store_true', help='Discard saved state and re-read the whole log')
+
+    args = parser.parse_args(argv)
+
+    log_path = Path(args.log)
+    stats_path = Path(args.stats)
+    state_path = Path(args.state) if args.state else stats_path.with_suffix('.state.json')
+
+    if args.rebuild and state_path.exists():
+        print(f"🗑️  Removing state: {state_path}")
+        state_path.unlink()
+
+    if not args.interval:
+        return 0 if run_once(log_path, stats_path, state_path) else 1
+
+    print(f"👀 Aggregating {log_path} every {args.interval:g}s (Ctrl+C to stop)")
+    try:
+        while True:
+            run_once(log_path, stats_path, state_path)
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        print("\n⚠️  Stopped by user")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
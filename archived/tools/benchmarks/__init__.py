@@ -0,0 +1,6 @@
+"""
+Benchmarks for the EnglishPod data tools
+
+Run from archived/tools so the tool modules are importable:
+    python3 -m benchmarks.run_benchmarks --episodes 1000 --output bench-results.json
+"""
@@ -0,0 +1,136 @@
+"""
+Synthetic EnglishPod corpus generator
+
+Produces description HTML in the shape YouTube's #expanded element has
+(dialogue lines with &nbsp; padding, Key/Supplementary Vocabulary lists with
+category annotations) and conversation HTML in the shape of the files under
+resources/conversation. Output is deterministic for a given seed.
+"""
+
+import random
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+LEVELS = ['Elementary', 'Intermediate', 'Upper Intermediate', 'Advanced']
+
+FOLDERS = ['Entry_01', 'Entry_02', 'Entry_03', 'Elementary', 'Intermediate', 'Upper_Intermediate', 'Advanced']
+
+WORDS = (
+    'airport passport luggage waiter order menu discount receipt meeting deadline '
+    'interview salary promotion doctor fever prescription apartment landlord rent '
+    'flight delay upgrade customer complaint refund manager schedule weekend hotel '
+    'invoice budget contract presentation client negotiation market investment'
+).split()
+
+CATEGORIES = [
+    'phrase', 'Adjective', 'adverb', 'preposition',
+    'principle verb, present simple', 'principle verb, past simple',
+    'verb, phrasal', 'common noun, singular', 'common noun, plural', 'noun, uncountable',
+]
+
+SPAN = '<span class="yt-core-attributed-string--link-inherit-color" dir="auto" style="color: rgb(60, 59, 4);">'
+UL = '<ul class="yt-core-attributed-string__list-group" dir="ltr">'
+
+
+class SyntheticEpisode:
+    """Raw material for one generated episode"""
+
+    def __init__(self, number: int, rng: random.Random):
+        self.number = number
+        self.level = rng.choice(LEVELS)
+        self.topic = ' '.join(rng.choice(WORDS).capitalize() for _ in range(rng.randint(1, 4)))
+        self.dialogue = [
+            ('AB'[i % 2], self._sentence(rng, rng.randint(6, 24)))
+            for i in range(rng.randint(8, 18))
+        ]
+        self.vocabulary = [self._vocab_line(rng) for _ in range(rng.randint(4, 8))]
+        self.supplementary = [self._vocab_line(rng) for _ in range(rng.randint(3, 7))]
+
+    @property
+    def title(self) -> str:
+        return f"EnglishPod {self.number} - {self.level} - {self.topic}"
+
+    @staticmethod
+    def _sentence(rng: random.Random, length: int) -> str:
+        words = [rng.choice(WORDS) for _ in range(length)]
+        words[0] = words[0].capitalize()
+        return ' '.join(words) + rng.choice(['.', '?', '!'])
+
+    def _vocab_line(self, rng: random.Random) -> str:
+        word = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(1, 3))).capitalize()
+        definition = self._sentence(rng, rng.randint(3, 9)).rstrip('.?!')
+        if rng.random() < 0.15:
+            return f"{word}: {definition}"
+        return f"{word} ({rng.choice(CATEGORIES)}): {definition}"
+
+
+def iter_episodes(count: int, seed: int = 1) -> Iterator[SyntheticEpisode]:
+    rng = random.Random(seed)
+    for number in range(1, count + 1):
+        yield SyntheticEpisode(number, rng)
+
+
+def description_html(episode: SyntheticEpisode) -> str:
+    """HTML as saved by the YouTube extractors (#expanded outerHTML)"""
+    dialogue = '\n'.join(f"{speaker}:&nbsp;&nbsp;{text}" for speaker, text in episode.dialogue)
+    key_items = ''.join(f'<li>{SPAN}{line}\n</span></li>' for line in episode.vocabulary)
+    supp_items = ''.join(f'<li>{SPAN}{line}\n</span></li>' for line in episode.supplementary)
+    return (
+        '<div id="expanded" class="style-scope ytd-text-inline-expander">'
+        '<yt-attributed-string class="style-scope ytd-text-inline-expander">'
+        '<span class="yt-core-attributed-string yt-core-attributed-string--white-space-pre-wrap" dir="auto">'
+        f'{SPAN}{episode.title}\n\nConversation \n{dialogue}\n\nKey Vocabulary \n</span>'
+        f'{UL}{key_items}</ul>'
+        f'{SPAN}\nSupplementary Vocabulary \n</span>'
+        f'{UL}{supp_items}</ul>'
+        '</span></yt-attributed-string></div>'
+    )
+
+
+def conversation_html(episode: SyntheticEpisode) -> str:
+    """HTML in the shape of resources/conversation/<folder>/*.html"""
+    dialogue = '\n'.join(f"{speaker}:&nbsp; {text}" for speaker, text in episode.dialogue)
+    key_items = ''.join(f'<li>{line}</li>' for line in episode.vocabulary)
+    supp_items = ''.join(f'<li>{line}</li>' for line in episode.supplementary)
+    return (
+        '<html><body>\n'
+        f'<p>{episode.title}\n</p>\n'
+        f'<p>Conversation\n{dialogue}\n</p>\n'
+        f'<p>Key Vocabulary\n</p><ul>{key_items}</ul>\n'
+        f'<p>Supplementary Vocabulary\n</p><ul>{supp_items}</ul>\n'
+        '</body></html>\n'
+    )
+
+
+def write_description_folders(root: Path, episodes: List[SyntheticEpisode]) -> Dict[str, int]:
+    """Spread episodes over youtube_descriptions/<folder>/video_NNN_*.html"""
+    counts: Dict[str, int] = {}
+    for index, episode in enumerate(episodes):
+        folder = FOLDERS[index % len(FOLDERS)]
+        folder_path = root / 'youtube_descriptions' / folder
+        folder_path.mkdir(parents=True, exist_ok=True)
+        safe_title = episode.title.replace(' ', '_')
+        (folder_path / f"video_{episode.number:03d}_{safe_title}.html").write_text(
+            description_html(episode), encoding='utf-8')
+        counts[folder] = counts.get(folder, 0) + 1
+    return counts
+
+
+def write_audio_conversation_folders(root: Path, episodes: List[SyntheticEpisode]) -> Dict[str, int]:
+    """Empty .m4a files plus matching conversation HTML under resources/"""
+    counts: Dict[str, int] = {}
+    for index, episode in enumerate(episodes):
+        folder = FOLDERS[index % len(FOLDERS)]
+        # The mapper expects a 3-digit number per folder
+        number = counts.get(folder, 0) + 1
+        if number > 999:
+            raise ValueError("at most 999 episodes per folder fit the NNN_Level_Topic.m4a naming")
+        audio_dir = root / 'resources' / 'audio' / folder
+        conv_dir = root / 'resources' / 'conversation' / folder
+        audio_dir.mkdir(parents=True, exist_ok=True)
+        conv_dir.mkdir(parents=True, exist_ok=True)
+        stem = f"{number:03d}_{episode.level.replace(' ', '_')}_{episode.topic.replace(' ', '_')}"
+        (audio_dir / f"{stem}.m4a").touch()
+        (conv_dir / f"{stem}.html").write_text(conversation_html(episode), encoding='utf-8')
+        counts[folder] = number
+    return counts
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Benchmark the description/conversation parsers and generators
+
+Generates a synthetic EnglishPod corpus (see benchmarks/corpus.py) and times:
+- parse_description             (extract_youtube_data.py)
+- parse_vocabulary_item         (extract_youtube_data.py)
+- generate_typescript_episode   (extract_youtube_data.py)
+- parse_conversation_html       (map_audio_conversations.py, needs bs4)
+- process_folder                end-to-end over youtube_descriptions/<folder>
+- map_audio_to_conversations    end-to-end over resources/{audio,conversation}
+
+Results are written as JSON. Passing --compare with an earlier results file
+flags benchmarks whose per-item time grew by more than --threshold.
+
+Usage (from archived/tools):
+    python3 -m benchmarks.run_benchmarks --episodes 1000 --output bench-results.json
+    python3 -m benchmarks.run_benchmarks --episodes 100000 --folder-episodes 2000
+    python3 -m benchmarks.run_benchmarks --compare bench-results.json --fail-on-regression
+"""
+
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from benchmarks import corpus
+
+MAX_EPISODES = 100_000
+
+
+def measure(name: str, items: int, func: Callable[[], object], repeat: int) -> Dict:
+    """Best-of-N wall time for func, which processes `items` items per call"""
+    best = float('inf')
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            started = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - started)
+    return {
+        'name': name,
+        'items': items,
+        'seconds': round(best, 6),
+        'per_item_us': round(best / items * 1e6, 3) if items else None,
+        'items_per_sec': round(items / best, 1) if best else None,
+    }
+
+
+def skipped(name: str, reason: str) -> Dict:
+    return {'name': name, 'skipped': reason}
+
+
+@contextlib.contextmanager
+def working_directory(path: Path):
+    previous = Path.cwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def run(episodes: int, folder_episodes: int, repeat: int, seed: int) -> List[Dict]:
+    from extract_youtube_data import parse_description, parse_vocabulary_item, generate_typescript_episode
+    from process_all_folders import process_folder
+
+    print(f"🧪 Generating {episodes} synthetic episodes (seed {seed})...")
+    synthetic = list(corpus.iter_episodes(episodes, seed))
+    descriptions = [corpus.description_html(ep) for ep in synthetic]
+    vocab_lines = [line for ep in synthetic for line in ep.vocabulary + ep.supplementary]
+    parsed = [parse_description(html) for html in descriptions]
+
+    results = [
+        measure('parse_description', len(descriptions),
+                lambda: [parse_description(html) for html in descriptions], repeat),
+        measure('parse_vocabulary_item', len(vocab_lines),
+                lambda: [parse_vocabulary_item(line) for line in vocab_lines], repeat),
+        measure('generate_typescript_episode', len(parsed),
+                lambda: [generate_typescript_episode(data, f"ep{i}", i) for i, data in enumerate(parsed, 1)],
+                repeat),
+    ]
+
+    try:
+        import map_audio_conversations
+    except ImportError as e:
+        map_audio_conversations = None
+        results.append(skipped('parse_conversation_html', f"import failed: {e}"))
+
+    folder_set = synthetic[:folder_episodes]
+    with tempfile.TemporaryDirectory(prefix='englishpod-bench-') as tmp:
+        root = Path(tmp)
+
+        if map_audio_conversations:
+            conv_dir = root / 'single'
+            conv_dir.mkdir()
+            conv_files = []
+            for ep in folder_set:
+                path = conv_dir / f"{ep.number:06d}.html"
+                path.write_text(corpus.conversation_html(ep), encoding='utf-8')
+                conv_files.append(path)
+            results.append(measure('parse_conversation_html', len(conv_files),
+                                   lambda: [map_audio_conversations.parse_conversation_html(p) for p in conv_files],
+                                   repeat))
+
+        print(f"📁 Writing {len(folder_set)} episodes as description folders...")
+        counts = corpus.write_description_folders(root, folder_set)
+        with working_directory(root):
+            results.append(measure('process_folder (all folders)', len(folder_set),
+                                   lambda: [process_folder(folder, 1) for folder in counts], repeat))
+
+        if map_audio_conversations:
+            try:
+                corpus.write_audio_conversation_folders(root, folder_set)
+            except ValueError as e:
+                results.append(skipped('map_audio_to_conversations', str(e)))
+            else:
+                with working_directory(root):
+                    results.append(measure('map_audio_to_conversations', len(folder_set),
+                                           map_audio_conversations.map_audio_to_conversations, repeat))
+        else:
+            results.append(skipped('map_audio_to_conversations', 'map_audio_conversations not importable'))
+
+    return results
+
+
+def compare(results: List[Dict], baseline_path: Path, threshold: float) -> List[Dict]:
+    """Benchmarks whose per-item time regressed beyond threshold"""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = {r['name']: r for r in json.load(f)['results'] if 'per_item_us' in r}
+
+    regressions = []
+    for result in results:
+        before = baseline.get(result['name'])
+        if not before or 'per_item_us' not in result or not before['per_item_us']:
+            continue
+        change = result['per_item_us'] / before['per_item_us'] - 1
+        result['change_vs_baseline'] = round(change, 4)
+        if change > threshold:
+            regressions.append(result)
+    return regressions
+
+
+def print_results(results: List[Dict]):
+    print(f"\n{'='*80}")
+    print("📊 BENCHMARK RESULTS")
+    print(f"{'='*80}")
+    for r in results:
+        if 'skipped' in r:
+            print(f"  {r['name']:32} ⏭️  skipped ({r['skipped']})")
+            continue
+        change = f"  {r['change_vs_baseline']:+.1%}" if 'change_vs_baseline' in r else ''
+        print(f"  {r['name']:32} {r['items']:>7} items  {r['seconds']:8.3f}s  "
+              f"{r['per_item_us']:10.1f} µs/item{change}")
+    print(f"{'='*80}\n")
+
+
+def main(argv: Optional[List[str]] = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark parsers and generators on a synthetic corpus')
+    parser.add_argument('--episodes', type=int, default=1000,
+                        help=f'Synthetic episodes for the per-function benchmarks (max {MAX_EPISODES})')
+    parser.add_argument('--folder-episodes', type=int, default=700,
+                        help='Episodes written to disk for the end-to-end folder runs (default: 700)')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per benchmark; the best is kept (default: 3)')
+    parser.add_argument('--seed', type=int, default=1, help='Corpus random seed (default: 1)')
+    parser.add_argument('--output', type=str, default='bench-results.json', help='Results JSON file')
+    parser.add_argument('--compare', type=str, default=None, help='Earlier results JSON to compare against')
+    parser.add_argument('--threshold', type=float, default=0.15,
+                        help='Relative slowdown reported as a regression (default: 0.15)')
+    parser.add_argument('--fail-on-regression', action='store_true', help='Exit with status 1 on regressions')
+
+    args = parser.parse_args(argv)
+
+    if not 1 <= args.episodes <= MAX_EPISODES:
+        print(f"❌ Error: --episodes must be between 1 and {MAX_EPISODES}")
+        return 1
+
+    results = run(args.episodes, min(args.folder_episodes, args.episodes), args.repeat, args.seed)
+
+    regressions = []
+    if args.compare:
+        regressions = compare(results, Path(args.compare), args.threshold)
+
+    print_results(results)
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'episodes': args.episodes,
+            'folder_episodes': min(args.folder_episodes, args.episodes),
+            'repeat': args.repeat,
+            'seed': args.seed,
+        },
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"💾 Results written to: {args.output}")
+
+    if regressions:
+        print(f"\n⚠️  {len(regressions)} regression(s) over {args.threshold:.0%}:")
+        for r in regressions:
+            print(f"   - {r['name']}: {r['change_vs_baseline']:+.1%}")
+        if args.fail_on_regression:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
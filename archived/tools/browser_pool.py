@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+In-process Chromium pool shared by playlist jobs
+
+Every level extractor launches and tears down its own Chromium, and
+extract_all_playlists.py ran them as separate subprocesses, so a full
+scrape paid browser startup seven times and could briefly hold several
+browsers at once. BrowserPool launches one browser and hands each job an
+isolated BrowserContext (its own cookies/cache) with a page, while a
+semaphore caps how many pages are open at the same time:
+
+    async with BrowserPool(max_pages=3, lean=True) as pool:
+        async with pool.page('Elementary') as page:
+            video_urls = await get_playlist_videos(page)
+            ...
+
+Jobs waiting for a slot simply block until another job releases its page.
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+
+from lean_page import block_requests, lean_context_options, lean_launch_options
+
+
+class BrowserPool:
+    """One Chromium, one context per job, at most max_pages pages open"""
+
+    def __init__(self, max_pages: int = 3, lean: bool = False, default_timeout_ms: Optional[int] = 60000):
+        self.max_pages = max_pages
+        self.lean = lean
+        self.default_timeout_ms = default_timeout_ms
+        self._slots = asyncio.Semaphore(max_pages)
+        self._playwright_cm = None
+        self.browser = None
+        self.stats: Dict[str, float] = {
+            'launches': 0, 'launch_s': 0.0, 'pages_served': 0, 'open_pages': 0, 'peak_pages': 0, 'waited_s': 0.0,
+        }
+
+    async def __aenter__(self):
+        try:
+            from playwright.async_api import async_playwright
+        except ImportError:
+            print("❌ Playwright is required: pip install playwright && playwright install chromium")
+            raise
+        started = time.perf_counter()
+        self._playwright_cm = async_playwright()
+        playwright = await self._playwright_cm.__aenter__()
+        print("🚀 Launching shared browser...")
+        self.browser = await playwright.chromium.launch(**lean_launch_options(self.lean))
+        self.stats['launches'] += 1
+        self.stats['launch_s'] = round(time.perf_counter() - started, 3)
+        print(f"✅ Browser ready in {self.stats['launch_s']:.1f}s (max {self.max_pages} pages)")
+        return self
+
+    async def __aexit__(self, *exc):
+        print("\n🔒 Closing shared browser...")
+        try:
+            await self.browser.close()
+        finally:
+            await self._playwright_cm.__aexit__(*exc)
+
+    @asynccontextmanager
+    async def page(self, job: str = ''):
+        """Yield a page in a fresh context; the slot is released when the block exits"""
+        waited = time.perf_counter()
+        async with self._slots:
+            self.stats['waited_s'] += time.perf_counter() - waited
+            context = await self.browser.new_context(**lean_context_options(self.lean))
+            if self.lean:
+                await block_requests(context)
+            page = await context.new_page()
+            if self.default_timeout_ms:
+                page.set_default_timeout(self.default_timeout_ms)
+            self.stats['pages_served'] += 1
+            self.stats['open_pages'] += 1
+            self.stats['peak_pages'] = max(self.stats['peak_pages'], self.stats['open_pages'])
+            if job:
+                print(f"🧩 {job}: got a page ({self.stats['open_pages']}/{self.max_pages} open)")
+            try:
+                yield page
+            finally:
+                self.stats['open_pages'] -= 1
+                await context.close()
+
+    def print_report(self):
+        s = self.stats
+        print(f"\n{'='*80}")
+        print("🧩 BROWSER POOL")
+        print(f"{'='*80}")
+        print(f"🚀 Browser launches: {s['launches']} ({s['launch_s']:.1f}s)")
+        print(f"📄 Pages served: {s['pages_served']} (peak {s['peak_pages']} open, limit {self.max_pages})")
+        print(f"⏳ Time jobs spent waiting for a page: {s['waited_s']:.1f}s")
+        print(f"{'='*80}")
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Catalogue Enrichment Pipeline
+
+Runs several catalogue passes (reorder, title fixes, pronunciations, ...)
+in one process with a single load and a single atomic save, instead of
+chaining separate scripts that each parse and rewrite the whole JSON.
+
+Each pass is a registered stage: a function that takes an iterator of
+episode dicts plus the pipeline context and yields episode dicts. Stages
+are chained lazily, so streaming stages hold one episode at a time; only
+stages that must see everything (reorder) buffer, and they do so on disk.
+
+Usage:
+    python3 catalogue_pipeline.py --list
+    python3 catalogue_pipeline.py --stages fix_titles,reorder,pronunciations
+    python3 catalogue_pipeline.py --stages estimate_pronunciations,validate --live
+    python3 catalogue_pipeline.py --stages fix_titles,reorder --live
+    python3 catalogue_pipeline.py --from-audio --stages fix_titles,reorder --live
+"""
+
+import re
+import shutil
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from catalogue_stream import iter_episodes, CatalogueFormatError, CatalogueWriter, EpisodeSpool
+from episode_model import Episode, SchemaError
+
+
+class Stage:
+    """A registered pipeline pass"""
+
+    def __init__(self, name: str, func: Callable, description: str):
+        self.name = name
+        self.func = func
+        self.description = description
+
+
+STAGES: Dict[str, Stage] = {}
+
+
+def stage(name: str, description: str = ''):
+    """Decorator registering a function as a pipeline stage"""
+    def register(func):
+        STAGES[name] = Stage(name, func, description or (func.__doc__ or '').strip())
+        return func
+    return register
+
+
+class PipelineContext:
+    """Options and per-stage counters shared by all stages of a run"""
+
+    def __init__(self, dry_run: bool = True, delay: float = 0.5):
+        self.dry_run = dry_run
+        self.delay = delay
+        self.counters: Dict[str, Dict[str, int]] = {}
+
+    def count(self, stage_name: str, key: str, amount: int = 1):
+        counters = self.counters.setdefault(stage_name, {})
+        counters[key] = counters.get(key, 0) + amount
+
+
+class TimedStream:
+    """Iterator wrapper recording the time spent producing each item"""
+
+    def __init__(self, name: str, iterable: Iterable[Dict]):
+        self.name = name
+        self.iterator = iter(iterable)
+        self.seconds = 0.0
+        self.count = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> Dict:
+        started = time.perf_counter()
+        try:
+            item = next(self.iterator)
+        finally:
+            self.seconds += time.perf_counter() - started
+        self.count += 1
+        return item
+
+
+# ---------------------------------------------------------------------------
+# Stages
+# ---------------------------------------------------------------------------
+
+LEVEL_FIXES = {
+    'Advance': 'Advanced',
+    'Upper': 'Upper Intermediate',
+}
+
+
+@stage('fix_titles', 'Normalize level typos and whitespace in titles/descriptions')
+def fix_titles(episodes: Iterator[Dict], ctx: PipelineContext) -> Iterator[Dict]:
+    for episode in episodes:
+        level = episode.get('level', '')
+        title = re.sub(r'\s+', ' ', episode.get('title', '')).strip()
+        topic = title.split(' - ', 1)[1] if ' - ' in title else title
+
+        fixed_level = LEVEL_FIXES.get(level, level)
+        if fixed_level == 'Upper Intermediate' and topic.startswith('Intermediate '):
+            # "Upper - Intermediate Soccer" came from splitting the audio
+            # filename on the first underscore
+            topic = topic[len('Intermediate '):]
+        elif level.isdigit():
+            # "187_187_Going_On_A_Diet.m4a": the number ended up as level
+            fixed_level = 'Unknown'
+
+        fixed_title = f"{fixed_level} - {topic}" if fixed_level else topic
+        if fixed_level != level or fixed_title != episode.get('title'):
+            episode['level'] = fixed_level
+            episode['title'] = fixed_title
+            episode['description'] = f"Learn {topic.lower()} through this lesson."
+            ctx.count('fix_titles', 'fixed')
+        yield episode
+
+
+@stage('reorder', 'Sort by difficulty folder and renumber ids (see reorder_episodes.py)')
+def reorder(episodes: Iterator[Dict], ctx: PipelineContext) -> Iterator[Dict]:
+    from reorder_episodes import get_level_order
+
+    with EpisodeSpool() as spool:
+        keys = []
+        for episode in episodes:
+            index = spool.append(episode)
+            keys.append((get_level_order(episode), episode.get('id', 0), index))
+
+        for new_id, (_, old_id, index) in enumerate(sorted(keys), start=1):
+            episode = spool[index]
+            if old_id != new_id:
+                ctx.count('reorder', 'renumbered')
+            episode['id'] = new_id
+            yield episode
+
+
+@stage('pronunciations', 'Fetch missing IPA pronunciations (see add_pronunciations.py)')
+def pronunciations(episodes: Iterator[Dict], ctx: PipelineContext) -> Iterator[Dict]:
+    from add_pronunciations import get_pronunciation, clean_word
+
+    # Each distinct word is looked up once per run
+    cache: Dict[str, Optional[str]] = {}
+
+    for episode in episodes:
+        transcript = episode.get('transcript') or {}
+        for key in ('vocabulary', 'supplementaryVocabulary'):
+            for vocab_item in transcript.get(key) or []:
+                # Estimates from estimate_pronunciations get another dictionary try
+                estimated = vocab_item.get('pronunciationEstimated')
+                if vocab_item.get('pronunciation') and not estimated:
+                    ctx.count('pronunciations', 'already_had')
+                    continue
+                word = clean_word(vocab_item.get('word', '')).lower()
+                if word not in cache:
+                    cache[word] = get_pronunciation(vocab_item.get('word', ''))
+                    time.sleep(ctx.delay)
+                if cache[word]:
+                    vocab_item['pronunciation'] = cache[word]
+                    vocab_item.pop('pronunciationEstimated', None)
+                    ctx.count('pronunciations', 'added')
+                elif estimated:
+                    ctx.count('pronunciations', 'kept_estimate')
+                else:
+                    ctx.count('pronunciations', 'failed')
+        yield episode
+
+
+@stage('estimate_pronunciations', 'Estimate the pronunciations still missing, offline (see g2p.py)')
+def estimate_pronunciations(episodes: Iterator[Dict], ctx: PipelineContext) -> Iterator[Dict]:
+    from add_pronunciations import clean_word
+    from g2p import G2P
+
+    def items(episode: Dict) -> Iterator[Dict]:
+        transcript = episode.get('transcript') or {}
+        for key in ('vocabulary', 'supplementaryVocabulary'):
+            yield from transcript.get(key) or []
+
+    # Phrases are built from the words the dictionary knows, wherever in
+    # the catalogue they appear, so everything is seen before estimating
+    g2p = G2P()
+    with EpisodeSpool() as spool:
+        for episode in episodes:
+            g2p.learn_items(items(episode), clean_word)
+            spool.append(episode)
+
+        for episode in spool:
+            for vocab_item in items(episode):
+                if vocab_item.get('pronunciation'):
+                    ctx.count('estimate_pronunciations', 'already_had')
+                elif g2p.fill(vocab_item, clean_word):
+                    ctx.count('estimate_pronunciations', 'estimated')
+                else:
+                    ctx.count('estimate_pronunciations', 'no_word')
+            yield episode
+
+
+@stage('validate', 'Check every episode against the schema in episode_model.py (stops on the first error)')
+def validate(episodes: Iterator[Dict], ctx: PipelineContext) -> Iterator[Dict]:
+    for index, episode in enumerate(episodes):
+        # Raises SchemaError (a ValueError) before anything is saved
+        Episode.decode(episode, f"$[{index}]")
+        ctx.count('validate', 'ok')
+        yield episode
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+def audio_source() -> Iterator[Dict]:
+    """Episodes freshly mapped from resources/audio + resources/conversation"""
+    from map_audio_conversations import map_audio_to_conversations, assign_unique_ids
+    yield from assign_unique_ids(map_audio_to_conversations())
+
+
+def run_pipeline(source: Iterable[Dict], stage_names: List[str], ctx: PipelineContext,
+                 output_path: Optional[Path] = None) -> List[Dict]:
+    """
+    Chain the named stages over source and save the result atomically.
+
+    Returns one timing row per step (load, each stage, save). Stage times
+    are exclusive: time spent in upstream steps is subtracted.
+    """
+    unknown = [name for name in stage_names if name not in STAGES]
+    if unknown:
+        raise ValueError(f"Unknown stage(s): {', '.join(unknown)}. Available: {', '.join(STAGES)}")
+
+    streams = [TimedStream('load', source)]
+    for name in stage_names:
+        streams.append(TimedStream(name, STAGES[name].func(streams[-1], ctx)))
+
+    started = time.perf_counter()
+    if output_path is not None and not ctx.dry_run:
+        with CatalogueWriter(output_path) as writer:
+            writer.write_all(streams[-1])
+    else:
+        for _ in streams[-1]:
+            pass
+    total = time.perf_counter() - started
+
+    timings = []
+    upstream = 0.0
+    for stream in streams:
+        timings.append({'step': stream.name, 'seconds': stream.seconds - upstream, 'episodes': stream.count})
+        upstream = stream.seconds
+    timings.append({'step': 'save' if not ctx.dry_run else 'drain', 'seconds': total - upstream,
+                    'episodes': streams[-1].count})
+    return timings
+
+
+def main(argv: Optional[List[str]] = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Run catalogue passes in one load/save cycle')
+    parser.add_argument('--stages', type=str, default='fix_titles,reorder',
+                        help='Comma-separated stage names, in order (default: fix_titles,reorder)')
+    parser.add_argument('--list', action='store_true', help='List registered stages and exit')
+    parser.add_argument('--live', action='store_true', help='Actually save changes (default is dry-run)')
+    parser.add_argument('--delay', type=float, default=0.5, help='Delay between API calls in seconds (default: 0.5)')
+    parser.add_argument('--file', type=str, default='src/data/all-episodes-mapped.json',
+                        help='Path to JSON file (default: src/data/all-episodes-mapped.json)')
+    parser.add_argument('--from-audio', action='store_true',
+                        help='Start from a fresh audio/conversation mapping instead of --file')
+    parser.add_argument('--output', type=str, default=None, help='Output path (default: same as --file)')
+
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("Registered stages:")
+        for registered in STAGES.values():
+            print(f"  {registered.name:16} {registered.description}")
+        return 0
+
+    json_path = Path(args.file)
+    output_path = Path(args.output) if args.output else json_path
+    stage_names = [name.strip() for name in args.stages.split(',') if name.strip()]
+    unknown = [name for name in stage_names if name not in STAGES]
+    if unknown:
+        print(f"❌ Error: Unknown stage(s): {', '.join(unknown)}. Available: {', '.join(STAGES)}")
+        return 1
+
+    if not args.from_audio and not json_path.exists():
+        print(f"❌ Error: File not found: {json_path}")
+        return 1
+
+    print(f"\n{'='*60}")
+    print(f"Catalogue pipeline: {' → '.join(['load'] + stage_names + ['save'])}")
+    print(f"Source: {'resources/audio + resources/conversation' if args.from_audio else json_path}")
+    print(f"Mode: {'DRY RUN (no changes will be saved)' if not args.live else 'LIVE (will update file)'}")
+    print(f"{'='*60}\n")
+
+    if args.live and output_path.exists():
+        backup_path = output_path.with_suffix(output_path.suffix + '.backup-pipeline')
+        print(f"💾 Creating backup: {backup_path}")
+        shutil.copy2(output_path, backup_path)
+
+    ctx = PipelineContext(dry_run=not args.live, delay=args.delay)
+    source = audio_source() if args.from_audio else iter_episodes(json_path)
+
+    try:
+        timings = run_pipeline(source, stage_names, ctx, output_path)
+    except CatalogueFormatError as e:
+        print(f"❌ Corrupt input: {e}")
+        return 1
+    except SchemaError as e:
+        print(f"❌ Validation failed: {e}")
+        return 1
+
+    print(f"\n{'='*60}")
+    print("⏱️  STAGE TIMINGS")
+    print(f"{'='*60}")
+    for row in timings:
+        counters = ctx.counters.get(row['step'], {})
+        extra = ', '.join(f"{k}={v}" for k, v in counters.items())
+        print(f"  {row['step']:16} {row['seconds']:8.3f}s  {row['episodes']:5d} episodes  {extra}")
+    print(f"  {'total':16} {sum(r['seconds'] for r in timings):8.3f}s")
+    print(f"{'='*60}\n")
+
+    if args.live:
+        print(f"✅ Saved: {output_path}")
+    else:
+        print("ℹ️  DRY RUN - No changes saved. Run with --live to save changes.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+Streaming reader/writer for the episode catalogue
+
+The catalogue tools used to json.load the whole of all-episodes-mapped.json
+before touching a single episode. This module lets them work one episode at
+a time instead:
+
+- iter_episodes(path)      yields episodes from a JSON array (or a .jsonl
+                           file) while holding only one record in memory
+- CatalogueWriter(path)    writes episodes one by one in the same layout as
+                           json.dump(..., indent=2) and atomically replaces
+                           the target on close
+- EpisodeSpool             disk-backed scratch list for passes that need to
+                           revisit episodes in a different order (reorder)
+
+Both readers and writers pick JSON-lines mode when the path ends in .jsonl.
+
+Benchmark (peak RSS of json.load vs streaming over a 10x synthetic catalogue):
+    python3 catalogue_stream.py --benchmark --file src/data/all-episodes-mapped.json
+"""
+
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+CHUNK_SIZE = 64 * 1024
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = ' \t\n\r'
+
+
+class CatalogueFormatError(ValueError):
+    """The catalogue file is truncated or not valid JSON"""
+
+
+def is_jsonl(path) -> bool:
+    """True if the path uses the JSON-lines storage format"""
+    return str(path).endswith('.jsonl')
+
+
+def _iter_jsonl(path: Path) -> Iterator[Dict]:
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                raise CatalogueFormatError(f"{path}:{line_no}: invalid JSON line: {e}") from e
+
+
+def _iter_json_array(path: Path, chunk_size: int = CHUNK_SIZE) -> Iterator[Dict]:
+    with open(path, 'r', encoding='utf-8') as f:
+        buf = ''
+        pos = 0
+        base = 0  # characters dropped from the front of buf, for error positions
+        eof = False
+        read_size = chunk_size
+
+        def fill() -> bool:
+            nonlocal buf, pos, base, eof, read_size
+            chunk = f.read(read_size)
+            if not chunk:
+                eof = True
+                return False
+            base += pos
+            buf = buf[pos:] + chunk
+            pos = 0
+            return True
+
+        def malformed(message: str) -> CatalogueFormatError:
+            return CatalogueFormatError(f"{path}: {message} at char {base + pos}")
+
+        def skip(chars: str):
+            nonlocal pos
+            while True:
+                while pos < len(buf) and buf[pos] in chars:
+                    pos += 1
+                if pos < len(buf) or not fill():
+                    return
+
+        skip(_WHITESPACE)
+        if pos >= len(buf) or buf[pos] != '[':
+            raise CatalogueFormatError(f"{path}: expected a JSON array of episodes")
+        pos += 1
+
+        # Exactly one ',' between values and none after the last: a leading
+        # comma ([, 1]), a doubled one ([1,, 2]), a trailing one ([1, ]) or a
+        # missing one ([1 2]) means the file is mangled, not just oddly spaced
+        skip(_WHITESPACE)
+        if pos < len(buf) and buf[pos] == ']':
+            return
+        while True:
+            skip(_WHITESPACE)
+            if pos >= len(buf):
+                raise CatalogueFormatError(f"{path}: unexpected end of file (missing ']')")
+            if buf[pos] in ',]':
+                raise malformed(f"expected an episode, found '{buf[pos]}'")
+
+            while True:
+                try:
+                    value, end = _decoder.raw_decode(buf, pos)
+                except json.JSONDecodeError as e:
+                    if eof or not fill():
+                        raise CatalogueFormatError(f"{path}: invalid JSON: {e}") from e
+                    # Records bigger than a chunk: grow reads geometrically
+                    # so a huge episode isn't re-parsed once per chunk
+                    read_size *= 2
+                    continue
+                if end == len(buf) and not eof and fill():
+                    # A value ending exactly at the buffer edge may be
+                    # truncated (e.g. a number); decode again with more data
+                    continue
+                break
+
+            read_size = chunk_size
+            pos = end
+            yield value
+
+            skip(_WHITESPACE)
+            if pos >= len(buf):
+                raise CatalogueFormatError(f"{path}: unexpected end of file (missing ']')")
+            if buf[pos] == ']':
+                return
+            if buf[pos] != ',':
+                raise malformed("expected ',' or ']' after an episode")
+            pos += 1
+
+
+def iter_episodes(path, chunk_size: int = CHUNK_SIZE) -> Iterator[Dict]:
+    """Yield episodes from a catalogue file one at a time"""
+    path = Path(path)
+    if is_jsonl(path):
+        return _iter_jsonl(path)
+    return _iter_json_array(path, chunk_size)
+
+
+class CatalogueWriter:
+    """
+    Write episodes one at a time to a catalogue file.
+
+    Output is byte-for-byte what json.dump(episodes, f, ensure_ascii=False,
+    indent=2) produces (or one record per line for .jsonl). Data goes to a
+    temporary file next to the target which replaces it atomically when the
+    writer is closed without an error.
+
+    Usage:
+        with CatalogueWriter(path) as writer:
+            for episode in iter_episodes(source):
+                writer.write(episode)
+    """
+
+    def __init__(self, path, indent: int = 2):
+        self.path = Path(path)
+        self.indent = indent
+        self.jsonl = is_jsonl(self.path)
+        self.count = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(prefix=f".{self.path.name}.", suffix='.tmp', dir=self.path.parent)
+        self._tmp_path = Path(tmp_name)
+        self._file = os.fdopen(fd, 'w', encoding='utf-8')
+        if not self.jsonl:
+            self._file.write('[')
+
+    def write(self, episode: Dict):
+        if self.jsonl:
+            self._file.write(json.dumps(episode, ensure_ascii=False, separators=(',', ':')))
+            self._file.write('\n')
+        else:
+            pad = ' ' * self.indent
+            body = json.dumps(episode, ensure_ascii=False, indent=self.indent)
+            self._file.write(',\n' if self.count else '\n')
+            self._file.write(pad + body.replace('\n', '\n' + pad))
+        self.count += 1
+
+    def write_all(self, episodes: Iterable[Dict]):
+        for episode in episodes:
+            self.write(episode)
+
+    def close(self):
+        if self._file.closed:
+            return
+        if not self.jsonl:
+            self._file.write('\n]' if self.count else ']')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        os.replace(self._tmp_path, self.path)
+
+    def abort(self):
+        if not self._file.closed:
+            self._file.close()
+        self._tmp_path.unlink(missing_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+
+class EpisodeSpool:
+    """
+    Disk-backed list of episodes with random access by index.
+
+    Episodes are appended as JSON lines to an anonymous temporary file and
+    only their byte offsets are kept in memory, so a pass can reorder the
+    whole catalogue without holding it.
+    """
+
+    def __init__(self):
+        self._file = tempfile.TemporaryFile(mode='w+b')
+        self._offsets: List[int] = []
+
+    def append(self, episode: Dict) -> int:
+        self._file.seek(0, os.SEEK_END)
+        self._offsets.append(self._file.tell())
+        self._file.write(json.dumps(episode, ensure_ascii=False).encode('utf-8'))
+        self._file.write(b'\n')
+        return len(self._offsets) - 1
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def __getitem__(self, index: int) -> Dict:
+        self._file.seek(self._offsets[index])
+        return json.loads(self._file.readline())
+
+    def __iter__(self) -> Iterator[Dict]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+# ---------------------------------------------------------------------------
+# Benchmark
+# ---------------------------------------------------------------------------
+
+def _peak_rss_mb() -> float:
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def _measure(mode: str, path: Path):
+    """Run one benchmark mode in this process and print peak RSS as JSON"""
+    import time
+
+    started = time.perf_counter()
+    vocab = 0
+    if mode == 'load':
+        with open(path, 'r', encoding='utf-8') as f:
+            episodes = json.load(f)
+        for episode in episodes:
+            vocab += len(episode.get('transcript', {}).get('vocabulary', []))
+    else:
+        for episode in iter_episodes(path):
+            vocab += len(episode.get('transcript', {}).get('vocabulary', []))
+    elapsed = time.perf_counter() - started
+    print(json.dumps({'mode': mode, 'seconds': round(elapsed, 3),
+                      'peak_rss_mb': round(_peak_rss_mb(), 1), 'vocab': vocab}))
+
+
+def build_synthetic_catalogue(source: Path, target: Path, factor: int = 10) -> int:
+    """Write a catalogue made of `factor` renumbered copies of source"""
+    count = 0
+    with CatalogueWriter(target) as writer:
+        for copy in range(factor):
+            for episode in iter_episodes(source):
+                count += 1
+                episode['id'] = count
+                episode['title'] = f"{episode.get('title', '')} (copy {copy + 1})"
+                writer.write(episode)
+    return count
+
+
+def run_benchmark(source: Path, factor: int = 10):
+    import subprocess
+
+    print(f"\n{'='*60}")
+    print(f"Streaming benchmark ({factor}x {source.name})")
+    print(f"{'='*60}\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        synthetic = Path(tmp) / 'synthetic-catalogue.json'
+        count = build_synthetic_catalogue(source, synthetic, factor)
+        size_mb = synthetic.stat().st_size / (1024 * 1024)
+        print(f"📦 Synthetic catalogue: {count} episodes, {size_mb:.1f} MB\n")
+
+        for mode in ('load', 'stream'):
+            out = subprocess.run(
+                [sys.executable, __file__, '--measure', mode, '--file', str(synthetic)],
+                check=True, capture_output=True, text=True,
+            )
+            result = json.loads(out.stdout.strip().splitlines()[-1])
+            label = 'json.load' if mode == 'load' else 'iter_episodes'
+            print(f"  {label:14} peak RSS {result['peak_rss_mb']:8.1f} MB   time {result['seconds']:.2f}s")
+
+    print(f"\n{'='*60}\n")
+
+
+def main(argv: Optional[List[str]] = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Streaming catalogue reader/writer utilities')
+    parser.add_argument('--file', type=str, default='src/data/all-episodes-mapped.json',
+                        help='Path to JSON file (default: src/data/all-episodes-mapped.json)')
+    parser.add_argument('--benchmark', action='store_true', help='Compare peak RSS of json.load vs streaming')
+    parser.add_argument('--factor', type=int, default=10, help='Synthetic catalogue size multiplier (default: 10)')
+    parser.add_argument('--to-jsonl', type=str, default=None, help='Convert --file to JSON-lines at this path')
+    parser.add_argument('--measure', choices=['load', 'stream'], help=argparse.SUPPRESS)
+
+    args = parser.parse_args(argv)
+    path = Path(args.file)
+
+    if not path.exists():
+        print(f"❌ Error: File not found: {path}")
+        return 1
+
+    if args.measure:
+        _measure(args.measure, path)
+    elif args.to_jsonl:
+        with CatalogueWriter(args.to_jsonl) as writer:
+            writer.write_all(iter_episodes(path))
+        print(f"✅ Wrote {writer.count} episodes to {args.to_jsonl}")
+    elif args.benchmark:
+        run_benchmark(path, args.factor)
+    else:
+        count = sum(1 for _ in iter_episodes(path))
+        print(f"📊 {path}: {count} episodes")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
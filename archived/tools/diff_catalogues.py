@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Compare two generations of all-episodes-mapped.json
+
+Loads both catalogues into columnar arrays (ids, titles, folders, vocab
+counts, content hashes) and reports what changed between them:
+- added / removed episodes
+- renumbered episodes (same lesson, different id)
+- retitled episodes
+- changed transcripts (dialogue hash differs)
+- vocabulary deltas (count changes, edited entries, new pronunciations)
+
+Episodes are matched across generations by their audioUrl, which survives
+renumbering. Every comparison is a hash lookup, so the report stays fast
+even for catalogues many times our current size.
+
+Usage:
+    python3 diff_catalogues.py src/data/all-episodes-mapped.json.backup-reorder src/data/all-episodes-mapped.json
+    python3 diff_catalogues.py OLD NEW --json diff-report.json
+"""
+
+import hashlib
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+def content_hash(value) -> str:
+    """Stable short hash of any JSON-serializable value"""
+    payload = json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def episode_key(episode: Dict) -> str:
+    """Identity of an episode that survives renumbering"""
+    if episode.get('audioUrl'):
+        return episode['audioUrl']
+    return f"{episode.get('folder', '')}/{episode.get('originalId', episode.get('id'))}"
+
+
+def vocab_entries(episode: Dict) -> List[Dict]:
+    """All key + supplementary vocabulary items of an episode"""
+    transcript = episode.get('transcript') or {}
+    return (transcript.get('vocabulary') or []) + (transcript.get('supplementaryVocabulary') or [])
+
+
+class Catalogue:
+    """Columnar view of a catalogue: one list per field, aligned by row"""
+
+    COLUMNS = ('key', 'id', 'title', 'folder', 'vocab_count',
+               'pronunciation_count', 'dialogue_hash', 'vocab_hash')
+
+    def __init__(self, path: Path):
+        self.path = path
+        for column in self.COLUMNS:
+            setattr(self, column, [])
+
+        with open(path, 'r', encoding='utf-8') as f:
+            episodes = json.load(f)
+
+        for episode in episodes:
+            transcript = episode.get('transcript') or {}
+            vocab = vocab_entries(episode)
+            self.key.append(episode_key(episode))
+            self.id.append(episode.get('id'))
+            self.title.append(episode.get('title', ''))
+            self.folder.append(episode.get('folder', 'Unknown'))
+            self.vocab_count.append(len(vocab))
+            self.pronunciation_count.append(sum(1 for v in vocab if v.get('pronunciation')))
+            self.dialogue_hash.append(content_hash(transcript.get('dialogue') or []))
+            # Pronunciations are tracked separately so enrichment runs don't
+            # show up as vocabulary edits
+            self.vocab_hash.append(content_hash([
+                [v.get('word', ''), v.get('definition', ''), v.get('category'), v.get('subcategory')]
+                for v in vocab
+            ]))
+
+        # key -> row index; duplicate keys keep the first row
+        self.index = {}
+        for row, key in enumerate(self.key):
+            self.index.setdefault(key, row)
+
+    def __len__(self):
+        return len(self.key)
+
+
+def diff_catalogues(old: Catalogue, new: Catalogue) -> Dict:
+    """Compute a structured diff between two columnar catalogues"""
+    old_keys = set(old.index)
+    new_keys = set(new.index)
+
+    def row_summary(cat: Catalogue, row: int) -> Dict:
+        return {'id': cat.id[row], 'title': cat.title[row], 'folder': cat.folder[row]}
+
+    added = [row_summary(new, new.index[k]) for k in new_keys - old_keys]
+    removed = [row_summary(old, old.index[k]) for k in old_keys - new_keys]
+
+    renumbered = []
+    retitled = []
+    moved = []
+    transcript_changed = []
+    vocab_changed = []
+
+    for key in old_keys & new_keys:
+        o = old.index[key]
+        n = new.index[key]
+
+        if old.id[o] != new.id[n]:
+            renumbered.append({'title': new.title[n], 'old_id': old.id[o], 'new_id': new.id[n]})
+        if old.title[o] != new.title[n]:
+            retitled.append({'id': new.id[n], 'old_title': old.title[o], 'new_title': new.title[n]})
+        if old.folder[o] != new.folder[n]:
+            moved.append({'id': new.id[n], 'title': new.title[n],
+                          'old_folder': old.folder[o], 'new_folder': new.folder[n]})
+        if old.dialogue_hash[o] != new.dialogue_hash[n]:
+            transcript_changed.append(row_summary(new, n))
+        if (old.vocab_hash[o] != new.vocab_hash[n]
+                or old.pronunciation_count[o] != new.pronunciation_count[n]):
+            vocab_changed.append({
+                **row_summary(new, n),
+                'vocab_delta': new.vocab_count[n] - old.vocab_count[o],
+                'entries_edited': old.vocab_hash[o] != new.vocab_hash[n],
+                'pronunciations_delta': new.pronunciation_count[n] - old.pronunciation_count[o],
+            })
+
+    by_id = lambda item: (item.get('id') or item.get('new_id') or 0)
+    for group in (added, removed, retitled, moved, transcript_changed, vocab_changed):
+        group.sort(key=by_id)
+    renumbered.sort(key=lambda item: item['new_id'] or 0)
+
+    duplicate_keys = len(new) - len(new.index)
+
+    return {
+        'old': {'path': str(old.path), 'episodes': len(old)},
+        'new': {'path': str(new.path), 'episodes': len(new)},
+        'duplicate_keys_in_new': duplicate_keys,
+        'added': added,
+        'removed': removed,
+        'renumbered': renumbered,
+        'retitled': retitled,
+        'moved': moved,
+        'transcript_changed': transcript_changed,
+        'vocab_changed': vocab_changed,
+        'totals': {
+            'vocab_old': sum(old.vocab_count),
+            'vocab_new': sum(new.vocab_count),
+            'pronunciations_old': sum(old.pronunciation_count),
+            'pronunciations_new': sum(new.pronunciation_count),
+        },
+    }
+
+
+def print_report(diff: Dict, limit: int = 10):
+    """Print a human-readable summary of the diff"""
+    print(f"\n{'='*80}")
+    print("📊 CATALOGUE DIFF")
+    print(f"{'='*80}")
+    print(f"Old: {diff['old']['path']} ({diff['old']['episodes']} episodes)")
+    print(f"New: {diff['new']['path']} ({diff['new']['episodes']} episodes)")
+    if diff['duplicate_keys_in_new']:
+        print(f"⚠️  {diff['duplicate_keys_in_new']} episodes in the new file share an audioUrl")
+
+    def cell(entry: Dict, key: str) -> str:
+        # Padding None (an episode without an id or folder) raises TypeError
+        value = entry.get(key)
+        return '-' if value is None else str(value)
+
+    def section(title: str, items: List[Dict], fmt):
+        print(f"\n{title}: {len(items)}")
+        for item in items[:limit]:
+            print(f"  {fmt(item)}")
+        if len(items) > limit:
+            print(f"  ... and {len(items) - limit} more")
+
+    section("➕ Added", diff['added'], lambda e: f"#{cell(e, 'id'):<4} [{cell(e, 'folder'):12}] {e['title']}")
+    section("➖ Removed", diff['removed'], lambda e: f"#{cell(e, 'id'):<4} [{cell(e, 'folder'):12}] {e['title']}")
+    section("🔢 Renumbered", diff['renumbered'], lambda e: f"{cell(e, 'old_id'):>4} → {cell(e, 'new_id'):<4} {e['title']}")
+    section("✏️  Retitled", diff['retitled'], lambda e: f"#{cell(e, 'id'):<4} {e['old_title']} → {e['new_title']}")
+    section("📁 Moved", diff['moved'], lambda e: f"#{cell(e, 'id'):<4} {e['old_folder']} → {e['new_folder']}: {e['title']}")
+    section("💬 Transcript changed", diff['transcript_changed'], lambda e: f"#{cell(e, 'id'):<4} [{cell(e, 'folder'):12}] {e['title']}")
+    section("📚 Vocabulary changed", diff['vocab_changed'], lambda e: (
+        f"#{cell(e, 'id'):<4} {e['title']} (words {e['vocab_delta']:+d}, "
+        f"pronunciations {e['pronunciations_delta']:+d}{', entries edited' if e['entries_edited'] else ''})"
+    ))
+
+    totals = diff['totals']
+    print(f"\n{'='*80}")
+    print(f"Vocabulary items: {totals['vocab_old']} → {totals['vocab_new']}")
+    print(f"With pronunciation: {totals['pronunciations_old']} → {totals['pronunciations_new']}")
+    print(f"{'='*80}\n")
+
+
+def main(argv: Optional[List[str]] = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Diff two generations of the episode catalogue')
+    parser.add_argument('old', type=str, help='Older catalogue JSON (e.g. a .backup-* file)')
+    parser.add_argument('new', type=str, help='Newer catalogue JSON')
+    parser.add_argument('--json', type=str, default=None, help='Also write the full diff to this JSON file')
+    parser.add_argument('--limit', type=int, default=10, help='Rows to print per section (default: 10)')
+
+    args = parser.parse_args(argv)
+
+    old_path = Path(args.old)
+    new_path = Path(args.new)
+    for path in (old_path, new_path):
+        if not path.exists():
+            print(f"❌ Error: File not found: {path}")
+            return 1
+
+    started = time.perf_counter()
+    diff = diff_catalogues(Catalogue(old_path), Catalogue(new_path))
+    elapsed = time.perf_counter() - started
+
+    print_report(diff, limit=args.limit)
+    print(f"⏱️  Diff computed in {elapsed:.2f}s")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(diff, f, ensure_ascii=False, indent=2)
+        print(f"💾 Full diff written to: {args.json}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,447 @@
+#!/usr/bin/env python3
+"""
+Episode API: a small asyncio HTTP service for the catalogue
+
+The app bundles all-episodes-mapped.json, so every visitor downloads every
+transcript up front. This service keeps the catalogue in memory, indexed,
+and serves only what a page needs:
+
+    GET /episodes?page=1&per_page=24&level=Elementary&folder=Entry_01
+        index page: episode summaries (no transcripts) plus paging info
+    GET /episodes/<id>
+        one full episode, transcript included (same shape as the catalogue)
+    GET /vocabulary?q=grab&limit=20
+        vocabulary search (word prefix matches first, then substrings),
+        each result listing the episodes that teach it
+    GET /health
+        catalogue size and load time
+
+Every response body is built once per catalogue generation and cached with
+a strong ETag (sha256 of the body) and, when the client accepts gzip, its
+compressed form (with its own ETag). A request whose If-None-Match matches
+gets an empty 304, so revalidating a page the browser already has costs
+one round trip and no body. Cache-Control is "no-cache": browsers always
+revalidate, so a catalogue change is visible immediately.
+
+The catalogue file's mtime is checked every --reload-interval seconds; a
+changed file is loaded in a worker thread and swapped in atomically (a file
+that fails to load leaves the previous catalogue in service).
+
+Only the standard library is used. nginx proxies /api/ to it (see
+nginx.conf and the optional "api" service in docker-compose.yml):
+
+    python3 episode_api.py --catalogue src/data/all-episodes-mapped.json --port 8090
+    curl -s localhost:8090/episodes?per_page=2
+"""
+
+import argparse
+import asyncio
+import bisect
+import gzip
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from email.utils import formatdate
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from catalogue_stream import iter_episodes
+from vocab_table import CompactCatalogue, is_vocab_table
+
+DEFAULT_CATALOGUE = Path('src/data/all-episodes-mapped.json')
+DEFAULT_PER_PAGE = 24
+MAX_PER_PAGE = 100
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 100
+
+# Responses smaller than this are not worth compressing
+GZIP_MIN_BYTES = 512
+RESPONSE_CACHE_SIZE = 2048
+KEEPALIVE_TIMEOUT = 30
+HEADER_TIMEOUT = 10
+
+STATUS_TEXT = {
+    200: 'OK', 304: 'Not Modified', 400: 'Bad Request', 404: 'Not Found',
+    405: 'Method Not Allowed', 431: 'Request Header Fields Too Large', 500: 'Internal Server Error',
+}
+
+SUMMARY_KEYS = ('id', 'originalId', 'title', 'level', 'folder', 'description', 'audioUrl')
+
+
+class Response:
+    """A response body with its ETag; the gzip form is built on first use"""
+
+    __slots__ = ('status', 'body', 'etag', 'cache_control', '_gzip')
+
+    def __init__(self, status: int, body: bytes, cache_control: str = 'no-cache'):
+        self.status = status
+        self.body = body
+        self.etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        self.cache_control = cache_control
+        self._gzip: Optional[bytes] = None
+
+    @classmethod
+    def json(cls, status: int, value, cache_control: str = 'no-cache') -> 'Response':
+        body = json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        return cls(status, body, cache_control)
+
+    @property
+    def gzip_etag(self) -> str:
+        # Each representation gets its own strong validator
+        return self.etag[:-1] + '-gzip"'
+
+    def gzipped(self) -> bytes:
+        if self._gzip is None:
+            self._gzip = gzip.compress(self.body, compresslevel=6, mtime=0)
+        return self._gzip
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """True if Accept-Encoding allows gzip (honouring q=0)"""
+    allowed = None
+    for part in accept_encoding.split(','):
+        coding, _, params = part.strip().partition(';')
+        coding = coding.strip().lower()
+        if coding not in ('gzip', '*'):
+            continue
+        q = 1.0
+        for param in params.split(';'):
+            name, _, value = param.strip().partition('=')
+            if name == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding == 'gzip':
+            return q > 0
+        allowed = q > 0
+    return bool(allowed)
+
+
+def etag_matches(if_none_match: str, etags: Tuple[str, ...]) -> bool:
+    """If-None-Match uses the weak comparison: W/ prefixes are ignored"""
+    if if_none_match.strip() == '*':
+        return True
+    candidates = {tag.strip().removeprefix('W/') for tag in if_none_match.split(',')}
+    return any(etag in candidates for etag in etags)
+
+
+class EpisodeStore:
+    """One loaded catalogue generation: episodes by id, summaries, vocabulary index"""
+
+    def __init__(self, episodes: List[Dict], source: Optional[Path] = None, mtime_ns: int = 0):
+        self.source = source
+        self.mtime_ns = mtime_ns
+        self.loaded = time.strftime('%Y-%m-%dT%H:%M:%S')
+        self.episodes = episodes
+        self.by_id = {episode['id']: episode for episode in episodes}
+        self.summaries = [self._summary(episode) for episode in episodes]
+
+        # One entry per distinct (word, definition), with the episodes using it
+        vocabulary: Dict[Tuple[str, str], Dict] = {}
+        for episode in episodes:
+            transcript = episode.get('transcript') or {}
+            for key in ('vocabulary', 'supplementaryVocabulary'):
+                for item in transcript.get(key) or []:
+                    entry = vocabulary.get((item['word'], item['definition']))
+                    if entry is None:
+                        entry = vocabulary[(item['word'], item['definition'])] = {**item, 'episodes': []}
+                    if episode['id'] not in entry['episodes']:
+                        entry['episodes'].append(episode['id'])
+        self.vocabulary = list(vocabulary.values())
+        # Sorted lowercased words for prefix search with bisect
+        self.word_index = sorted((entry['word'].lower(), n) for n, entry in enumerate(self.vocabulary))
+        self._words = [word for word, _ in self.word_index]
+        self._responses: 'OrderedDict[str, Response]' = OrderedDict()
+
+    @staticmethod
+    def _summary(episode: Dict) -> Dict:
+        summary = {key: episode[key] for key in SUMMARY_KEYS if key in episode}
+        transcript = episode.get('transcript') or {}
+        summary['dialogueLines'] = len(transcript.get('dialogue') or [])
+        summary['vocabularyCount'] = len(transcript.get('vocabulary') or [])
+        return summary
+
+    @classmethod
+    def load(cls, path: Path) -> 'EpisodeStore':
+        mtime_ns = os.stat(path).st_mtime_ns
+        if is_vocab_table(path):
+            episodes = list(CompactCatalogue(path))
+        else:
+            episodes = list(iter_episodes(path))
+        return cls(episodes, Path(path), mtime_ns)
+
+    def search(self, query: str, limit: int) -> List[Dict]:
+        query = query.strip().lower()
+        if not query:
+            return []
+        found: List[int] = []
+        start = bisect.bisect_left(self._words, query)
+        for word, n in self.word_index[start:]:
+            if not word.startswith(query) or len(found) >= limit:
+                break
+            found.append(n)
+        if len(found) < limit:
+            seen = set(found)
+            for word, n in self.word_index:
+                if query in word and n not in seen:
+                    found.append(n)
+                    if len(found) >= limit:
+                        break
+        return [self.vocabulary[n] for n in found]
+
+    def cached(self, key: str, build) -> Response:
+        response = self._responses.get(key)
+        if response is None:
+            response = self._responses[key] = build()
+            if len(self._responses) > RESPONSE_CACHE_SIZE:
+                self._responses.popitem(last=False)
+        else:
+            self._responses.move_to_end(key)
+        return response
+
+
+def _int_param(params: Dict[str, List[str]], name: str, default: int, low: int, high: int) -> int:
+    values = params.get(name)
+    if not values:
+        return default
+    try:
+        value = int(values[0])
+    except ValueError:
+        raise ValueError(f"{name} must be an integer")
+    if not low <= value <= high:
+        raise ValueError(f"{name} must be between {low} and {high}")
+    return value
+
+
+class EpisodeAPI:
+    """Routes requests against the current EpisodeStore"""
+
+    def __init__(self, store: EpisodeStore):
+        self.store = store
+
+    def route(self, target: str) -> Response:
+        parts = urlsplit(target)
+        path = parts.path.rstrip('/') or '/'
+        # Also answer on the public prefix, for running without nginx
+        if path == '/api' or path.startswith('/api/'):
+            path = path[4:] or '/'
+        params = parse_qs(parts.query)
+        store = self.store
+
+        if path == '/health':
+            return Response.json(200, {
+                'status': 'ok',
+                'episodes': len(store.episodes),
+                'vocabulary': len(store.vocabulary),
+                'source': str(store.source) if store.source else None,
+                'loaded': store.loaded,
+            }, cache_control='no-store')
+
+        # Normalized key, so equivalent query strings share one cached body
+        key = path + '?' + '&'.join(f"{k}={v}" for k in sorted(params) for v in params[k])
+
+        if path == '/episodes':
+            page = _int_param(params, 'page', 1, 1, 1_000_000)
+            per_page = _int_param(params, 'per_page', DEFAULT_PER_PAGE, 1, MAX_PER_PAGE)
+            level = params.get('level', [None])[0]
+            folder = params.get('folder', [None])[0]
+
+            def build() -> Response:
+                summaries = [s for s in store.summaries
+                             if (level is None or s.get('level') == level)
+                             and (folder is None or s.get('folder') == folder)]
+                start = (page - 1) * per_page
+                return Response.json(200, {
+                    'page': page,
+                    'perPage': per_page,
+                    'total': len(summaries),
+                    'pages': (len(summaries) + per_page - 1) // per_page,
+                    'episodes': summaries[start:start + per_page],
+                })
+            return store.cached(key, build)
+
+        if path.startswith('/episodes/'):
+            try:
+                episode_id = int(path[len('/episodes/'):])
+            except ValueError:
+                return Response.json(404, {'error': 'not found'})
+            episode = store.by_id.get(episode_id)
+            if episode is None:
+                return Response.json(404, {'error': f"no episode {episode_id}"})
+            return store.cached(path, lambda: Response.json(200, episode))
+
+        if path == '/vocabulary':
+            query = params.get('q', [''])[0]
+            if not query.strip():
+                raise ValueError('q is required')
+            limit = _int_param(params, 'limit', DEFAULT_SEARCH_LIMIT, 1, MAX_SEARCH_LIMIT)
+            return store.cached(key, lambda: Response.json(200, {
+                'query': query, 'results': store.search(query, limit)}))
+
+        return Response.json(404, {'error': 'not found'})
+
+    def respond(self, method: str, target: str, headers: Dict[str, str]) -> Tuple[int, Dict[str, str], bytes]:
+        """(status, headers, body) for a request, applying gzip and conditional GET"""
+        if method not in ('GET', 'HEAD'):
+            response = Response.json(405, {'error': 'method not allowed'})
+            extra = {'Allow': 'GET, HEAD'}
+        else:
+            extra = {}
+            try:
+                response = self.route(target)
+            except ValueError as e:
+                response = Response.json(400, {'error': str(e)})
+
+        use_gzip = len(response.body) >= GZIP_MIN_BYTES and accepts_gzip(headers.get('accept-encoding', ''))
+        etag = response.gzip_etag if use_gzip else response.etag
+        out = {
+            'Content-Type': 'application/json; charset=utf-8',
+            'Cache-Control': response.cache_control,
+            'Vary': 'Accept-Encoding',
+            **extra,
+        }
+        if response.status == 200:
+            out['ETag'] = etag
+            if_none_match = headers.get('if-none-match')
+            if if_none_match and etag_matches(if_none_match, (response.etag, response.gzip_etag)):
+                del out['Content-Type']
+                return 304, out, b''
+        body = response.gzipped() if use_gzip else response.body
+        if use_gzip:
+            out['Content-Encoding'] = 'gzip'
+        return response.status, out, body
+
+
+class EpisodeServer:
+    """Minimal HTTP/1.1 server (keep-alive, GET/HEAD only) around EpisodeAPI"""
+
+    def __init__(self, catalogue: Path, reload_interval: float = 2.0, access_log: bool = False):
+        self.catalogue = Path(catalogue)
+        self.reload_interval = reload_interval
+        self.access_log = access_log
+        self.api = EpisodeAPI(EpisodeStore.load(self.catalogue))
+        self._failed_mtime: Optional[int] = None
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    request_line = await asyncio.wait_for(reader.readline(), KEEPALIVE_TIMEOUT)
+                    if not request_line.strip():
+                        break
+                    headers = {}
+                    while True:
+                        line = await asyncio.wait_for(reader.readline(), HEADER_TIMEOUT)
+                        if line in (b'\r\n', b'\n', b''):
+                            break
+                        name, _, value = line.decode('latin-1').partition(':')
+                        headers[name.strip().lower()] = value.strip()
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError):
+                    break
+                except ValueError:
+                    # Line longer than the StreamReader limit
+                    self._write(writer, 'HTTP/1.1', 431, {'Connection': 'close'}, b'', False)
+                    break
+
+                parts = request_line.decode('latin-1').split()
+                if len(parts) != 3 or not parts[2].startswith('HTTP/'):
+                    self._write(writer, 'HTTP/1.1', 400, {'Connection': 'close'}, b'', False)
+                    break
+                method, target, version = parts
+
+                # GET/HEAD bodies carry no meaning here; read and drop them
+                length = headers.get('content-length', '0')
+                if length.isdigit() and int(length):
+                    await reader.readexactly(int(length))
+
+                try:
+                    status, out, body = self.api.respond(method, target, headers)
+                except Exception as e:
+                    print(f"❌ {method} {target}: {e!r}")
+                    status, out, body = 500, {'Content-Type': 'application/json'}, b'{"error":"internal"}'
+
+                connection = headers.get('connection', '').lower()
+                keep_alive = connection != 'close' if version == 'HTTP/1.1' else connection == 'keep-alive'
+                self._write(writer, version, status, out, body, method == 'HEAD', keep_alive)
+                await writer.drain()
+                if self.access_log:
+                    print(f"{time.strftime('%H:%M:%S')} {method} {target} {status} {len(body)}")
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _write(writer: asyncio.StreamWriter, version: str, status: int, headers: Dict[str, str],
+               body: bytes, head_only: bool, keep_alive: bool = False):
+        lines = [f"{'HTTP/1.0' if version == 'HTTP/1.0' else 'HTTP/1.1'} {status} {STATUS_TEXT.get(status, '')}",
+                 f"Date: {formatdate(usegmt=True)}", 'Server: episode-api']
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        if status != 304:
+            lines.append(f"Content-Length: {len(body)}")
+        if 'Connection' not in headers:
+            lines.append(f"Connection: {'keep-alive' if keep_alive else 'close'}")
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+        if body and not head_only and status != 304:
+            writer.write(body)
+
+    async def reload_when_changed(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            try:
+                mtime_ns = os.stat(self.catalogue).st_mtime_ns
+            except FileNotFoundError:
+                continue
+            if mtime_ns in (self.api.store.mtime_ns, self._failed_mtime):
+                continue
+            started = time.perf_counter()
+            try:
+                store = await loop.run_in_executor(None, EpisodeStore.load, self.catalogue)
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                self._failed_mtime = mtime_ns
+                print(f"⚠️  Could not reload {self.catalogue}, still serving the previous catalogue: {e}")
+                continue
+            self.api.store = store
+            print(f"🔄 Reloaded {len(store.episodes)} episodes in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+    async def serve(self, host: str, port: int):
+        server = await asyncio.start_server(self.handle, host, port)
+        store = self.api.store
+        print(f"🚀 Serving {len(store.episodes)} episodes, {len(store.vocabulary)} vocabulary items "
+              f"from {self.catalogue} on http://{host}:{port}")
+        reloader = asyncio.create_task(self.reload_when_changed()) if self.reload_interval > 0 else None
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            if reloader:
+                reloader.cancel()
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='Serve the episode catalogue over HTTP')
+    parser.add_argument('--catalogue', type=Path, default=DEFAULT_CATALOGUE,
+                        help='Catalogue file: inline JSON, JSONL or vocab-table (default: %(default)s)')
+    parser.add_argument('--host', default='127.0.0.1', help='Bind address (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8090, help='Port (default: 8090)')
+    parser.add_argument('--reload-interval', type=float, default=2.0,
+                        help='Seconds between catalogue mtime checks, 0 to disable (default: 2)')
+    parser.add_argument('--access-log', action='store_true', help='Print one line per request')
+    args = parser.parse_args(argv)
+
+    server = EpisodeServer(args.catalogue, args.reload_interval, args.access_log)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        print("\n👋 Stopped")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+Typed, compact records for episodes, dialogue lines and vocabulary items
+
+The tools pass episodes around as nested dicts, so a typo'd key or a
+number where a string belongs is only noticed when the React app renders
+it. These classes mirror src/types.ts (Episode, DialogueLine,
+VocabularyItem) and are:
+
+- compact: __slots__ instead of a per-object __dict__, lists stored as
+  tuples, and repeated short strings (speaker, level, folder, category)
+  interned so 2,400 "A"/"B" speakers share two objects
+- frozen: attributes cannot be reassigned; use .replace(**changes)
+- validated on decode: Episode.decode(obj) rejects missing required keys,
+  unknown keys and wrong types, naming the exact path
+  ("$[12].transcript.vocabulary[3].word: expected str, got int")
+- round-trippable: encode() emits keys in the catalogue's order and omits
+  unset optional fields, so decode -> encode -> CatalogueWriter reproduces
+  all-episodes-mapped.json byte for byte
+
+    episodes = [Episode.decode(e, f"$[{i}]") for i, e in enumerate(iter_episodes(path))]
+    episodes[0].transcript.vocabulary[0].word
+    writer.write(episode.encode())
+
+    python3 episode_model.py --validate src/data/all-episodes-mapped.json
+    python3 episode_model.py --benchmark --file src/data/all-episodes-mapped.json
+
+msgspec would do the same in C, but the tools only depend on the stdlib.
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from catalogue_stream import CatalogueWriter, iter_episodes
+
+# Mirrors VocabularyCategory in src/types.ts
+VOCABULARY_CATEGORIES = frozenset({
+    'verb', 'noun', 'adjective', 'adverb', 'phrase', 'preposition', 'conjunction', 'pronoun', 'interjection',
+})
+
+_set = object.__setattr__
+_MISSING = object()
+
+
+class SchemaError(ValueError):
+    """A catalogue value does not match the episode schema"""
+
+    def __init__(self, path: str, message: str):
+        super().__init__(f"{path}: {message}")
+        self.path = path
+
+
+def _type_name(value: Any) -> str:
+    return 'null' if value is None else type(value).__name__
+
+
+class Field:
+    """One JSON key of a record: its type, whether it is required, how to store it"""
+
+    __slots__ = ('name', 'kind', 'required', 'intern', 'choices')
+
+    def __init__(self, name: str, kind: Any, required: bool = True, intern: bool = False,
+                 choices: Optional[frozenset] = None):
+        self.name = name
+        # str / int / bool, a Record subclass, or [RecordSubclass] for a list
+        self.kind = kind
+        self.required = required
+        self.intern = intern
+        self.choices = choices
+
+
+class Record:
+    """Base for the frozen, slotted record classes"""
+
+    __slots__ = ()
+    FIELDS: Tuple[Field, ...] = ()
+    _KEYS: frozenset = frozenset()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._KEYS = frozenset(f.name for f in cls.FIELDS)
+
+    def __init__(self, *args, **kwargs):
+        if len(args) > len(self.FIELDS):
+            raise TypeError(f"{type(self).__name__} takes at most {len(self.FIELDS)} positional arguments")
+        for field, value in zip(self.FIELDS, args):
+            _set(self, field.name, value)
+        for field in self.FIELDS[len(args):]:
+            if field.name in kwargs:
+                _set(self, field.name, kwargs.pop(field.name))
+            elif field.required:
+                raise TypeError(f"{type(self).__name__} missing required argument '{field.name}'")
+            else:
+                _set(self, field.name, None)
+        if kwargs:
+            raise TypeError(f"{type(self).__name__} got unexpected argument(s): {', '.join(kwargs)}")
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is frozen; use .replace({name}=...)")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is frozen")
+
+    def replace(self, **changes) -> 'Record':
+        values = {f.name: getattr(self, f.name) for f in self.FIELDS}
+        values.update(changes)
+        return type(self)(**values)
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, f.name) == getattr(other, f.name) for f in self.FIELDS)
+
+    def __hash__(self):
+        return hash(tuple(getattr(self, f.name) for f in self.FIELDS))
+
+    def __repr__(self):
+        shown = ', '.join(f"{f.name}={getattr(self, f.name)!r}" for f in self.FIELDS
+                          if getattr(self, f.name) is not None)
+        return f"{type(self).__name__}({shown})"
+
+    def __reduce__(self):
+        return (type(self), tuple(getattr(self, f.name) for f in self.FIELDS))
+
+    @classmethod
+    def decode(cls, obj: Any, path: str = '$') -> 'Record':
+        """Validate a JSON object and build the record"""
+        if type(obj) is not dict:
+            raise SchemaError(path, f"expected object, got {_type_name(obj)}")
+        if not cls._KEYS.issuperset(obj):
+            unknown = sorted(set(obj) - cls._KEYS)
+            raise SchemaError(path, f"unknown field(s) {', '.join(unknown)} for {cls.__name__}")
+
+        record = object.__new__(cls)
+        for field in cls.FIELDS:
+            value = obj.get(field.name, _MISSING)
+            if value is _MISSING or value is None:
+                if field.required:
+                    raise SchemaError(f"{path}.{field.name}", "required field is missing")
+                _set(record, field.name, None)
+                continue
+
+            kind = field.kind
+            if kind is str or kind is int or kind is bool:
+                if type(value) is not kind:
+                    raise SchemaError(f"{path}.{field.name}",
+                                      f"expected {kind.__name__}, got {_type_name(value)}")
+                if field.choices is not None and value not in field.choices:
+                    raise SchemaError(f"{path}.{field.name}", f"{value!r} is not one of {sorted(field.choices)}")
+                if field.intern:
+                    value = sys.intern(value)
+            elif type(kind) is list:
+                if type(value) is not list:
+                    raise SchemaError(f"{path}.{field.name}", f"expected array, got {_type_name(value)}")
+                item_cls = kind[0]
+                value = tuple(item_cls.decode(item, f"{path}.{field.name}[{i}]") for i, item in enumerate(value))
+            else:
+                value = kind.decode(value, f"{path}.{field.name}")
+            _set(record, field.name, value)
+        return record
+
+    def encode(self) -> Dict[str, Any]:
+        """JSON-ready dict in catalogue key order, unset optional fields omitted"""
+        out = {}
+        for field in self.FIELDS:
+            value = getattr(self, field.name)
+            if value is None:
+                continue
+            kind = field.kind
+            if type(kind) is list:
+                value = [item.encode() for item in value]
+            elif isinstance(kind, type) and issubclass(kind, Record):
+                value = value.encode()
+            out[field.name] = value
+        return out
+
+
+class DialogueLine(Record):
+    __slots__ = ('speaker', 'text')
+    FIELDS = (
+        Field('speaker', str, intern=True),
+        Field('text', str),
+    )
+
+
+class VocabularyItem(Record):
+    __slots__ = ('word', 'definition', 'category', 'subcategory', 'example', 'pronunciation',
+                 'pronunciationEstimated', 'pronunciationAudio')
+    FIELDS = (
+        Field('word', str),
+        Field('definition', str),
+        Field('category', str, required=False, intern=True, choices=VOCABULARY_CATEGORIES),
+        Field('subcategory', str, required=False, intern=True),
+        Field('example', str, required=False),
+        Field('pronunciation', str, required=False),
+        Field('pronunciationEstimated', bool, required=False),
+        Field('pronunciationAudio', str, required=False),
+    )
+
+    @classmethod
+    def from_parsed(cls, item: Dict) -> 'VocabularyItem':
+        """From extract_youtube_data.parse_vocabulary_item() output (None for unset categories)"""
+        return cls.decode({k: v for k, v in item.items() if v is not None})
+
+
+class Transcript(Record):
+    __slots__ = ('dialogue', 'vocabulary', 'supplementaryVocabulary')
+    FIELDS = (
+        Field('dialogue', [DialogueLine]),
+        Field('vocabulary', [VocabularyItem]),
+        Field('supplementaryVocabulary', [VocabularyItem], required=False),
+    )
+
+
+class Episode(Record):
+    __slots__ = ('id', 'title', 'level', 'folder', 'description', 'audioUrl', 'transcript', 'originalId',
+                 'videoId')
+    FIELDS = (
+        Field('id', int),
+        Field('title', str),
+        Field('level', str, intern=True),
+        Field('folder', str, intern=True),
+        Field('description', str),
+        Field('audioUrl', str),
+        Field('transcript', Transcript),
+        Field('originalId', int, required=False),
+        Field('videoId', str, required=False),
+    )
+
+
+def decode_episodes(episodes: Iterable[Dict]) -> Iterator[Episode]:
+    """Episode records from catalogue dicts, with $[index] paths in errors"""
+    for index, episode in enumerate(episodes):
+        yield Episode.decode(episode, f"$[{index}]")
+
+
+def load_catalogue(path) -> List[Episode]:
+    """Stream and validate a catalogue file into records"""
+    return list(decode_episodes(iter_episodes(path)))
+
+
+def save_catalogue(episodes: Iterable[Episode], path) -> int:
+    with CatalogueWriter(path) as writer:
+        for episode in episodes:
+            writer.write(episode.encode())
+    return writer.count
+
+
+def validate_file(path: Path) -> List[str]:
+    """Every schema error in a catalogue (decoding continues past bad episodes)"""
+    errors = []
+    for index, episode in enumerate(iter_episodes(path)):
+        try:
+            Episode.decode(episode, f"$[{index}]")
+        except SchemaError as e:
+            errors.append(str(e))
+    return errors
+
+
+# ---------------------------------------------------------------------------
+# Benchmark
+# ---------------------------------------------------------------------------
+
+def _measure(mode: str, path: Path):
+    """Decode the whole catalogue as dicts or records in this process; print results as JSON"""
+    import gc
+    import tracemalloc
+    from catalogue_stream import _peak_rss_mb
+
+    def build():
+        if mode == 'dicts':
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        return load_catalogue(path)
+
+    started = time.perf_counter()
+    episodes = build()
+    decode_s = time.perf_counter() - started
+    peak_rss = _peak_rss_mb()
+
+    started = time.perf_counter()
+    if mode == 'dicts':
+        for episode in episodes:
+            json.dumps(episode, ensure_ascii=False)
+    else:
+        for episode in episodes:
+            json.dumps(episode.encode(), ensure_ascii=False)
+    encode_s = time.perf_counter() - started
+
+    count = len(episodes)
+    del episodes
+    gc.collect()
+
+    # Retained size of the in-memory catalogue, built again under tracemalloc
+    tracemalloc.start()
+    episodes = build()
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    print(json.dumps({
+        'mode': mode, 'episodes': count, 'decode_s': round(decode_s, 3), 'encode_s': round(encode_s, 3),
+        'peak_rss_mb': round(peak_rss, 1), 'retained_mb': round(retained / 2**20, 2),
+        'bytes_per_episode': retained // max(count, 1),
+    }))
+
+
+def run_benchmark(source: Path, factor: int = 10):
+    import subprocess
+    import tempfile
+    from catalogue_stream import build_synthetic_catalogue
+
+    print(f"\n{'='*60}")
+    print(f"Episode model benchmark ({factor}x {source.name})")
+    print(f"{'='*60}\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        synthetic = Path(tmp) / 'synthetic-catalogue.json'
+        count = build_synthetic_catalogue(source, synthetic, factor)
+        print(f"📦 Synthetic catalogue: {count} episodes, {synthetic.stat().st_size / 2**20:.1f} MB\n")
+
+        results = {}
+        for mode in ('dicts', 'records'):
+            out = subprocess.run(
+                [sys.executable, __file__, '--measure', mode, '--file', str(synthetic)],
+                check=True, capture_output=True, text=True,
+            )
+            results[mode] = result = json.loads(out.stdout.strip().splitlines()[-1])
+            label = 'plain dicts' if mode == 'dicts' else 'Episode records'
+            print(f"  {label:16} decode {result['decode_s']:6.2f}s  encode {result['encode_s']:6.2f}s  "
+                  f"peak RSS {result['peak_rss_mb']:7.1f} MB  "
+                  f"held {result['retained_mb']:7.1f} MB ({result['bytes_per_episode']:,} B/episode)")
+
+    dicts, records = results['dicts'], results['records']
+    print(f"\n  📉 Memory held per episode: {1 - records['bytes_per_episode'] / dicts['bytes_per_episode']:.0%} less")
+    print(f"  ⏱️  Validated decode costs {records['decode_s'] / dicts['decode_s']:.1f}x json.load alone")
+    print(f"\n{'='*60}\n")
+
+
+def main(argv: Optional[List[str]] = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Validate the catalogue against the episode schema')
+    parser.add_argument('--file', type=str, default='src/data/all-episodes-mapped.json',
+                        help='Path to JSON file (default: src/data/all-episodes-mapped.json)')
+    parser.add_argument('--validate', action='store_true', help='Report every schema error in --file')
+    parser.add_argument('--roundtrip', action='store_true',
+                        help='Check that decode/encode reproduces --file byte for byte')
+    parser.add_argument('--benchmark', action='store_true', help='Compare decode speed and memory with plain dicts')
+    parser.add_argument('--factor', type=int, default=10, help='Synthetic catalogue size multiplier (default: 10)')
+    parser.add_argument('--measure', choices=['dicts', 'records'], help=argparse.SUPPRESS)
+
+    args = parser.parse_args(argv)
+    path = Path(args.file)
+
+    if not path.exists():
+        print(f"❌ Error: File not found: {path}")
+        return 1
+
+    if args.measure:
+        _measure(args.measure, path)
+    elif args.benchmark:
+        run_benchmark(path, args.factor)
+    elif args.roundtrip:
+        import tempfile
+        with tempfile.TemporaryDirectory() as tmp:
+            copy = Path(tmp) / path.name
+            count = save_catalogue(load_catalogue(path), copy)
+            same = copy.read_bytes() == path.read_bytes()
+        print(f"{'✅' if same else '❌'} {count} episodes; round trip {'identical' if same else 'differs'}")
+        return 0 if same else 1
+    else:
+        errors = validate_file(path)
+        for error in errors[:50]:
+            print(f"❌ {error}")
+        if len(errors) > 50:
+            print(f"   ... and {len(errors) - 50} more")
+        if errors:
+            return 1
+        print(f"✅ {path}: schema OK")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
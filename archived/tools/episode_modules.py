@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Per-folder TypeScript modules for the generated episode catalogue
+
+process_all_folders.py used to write every episode into one literal array
+in src/data/all-episodes-generated.ts. tsc has to type-check the whole
+array whenever any episode changes, and Vite puts the whole dataset into
+one chunk. Here each playlist folder gets its own module and a small index
+loads them with dynamic import(), so each folder becomes its own chunk:
+
+    src/data/episodes/Entry_01.ts         const episodes: Episode[] = [...]
+    ...
+    src/data/episodes/Advanced.ts
+    src/data/episodes/index.ts            FOLDERS, loadFolder(), loadAllEpisodes()
+
+A module is only rewritten when the sha256 of its new content differs from
+the file on disk. Unchanged modules keep their mtime, so tsc --build and
+Vite's watcher recompile only the folders that actually changed. Episode
+ids are numbered across folders in order, so adding or removing an episode
+also rewrites the folders after it (their ids shift); editing an episode in
+place touches only its own folder.
+
+    from episode_modules import write_episode_modules
+    results = write_episode_modules({'Entry_01': [...], ...})
+"""
+
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from extract_youtube_data import generate_typescript_episode
+
+# Playlist folders in catalogue order
+FOLDERS = [
+    'Entry_01',
+    'Entry_02',
+    'Entry_03',
+    'Elementary',
+    'Intermediate',
+    'Upper_Intermediate',
+    'Advanced',
+]
+
+MODULES_DIR = Path('src/data/episodes')
+INDEX_NAME = 'index.ts'
+HEADER = '// Auto-generated by process_all_folders.py - do not edit\n'
+
+
+def episode_to_typescript(episode: Dict) -> str:
+    """Object literal for one episode, with its folder after the level line"""
+    ts_code = generate_typescript_episode(episode, f"ep{episode['id']}", episode['id'])
+    folder = episode.get('folder', 'Unknown')
+    lines = []
+    for line in ts_code.split('\n'):
+        lines.append(line)
+        if line.startswith('    level:'):
+            lines.append(f'    folder: "{folder}",')
+    return '\n'.join(lines)
+
+
+def render_folder_module(folder: str, episodes: List[Dict]) -> str:
+    body = ',\n'.join(episode_to_typescript(episode) for episode in episodes)
+    return (
+        HEADER
+        + f"// Folder: {folder} ({len(episodes)} episodes)\n"
+        + "import type { Episode } from '../../types';\n\n"
+        + "const episodes: Episode[] = [\n"
+        + (body + '\n' if body else '')
+        + "];\n\n"
+        + "export default episodes;\n"
+    )
+
+
+def render_index(folders: Iterable[str] = FOLDERS) -> str:
+    """
+    Index module. It lists folders only (no counts or ids), so it changes
+    only when the folder list does.
+    """
+    folders = list(folders)
+    names = ''.join(f"  '{folder}',\n" for folder in folders)
+    loaders = ''.join(f"  {folder}: () => import('./{folder}'),\n" for folder in folders)
+    return (
+        HEADER
+        + "import type { Episode } from '../../types';\n\n"
+        + f"export const FOLDERS = [\n{names}] as const;\n\n"
+        + "export type EpisodeFolder = (typeof FOLDERS)[number];\n\n"
+        + "const loaders: Record<EpisodeFolder, () => Promise<{ default: Episode[] }>> = {\n"
+        + loaders
+        + "};\n\n"
+        + "export function loadFolder(folder: EpisodeFolder): Promise<Episode[]> {\n"
+        + "  return loaders[folder]().then((module) => module.default);\n"
+        + "}\n\n"
+        + "export async function loadAllEpisodes(): Promise<Episode[]> {\n"
+        + "  const folders = await Promise.all(FOLDERS.map(loadFolder));\n"
+        + "  return folders.flat();\n"
+        + "}\n"
+    )
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def write_if_changed(path: Path, text: str) -> bool:
+    """Atomically write text unless the file already has the same content hash"""
+    path = Path(path)
+    data = text.encode('utf-8')
+    try:
+        if content_hash(path.read_bytes()) == content_hash(data):
+            return False
+    except FileNotFoundError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix='.tmp', dir=path.parent)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        # mkstemp creates 0600; generated sources should be readable like any other
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+    return True
+
+
+def write_episode_modules(episodes_by_folder: Dict[str, List[Dict]], out_dir: Path = MODULES_DIR,
+                          folders: Optional[List[str]] = None) -> Dict[str, bool]:
+    """
+    Write one module per folder plus the index; returns {file name: written}.
+    Every folder in the list gets a module, empty if it has no episodes, so
+    the index never points at a missing file.
+    """
+    out_dir = Path(out_dir)
+    folders = list(folders or FOLDERS)
+    results = {}
+    for folder in folders:
+        text = render_folder_module(folder, episodes_by_folder.get(folder, []))
+        results[f"{folder}.ts"] = write_if_changed(out_dir / f"{folder}.ts", text)
+    results[INDEX_NAME] = write_if_changed(out_dir / INDEX_NAME, render_index(folders))
+    return results
+
+
+def render_single_module(episodes: List[Dict], folders: List[str] = FOLDERS) -> str:
+    """The legacy all-episodes-generated.ts layout: one array of every episode"""
+    body = ',\n'.join(episode_to_typescript(episode) for episode in episodes)
+    order = [f"{n}. {folder}" for n, folder in enumerate(folders, 1)]
+    return (
+        "import type { Episode } from '../types';\n\n"
+        "// Auto-generated from YouTube descriptions\n"
+        f"// Total episodes: {len(episodes)}\n"
+        f"// Generated from {len(folders)} folders in order:\n"
+        f"// {', '.join(order[:3])}\n"
+        f"// {', '.join(order[3:])}\n\n"
+        "const allEpisodes: Episode[] = [\n"
+        f"{body}\n"
+        "];\n\n"
+        "export default allEpisodes;\n"
+    )
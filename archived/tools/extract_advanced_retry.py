@@ -11,6 +11,10 @@ import re
 from pathlib import Path
 from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeout
 
+from http_cache import CacheSession, add_cache_arguments, pace
+from playlist_enum import enumerate_playlist
+from retry_policy import MissingSelectorError, Retrier, RetryExhausted
+
 PLAYLIST_URL = "https://www.youtube.com/playlist?list=PL6vHaAQyQlk9G-4w1grcLPvjBdhOQC6Ma"
 OUTPUT_DIR = Path("youtube_descriptions/Advanced")
 VIDEO_TITLES = {}
@@ -26,91 +30,50 @@ def sanitize_filename(title):
 
 async def get_playlist_videos(page):
     """Get all video URLs from the playlist"""
-    print(f"📋 Loading playlist: {PLAYLIST_URL}")
-    await page.goto(PLAYLIST_URL, wait_until="networkidle", timeout=60000)
-    await page.wait_for_selector("ytd-playlist-video-renderer", timeout=15000)
-    
-    print("📜 Scrolling to load all videos...")
-    for i in range(20):  # More scrolls to ensure all videos load
-        await page.evaluate("window.scrollTo(0, document.documentElement.scrollHeight)")
-        await asyncio.sleep(1.5)
-    
-    video_elements = await page.query_selector_all("a#video-title")
-    video_urls = []
-    
-    for elem in video_elements:
-        url = await elem.get_attribute("href")
-        if url and "/watch?v=" in url:
-            video_id = url.split("/watch?v=")[1].split("&")[0]
-            clean_url = f"https://www.youtube.com/watch?v={video_id}"
-            if clean_url not in video_urls:
-                video_urls.append(clean_url)
-    
-    print(f"✅ Found {len(video_urls)} videos in playlist")
-    return video_urls
+    return await enumerate_playlist(page, PLAYLIST_URL)
 
 
-async def extract_video_description(page, video_url, video_number, retry_count=0):
-    """Extract description from a single video with retry logic"""
+async def extract_video_description(page, video_url, video_number):
+    """Extract description from a single video (one attempt; raises on failure so the Retrier can retry)"""
     print(f"\n{'='*80}")
     print(f"📹 Processing Video {video_number}: {video_url}")
-    if retry_count > 0:
-        print(f"🔄 Retry attempt {retry_count}")
     print(f"{'='*80}")
     
+    # Longer timeout for page load
+    await page.goto(video_url, wait_until="networkidle", timeout=60000)
+    await pace(3)
+    
     try:
-        # Longer timeout for page load
-        await page.goto(video_url, wait_until="networkidle", timeout=60000)
-        await asyncio.sleep(3)
-        
-        try:
-            title_elem = await page.wait_for_selector("h1.ytd-watch-metadata yt-formatted-string", timeout=15000)
-            video_title = await title_elem.inner_text()
-            print(f"📝 Title: {video_title}")
-            VIDEO_TITLES[video_number] = video_title
-        except:
-            video_title = "Unknown"
-            print("⚠️  Could not get video title")
-        
-        try:
-            expand_button = await page.wait_for_selector("tp-yt-paper-button#expand, button#expand", timeout=10000)
-            if expand_button:
-                await expand_button.click()
-                print("✅ Clicked 'Show more'")
-                await asyncio.sleep(2)
-        except:
-            print("⚠️  'Show more' button not found")
-        
-        try:
-            expanded_desc = await page.wait_for_selector("#expanded", timeout=15000)
-            html_content = await expanded_desc.evaluate("el => el.outerHTML")
-            print(f"✅ Extracted description HTML ({len(html_content)} characters)")
-            
-            output_file = OUTPUT_DIR / f"video_{video_number}.html"
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(html_content)
-            
-            print(f"💾 Saved to: {output_file}")
-            return True
-        except Exception as e:
-            print(f"❌ Error extracting description: {e}")
-            return False
-            
-    except PlaywrightTimeout as e:
-        print(f"⏱️  Timeout error: {e}")
-        
-        # Retry up to 2 times
-        if retry_count < 2:
-            print(f"🔄 Retrying video {video_number}...")
-            await asyncio.sleep(3)
-            return await extract_video_description(page, video_url, video_number, retry_count + 1)
-        else:
-            print(f"❌ Failed after {retry_count + 1} attempts")
-            return False
-            
-    except Exception as e:
-        print(f"❌ Error processing video: {e}")
-        return False
+        title_elem = await page.wait_for_selector("h1.ytd-watch-metadata yt-formatted-string", timeout=15000)
+        video_title = await title_elem.inner_text()
+        print(f"📝 Title: {video_title}")
+        VIDEO_TITLES[video_number] = video_title
+    except:
+        video_title = "Unknown"
+        print("⚠️  Could not get video title")
+    
+    try:
+        expand_button = await page.wait_for_selector("tp-yt-paper-button#expand, button#expand", timeout=10000)
+        if expand_button:
+            await expand_button.click()
+            print("✅ Clicked 'Show more'")
+            await pace(2)
+    except:
+        print("⚠️  'Show more' button not found")
+    
+    try:
+        expanded_desc = await page.wait_for_selector("#expanded", timeout=15000)
+    except PlaywrightTimeout:
+        raise MissingSelectorError("#expanded not found")
+    html_content = await expanded_desc.evaluate("el => el.outerHTML")
+    print(f"✅ Extracted description HTML ({len(html_content)} characters)")
+    
+    output_file = OUTPUT_DIR / f"video_{video_number}.html"
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(html_content)
+    
+    print(f"💾 Saved to: {output_file}")
+    return True
 
 
 def rename_files():
@@ -141,7 +104,7 @@ def rename_files():
     print(f"\n✅ Renamed {renamed} files")
 
 
-async def main():
+async def main(cache: CacheSession = None):
     """Main function"""
     print("""
 ╔══════════════════════════════════════════════════════════════════════════════╗
@@ -158,10 +121,13 @@ async def main():
         print("🚀 Launching browser...")
         browser = await p.chromium.launch(headless=False, args=['--start-maximized'])
         context = await browser.new_context(viewport={'width': 1920, 'height': 1080})
+        if cache:
+            await cache.attach(context)
         page = await context.new_page()
         
         # Increase default timeout
         page.set_default_timeout(60000)
+        retrier = Retrier(sleep=pace)
         
         try:
             video_urls = await get_playlist_videos(page)
@@ -177,13 +143,15 @@ async def main():
             failed = 0
             
             for i, video_url in enumerate(video_urls, 1):
-                if await extract_video_description(page, video_url, i):
+                try:
+                    await retrier.run(extract_video_description, page, video_url, i, label=f"video {i}")
                     successful += 1
-                else:
+                except RetryExhausted as e:
+                    print(f"❌ {e}")
                     failed += 1
                 
                 if i < len(video_urls):
-                    await asyncio.sleep(2)  # Longer delay between videos
+                    await pace(2)  # Longer delay between videos
             
             print("\n" + "="*80)
             print("📊 EXTRACTION SUMMARY")
@@ -192,6 +160,7 @@ async def main():
             print(f"❌ Failed: {failed} videos")
             print(f"📁 Files saved in: {OUTPUT_DIR.absolute()}")
             print("="*80)
+            retrier.print_report()
             
             if successful > 0:
                 rename_files()
@@ -208,8 +177,15 @@ async def main():
         finally:
             print("\n🔒 Closing browser...")
             await browser.close()
+            if cache:
+                cache.close()
             print("✅ Done!")
 
 
 if __name__ == '__main__':
-    asyncio.run(main())
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    add_cache_arguments(parser)
+    args = parser.parse_args()
+    asyncio.run(main(CacheSession.from_args(args)))
@@ -9,12 +9,37 @@ This script runs all playlist extractions in order:
 4. Advanced
 
 Each extraction will auto-rename files after completion.
+
+With --pooled, all seven playlists (Entry_01-03 and the four levels) run in
+this process on one shared Chromium (browser_pool.py) instead of one
+subprocess and one browser per script:
+
+    python3 extract_all_playlists.py --pooled --max-pages 3 --lean
+    python3 extract_all_playlists.py --pooled --playlists Elementary Advanced
 """
 
+import argparse
+import asyncio
+import importlib
 import subprocess
 import sys
 from pathlib import Path
 
+from extraction_status import html_counts
+from playlists import PLAYLISTS
+
+# Playlist -> extractor module whose get_playlist_videos / extract_video_description
+# (and rename_files, where present) the pooled mode reuses
+POOLED_MODULES = {
+    'Entry_01': 'playwright_extractor_v2',
+    'Entry_02': 'extract_entry_02',
+    'Entry_03': 'extract_entry_03',
+    'Elementary': 'extract_elementary',
+    'Intermediate': 'extract_intermediate',
+    'Upper_Intermediate': 'extract_upper_intermediate',
+    'Advanced': 'extract_advanced',
+}
+
 
 def run_extraction(script_name, playlist_name):
     """Run an extraction script and wait for completion"""
@@ -41,8 +66,95 @@ def run_extraction(script_name, playlist_name):
         return False
 
 
+async def run_pooled_job(pool, name):
+    """Extract one playlist with a page borrowed from the shared pool"""
+    module = importlib.import_module(POOLED_MODULES[name])
+    module.OUTPUT_DIR = PLAYLISTS[name]['output_dir']
+    module.OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    
+    successful = 0
+    failed = 0
+    try:
+        async with pool.page(name) as page:
+            video_urls = await module.get_playlist_videos(page)
+            if not video_urls:
+                print(f"❌ {name}: no videos found in playlist!")
+                return False
+            
+            for i, video_url in enumerate(video_urls, 1):
+                if await module.extract_video_description(page, video_url, i):
+                    successful += 1
+                else:
+                    failed += 1
+                if i < len(video_urls):
+                    await asyncio.sleep(1)
+    except Exception as e:
+        print(f"\n❌ FAILED: {name}: {e}")
+        return False
+    
+    print(f"\n✅ COMPLETED: {name} ({successful} extracted, {failed} failed)")
+    if successful and hasattr(module, 'rename_files'):
+        module.rename_files()
+    return failed == 0
+
+
+async def run_pooled(names, max_pages, lean):
+    """Run the playlist jobs concurrently on one browser, at most max_pages at a time"""
+    from browser_pool import BrowserPool
+    
+    async with BrowserPool(max_pages=max_pages, lean=lean) as pool:
+        outcomes = await asyncio.gather(*(run_pooled_job(pool, name) for name in names))
+        pool.print_report()
+    return dict(zip(names, outcomes))
+
+
+def print_summary(results, output_dirs):
+    """Final per-playlist status and file counts"""
+    print("\n" + "="*80)
+    print("📊 FINAL SUMMARY")
+    print("="*80)
+    
+    for name, success in results.items():
+        status = "✅ SUCCESS" if success else "❌ FAILED"
+        print(f"{status}: {name}")
+    
+    print("\n" + "="*80)
+    
+    print("\n📁 EXTRACTED FILES:")
+    total_files = 0
+    
+    # One scan per parent tree (reuses its cached status manifest)
+    counts = html_counts(output_dirs.values())
+    for name, folder_path in output_dirs.items():
+        count = counts[folder_path]
+        if count is not None:
+            total_files += count
+            print(f"  {name}: {count} files")
+    
+    print(f"\n🎉 TOTAL: {total_files} episodes extracted!")
+    
+    print("\n" + "="*80)
+    print("✅ All extractions complete!")
+    print("="*80)
+
+
 def main():
     """Run all extractions sequentially"""
+    parser = argparse.ArgumentParser(description='Extract all EnglishPod playlists')
+    parser.add_argument('--pooled', action='store_true',
+                        help='Run in-process on one shared browser instead of one subprocess per script')
+    parser.add_argument('--playlists', nargs='+', choices=list(POOLED_MODULES), default=list(POOLED_MODULES),
+                        help='Playlists for --pooled (default: all seven)')
+    parser.add_argument('--max-pages', type=int, default=3, help='Pages open at once with --pooled (default: 3)')
+    parser.add_argument('--lean', action='store_true', help='Headless pool that blocks media/images/trackers')
+    args = parser.parse_args()
+    
+    if args.pooled:
+        print(f"🧩 Pooled extraction: {', '.join(args.playlists)} (max {args.max_pages} pages)")
+        results = asyncio.run(run_pooled(args.playlists, args.max_pages, args.lean))
+        print_summary(results, {name: PLAYLISTS[name]['output_dir'] for name in args.playlists})
+        return
+    
     print("""
 ╔══════════════════════════════════════════════════════════════════════════════╗
 ║                     MASTER EXTRACTION SCRIPT                                 ║
@@ -79,44 +191,15 @@ Press Ctrl+C to stop at any time.
             print(f"\n⚠️  Stopping due to failure in {name}")
             break
     
-    # Final summary
-    print("\n" + "="*80)
-    print("📊 FINAL SUMMARY")
-    print("="*80)
-    
-    for name, success in results.items():
-        status = "✅ SUCCESS" if success else "❌ FAILED"
-        print(f"{status}: {name}")
-    
-    print("\n" + "="*80)
-    
-    # Count folders
-    base_dir = Path("youtube_descriptions")
-    if base_dir.exists():
-        folders = [
-            "Elementary",
-            "Intermediate", 
-            "Upper_Intermediate",
-            "Advanced"
+    print_summary(results, {
+        name: Path("youtube_descriptions") / folder
+        for name, folder in [
+            ("Elementary", "Elementary"),
+            ("Intermediate", "Intermediate"),
+            ("Upper Intermediate", "Upper_Intermediate"),
+            ("Advanced", "Advanced"),
         ]
-        
-        print("\n📁 EXTRACTED FILES:")
-        total_files = 0
-        
-        for folder in folders:
-            folder_path = base_dir / folder
-            if folder_path.exists():
-                files = list(folder_path.glob("*.html"))
-                count = len(files)
-                total_files += count
-                print(f"  {folder}: {count} files")
-        
-        print(f"\n🎉 TOTAL: {total_files} episodes extracted!")
-    
-    print("\n" + "="*80)
-    print("✅ All extractions complete!")
-    print("="*80)
-
+    })
 
 if __name__ == '__main__':
     try:
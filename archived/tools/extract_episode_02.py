@@ -12,6 +12,8 @@ import asyncio
 from pathlib import Path
 from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeout
 
+from playlist_enum import enumerate_playlist
+
 # Playlist URL for Episodes 101-200
 PLAYLIST_URL = "https://www.youtube.com/playlist?list=PL6vHaAQyQlk8Vwa7S2eQ2kcFQNb2chipE"
 OUTPUT_DIR = Path("youtube_descriptions/Episode_02")
@@ -19,30 +21,7 @@ OUTPUT_DIR = Path("youtube_descriptions/Episode_02")
 
 async def get_playlist_videos(page):
     """Get all video URLs from the playlist"""
-    print(f"📋 Loading playlist: {PLAYLIST_URL}")
-    await page.goto(PLAYLIST_URL, wait_until="networkidle")
-    
-    await page.wait_for_selector("ytd-playlist-video-renderer", timeout=10000)
-    
-    print("📜 Scrolling to load all videos...")
-    
-    for i in range(15):
-        await page.evaluate("window.scrollTo(0, document.documentElement.scrollHeight)")
-        await asyncio.sleep(1)
-    
-    video_elements = await page.query_selector_all("a#video-title")
-    video_urls = []
-    
-    for elem in video_elements:
-        url = await elem.get_attribute("href")
-        if url and "/watch?v=" in url:
-            video_id = url.split("/watch?v=")[1].split("&")[0]
-            clean_url = f"https://www.youtube.com/watch?v={video_id}"
-            if clean_url not in video_urls:
-                video_urls.append(clean_url)
-    
-    print(f"✅ Found {len(video_urls)} videos in playlist")
-    return video_urls
+    return await enumerate_playlist(page, PLAYLIST_URL)
 
 
 async def extract_video_description(page, video_url, video_number):
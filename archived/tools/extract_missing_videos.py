@@ -9,6 +9,8 @@ import asyncio
 from pathlib import Path
 from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeout
 
+from playlist_enum import enumerate_playlist
+
 # Playlist URL
 PLAYLIST_URL = "https://www.youtube.com/playlist?list=PL6vHaAQyQlk9RH8F_1lsI_z9wn3SLZHDi"
 OUTPUT_DIR = Path("youtube_descriptions")
@@ -78,29 +80,8 @@ async def extract_specific_video(page, video_url, video_number):
 async def get_video_url_by_index(page, index):
     """Get video URL from playlist by index"""
     print(f"📋 Loading playlist to find video {index}...")
-    await page.goto(PLAYLIST_URL, wait_until="networkidle")
-    
-    await page.wait_for_selector("ytd-playlist-video-renderer", timeout=10000)
-    
-    # Scroll to load all videos
-    print("📜 Scrolling to load videos...")
-    for i in range(15):
-        await page.evaluate("window.scrollTo(0, document.documentElement.scrollHeight)")
-        await asyncio.sleep(1)
-    
-    # Get all video links
-    video_elements = await page.query_selector_all("a#video-title")
-    video_urls = []
-    
-    for elem in video_elements:
-        url = await elem.get_attribute("href")
-        if url and "/watch?v=" in url:
-            video_id = url.split("/watch?v=")[1].split("&")[0]
-            clean_url = f"https://www.youtube.com/watch?v={video_id}"
-            if clean_url not in video_urls:
-                video_urls.append(clean_url)
-    
-    print(f"✅ Found {len(video_urls)} videos in playlist")
+    # Stops scrolling as soon as the playlist has rendered `index` videos
+    video_urls = await enumerate_playlist(page, PLAYLIST_URL, limit=index)
     
     if index <= len(video_urls):
         return video_urls[index - 1]
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Single-scan extraction status for the youtube_descriptions tree
+
+check_extraction_status.py globbed and regex-parsed every folder
+separately, and extract_all_playlists.py globbed the same folders again
+for its summary. scan_tree() makes one os.scandir pass over the tree root
+and, for each playlist folder, either reuses the cached manifest entry
+(the folder's mtime has not changed since it was scanned) or rescans that
+one folder. The manifest is small: per folder, its mtime, file counts, the
+video indices present as compressed ranges, and any duplicate or
+unparseable names.
+
+While an extraction is running only the folder being written changes, so
+polling is one root scandir, one scandir of the active folder, and one
+manifest write:
+
+    python3 extraction_status.py                 # human-readable report
+    python3 extraction_status.py --json          # for automation
+    python3 extraction_status.py --no-cache      # ignore the manifest
+
+Missing and duplicate indices are reported as ranges ("101-110, 134").
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DESCRIPTIONS_ROOT = Path('youtube_descriptions')
+MANIFEST_NAME = '.extraction-status.json'
+MANIFEST_VERSION = 1
+
+# Folder -> (first index, count) of the videos a complete extraction holds.
+# The level folders are filled by reorganize_by_level.py with the Entry
+# numbering, so they have no contiguous range to check.
+EXPECTED: Dict[str, Tuple[int, int]] = {
+    'Entry_01': (1, 100),
+    'Entry_02': (101, 39),
+    'Entry_03': (140, 63),
+}
+
+VIDEO_FILE = re.compile(r'^video_(\d+)(?:_.*)?\.html$')
+
+# A folder modified this close to its scan may still have had entries
+# added in the same mtime tick (NAS filesystems keep 1-2 s granularity),
+# so such an entry is rescanned next time rather than trusted
+RACY_NS = 2_000_000_000
+
+
+def compress_ranges(numbers: Iterable[int]) -> List[List[int]]:
+    """[1, 2, 3, 5, 7, 8] -> [[1, 3], [5, 5], [7, 8]]"""
+    ranges: List[List[int]] = []
+    for n in sorted(set(numbers)):
+        if ranges and n == ranges[-1][1] + 1:
+            ranges[-1][1] = n
+        else:
+            ranges.append([n, n])
+    return ranges
+
+
+def expand_ranges(ranges: List[List[int]]) -> List[int]:
+    return [n for start, end in ranges for n in range(start, end + 1)]
+
+
+def format_ranges(ranges: List[List[int]]) -> str:
+    """[[1, 3], [5, 5]] -> '1-3, 5'"""
+    return ', '.join(str(start) if start == end else f"{start}-{end}" for start, end in ranges) or '-'
+
+
+def scan_folder(path: str) -> Dict:
+    """Counts, present indices, duplicates and unparseable names for one folder"""
+    by_index: Dict[int, List[str]] = {}
+    html = 0
+    unparsed = []
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if not entry.name.endswith('.html'):
+                continue
+            html += 1
+            match = VIDEO_FILE.match(entry.name)
+            if match:
+                by_index.setdefault(int(match.group(1)), []).append(entry.name)
+            else:
+                unparsed.append(entry.name)
+    return {
+        'html': html,
+        'indices': compress_ranges(by_index),
+        'duplicates': {str(i): sorted(names) for i, names in sorted(by_index.items()) if len(names) > 1},
+        'unparsed': sorted(unparsed),
+    }
+
+
+def _load_manifest(path: Path) -> Dict:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return manifest.get('folders', {}) if manifest.get('version') == MANIFEST_VERSION else {}
+
+
+def _save_manifest(path: Path, folders: Dict):
+    try:
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'version': MANIFEST_VERSION, 'folders': folders}, f, indent=1)
+        os.replace(tmp, path)
+    except OSError as e:
+        # A read-only mount still gets a status, just without the cache
+        print(f"⚠️  Could not write {path}: {e}", file=sys.stderr)
+
+
+def scan_tree(root: Path = DESCRIPTIONS_ROOT, use_cache: bool = True) -> Dict[str, Dict]:
+    """Scan results for every subfolder of root, reusing unchanged manifest entries"""
+    root = Path(root)
+    manifest_path = root / MANIFEST_NAME
+    cached = _load_manifest(manifest_path) if use_cache else {}
+    folders: Dict[str, Dict] = {}
+    rescanned = 0
+    now_ns = time.time_ns()
+
+    if not root.is_dir():
+        return folders
+
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if not entry.is_dir() or entry.name.startswith('.'):
+                continue
+            mtime_ns = entry.stat().st_mtime_ns
+            previous = cached.get(entry.name)
+            if previous and previous['mtime_ns'] == mtime_ns and previous['scanned_ns'] - mtime_ns > RACY_NS:
+                folders[entry.name] = previous
+                continue
+            folders[entry.name] = {'mtime_ns': mtime_ns, 'scanned_ns': now_ns, **scan_folder(entry.path)}
+            rescanned += 1
+
+    if use_cache and (rescanned or set(folders) != set(cached)):
+        _save_manifest(manifest_path, folders)
+    return folders
+
+
+def folder_report(name: str, scan: Dict, expected: Optional[Tuple[int, int]] = None) -> Dict:
+    present = expand_ranges(scan['indices'])
+    report = {
+        'folder': name,
+        'found': len(present),
+        'html_files': scan['html'],
+        'indices': scan['indices'],
+        'duplicates': compress_ranges(int(i) for i in scan['duplicates']),
+        'duplicate_files': scan['duplicates'],
+        'unparsed': scan['unparsed'],
+        'expected': None,
+        'missing': [],
+        'missing_count': 0,
+        'complete': None,
+    }
+    if expected:
+        start, count = expected
+        missing = sorted(set(range(start, start + count)) - set(present))
+        report.update({
+            'expected': count,
+            'expected_range': [start, start + count - 1],
+            'missing': compress_ranges(missing),
+            'missing_count': len(missing),
+            'complete': not missing,
+        })
+    return report
+
+
+def status_report(root: Path = DESCRIPTIONS_ROOT, expected: Optional[Dict[str, Tuple[int, int]]] = None,
+                  use_cache: bool = True) -> Dict:
+    """Status of every folder under root plus totals over the folders with an expected range"""
+    expected = EXPECTED if expected is None else expected
+    started = time.perf_counter()
+    scans = scan_tree(root, use_cache)
+    folders = {name: folder_report(name, scans[name], expected.get(name)) for name in sorted(scans)}
+    for name in expected:
+        if name not in folders:
+            folders[name] = folder_report(name, {'html': 0, 'indices': [], 'duplicates': {}, 'unparsed': []},
+                                          expected[name])
+            folders[name]['exists'] = False
+
+    tracked = [folders[name] for name in expected]
+    total_expected = sum(r['expected'] for r in tracked)
+    total_missing = sum(r['missing_count'] for r in tracked)
+    return {
+        'root': str(root),
+        'generated': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'scan_ms': round((time.perf_counter() - started) * 1000, 2),
+        'folders': folders,
+        'totals': {
+            'expected': total_expected,
+            'found': total_expected - total_missing,
+            'missing': total_missing,
+            'completion': round((total_expected - total_missing) / total_expected * 100, 1) if total_expected else None,
+            'html_files': sum(r['html_files'] for r in folders.values()),
+        },
+    }
+
+
+def html_counts(paths: Iterable[Path]) -> Dict[Path, Optional[int]]:
+    """.html file count per folder (None if missing), scanning each parent tree once"""
+    paths = [Path(p) for p in paths]
+    scans = {parent: scan_tree(parent) for parent in {p.parent for p in paths}}
+    return {p: scans[p.parent][p.name]['html'] if p.name in scans[p.parent] else None for p in paths}
+
+
+def print_report(report: Dict):
+    for name, r in report['folders'].items():
+        print(f"\n📁 {name}:")
+        if r.get('exists') is False:
+            print(f"   ❌ Folder doesn't exist")
+        if r['expected'] is not None:
+            print(f"   Expected: {r['expected']} videos ({format_ranges([r['expected_range']])})")
+        print(f"   Found: {r['found']} videos ({format_ranges(r['indices'])})")
+        if r['expected'] is not None:
+            print(f"   Missing: {r['missing_count']} videos")
+            if r['missing']:
+                print(f"   Missing numbers: {format_ranges(r['missing'])}")
+            else:
+                print(f"   ✅ Complete!")
+        if r['duplicates']:
+            print(f"   ⚠️  Duplicate numbers: {format_ranges(r['duplicates'])}")
+        if r['unparsed']:
+            print(f"   ⚠️  {len(r['unparsed'])} file(s) without a video number")
+
+    t = report['totals']
+    print("\n" + "="*80)
+    print("📊 SUMMARY")
+    print("="*80)
+    print(f"\n📈 Total Expected: {t['expected']} videos")
+    print(f"✅ Total Found: {t['found']} videos")
+    print(f"❌ Total Missing: {t['missing']} videos")
+    if t['completion'] is not None:
+        print(f"📊 Completion: {t['completion']:.1f}%")
+
+    retry = [(name, r) for name, r in report['folders'].items() if r['missing_count'] or r['duplicates']]
+    if retry:
+        print("\n🔄 Folders needing attention:")
+        for name, r in retry:
+            parts = []
+            if r['missing_count']:
+                parts.append(f"{r['missing_count']} missing")
+            if r['duplicates']:
+                parts.append(f"duplicates {format_ranges(r['duplicates'])}")
+            print(f"   - {name}: {', '.join(parts)}")
+    print(f"\n⏱️  Scanned in {report['scan_ms']:.1f} ms")
+    print("\n" + "="*80)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Extraction status across all playlist folders')
+    parser.add_argument('--root', type=str, default=str(DESCRIPTIONS_ROOT),
+                        help='Descriptions tree (default: youtube_descriptions)')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    parser.add_argument('--no-cache', action='store_true', help='Rescan every folder and leave the manifest alone')
+
+    args = parser.parse_args()
+    report = status_report(Path(args.root), use_cache=not args.no_cache)
+
+    if args.json:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        print_report(report)
+
+
+if __name__ == '__main__':
+    main()
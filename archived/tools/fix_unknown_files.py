@@ -3,25 +3,15 @@
 Fix Unknown files - Move them to correct level folders based on filename
 """
 
-import re
 from pathlib import Path
 import shutil
 
+from level_classifier import build_move_plan, classify_folders, classify_name
+
 
 def get_level_from_filename(filename):
     """Extract level from filename"""
-    filename_lower = filename.lower()
-    
-    if 'elementary' in filename_lower:
-        return 'Elementary'
-    elif 'upper_intermediate' in filename_lower or 'upper-intermediate' in filename_lower:
-        return 'Upper_Intermediate'
-    elif 'intermediate' in filename_lower:
-        return 'Intermediate'
-    elif 'advanced' in filename_lower:
-        return 'Advanced'
-    else:
-        return 'Unknown'
+    return classify_name(filename)
 
 
 def fix_unknown_files():
@@ -59,25 +49,22 @@ def fix_unknown_files():
         'Still_Unknown': 0
     }
     
-    unknown_files = list(unknown_folder.glob("video_*.html"))
-    print(f"📊 Found {len(unknown_files)} files in Unknown folder\n")
+    # Title line first, filename as the fallback
+    classified = classify_folders([unknown_folder])
+    print(f"📊 Found {len(classified)} files in Unknown folder\n")
     
-    for html_file in unknown_files:
-        level = get_level_from_filename(html_file.name)
-        
+    for html_file, level in classified:
         if level == 'Unknown':
             stats['Still_Unknown'] += 1
             print(f"⚠️  Still unknown: {html_file.name}")
-            continue
-        
-        target_folder = level_folders[level]
-        target_file = target_folder / html_file.name
-        
-        if target_file.exists():
-            print(f"⏭️  Already exists: {html_file.name}")
-            html_file.unlink()  # Delete from Unknown
-            continue
-        
+    
+    moves, already_there = build_move_plan(classified, level_folders)
+    
+    for html_file in already_there:
+        print(f"⏭️  Already exists: {html_file.name}")
+        html_file.unlink()  # Delete from Unknown
+    
+    for html_file, target_file, level in moves:
         try:
             shutil.move(str(html_file), str(target_file))
             stats[level] += 1
@@ -0,0 +1,625 @@
+#!/usr/bin/env python3
+"""
+Rule-based grapheme-to-phoneme estimates (US IPA) for vocabulary items
+
+The dictionary API behind add_pronunciations.py knows single headwords but
+returns nothing for phrases ("Check out", "Go down in history"), compounds
+("Airhead") and unusual forms, so those items never get a pronunciation.
+G2P guesses one offline for any word or phrase:
+
+1. Lexicon: a built-in list of irregular and function words, plus every
+   dictionary pronunciation already in the catalogue (learn()).
+2. Morphology: inflections and neutral suffixes (-s, -ed, -ing, -er, -ly,
+   -ness, ...) are split off, the stem is pronounced on its own and the
+   suffix appended with the right allomorph (/s/, /z/ or /ɪz/ ...).
+   Closed compounds are split when both halves are known ("air" + "head").
+3. Letter-cluster rules for everything else: longest-match spelling
+   patterns with context (magic e, soft c/g, -tion, r-colouring ...),
+   then stress from suffix and prefix heuristics or syllable weight, and
+   unstressed vowels reduced to schwa.
+
+Phrases are the per-token results joined with spaces; function words take
+their weak form ("to" /tə/) inside a phrase. Results are memoized, so a
+batch over the whole catalogue costs milliseconds. Every result is a guess:
+callers store it with pronunciationEstimated: true.
+
+    from g2p import G2P
+    g2p = G2P()
+    g2p.learn('check', 'tʃɛk')
+    g2p.estimate('Check out')              # 'tʃɛk aʊt'
+    g2p.estimate_many(['Airhead', 'Skin graft'])
+
+    python3 g2p.py "Go down in history" layover
+    python3 g2p.py --check src/data/all-episodes-mapped.json
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+VOWELS = frozenset(['i', 'ɪ', 'eɪ', 'ɛ', 'æ', 'ɑ', 'ɔ', 'oʊ', 'ʊ', 'u', 'ʌ', 'ə',
+                    'aɪ', 'aʊ', 'ɔɪ', 'ɝ', 'ɚ'])
+LONG_VOWELS = frozenset(['i', 'eɪ', 'oʊ', 'u', 'aɪ', 'aʊ', 'ɔɪ', 'ɝ'])
+# Unstressed, these lose their quality
+REDUCED = {'æ': 'ə', 'ɛ': 'ə', 'ʌ': 'ə', 'ɑ': 'ə', 'ɔ': 'ə', 'ɝ': 'ɚ'}
+SIBILANTS = ('s', 'z', 'ʃ', 'ʒ', 'tʃ', 'dʒ')
+VOICELESS = ('p', 't', 'k', 'f', 'θ')
+ONSETS = frozenset([
+    'p ɹ', 'b ɹ', 't ɹ', 'd ɹ', 'k ɹ', 'ɡ ɹ', 'f ɹ', 'θ ɹ', 'ʃ ɹ',
+    'p l', 'b l', 'k l', 'ɡ l', 'f l', 's l',
+    't w', 'd w', 'k w', 'ɡ w', 's w', 'θ w',
+    'p j', 'b j', 'k j', 'f j', 'm j', 'h j', 'v j',
+    's p', 's t', 's k', 's m', 's n', 's f',
+    's p ɹ', 's t ɹ', 's k ɹ', 's p l', 's k w', 's k j',
+])
+
+# Function words: (strong form, weak form used inside phrases)
+FUNCTION_WORDS = {
+    'a': ('eɪ', 'ə'), 'an': ('æn', 'ən'), 'the': ('ði', 'ðə'), 'to': ('tu', 'tə'),
+    'of': ('ʌv', 'əv'), 'for': ('fɔɹ', 'fɚ'), 'from': ('fɹʌm', 'fɹəm'), 'and': ('ænd', 'ən'),
+    'or': ('ɔɹ', 'ɚ'), 'at': ('æt', 'ət'), 'as': ('æz', 'əz'), 'can': ('kæn', 'kən'),
+    'but': ('bʌt', 'bət'), 'than': ('ðæn', 'ðən'), 'that': ('ðæt', 'ðət'), 'some': ('sʌm', 'səm'),
+    'your': ('jɔɹ', 'jɚ'), 'you': ('ju', 'jə'), 'them': ('ðɛm', 'ðəm'), 'us': ('ʌs', 'əs'),
+    'was': ('wʌz', 'wəz'), 'were': ('wɝ', 'wɚ'), 'have': ('hæv', 'həv'), 'has': ('hæz', 'həz'),
+    'had': ('hæd', 'həd'), 'do': ('du', 'də'), 'does': ('dʌz', 'dəz'), 'be': ('bi', 'bi'),
+}
+
+# Irregular spellings the rules get wrong
+LEXICON = {
+    'i': 'aɪ', 'me': 'mi', 'my': 'maɪ', 'he': 'hi', 'she': 'ʃi', 'we': 'wi', 'they': 'ðeɪ',
+    'it': 'ɪt', 'is': 'ɪz', 'in': 'ɪn', 'on': 'ɑn', 'up': 'ʌp', 'off': 'ɔf', 'out': 'aʊt',
+    'by': 'baɪ', 'buy': 'baɪ', 'guy': 'ɡaɪ', 'eye': 'aɪ', 'go': 'ɡoʊ', 'no': 'noʊ', 'so': 'soʊ',
+    'oh': 'oʊ', 'ok': 'ˌoʊˈkeɪ', 'okay': 'ˌoʊˈkeɪ', 'who': 'hu', 'whose': 'huz', 'whom': 'hum',
+    'what': 'wʌt', 'where': 'wɛɹ', 'there': 'ðɛɹ', 'their': 'ðɛɹ', 'here': 'hɪɹ', 'this': 'ðɪs',
+    'these': 'ðiz', 'those': 'ðoʊz', 'then': 'ðɛn', 'with': 'wɪð', 'his': 'hɪz', 'her': 'hɝ',
+    'him': 'hɪm', 'our': 'aʊɚ', 'hour': 'aʊɚ', 'one': 'wʌn', 'once': 'wʌns', 'two': 'tu',
+    'four': 'fɔɹ', 'eight': 'eɪt', 'any': 'ˈɛni', 'many': 'ˈmɛni', 'again': 'əˈɡɛn',
+    'only': 'ˈoʊnli', 'busy': 'ˈbɪzi', 'very': 'ˈvɛɹi', 'every': 'ˈɛvɹi', 'been': 'bɪn',
+    'give': 'ɡɪv', 'live': 'lɪv', 'love': 'lʌv', 'come': 'kʌm', 'become': 'bɪˈkʌm', 'done': 'dʌn',
+    'none': 'nʌn', 'gone': 'ɡɔn', 'get': 'ɡɛt', 'said': 'sɛd', 'says': 'sɛz', 'put': 'pʊt',
+    'full': 'fʊl', 'pull': 'pʊl', 'push': 'pʊʃ', 'bush': 'bʊʃ', 'sure': 'ʃʊɹ', 'could': 'kʊd',
+    'would': 'wʊd', 'should': 'ʃʊd', 'know': 'noʊ', 'great': 'ɡɹeɪt', 'break': 'bɹeɪk',
+    'steak': 'steɪk', 'heart': 'hɑɹt', 'laugh': 'læf', 'enough': 'ɪˈnʌf', 'through': 'θɹu',
+    'though': 'ðoʊ', 'although': 'ɔlˈðoʊ', 'tough': 'tʌf', 'rough': 'ɹʌf', 'cough': 'kɔf',
+    'friend': 'fɹɛnd', 'water': 'ˈwɔtɚ', 'money': 'ˈmʌni', 'honey': 'ˈhʌni', 'other': 'ˈʌðɚ',
+    'mother': 'ˈmʌðɚ', 'brother': 'ˈbɹʌðɚ', 'father': 'ˈfɑðɚ', 'another': 'əˈnʌðɚ',
+    'never': 'ˈnɛvɚ', 'ever': 'ˈɛvɚ', 'river': 'ˈɹɪvɚ', 'over': 'ˈoʊvɚ', 'people': 'ˈpipəl',
+    'woman': 'ˈwʊmən', 'women': 'ˈwɪmən', 'family': 'ˈfæməli', 'idea': 'aɪˈdiə', 'area': 'ˈɛɹiə',
+    'about': 'əˈbaʊt', 'above': 'əˈbʌv', 'into': 'ˈɪntu', 'onto': 'ˈɑntu',
+    'just': 'dʒʌst', 'all': 'ɔl', 'how': 'haʊ', 'now': 'naʊ', 'down': 'daʊn', 'town': 'taʊn',
+    'own': 'oʊn', 'show': 'ʃoʊ', 'way': 'weɪ', 'day': 'deɪ', 'head': 'hɛd', 'dead': 'dɛd',
+    'read': 'ɹid', 'lead': 'lid', 'bread': 'bɹɛd', 'ready': 'ˈɹɛdi', 'early': 'ˈɝli',
+    'learn': 'lɝn', 'work': 'wɝk', 'word': 'wɝd', 'world': 'wɝld', 'worth': 'wɝθ',
+    'move': 'muv', 'prove': 'pɹuv', 'lose': 'luz', 'whole': 'hoʊl',
+    'good': 'ɡʊd', 'wood': 'wʊd', 'stood': 'stʊd', 'foot': 'fʊt', 'blood': 'blʌd',
+    'flood': 'flʌd', 'door': 'dɔɹ', 'floor': 'flɔɹ', 'poor': 'pʊɹ', 'minute': 'ˈmɪnɪt',
+    'time': 'taɪm', 'take': 'teɪk', 'make': 'meɪk', 'set': 'sɛt', 'seat': 'sit',
+    'someone': 'ˈsʌmwʌn', 'something': 'ˈsʌmθɪŋ', 'somebody': 'ˈsʌmˌbɑdi', 'anyone': 'ˈɛniˌwʌn',
+    'anything': 'ˈɛniˌθɪŋ', 'everyone': 'ˈɛvɹiˌwʌn', 'everything': 'ˈɛvɹiˌθɪŋ',
+    'nothing': 'ˈnʌθɪŋ', 'oneself': 'wʌnˈsɛlf', 'one\'s': 'wʌnz',
+    'don\'t': 'doʊnt', 'won\'t': 'woʊnt', 'can\'t': 'kænt', 'i\'m': 'aɪm', 'let\'s': 'lɛts',
+    'o\'clock': 'əˈklɑk', 'tv': 'ˌtiˈvi', 'ceo': 'ˌsiiˈoʊ', 'atm': 'ˌeɪtiˈɛm', 'etc': 'ɛtˈsɛtɚə',
+}
+
+CONTRACTIONS = [("'ll", 'l'), ("'re", 'ɚ'), ("'ve", 'v'), ("'d", 'd'), ("'m", 'm')]
+
+# Shorthand in vocabulary entries
+ALIASES = {'sb': 'somebody', 'sth': 'something', 'sb\'s': 'somebody\'s', 'smb': 'somebody'}
+
+LETTER_NAMES = {
+    'a': 'eɪ', 'b': 'bi', 'c': 'si', 'd': 'di', 'e': 'i', 'f': 'ɛf', 'g': 'dʒi', 'h': 'eɪtʃ',
+    'i': 'aɪ', 'j': 'dʒeɪ', 'k': 'keɪ', 'l': 'ɛl', 'm': 'ɛm', 'n': 'ɛn', 'o': 'oʊ', 'p': 'pi',
+    'q': 'kju', 'r': 'ɑɹ', 's': 'ɛs', 't': 'ti', 'u': 'ju', 'v': 'vi', 'w': 'ˈdʌbəlju', 'x': 'ɛks',
+    'y': 'waɪ', 'z': 'zi',
+}
+
+NUMBERS = ['zero', 'one', 'two', 'three', 'four', 'five', 'six', 'seven', 'eight', 'nine', 'ten',
+           'eleven', 'twelve', 'thirteen', 'fourteen', 'fifteen', 'sixteen', 'seventeen',
+           'eighteen', 'nineteen']
+TENS = ['', '', 'twenty', 'thirty', 'forty', 'fifty', 'sixty', 'seventy', 'eighty', 'ninety']
+
+C = '[bcdfghjklmnpqrstvwxz]'
+V = '[aeiouy]'
+# Ending that makes the vowel before a single consonant long: hate, table, nation
+LONG_CONTEXT = rf'(?={C}(?:e#|le#|ion|ia[ln]?#|ious#))'
+# Some vowel letter earlier in the word (1-3 letters back): endings like
+# -ive and -ine only reduce in polysyllables (active vs five)
+POLY = r'(?:(?<=[aeiouy][a-z])|(?<=[aeiouy][a-z]{2})|(?<=[aeiouy][a-z]{3}))'
+
+# (pattern, phones) in priority order. Words are matched as "#word#"; the
+# pattern's consumed text is replaced by the space-separated phones.
+RULES: List[Tuple[str, str]] = [
+    # Vowel patterns
+    (r'augh', 'ɔ'), (r'ough(?=t)', 'ɔ'), (r'ough', 'oʊ'), (r'eigh', 'eɪ'), (r'igh', 'aɪ'),
+    (r'tion', 'ʃ ə n'), (r'ssion', 'ʃ ə n'), (r'ssure', 'ʃ ɚ'),
+    (r'(?<=s)sion', 'ʃ ə n'), (r'(?<=[aeiouyr])sion', 'ʒ ə n'), (r'sion', 'ʃ ə n'),
+    (r'[ct]ial', 'ʃ ə l'), (r'[ct]ious', 'ʃ ə s'), (r'[ct]ian', 'ʃ ə n'), (r'cean', 'ʃ ə n'),
+    (r'ture', 'tʃ ɚ'), (POLY + r'ify(?=#)', 'ɪ f aɪ'), (r'ique(?=#)', 'i k'), (r'que(?=#)', 'k'),
+    (POLY + r'[ai]ble(?=#)', 'ə b ə l'), (r'ign(?=#|s#|ed#)', 'aɪ n'),
+    (r'ange(?=#)', 'eɪ n dʒ'), (r'nge(?=#)', 'n dʒ'), (r'(?<=[aeiou])sure', 'ʒ ɚ'),
+    (r'ous(?=#)', 'ə s'), (r'eous(?=#)', 'i ə s'),
+    (r'(?<=[^aeiou#])le(?=#)', 'ə l'), (r'(?<=[^aeiou#])re(?=#)', 'ɚ'), (r'ism(?=#)', 'ɪ z ə m'),
+    (POLY + r'age(?=#)', 'ɪ dʒ'), (POLY + r'ive(?=#)', 'ɪ v'), (POLY + r'ine(?=#)', 'ɪ n'),
+    (POLY + r'ice(?=#)', 'ɪ s'), (POLY + r'ace(?=#)', 'ə s'), (r'ful(?=#)', 'f ə l'),
+    (r'(?<=[ln])ion', 'j ə n'), (r'(?<=[bcfgkmp])u(?=l[aeio])', 'j ə'), (r'(?<=g)u(?=[aeiy])', ''),
+    (r'(?<=#[^aeiouy])i(?=[aou])', 'aɪ'), (r'io(?=#)', 'i oʊ'), (r'ia(?=#|l#|n#)', 'i ə'),
+    (r'(?<=w)ar(?=[^aeiouyr]|#)', 'ɔ ɹ'), (r'ar(?=[^aeiouyr]|#)', 'ɑ ɹ'),
+    (r'(?<=w)or', 'ɝ'), (r'or(?=[^aeiouyr]|#|e#)', 'ɔ ɹ'),
+    (r'(?<=qu)a', 'ɑ'), (r'(?<=w)a(?=[^aeiouyrgkx])', 'ɑ'),
+    (r'all(?=#|s#|ed#|er#|ing#)', 'ɔ l'), (r'alk', 'ɔ k'), (r'al(?=t)', 'ɔ l'),
+    (r'are(?=#)', 'ɛ ɹ'), (r'air', 'ɛ ɹ'), (r'ear(?=[^aeiouy#])', 'ɝ'), (r'ear|eer|ere(?=#)', 'ɪ ɹ'),
+    (r'ire(?=#)', 'aɪ ɚ'), (r'ure(?=#)', 'j ʊ ɹ'), (r'ore(?=#)', 'ɔ ɹ'),
+    (r'[eiu]r(?=[^aeiouyr]|#)', 'ɝ'), (r'our(?=#)', 'aʊ ɚ'), (r'our', 'ɔ ɹ'),
+    (r'ai|ay', 'eɪ'), (r'au|aw', 'ɔ'), (r'ee', 'i'), (r'ead(?=#)', 'ɛ d'), (r'ea', 'i'),
+    (r'ey(?=#)', 'i'), (r'ei|ey', 'eɪ'), (r'ew', 'u'), (r'eu', 'j u'), (r'ie(?=#)', 'aɪ'),
+    (r'ie', 'i'), (r'ind(?=#)', 'aɪ n d'), (r'ild(?=#)', 'aɪ l d'), (r'old', 'oʊ l d'),
+    (r'oa', 'oʊ'), (r'oo(?=k)', 'ʊ'), (r'oo', 'u'), (r'ou', 'aʊ'), (r'ow(?=#|s#|ed#)', 'oʊ'),
+    (r'(?<=[bglr])own', 'oʊ n'), (r'ow', 'aʊ'), (r'oi|oy', 'ɔɪ'), (r'ui', 'u'), (r'ue(?=#)', 'u'),
+    (r'(?<=[^aeiouy])u(?=[aeio])', 'u'), (r'o(?=ve[nr])', 'ʌ'),
+    (r'(?<=[bpf])u(?=ll|sh|t#)', 'ʊ'),
+    (r'a' + LONG_CONTEXT, 'eɪ'), (r'e' + LONG_CONTEXT, 'i'), (r'i(?=[^aeiouy#]e#)', 'aɪ'),
+    (r'o' + LONG_CONTEXT, 'oʊ'), (r'(?<=[bcfghkmpv#])u' + LONG_CONTEXT, 'j u'), (r'u' + LONG_CONTEXT, 'u'),
+    (r'y(?=[^aeiouy#]e#)', 'aɪ'),
+    (r'(?<=[aeiou][^aeiouy])e(?=#)', ''), (r'(?<=[aeiou][^aeiouy][^aeiouy])e(?=#)', ''),
+    (r'(?<=[^aeiouy])y(?=#)', 'i'), (r'(?<=#[^aeiouy])y(?=#)', 'aɪ'),
+    (r'(?<=#[^aeiouy][^aeiouy])y(?=#)', 'aɪ'),
+    (r'(?<=[^#aeiou])y(?=[^aeiouy])', 'ɪ'), (r'y', 'j'),
+    (r'a(?=#)', 'ə'), (r'o(?=#)', 'oʊ'), (r'i(?=#)', 'i'), (r'e(?=#)', 'i'), (r'(?<=#)e(?=[aeiou])', 'i'),
+    (r'a', 'æ'), (r'e', 'ɛ'), (r'i', 'ɪ'), (r'o', 'ɑ'), (r'u', 'ʌ'),
+    # Consonant clusters
+    (r'tch', 'tʃ'), (r'(?<=#)chr', 'k ɹ'), (r'sch', 's k'), (r'ch', 'tʃ'), (r'sh', 'ʃ'),
+    (r'(?<=#)th(?=e#|is#|at#|ey#|ere#|ese#|ose#|us#)', 'ð'), (r'th(?=er#|e#)', 'ð'), (r'th', 'θ'),
+    (r'ph', 'f'), (r'(?<=#)gh', 'ɡ'), (r'gh', ''), (r'ck', 'k'), (r'ng(?=[aeiouy])', 'ŋ ɡ'),
+    (r'ng', 'ŋ'), (r'n(?=k|c[^eiy]|q|x)', 'ŋ'), (r'(?<=#)wh', 'w'), (r'(?<=#)wr', 'ɹ'),
+    (r'(?<=#)kn', 'n'), (r'(?<=#)gn|gn(?=#)', 'n'), (r'(?<=#)ps', 's'), (r'mb(?=#)', 'm'),
+    (r'qu', 'k w'), (r'(?<=#)x', 'z'), (r'xc(?=[eiy])', 'k s'), (r'x', 'k s'),
+    (r'dge', 'dʒ'), (r'dg', 'dʒ'), (r'c(?=[eiy])', 's'),
+    (r'cc', 'k'), (r'c', 'k'), (r'(?<=#)g(?=e[tr]|i[rvfgl])', 'ɡ'), (r'g(?=[eiy])', 'dʒ'), (r'gg', 'ɡ'),
+    (r'g', 'ɡ'), (r'j', 'dʒ'), (r'(?<=[aeiou])s(?=[aeiouy])', 'z'), (r'ss|s', 's'), (r'r+', 'ɹ'),
+    (r'zz|z', 'z'), (r'(?<=[aeiou])h(?=#)', ''), (r'h', 'h'), (r'w', 'w'), (r'bb|b', 'b'),
+    (r'dd|d', 'd'), (r'ff|f', 'f'), (r'kk|k', 'k'), (r'll|l', 'l'), (r'mm|m', 'm'), (r'nn|n', 'n'),
+    (r'pp|p', 'p'), (r'tt|t', 't'), (r'vv|v', 'v'),
+]
+
+
+def _first_letters(pattern: str) -> str:
+    """Letters the text consumed by a rule pattern can start with"""
+    letters = ''
+    for alternative in pattern.replace(POLY, '').split('|'):
+        alternative = re.sub(r'\(\?<[=!][^)]*\)', '', alternative)
+        if alternative.startswith('['):
+            klass = alternative[1:alternative.index(']')]
+            letters += re.sub(r'(\w)-(\w)',
+                              lambda m: ''.join(map(chr, range(ord(m[1]), ord(m[2]) + 1))), klass)
+        else:
+            letters += alternative[:1]
+    return letters
+
+
+def _compile_rules(rules: List[Tuple[str, str]]) -> Dict[str, List[Tuple['re.Pattern', List[str]]]]:
+    """Rules indexed by the letter their match starts with, in priority order"""
+    table: Dict[str, List] = {}
+    for pattern, phones in rules:
+        entry = (re.compile(pattern), phones.split())
+        for letter in sorted(set(_first_letters(pattern))):
+            table.setdefault(letter, []).append(entry)
+    return table
+
+
+_RULES = _compile_rules(RULES)
+
+# Suffixes: where they put the stress
+STRESS_BEFORE = ('tion', 'sion', 'cian', 'tian', 'cial', 'tial', 'cious', 'tious', 'ical', 'ic', 'ics',
+                 'ity', 'ify', 'ial', 'ian', 'ious', 'eous', 'ient', 'ience', 'iency', 'ual', 'uous',
+                 'ular', 'logy', 'graphy', 'metry', 'nomy', 'pathy', 'itude', 'ative', 'itive', 'ety')
+STRESS_ON = ('eer', 'ee', 'ese', 'ette', 'esque', 'ique', 'oon', 'self', 'selves')
+UNSTRESSED_PREFIXES = ('be', 'de', 're', 'pre', 'un', 'ex', 'en', 'em', 'dis', 'mis', 'con', 'com', 'in',
+                       'im', 'ob', 'sub', 'sus', 'trans', 'for', 'a')
+
+# Inflections and stress-neutral suffixes: (spelling, phones or None for allomorphs)
+SUFFIXES = [
+    ('ness', 'nəs'), ('ment', 'mənt'), ('less', 'ləs'), ('ship', 'ʃɪp'), ('hood', 'hʊd'),
+    ('ful', 'fəl'), ('ing', 'ɪŋ'), ('est', 'ɪst'), ('ly', 'li'), ('er', 'ɚ'), ('ed', None), ('s', None),
+]
+# Split off even when the stem is unknown; the others only in front of a known word
+INFLECTIONS = ('ing', 'est', 'ly', 'er', 'ed', 's')
+
+
+def _vowel_groups(spelling: str) -> int:
+    return len(re.findall(r'[aeiouy]+', spelling.rstrip('e') or spelling))
+
+
+def _stem_candidates(word: str, suffix: str) -> List[str]:
+    """Spellings the stem may have had before the suffix was added"""
+    stem = word[:-len(suffix)]
+    candidates = []
+    if suffix == 's':
+        if stem.endswith('ie') and len(stem) > 3:
+            candidates.append(stem[:-2] + 'y')
+        if re.search(r'(?:[sxz]|[cs]h)e$', stem):
+            candidates.append(stem[:-1])
+    if stem.endswith('i') and suffix not in ('ing',):
+        candidates.append(stem[:-1] + 'y')
+    if len(stem) > 2 and stem[-1] == stem[-2] and stem[-1] not in 'lsaeiouy':
+        candidates.append(stem[:-1])
+    if suffix[0] in 'aeiy':
+        if re.search(rf'{C}[lr]$', stem) and not stem.endswith(('rl', 'll')):
+            candidates.append(stem + 'e')
+        elif (re.search(rf'(?:^|{C}){V}{C}$', stem) and _vowel_groups(stem) == 1
+              and not stem.endswith(('w', 'x', 'y'))
+              or stem.endswith(('at', 'iz', 'yz'))):
+            candidates.append(stem + 'e')
+    candidates.append(stem)
+    return candidates
+
+
+def _ends_with(ipa: str, sounds: Tuple[str, ...]) -> bool:
+    return ipa.rstrip('ˈˌ').endswith(sounds)
+
+
+def _allomorph(suffix: str, stem_ipa: str) -> str:
+    if suffix == 's':
+        return 'ɪz' if _ends_with(stem_ipa, SIBILANTS) else 's' if _ends_with(stem_ipa, VOICELESS) else 'z'
+    if suffix == 'ed':
+        if _ends_with(stem_ipa, ('t', 'd')):
+            return 'ɪd'
+        return 't' if _ends_with(stem_ipa, VOICELESS + ('s', 'ʃ', 'tʃ')) else 'd'
+    return ''
+
+
+def _has_vowel(ipa: str) -> bool:
+    return any(v in ipa for v in ('i', 'ɪ', 'e', 'ɛ', 'æ', 'ɑ', 'ɔ', 'o', 'ʊ', 'u', 'ʌ', 'ə',
+                                  'a', 'ɝ', 'ɚ'))
+
+
+def _mark(ipa: str, mark: str = 'ˈ') -> str:
+    """Make sure a polysyllabic combination carries a stress mark"""
+    if 'ˈ' in ipa or 'ˌ' in ipa:
+        return ipa if mark == 'ˈ' else ipa.replace('ˈ', 'ˌ')
+    return mark + ipa
+
+
+def _syllables(ipa: str) -> int:
+    return len(re.findall(r'eɪ|aɪ|aʊ|oʊ|ɔɪ|[iɪɛæɑɔʊuʌəɝɚ]', ipa))
+
+
+def _number_words(digits: str) -> List[str]:
+    n = int(digits)
+    if n < 20:
+        return [NUMBERS[n]]
+    if n < 100:
+        return [TENS[n // 10]] + ([NUMBERS[n % 10]] if n % 10 else [])
+    return [NUMBERS[int(d)] for d in digits]
+
+
+class G2P:
+    """Memoizing rule-based estimator; see the module docstring"""
+
+    def __init__(self, lexicon: Optional[Dict[str, str]] = None):
+        self.lexicon: Dict[str, str] = dict(LEXICON)
+        self.lexicon.update({word: strong for word, (strong, _weak) in FUNCTION_WORDS.items()})
+        if lexicon:
+            self.lexicon.update(lexicon)
+        self._tokens: Dict[str, str] = {}
+        self._phrases: Dict[str, str] = {}
+
+    def learn(self, word: str, ipa: str):
+        """Add a known (dictionary) pronunciation for a single word"""
+        word = word.strip().lower()
+        # First variant, without syllable dots, tie bars and optional-sound brackets
+        ipa = re.sub(r'[.()\u0361\u032f]', '', ipa.strip().strip('/[]').split(',')[0]).strip()
+        if not word or not ipa or ' ' in word or word in FUNCTION_WORDS:
+            return
+        if word not in self.lexicon:
+            self.lexicon[word] = ipa
+            self._tokens.clear()
+            self._phrases.clear()
+
+    # Tokens
+
+    def token(self, word: str) -> str:
+        word = word.lower()
+        cached = self._tokens.get(word)
+        if cached is None:
+            cached = self._tokens[word] = self._token(word, depth=0)
+        return cached
+
+    def _known(self, word: str, depth: int) -> Optional[str]:
+        """Pronunciation from the lexicon or by morphology over it, without rules"""
+        if word in self.lexicon:
+            return self.lexicon[word]
+        if depth < 2:
+            return self._morphology(word, depth, known_only=True)
+        return None
+
+    def _token(self, word: str, depth: int) -> str:
+        if word in self.lexicon:
+            return self.lexicon[word]
+        if word.endswith("'s"):
+            stem = self._token(word[:-2], depth + 1)
+            return stem + _allomorph('s', stem)
+        if word.endswith("n't"):
+            return _mark(self._token(word[:-3], depth + 1)) + 'nt'
+        for ending, phones in CONTRACTIONS:
+            if word.endswith(ending) and len(word) > len(ending):
+                return self._token(word[:-len(ending)], depth + 1) + phones
+        word = word.replace("'", '')
+        if not word:
+            return ''
+        return (self._morphology(word, depth, known_only=True)
+                or self._compound(word, depth)
+                or self._morphology(word, depth, known_only=False)
+                or self._rules(word))
+
+    def _morphology(self, word: str, depth: int, known_only: bool) -> Optional[str]:
+        for suffix, phones in SUFFIXES:
+            # Two-letter stems only when known: going, but not gas
+            if not word.endswith(suffix) or len(word) - len(suffix) < (2 if known_only else 3):
+                continue
+            if suffix == 's' and word.endswith(('ss', 'us', 'is', 'ous')):
+                continue
+            if suffix in ('ed', 'er') and word.endswith('e' + suffix):
+                continue
+            if not known_only and suffix not in INFLECTIONS:
+                continue
+            candidates = [stem for stem in _stem_candidates(word, suffix) if len(stem) > 1 and re.search(V, stem)]
+            if not known_only:
+                # Most likely spelling only: no lexicon to tell the candidates apart
+                candidates = candidates[:1]
+            for stem in candidates:
+                stem_ipa = self._known(stem, depth + 1) if known_only else self._rules(stem)
+                if stem_ipa is None:
+                    continue
+                ending = phones if phones is not None else _allomorph(suffix, stem_ipa)
+                if _has_vowel(ending) and not ('ˈ' in stem_ipa or 'ˌ' in stem_ipa) and _has_vowel(stem_ipa):
+                    stem_ipa = _mark(stem_ipa)
+                if ending[:1] == stem_ipa[-1:] and ending[:1] not in VOWELS:
+                    ending = ending[1:]       # essential + ly
+                return stem_ipa + ending
+        return None
+
+    def _compound(self, word: str, depth: int) -> Optional[str]:
+        """
+        Closed compound of two known words (online, airhead), or of a
+        spelled-out first part and a known second word of 4+ letters (layover)
+        """
+        if len(word) < 5 or depth > 1:
+            return None
+        for split in range(len(word) - 2, 1, -1):
+            left = self._known(word[:split], depth + 1)
+            if left is None:
+                continue
+            right = self._known(word[split:], depth + 1)
+            if right is not None:
+                return _mark(left) + _mark(right, 'ˌ')
+        for split in range(3, len(word) - 3):
+            left, right = word[:split], self._known(word[split:], depth + 1)
+            if right is not None and re.search(V, left) and _syllables(self._rules(left)) == 1:
+                return _mark(self._rules(left)) + _mark(right, 'ˌ')
+        return None
+
+    def _rules(self, word: str) -> str:
+        if not re.search(V, word):
+            return ''.join(LETTER_NAMES.get(c, '') for c in word)
+        padded = f'#{word}#'
+        phones: List[str] = []
+        origins: List[int] = []       # letter index each phone came from
+        pos = 1
+        while pos < len(padded) - 1:
+            for pattern, out in _RULES.get(padded[pos], ()):
+                match = pattern.match(padded, pos)
+                if match and match.end() > pos:
+                    phones.extend(out)
+                    # Letter index of the last letter spelled by this match
+                    origins.extend([match.end() - 2] * len(out))
+                    pos = match.end()
+                    break
+            else:
+                pos += 1
+        return self._stress(word, phones, origins)
+
+    def _stress(self, word: str, phones: List[str], origins: List[int]) -> str:
+        nuclei = [i for i, p in enumerate(phones) if p in VOWELS]
+        if len(nuclei) < 2:
+            return ''.join(phones)
+
+        def before(start: int) -> Optional[int]:
+            """Syllable whose nucleus is the last one spelled before letter `start`"""
+            candidates = [n for n, i in enumerate(nuclei) if origins[i] < start]
+            return candidates[-1] if candidates else None
+
+        primary = None
+        for suffix in STRESS_ON:
+            if word.endswith(suffix) and len(word) > len(suffix) + 1:
+                primary = len(nuclei) - 1
+                break
+        if primary is None:
+            for suffix in STRESS_BEFORE:
+                if word.endswith(suffix) and len(word) > len(suffix) + 1:
+                    primary = before(len(word) - len(suffix))
+                    break
+        if primary is None:
+            count = len(nuclei)
+            prefixed = any(word.startswith(p) and len(word) > len(p) + 2 and word[len(p)] not in 'aeiouy'
+                           and (p != 'a' or word[2] in 'aeiouy') for p in UNSTRESSED_PREFIXES)
+            if count == 2:
+                primary = 1 if prefixed else 0
+            else:
+                penult = nuclei[-2]
+                heavy = phones[penult] in LONG_VOWELS or nuclei[-1] - penult > 2
+                primary = count - 2 if heavy else count - 3
+        primary = max(0, min(primary, len(nuclei) - 1))
+        secondary = 0 if primary >= 2 else None
+
+        out = list(phones)
+        for n, i in enumerate(nuclei):
+            if n != primary and n != secondary:
+                if out[i] in ('ɑ', 'ɔ') and i + 1 < len(out) and out[i + 1] == 'ɹ':
+                    out[i], out[i + 1] = 'ɚ', ''
+                elif out[i] == 'ɛ' and n == 0:
+                    out[i] = 'ɪ'      # emission, rebound
+                else:
+                    out[i] = REDUCED.get(out[i], out[i])
+
+        marks = {primary: 'ˈ'}
+        if secondary is not None:
+            marks[secondary] = 'ˌ'
+        for n, mark in marks.items():
+            # The mark goes before the longest legal onset of the syllable
+            start = nuclei[n - 1] + 1 if n else 0
+            consonants = [j for j in range(start, nuclei[n]) if out[j]]
+            onset = nuclei[n]
+            for k in range(len(consonants)):
+                cluster = [out[j] for j in consonants[k:]]
+                if (len(cluster) == 1 and cluster[0] != 'ŋ') or ' '.join(cluster) in ONSETS:
+                    onset = consonants[k]
+                    break
+            out[onset] = mark + out[onset]
+        return ''.join(out)
+
+    # Phrases
+
+    def estimate(self, text: str) -> str:
+        """IPA guess (no slashes) for a word or phrase; '' if it has no letters"""
+        key = text.strip().lower()
+        cached = self._phrases.get(key)
+        if cached is not None:
+            return cached
+        if re.fullmatch(r'\(.*\)', key):
+            # Only a category label such as "(phrase)": there is no word
+            return ''
+
+        tokens: List[Tuple[str, bool]] = []    # (word, uppercase acronym)
+        for raw in re.split(r'[\s/]+', text.replace('…', ' ').replace('...', ' ')):
+            raw = raw.strip('()[]{}"“”‘’.,;:!?').replace('’', "'")
+            if not raw:
+                continue
+            for part in raw.split('-'):
+                if re.fullmatch(r'\d+', part):
+                    tokens.extend((w, False) for w in _number_words(part))
+                elif part:
+                    tokens.append((part, part.isupper() and len(part) > 1 and part.lower() not in self.lexicon))
+
+        words: List[str] = []
+        phrase = len(tokens) > 1
+        for word, acronym in tokens:
+            lower = ALIASES.get(word.lower(), word.lower())
+            if acronym:
+                letters = [LETTER_NAMES[c].lstrip('ˈ') for c in lower if c in LETTER_NAMES]
+                ipa = 'ˌ' + ''.join(letters[:-1]) + 'ˈ' + letters[-1] if len(letters) > 1 else ''.join(letters)
+            elif phrase and lower in FUNCTION_WORDS:
+                ipa = FUNCTION_WORDS[lower][1]
+            elif ' ' in lower:
+                ipa = ' '.join(self.token(w) for w in lower.split())
+            else:
+                ipa = self.token(re.sub(r"[^a-z']", '', lower))
+            if ipa:
+                words.append(ipa)
+
+        result = self._phrases[key] = ' '.join(words)
+        return result
+
+    def estimate_many(self, texts: Iterable[str]) -> Dict[str, str]:
+        return {text: self.estimate(text) for text in texts}
+
+    # Vocabulary items
+
+    def learn_items(self, items: Iterable[Dict], clean: Callable[[str], str] = str.strip) -> int:
+        """Learn the dictionary (not estimated) pronunciations of single-word items"""
+        learned = len(self.lexicon)
+        for item in items:
+            if item.get('pronunciation') and not item.get('pronunciationEstimated'):
+                self.learn(clean(item.get('word', '')), item['pronunciation'])
+        return len(self.lexicon) - learned
+
+    def fill(self, item: Dict, clean: Callable[[str], str] = str.strip) -> bool:
+        """Give an item without pronunciation an estimate, flagged as such"""
+        if item.get('pronunciation'):
+            return False
+        guess = self.estimate(clean(item.get('word', '')))
+        if not guess:
+            return False
+        item['pronunciation'] = guess
+        item['pronunciationEstimated'] = True
+        return True
+
+
+def _normalize(ipa: str) -> str:
+    """Loose form for comparing against dictionary transcriptions"""
+    ipa = re.sub(r'[/\[\]()\u0361\u032f]', '', ipa)
+    # In order: 'ɜɹ' must become 'ɝ' before the lone 'ɜ' does
+    for old, new in (('ɨ', 'ɪ'), ('ː', ''), ('.', ''), ('r', 'ɹ'), ('ɡ', 'g'),
+                     ('əɹ', 'ɚ'), ('ɜɹ', 'ɝ'), ('ɜ', 'ɝ'), ('əʊ', 'oʊ'), ('ɒ', 'ɑ'),
+                     ('ɐ', 'ə'), ('ɫ', 'l'), ('ɾ', 't'), ('ɹ̩', 'ɚ'), ('n̩', 'ən'),
+                     ('l̩', 'əl'), ('ˌ', '')):
+        ipa = ipa.replace(old, new)
+    return ipa
+
+
+def check_catalogue(path: Path) -> int:
+    """Leave-one-out agreement with the dictionary pronunciations already in the catalogue"""
+    from catalogue_stream import iter_episodes
+
+    def clean(word: str) -> str:
+        return re.sub(r'\s*\([^)]*\)\s*$', '', word).strip()
+
+    known: Dict[str, str] = {}
+    missing: List[str] = []
+    for episode in iter_episodes(path):
+        transcript = episode.get('transcript') or {}
+        for key in ('vocabulary', 'supplementaryVocabulary'):
+            for item in transcript.get(key) or []:
+                word = clean(item.get('word', ''))
+                if item.get('pronunciation') and not item.get('pronunciationEstimated'):
+                    if ' ' not in word:
+                        known.setdefault(word.lower(), item['pronunciation'])
+                else:
+                    missing.append(word)
+
+    rules_only = G2P()
+    segmental = stressed = 0
+    for word, ipa in known.items():
+        guess, expected = _normalize(rules_only.token(word)), _normalize(ipa)
+        segmental += guess.replace('ˈ', '') == expected.replace('ˈ', '')
+        stressed += guess == expected
+
+    g2p = G2P()
+    for word, ipa in known.items():
+        g2p.learn(word, ipa)
+    started = time.perf_counter()
+    results = g2p.estimate_many(missing)
+    elapsed = time.perf_counter() - started
+
+    print(f"\n{'='*60}")
+    print(f"G2P check: {path}")
+    print(f"{'='*60}")
+    print(f"  Dictionary words: {len(known)}, rules alone reproduce "
+          f"{segmental / max(1, len(known)):.1%} of the sounds, {stressed / max(1, len(known)):.1%} with stress")
+    print(f"  Items without pronunciation: {len(missing)}")
+    print(f"  Estimated: {sum(1 for word in missing if results[word])} in {elapsed * 1000:.0f} ms")
+    for word in missing[:15]:
+        print(f"    {word:30} /{results[word]}/")
+    print(f"{'='*60}\n")
+    return 0
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='Estimate US IPA pronunciations with spelling rules')
+    parser.add_argument('words', nargs='*', help='Words or phrases to estimate')
+    parser.add_argument('--check', metavar='CATALOGUE',
+                        help='Compare against the dictionary pronunciations in a catalogue file')
+    args = parser.parse_args(argv)
+
+    if args.check:
+        return check_catalogue(Path(args.check))
+    g2p = G2P()
+    for word in args.words:
+        print(f"{word}: /{g2p.estimate(word)}/")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
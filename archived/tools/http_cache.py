@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Record/replay HTTP cache for the extractor scripts
+
+Record mode stores every watch/playlist/API response a scraper run fetches
+(HAR-like index.json plus one gzip body per entry, keyed by a canonical
+URL). Replay mode serves those responses back from a local stand-in
+server, so a parser tweak can be re-run against the exact same pages with
+no browser traffic leaving the machine and no pacing sleeps:
+
+    python3 extract_advanced_retry.py --record .http-cache/advanced
+    python3 extract_advanced_retry.py --replay .http-cache/advanced
+    python3 http_extractor.py --playlist Advanced --replay .http-cache/advanced
+
+Playwright scripts hook in through CacheSession:
+
+    session = CacheSession.from_args(args)
+    await session.attach(context)        # routes every request through the cache
+    ...
+    await pace(3)                        # asyncio.sleep, skipped when replaying
+    session.close()
+
+Requests missing from the cache get a 404 in replay mode (never the network),
+which keeps replays deterministic.
+
+Usage:
+    python3 http_cache.py --list .http-cache/advanced
+    python3 http_cache.py --serve .http-cache/advanced --port 8765
+"""
+
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, parse_qsl, urlencode, urlparse, urlunparse
+
+YOUTUBE = 'https://www.youtube.com'
+REPLAY_PATH = '/__replay__'
+
+# Per-request noise that would otherwise make every recording a cache miss
+VOLATILE_PARAMS = {'cpn', 'rn', 'ei', '_'}
+# Headers that describe the transfer rather than the content we store
+DROP_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding', 'connection', 'set-cookie',
+                'alt-svc', 'date', 'expires', 'report-to', 'nel'}
+
+# Set while a replay session is active so pace() skips politeness delays
+REPLAYING = False
+
+
+def canonical_url(url: str) -> str:
+    """Drop the fragment and volatile params and sort the query"""
+    parts = urlparse(url)
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k not in VOLATILE_PARAMS)
+    return urlunparse((parts.scheme, parts.netloc.lower(), parts.path or '/', '', urlencode(query), ''))
+
+
+def request_key(method: str, url: str, body: Optional[bytes] = None) -> str:
+    """
+    Cache key for a request.
+
+    POST bodies are part of the key; for JSON bodies the innertube 'context'
+    object (client version, visitor data) is left out so continuation
+    requests replay across sessions.
+    """
+    digest = hashlib.sha256(f"{method.upper()} {canonical_url(url)}".encode('utf-8'))
+    if body:
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            digest.update(body)
+        else:
+            if isinstance(payload, dict):
+                payload.pop('context', None)
+            digest.update(json.dumps(payload, sort_keys=True).encode('utf-8'))
+    return digest.hexdigest()[:32]
+
+
+class ResponseCache:
+    """index.json + bodies/<key>.gz under one directory"""
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.index_path = self.directory / 'index.json'
+        self.bodies_dir = self.directory / 'bodies'
+        self.entries: Dict[str, Dict] = {}
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        self._lock = threading.Lock()
+        if self.index_path.exists():
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                self.entries = {entry['key']: entry for entry in json.load(f)['log']['entries']}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def put(self, method: str, url: str, body: Optional[bytes], status: int, headers: Dict[str, str],
+            content: bytes):
+        key = request_key(method, url, body)
+        self.bodies_dir.mkdir(parents=True, exist_ok=True)
+        # mtime=0 keeps re-recordings of identical content byte-identical
+        with open(self.bodies_dir / f"{key}.gz", 'wb') as raw:
+            with gzip.GzipFile(fileobj=raw, mode='wb', mtime=0) as f:
+                f.write(content)
+        with self._lock:
+            self.entries[key] = {
+                'key': key,
+                'startedDateTime': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                'request': {'method': method.upper(), 'url': url},
+                'response': {
+                    'status': status,
+                    'headers': {k.lower(): v for k, v in headers.items() if k.lower() not in DROP_HEADERS},
+                    'bodySize': len(content),
+                },
+            }
+            self._dirty = True
+
+    def get(self, method: str, url: str, body: Optional[bytes] = None) -> Optional[Tuple[int, Dict[str, str], bytes]]:
+        entry = self.entries.get(request_key(method, url, body))
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        with gzip.open(self.bodies_dir / f"{entry['key']}.gz", 'rb') as f:
+            content = f.read()
+        return entry['response']['status'], entry['response']['headers'], content
+
+    def save(self):
+        """Write index.json atomically (entries sorted by URL so diffs stay readable)"""
+        with self._lock:
+            if not self._dirty:
+                return
+            entries = sorted(self.entries.values(), key=lambda e: (e['request']['url'], e['request']['method']))
+            self._dirty = False
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'log': {'version': '1.2', 'creator': {'name': 'http_cache.py'}, 'entries': entries}},
+                      f, indent=2)
+        os.replace(tmp, self.index_path)
+
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    """
+    Serves cached responses.
+
+    /__replay__?url=<absolute url> replays any host (used by the Playwright
+    route); any other path is looked up relative to `origin`, so HTTP
+    clients can simply use the server as their base URL.
+    """
+
+    cache: ResponseCache = None
+    origin = YOUTUBE
+
+    def _target(self) -> str:
+        parsed = urlparse(self.path)
+        if parsed.path == REPLAY_PATH:
+            return parse_qs(parsed.query).get('url', [''])[0]
+        return self.origin + self.path
+
+    def _replay(self, body: Optional[bytes] = None):
+        hit = self.cache.get(self.command, self._target(), body)
+        if hit is None:
+            self.send_response(404)
+            self.send_header('X-Cache', 'miss')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        status, headers, content = hit
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('X-Cache', 'hit')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def do_GET(self):
+        self._replay()
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        self._replay(self.rfile.read(length) if length else None)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_cache(cache: ResponseCache, origin: str = YOUTUBE, port: int = 0) -> ThreadingHTTPServer:
+    """Start the stand-in server in a daemon thread; returns the server"""
+    handler = type('ReplayHandler', (_ReplayHandler,), {'cache': cache, 'origin': origin.rstrip('/')})
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def server_url(server: ThreadingHTTPServer) -> str:
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def should_record(url: str, resource_type: str) -> bool:
+    """Video streams are large and never needed to rebuild a description"""
+    return resource_type != 'media' and 'videoplayback' not in url
+
+
+class CacheSession:
+    """Record or replay mode for one Playwright run (no-op when neither is set)"""
+
+    def __init__(self, record: Optional[str] = None, replay: Optional[str] = None):
+        if record and replay:
+            raise ValueError("--record and --replay are mutually exclusive")
+        self.mode = 'record' if record else 'replay' if replay else None
+        self.cache = ResponseCache(Path(record or replay)) if self.mode else None
+        self.server = None
+        self._api = None
+
+    @classmethod
+    def from_args(cls, args) -> 'CacheSession':
+        return cls(getattr(args, 'record', None), getattr(args, 'replay', None))
+
+    async def attach(self, context):
+        """Route every request of a Playwright browser context through the cache"""
+        global REPLAYING
+        if self.mode == 'record':
+            print(f"📼 Recording responses to {self.cache.directory}")
+            await context.route('**/*', self._record)
+        elif self.mode == 'replay':
+            if not len(self.cache):
+                print(f"⚠️  Cache {self.cache.directory} is empty - every request will 404")
+            self.server = serve_cache(self.cache)
+            self._api = context.request
+            REPLAYING = True
+            print(f"▶️  Replaying {len(self.cache)} responses from {self.cache.directory} via {server_url(self.server)}")
+            await context.route('**/*', self._replay)
+
+    async def _record(self, route):
+        request = route.request
+        if not should_record(request.url, request.resource_type):
+            await route.continue_()
+            return
+        try:
+            response = await route.fetch()
+            content = await response.body()
+        except Exception:
+            await route.abort()
+            return
+        self.cache.put(request.method, request.url, request.post_data_buffer, response.status,
+                       response.headers, content)
+        await route.fulfill(response=response, body=content)
+
+    async def _replay(self, route):
+        request = route.request
+        target = f"{server_url(self.server)}{REPLAY_PATH}?{urlencode({'url': request.url})}"
+        try:
+            response = await self._api.fetch(
+                target, method=request.method, data=request.post_data_buffer)
+        except Exception:
+            await route.abort()
+            return
+        await route.fulfill(response=response)
+
+    def close(self):
+        global REPLAYING
+        if self.cache is None:
+            return
+        if self.mode == 'record':
+            self.cache.save()
+            print(f"📼 Cache now holds {len(self.cache)} responses ({self.cache.directory})")
+        else:
+            self.server.shutdown()
+            REPLAYING = False
+            print(f"▶️  Replay: {self.cache.hits} hits, {self.cache.misses} misses")
+
+
+async def pace(seconds: float):
+    """Politeness/settle delay that is skipped while replaying"""
+    await asyncio.sleep(0 if REPLAYING else seconds)
+
+
+def add_cache_arguments(parser):
+    """Add --record DIR / --replay DIR to an argparse parser"""
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--record', type=str, default=None, metavar='DIR',
+                       help='Store every fetched response in DIR for later replay')
+    group.add_argument('--replay', type=str, default=None, metavar='DIR',
+                       help='Serve responses recorded in DIR instead of using the network')
+    return parser
+
+
+def list_cache(cache: ResponseCache):
+    print(f"\n{'='*80}")
+    print(f"📼 {cache.directory}: {len(cache)} responses")
+    print(f"{'='*80}")
+    total = 0
+    for entry in sorted(cache.entries.values(), key=lambda e: e['request']['url']):
+        size = entry['response']['bodySize']
+        total += size
+        print(f"  {entry['response']['status']} {entry['request']['method']:4} {size:>9,}  "
+              f"{entry['request']['url'][:100]}")
+    print(f"{'='*80}")
+    print(f"📦 {total / 2**20:.1f} MB of response bodies")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Inspect or serve a recorded HTTP cache')
+    parser.add_argument('directory', type=str, help='Cache directory')
+    action = parser.add_mutually_exclusive_group(required=True)
+    action.add_argument('--list', action='store_true', help='List recorded responses')
+    action.add_argument('--serve', action='store_true', help='Run the stand-in server in the foreground')
+    parser.add_argument('--port', type=int, default=8765, help='Port for --serve (default: 8765)')
+    parser.add_argument('--origin', type=str, default=YOUTUBE, help='Origin relative paths map to')
+
+    args = parser.parse_args()
+    cache = ResponseCache(Path(args.directory))
+
+    if args.list:
+        list_cache(cache)
+        return
+
+    server = serve_cache(cache, args.origin, args.port)
+    print(f"▶️  Serving {len(cache)} responses at {server_url(server)} (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+        print(f"\n▶️  {cache.hits} hits, {cache.misses} misses")
+
+
+if __name__ == '__main__':
+    main()
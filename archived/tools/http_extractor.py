@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+"""
+Browserless YouTube description extractor
+
+The selenium/playwright extractors start Chromium only to click "Show more"
+and read #expanded, but the full description is already in the watch page's
+embedded JSON (ytInitialPlayerResponse.videoDetails.shortDescription, with
+ytInitialData's attributedDescription as a fallback). This fetches watch
+pages with a pooled aiohttp session and pulls out just that object with a
+targeted scanner instead of building a DOM, then writes the same
+video_NNN_<Title>.html files the parsers (process_all_folders.py,
+extract_youtube_data.parse_description) already consume.
+
+Requirements:
+    pip install aiohttp
+
+Usage:
+    python3 http_extractor.py --playlist Elementary
+    python3 http_extractor.py --all --concurrency 8
+    python3 http_extractor.py --videos z2jPY6CJZjs 0ZjXhBf6rqs --output-dir /tmp/out --text
+
+    # Offline, against saved pages (DIR/<videoId>.html, DIR/playlist_<listId>.html)
+    python3 http_extractor.py --serve-fixtures tests/pages --playlist Entry_01 --output-dir /tmp/out
+
+    # Record a run once, then replay it offline (see http_cache.py)
+    python3 http_extractor.py --playlist Advanced --record .http-cache/advanced
+    python3 http_extractor.py --playlist Advanced --replay .http-cache/advanced
+"""
+
+import argparse
+import asyncio
+import html
+import json
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+from http_cache import ResponseCache, add_cache_arguments, serve_cache, server_url
+from instrumentation import add_instrumentation_arguments, count, observe, start_instrumentation, timer
+from playlists import PLAYLISTS, sanitize_filename, watch_url
+
+YOUTUBE = 'https://www.youtube.com'
+
+HEADERS = {
+    'User-Agent': ('Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 '
+                   '(KHTML, like Gecko) Chrome/120.0 Safari/537.36'),
+    'Accept-Language': 'en-US,en;q=0.9',
+}
+# Skips the EU consent interstitial, which has no ytInitial* data
+COOKIES = {'CONSENT': 'YES+cb', 'SOCS': 'CAI'}
+
+_DECODER = json.JSONDecoder()
+
+PLAYLIST_VIDEO = re.compile(r'"playlistVideoRenderer":\{"videoId":"([\w-]{11})"')
+CONTINUATION = re.compile(r'"continuationCommand":\{"token":"([^"]+)"')
+API_KEY = re.compile(r'"INNERTUBE_API_KEY":"([^"]+)"')
+
+SECTION_HEADINGS = ('key vocabulary', 'supplementary vocabulary')
+
+
+def decode_at(text: str, marker: str, start: int = 0):
+    """
+    Decode the JSON value that follows `marker` in text, or None.
+
+    Only the one value is parsed (raw_decode stops at its end), so a 1 MB
+    watch page costs a substring search plus a few KB of JSON.
+    """
+    index = text.find(marker, start)
+    if index == -1:
+        return None
+    index += len(marker)
+    while index < len(text) and text[index] in ' \t\r\n':
+        index += 1
+    try:
+        value, _ = _DECODER.raw_decode(text, index)
+    except ValueError:
+        return None
+    return value
+
+
+def scan_watch_page(page: str) -> Optional[Dict[str, str]]:
+    """Return {'videoId', 'title', 'description'} from a watch page's embedded JSON"""
+    details = decode_at(page, '"videoDetails":')
+    if isinstance(details, dict) and details.get('shortDescription'):
+        return {
+            'videoId': details.get('videoId', ''),
+            'title': details.get('title', ''),
+            'description': details['shortDescription'],
+        }
+
+    # Fallback: ytInitialData renders the description as attributed text
+    description = decode_at(page, '"attributedDescription":{"content":')
+    if not isinstance(description, str):
+        return None
+    title = None
+    title_runs = decode_at(page, '"videoPrimaryInfoRenderer":{"title":{"runs":')
+    if isinstance(title_runs, list):
+        title = ''.join(run.get('text', '') for run in title_runs)
+    if not title:
+        match = re.search(r'<meta name="title" content="([^"]*)"', page)
+        title = html.unescape(match.group(1)) if match else ''
+    match = re.search(r'"watchEndpoint":\{"videoId":"([\w-]{11})"', page)
+    return {
+        'videoId': match.group(1) if match else '',
+        'title': title,
+        'description': description,
+    }
+
+
+def description_to_html(description: str) -> str:
+    """
+    Render the plain-text description the way #expanded looks once expanded:
+    running text in a pre-wrap span, vocabulary sections as <li> items.
+    """
+    span = '<span class="yt-core-attributed-string--link-inherit-color" dir="auto">'
+    parts = []
+    block: List[str] = []
+    items: List[str] = []
+    in_list = False
+
+    def flush_block():
+        if block:
+            parts.append(span + html.escape('\n'.join(block) + '\n', quote=False) + '</span>')
+            block.clear()
+
+    def flush_items():
+        if items:
+            parts.append('<ul class="yt-core-attributed-string__list-group" dir="ltr">' + ''.join(
+                f"<li>{span}{html.escape(item, quote=False)}\n</span></li>" for item in items) + '</ul>')
+            items.clear()
+
+    for line in description.split('\n'):
+        heading = line.strip().lower()
+        if any(heading.startswith(h) for h in SECTION_HEADINGS):
+            flush_items()
+            block.append(line)
+            flush_block()
+            in_list = True
+        elif in_list and line.strip():
+            items.append(line.strip())
+        else:
+            block.append(line)
+
+    flush_items()
+    flush_block()
+    return (
+        '<div id="expanded" class="style-scope ytd-text-inline-expander">'
+        '<yt-attributed-string class="style-scope ytd-text-inline-expander">'
+        '<span class="yt-core-attributed-string yt-core-attributed-string--white-space-pre-wrap" dir="auto">'
+        + ''.join(parts) +
+        '</span></yt-attributed-string></div>'
+    )
+
+
+class HttpExtractor:
+    """Pooled aiohttp session plus a semaphore bounding in-flight requests"""
+
+    def __init__(self, base_url: str = YOUTUBE, concurrency: int = 8, timeout: float = 20.0,
+                 record: Optional[ResponseCache] = None):
+        self.base_url = base_url.rstrip('/')
+        self.record = record
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.session = None
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    async def __aenter__(self):
+        try:
+            import aiohttp
+        except ImportError:
+            print("❌ aiohttp is required: pip install aiohttp")
+            raise
+        connector = aiohttp.TCPConnector(limit=self.concurrency, ttl_dns_cache=300)
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            headers=HEADERS,
+            cookies=COOKIES,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+        )
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.session.close()
+
+    async def get_text(self, url: str) -> str:
+        async with self._semaphore:
+            started = time.perf_counter()
+            async with self.session.get(url) as response:
+                response.raise_for_status()
+                text = await response.text()
+                if self.record is not None:
+                    self.record.put('GET', url, None, response.status, dict(response.headers), text.encode('utf-8'))
+            observe('http_fetch', time.perf_counter() - started)
+            count('http_bytes', len(text))
+            return text
+
+    async def post_json(self, url: str, payload: Dict) -> str:
+        async with self._semaphore:
+            async with self.session.post(url, json=payload) as response:
+                response.raise_for_status()
+                text = await response.text()
+                if self.record is not None:
+                    self.record.put('POST', url, json.dumps(payload).encode('utf-8'), response.status,
+                                    dict(response.headers), text.encode('utf-8'))
+                return text
+
+    async def playlist_video_ids(self, playlist_url: str, max_pages: int = 20) -> List[str]:
+        """Video ids in playlist order; follows browse continuations past the first 100"""
+        list_id = parse_qs(urlparse(playlist_url).query).get('list', [''])[0]
+        page = await self.get_text(f"{self.base_url}/playlist?list={list_id}")
+
+        # dict keeps insertion order, so it doubles as an ordered set
+        video_ids = dict.fromkeys(PLAYLIST_VIDEO.findall(page))
+
+        api_key = API_KEY.search(page)
+        context = decode_at(page, '"INNERTUBE_CONTEXT":')
+        token = CONTINUATION.search(page)
+        pages = 1
+        while token and api_key and context and pages < max_pages:
+            try:
+                body = await self.post_json(
+                    f"{self.base_url}/youtubei/v1/browse?key={api_key.group(1)}&prettyPrint=false",
+                    {'context': context, 'continuation': token.group(1)},
+                )
+            except Exception as e:
+                print(f"⚠️  Continuation request failed, keeping {len(video_ids)} videos: {e}")
+                break
+            before = len(video_ids)
+            video_ids.update(dict.fromkeys(PLAYLIST_VIDEO.findall(body)))
+            if len(video_ids) == before:
+                break
+            token = CONTINUATION.search(body)
+            pages += 1
+
+        return list(video_ids)
+
+    async def fetch_video(self, video_id: str) -> Optional[Dict[str, str]]:
+        page = await self.get_text(watch_url(video_id, self.base_url))
+        started = time.perf_counter()
+        data = scan_watch_page(page)
+        observe('scan_watch_page', time.perf_counter() - started)
+        if data and not data['videoId']:
+            data['videoId'] = video_id
+        return data
+
+
+def save_description(data: Dict[str, str], number: int, output_dir: Path, write_text: bool = False) -> Path:
+    """Write video_NNN_<Title>.html (and optionally .txt) like the browser extractors"""
+    stem = f"video_{number:03d}_{sanitize_filename(data['title'] or 'Unknown')}"
+    html_path = output_dir / f"{stem}.html"
+    with open(html_path, 'w', encoding='utf-8') as f:
+        f.write(description_to_html(data['description']))
+    if write_text:
+        with open(output_dir / f"{stem}.txt", 'w', encoding='utf-8') as f:
+            f.write(f"{data['title']}\n\n{data['description']}\n")
+    return html_path
+
+
+async def extract_videos(extractor: HttpExtractor, video_ids: List[str], output_dir: Path,
+                         write_text: bool = False, skip_existing: bool = False, start: int = 1) -> Dict[str, int]:
+    """Fetch and save every video concurrently; numbering follows list order"""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    stats = {'saved': 0, 'skipped': 0, 'failed': 0}
+
+    async def one(number: int, video_id: str):
+        if skip_existing and any(output_dir.glob(f"video_{number:03d}_*.html")):
+            stats['skipped'] += 1
+            return
+        try:
+            data = await extractor.fetch_video(video_id)
+        except Exception as e:
+            print(f"❌ Video {number} ({video_id}): {e}")
+            stats['failed'] += 1
+            return
+        if not data:
+            print(f"❌ Video {number} ({video_id}): no description in page data")
+            stats['failed'] += 1
+            return
+        path = save_description(data, number, output_dir, write_text)
+        print(f"✅ Video {number}: {path.name}")
+        stats['saved'] += 1
+
+    await asyncio.gather(*(one(number, video_id) for number, video_id in enumerate(video_ids, start)))
+    return stats
+
+
+class _FixtureHandler(BaseHTTPRequestHandler):
+    """Serves /watch?v=ID -> DIR/ID.html and /playlist?list=X -> DIR/playlist_X.html"""
+
+    fixture_dir = Path('.')
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        query = parse_qs(parsed.query)
+        if parsed.path == '/watch' and 'v' in query:
+            path = self.fixture_dir / f"{query['v'][0]}.html"
+        elif parsed.path == '/playlist' and 'list' in query:
+            path = self.fixture_dir / f"playlist_{query['list'][0]}.html"
+        else:
+            path = None
+        if path is None or not path.is_file():
+            self.send_error(404)
+            return
+        body = path.read_bytes()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        # Saved fixtures have no continuation pages
+        self.send_error(404)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_fixtures(fixture_dir: Path) -> ThreadingHTTPServer:
+    """Start a local server for saved pages on a free port; returns the server"""
+    handler = type('FixtureHandler', (_FixtureHandler,), {'fixture_dir': fixture_dir})
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+async def run(args) -> int:
+    base_url = args.base_url
+    server = None
+    record = ResponseCache(Path(args.record)) if args.record else None
+    replay = ResponseCache(Path(args.replay)) if args.replay else None
+    if args.serve_fixtures:
+        server = serve_fixtures(Path(args.serve_fixtures))
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+        print(f"🧪 Serving fixtures from {args.serve_fixtures} at {base_url}")
+    elif replay is not None:
+        server = serve_cache(replay, origin=base_url)
+        base_url = server_url(server)
+        print(f"▶️  Replaying {len(replay)} responses from {args.replay} at {base_url}")
+
+    if args.videos:
+        jobs = [('videos', args.videos, Path(args.output_dir or 'youtube_descriptions'))]
+    else:
+        names = list(PLAYLISTS) if args.all else [args.playlist]
+        jobs = [(name, None, Path(args.output_dir) if args.output_dir else PLAYLISTS[name]['output_dir'])
+                for name in names]
+
+    totals = {'saved': 0, 'skipped': 0, 'failed': 0}
+    try:
+        async with HttpExtractor(base_url, args.concurrency, args.timeout, record) as extractor:
+            for name, video_ids, output_dir in jobs:
+                print(f"\n{'='*80}")
+                print(f"📋 {name} -> {output_dir}")
+                print(f"{'='*80}")
+                with timer('playlist', playlist=name):
+                    if video_ids is None:
+                        video_ids = await extractor.playlist_video_ids(PLAYLISTS[name]['url'])
+                        print(f"✅ Found {len(video_ids)} videos in playlist")
+                    if args.limit:
+                        video_ids = video_ids[:args.limit]
+                    started = time.perf_counter()
+                    stats = await extract_videos(extractor, video_ids, output_dir,
+                                                 args.text, args.skip_existing, args.start)
+                    elapsed = time.perf_counter() - started
+                done = stats['saved'] or 1
+                print(f"⏱️  {stats['saved']} saved in {elapsed:.2f}s ({elapsed / done * 1000:.0f} ms/video)")
+                for key in totals:
+                    totals[key] += stats[key]
+    finally:
+        if server:
+            server.shutdown()
+        if record is not None:
+            record.save()
+            print(f"📼 Recorded {len(record)} responses to {args.record}")
+        if replay is not None:
+            print(f"▶️  Replay: {replay.hits} hits, {replay.misses} misses")
+
+    print(f"\n{'='*80}")
+    print("📊 EXTRACTION SUMMARY")
+    print(f"{'='*80}")
+    print(f"✅ Saved: {totals['saved']}")
+    print(f"⏭️  Skipped (already extracted): {totals['skipped']}")
+    print(f"❌ Failed: {totals['failed']}")
+    print(f"{'='*80}")
+    return 1 if totals['failed'] else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Extract YouTube descriptions over plain HTTP (no browser)')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--playlist', choices=list(PLAYLISTS), help='Playlist to extract')
+    source.add_argument('--all', action='store_true', help='Extract every playlist')
+    source.add_argument('--videos', nargs='+', metavar='ID', help='Specific video ids, numbered from --start')
+    parser.add_argument('--output-dir', type=str, default=None,
+                        help="Output folder (default: the playlist's usual folder)")
+    parser.add_argument('--start', type=int, default=1, help='Number of the first video (default: 1)')
+    parser.add_argument('--limit', type=int, default=None, help='Only the first N videos')
+    parser.add_argument('--concurrency', type=int, default=8, help='Concurrent requests (default: 8)')
+    parser.add_argument('--timeout', type=float, default=20.0, help='Per-request timeout in seconds')
+    parser.add_argument('--text', action='store_true', help='Also write the plain description as .txt')
+    parser.add_argument('--skip-existing', action='store_true', help='Skip numbers that already have a file')
+    parser.add_argument('--base-url', type=str, default=YOUTUBE, help='Site to fetch from (default: YouTube)')
+    parser.add_argument('--serve-fixtures', type=str, default=None, metavar='DIR',
+                        help='Serve saved pages from DIR locally and extract from them')
+    add_cache_arguments(parser)
+    add_instrumentation_arguments(parser)
+
+    args = parser.parse_args()
+    start_instrumentation(args)
+    return asyncio.run(run(args))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
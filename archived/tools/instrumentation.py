@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Shared timing/memory instrumentation for the data tools
+
+Lets a slow rebuild show where its time goes without attaching a profiler
+by hand:
+
+    from instrumentation import add_instrumentation_arguments, start_instrumentation, timer, observe
+
+    parser = argparse.ArgumentParser(...)
+    add_instrumentation_arguments(parser)      # --metrics, --trace-memory, --profile
+    args = parser.parse_args()
+    start_instrumentation(args)
+
+    with timer('process_folder', folder='Elementary'):   # nests: outer > inner
+        ...
+        observe('parse_description', seconds)           # latency histogram
+
+    @timed('generate_typescript')
+    def write_output(...): ...
+
+When nothing is enabled every call is a cheap no-op apart from timers,
+which always record. A JSON report is written at exit when --metrics is
+given; --trace-memory adds tracemalloc peaks per timer; --profile captures
+a cProfile dump next to the report and prints the top functions.
+"""
+
+import atexit
+import bisect
+import functools
+import json
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Histogram bucket upper bounds, in milliseconds
+BUCKETS_MS = [0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+
+class Histogram:
+    """Fixed-bucket latency histogram (values in seconds)"""
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, seconds: float):
+        self.counts[bisect.bisect_left(BUCKETS_MS, seconds * 1000)] += 1
+        self.count += 1
+        self.total += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = seconds if self.max is None else max(self.max, seconds)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Upper bucket bound (ms) containing the given fraction of samples"""
+        if not self.count:
+            return None
+        needed = fraction * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= needed:
+                return BUCKETS_MS[index] if index < len(BUCKETS_MS) else self.max * 1000
+        return self.max * 1000
+
+    def to_dict(self) -> Dict:
+        return {
+            'count': self.count,
+            'total_s': round(self.total, 6),
+            'mean_ms': round(self.total / self.count * 1000, 3) if self.count else None,
+            'min_ms': round(self.min * 1000, 3) if self.min is not None else None,
+            'max_ms': round(self.max * 1000, 3) if self.max is not None else None,
+            'p50_ms': self.percentile(0.5),
+            'p95_ms': self.percentile(0.95),
+            'buckets_ms': {
+                (f"<={bound:g}" if i < len(BUCKETS_MS) else f">{BUCKETS_MS[-1]:g}"): n
+                for i, (bound, n) in enumerate(zip(BUCKETS_MS + [None], self.counts)) if n
+            },
+        }
+
+
+class Metrics:
+    """Collects nested timers, histograms and memory peaks for one run"""
+
+    def __init__(self):
+        self.timers: Dict[str, Dict] = {}
+        self.histograms: Dict[str, Histogram] = {}
+        self.counters: Dict[str, int] = {}
+        self.trace_memory = False
+        self.run_peak = 0
+        self._stack: List[Dict] = []
+        self.started = time.perf_counter()
+
+    def observe(self, name: str, seconds: float):
+        self.histograms.setdefault(name, Histogram()).add(seconds)
+
+    def count(self, name: str, amount: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def report(self) -> Dict:
+        import tracemalloc
+        report = {
+            'generated_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'wall_s': round(time.perf_counter() - self.started, 6),
+            'timers': self.timers,
+            'histograms': {name: h.to_dict() for name, h in self.histograms.items()},
+            'counters': self.counters,
+        }
+        if self.trace_memory and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            peak = max(peak, self.run_peak)
+            report['memory'] = {'current_mb': round(current / 2**20, 3), 'peak_mb': round(peak / 2**20, 3)}
+        return report
+
+
+METRICS = Metrics()
+
+
+class timer:
+    """
+    Context manager/decorator timing a named section.
+
+    Nested timers are recorded under 'outer > inner' so the report shows
+    where time went inside each stage. Extra keyword labels are appended
+    to the name, e.g. timer('folder', name='Elementary') -> 'folder[Elementary]'.
+    """
+
+    def __init__(self, name: str, metrics: Metrics = None, **labels):
+        if labels:
+            name += '[' + ','.join(str(v) for v in labels.values()) + ']'
+        self.name = name
+        self.metrics = metrics or METRICS
+
+    def __enter__(self):
+        import tracemalloc
+        metrics = self.metrics
+        path = ' > '.join([frame['name'] for frame in metrics._stack] + [self.name])
+        frame = {'name': self.name, 'path': path, 'peak': 0}
+        if metrics.trace_memory and tracemalloc.is_tracing():
+            # reset_peak() is global, so remember the run's and the parent's
+            # peak so far before resetting it
+            peak_so_far = tracemalloc.get_traced_memory()[1]
+            metrics.run_peak = max(metrics.run_peak, peak_so_far)
+            if metrics._stack:
+                parent = metrics._stack[-1]
+                parent['peak'] = max(parent['peak'], peak_so_far)
+            tracemalloc.reset_peak()
+        metrics._stack.append(frame)
+        frame['started'] = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        import tracemalloc
+        metrics = self.metrics
+        elapsed = time.perf_counter() - metrics._stack[-1]['started']
+        frame = metrics._stack.pop()
+
+        entry = metrics.timers.setdefault(frame['path'], {'count': 0, 'total_s': 0.0, 'min_s': None, 'max_s': 0.0})
+        entry['count'] += 1
+        entry['total_s'] = round(entry['total_s'] + elapsed, 6)
+        entry['min_s'] = round(elapsed if entry['min_s'] is None else min(entry['min_s'], elapsed), 6)
+        entry['max_s'] = round(max(entry['max_s'], elapsed), 6)
+
+        if metrics.trace_memory and tracemalloc.is_tracing():
+            peak = max(frame['peak'], tracemalloc.get_traced_memory()[1])
+            entry['peak_mb'] = round(max(entry.get('peak_mb', 0), peak / 2**20), 3)
+            if metrics._stack:
+                metrics._stack[-1]['peak'] = max(metrics._stack[-1]['peak'], peak)
+        return False
+
+    def __call__(self, func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with timer(self.name, self.metrics):
+                return func(*args, **kwargs)
+        return wrapper
+
+
+timed = timer
+
+
+def observe(name: str, seconds: float):
+    """Add one latency sample (seconds) to the named histogram"""
+    METRICS.observe(name, seconds)
+
+
+def count(name: str, amount: int = 1):
+    METRICS.count(name, amount)
+
+
+def add_instrumentation_arguments(parser):
+    """Add --metrics / --trace-memory / --profile to an argparse parser"""
+    group = parser.add_argument_group('instrumentation')
+    group.add_argument('--metrics', type=str, default=None, metavar='PATH',
+                       help='Write a JSON timing/memory report to PATH at exit')
+    group.add_argument('--trace-memory', action='store_true', help='Track tracemalloc peaks per stage')
+    group.add_argument('--profile', action='store_true',
+                       help='Capture a cProfile dump (next to --metrics, or ./profile.prof)')
+    return parser
+
+
+def start_instrumentation(args=None, metrics_path: Optional[str] = None, trace_memory: bool = False,
+                          profile: bool = False):
+    """Enable the requested instrumentation and register the exit report"""
+    if args is not None:
+        metrics_path = getattr(args, 'metrics', None) or metrics_path
+        trace_memory = getattr(args, 'trace_memory', False) or trace_memory
+        profile = getattr(args, 'profile', False) or profile
+
+    if trace_memory:
+        import tracemalloc
+        tracemalloc.start()
+        METRICS.trace_memory = True
+
+    profiler = None
+    if profile:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    if metrics_path or profiler:
+        atexit.register(_finish, metrics_path, profiler)
+
+
+def _finish(metrics_path: Optional[str], profiler):
+    if profiler is not None:
+        import pstats
+        profiler.disable()
+        prof_path = Path(metrics_path).with_suffix('.prof') if metrics_path else Path('profile.prof')
+        profiler.dump_stats(prof_path)
+        print(f"\n🔬 cProfile dump: {prof_path} (top functions by cumulative time)")
+        pstats.Stats(profiler).sort_stats('cumulative').print_stats(15)
+
+    if metrics_path:
+        path = Path(metrics_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(METRICS.report(), f, indent=2)
+        print(f"📈 Metrics report: {path}")
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Lean page profile for the browser-based extractors
+
+A full watch page pulls the video stream, thumbnails, avatars, fonts, ads
+and telemetry beacons, none of which is needed to click "Show more" and
+read #expanded. Lean mode runs headless in a small viewport and aborts
+those requests; PageStats records transferred bytes (from Chromium's
+Network domain, so blocked requests cost nothing) and page-ready time per
+video, so a lean and a full run of the same playlist can be compared:
+
+    python3 playwright_extractor_v2.py --stats full.json
+    python3 playwright_extractor_v2.py --lean --stats lean.json
+    python3 lean_page.py full.json lean.json
+
+Playwright:
+    stats = PageStats('lean')
+    browser = await p.chromium.launch(**lean_launch_options(lean=True))
+    context = await browser.new_context(**lean_context_options(lean=True))
+    await block_requests(context, stats)
+    await track_page(page, stats)
+
+Selenium:
+    apply_lean_options(chrome_options)       # before webdriver.Chrome(...)
+    enable_performance_log(chrome_options)
+    enable_selenium_blocking(driver)
+    stats.collect_selenium_log(driver)       # after each page
+"""
+
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from instrumentation import observe
+
+LEAN_VIEWPORT = {'width': 800, 'height': 600}
+
+# Playwright resource types that never affect the description
+BLOCKED_RESOURCE_TYPES = {'media', 'image', 'imageset', 'font'}
+
+# Ads, telemetry and stream hosts, matched as substrings of the URL
+TRACKER_PATTERNS = [
+    'googlevideo.com/videoplayback',
+    'doubleclick.net',
+    'googlesyndication.com',
+    'googleadservices.com',
+    'google-analytics.com',
+    'googletagmanager.com',
+    'youtube.com/api/stats/',
+    'youtube.com/pagead/',
+    'youtube.com/ptracking',
+    'youtube.com/generate_204',
+    'youtube.com/youtubei/v1/log_event',
+    'play.google.com/log',
+    'jnn-pa.googleapis.com',
+]
+
+# The same set as Chromium Network.setBlockedURLs wildcards (Selenium has no
+# per-request interception, and resource types are not available there)
+BLOCKED_URL_PATTERNS = [f"*{pattern}*" for pattern in TRACKER_PATTERNS] + [
+    '*i.ytimg.com/*',
+    '*yt3.ggpht.com/*',
+    '*.woff', '*.woff2', '*.ttf',
+    '*.jpg', '*.jpeg', '*.png', '*.webp', '*.gif',
+]
+
+
+def is_blocked(url: str, resource_type: str) -> bool:
+    return resource_type in BLOCKED_RESOURCE_TYPES or any(pattern in url for pattern in TRACKER_PATTERNS)
+
+
+class PageStats:
+    """Requests, blocked requests, transferred bytes and ready time per page"""
+
+    def __init__(self, label: str):
+        self.label = label
+        self.pages: List[Dict] = []
+        self.current: Optional[Dict] = None
+        self._started = 0.0
+
+    def start_page(self, url: str):
+        self.current = {'url': url, 'requests': 0, 'blocked': 0, 'bytes': 0, 'ready_s': None}
+        self.pages.append(self.current)
+        self._started = time.perf_counter()
+
+    def page_ready(self):
+        """Call once #expanded has been read"""
+        if self.current is None or self.current['ready_s'] is not None:
+            return
+        elapsed = time.perf_counter() - self._started
+        self.current['ready_s'] = round(elapsed, 3)
+        observe(f'page_ready[{self.label}]', elapsed)
+
+    def add_request(self):
+        if self.current is not None:
+            self.current['requests'] += 1
+
+    def add_blocked(self):
+        # Blocked requests are still announced to the Network domain, so
+        # they are already included in 'requests'
+        if self.current is not None:
+            self.current['blocked'] += 1
+
+    def add_bytes(self, amount: int):
+        if self.current is not None:
+            self.current['bytes'] += int(amount)
+
+    def collect_selenium_log(self, driver):
+        """Fold Chrome's performance log (goog:loggingPrefs) into the current page"""
+        for entry in driver.get_log('performance'):
+            message = json.loads(entry['message'])['message']
+            method = message.get('method')
+            if method == 'Network.requestWillBeSent':
+                self.add_request()
+            elif method == 'Network.loadingFinished':
+                self.add_bytes(message['params'].get('encodedDataLength', 0))
+            elif method == 'Network.loadingFailed' and message['params'].get('blockedReason'):
+                self.add_blocked()
+
+    def summary(self) -> Dict:
+        ready = [p['ready_s'] for p in self.pages if p['ready_s'] is not None]
+        total_bytes = sum(p['bytes'] for p in self.pages)
+        return {
+            'label': self.label,
+            'pages': len(self.pages),
+            'requests': sum(p['requests'] for p in self.pages),
+            'blocked': sum(p['blocked'] for p in self.pages),
+            'mb_total': round(total_bytes / 2**20, 3),
+            'mb_per_page': round(total_bytes / 2**20 / len(self.pages), 3) if self.pages else 0,
+            'ready_mean_s': round(statistics.mean(ready), 3) if ready else None,
+            'ready_median_s': round(statistics.median(ready), 3) if ready else None,
+        }
+
+    def print_report(self):
+        s = self.summary()
+        print(f"\n{'='*80}")
+        print(f"📶 PAGE LOAD STATS ({s['label']})")
+        print(f"{'='*80}")
+        print(f"📄 Pages: {s['pages']}")
+        print(f"🌐 Requests: {s['requests']} ({s['blocked']} blocked)")
+        print(f"📦 Transferred: {s['mb_total']:.1f} MB ({s['mb_per_page']:.2f} MB/page)")
+        if s['ready_mean_s'] is not None:
+            print(f"⏱️  Page ready: {s['ready_mean_s']:.2f}s mean, {s['ready_median_s']:.2f}s median")
+        print(f"{'='*80}")
+
+    def save(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'summary': self.summary(), 'pages': self.pages}, f, indent=2)
+        print(f"💾 Page stats written to: {path}")
+
+
+def lean_launch_options(lean: bool) -> Dict:
+    """chromium.launch() kwargs: headless and muted in lean mode, the old visible window otherwise"""
+    if lean:
+        return {'headless': True, 'args': ['--mute-audio', '--autoplay-policy=user-gesture-required']}
+    return {'headless': False, 'args': ['--start-maximized']}
+
+
+def lean_context_options(lean: bool) -> Dict:
+    return {'viewport': LEAN_VIEWPORT if lean else {'width': 1920, 'height': 1080}}
+
+
+async def block_requests(context, stats: Optional[PageStats] = None):
+    """Abort media/image/font/tracker requests for every page in a Playwright context"""
+    async def handler(route):
+        request = route.request
+        if is_blocked(request.url, request.resource_type):
+            if stats:
+                stats.add_blocked()
+            await route.abort()
+        else:
+            await route.continue_()
+
+    await context.route('**/*', handler)
+
+
+async def track_page(page, stats: PageStats):
+    """Count requests and encoded bytes for a Playwright page via a CDP session"""
+    session = await page.context.new_cdp_session(page)
+    await session.send('Network.enable')
+    session.on('Network.requestWillBeSent', lambda params: stats.add_request())
+    session.on('Network.loadingFinished', lambda params: stats.add_bytes(params.get('encodedDataLength', 0)))
+    return session
+
+
+def apply_lean_options(chrome_options):
+    """Headless, small window, muted, images off"""
+    chrome_options.add_argument("--headless=new")
+    chrome_options.add_argument(f"--window-size={LEAN_VIEWPORT['width']},{LEAN_VIEWPORT['height']}")
+    chrome_options.add_argument("--mute-audio")
+    chrome_options.add_argument("--autoplay-policy=user-gesture-required")
+    chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+    chrome_options.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
+    return chrome_options
+
+
+def enable_performance_log(chrome_options):
+    chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+    return chrome_options
+
+
+def enable_selenium_blocking(driver):
+    driver.execute_cdp_cmd('Network.enable', {})
+    driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS})
+
+
+def add_lean_arguments(parser):
+    """Add --lean / --stats to an argparse parser"""
+    parser.add_argument('--lean', action='store_true',
+                        help='Headless, small viewport, block media/images/fonts/trackers')
+    parser.add_argument('--stats', type=str, default=None, metavar='PATH',
+                        help='Write per-page bandwidth and page-ready times to PATH')
+    return parser
+
+
+def compare(paths: List[str]):
+    """Print the summaries of several --stats files side by side"""
+    summaries = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            summaries.append(json.load(f)['summary'])
+
+    print(f"\n{'='*80}")
+    print("📶 PAGE PROFILE COMPARISON")
+    print(f"{'='*80}")
+    print(f"  {'run':12} {'pages':>6} {'requests':>9} {'blocked':>8} {'MB/page':>8} {'ready (median)':>15}")
+    for s in summaries:
+        ready = f"{s['ready_median_s']:.2f}s" if s['ready_median_s'] is not None else '-'
+        print(f"  {s['label']:12} {s['pages']:>6} {s['requests']:>9} {s['blocked']:>8} "
+              f"{s['mb_per_page']:>8.2f} {ready:>15}")
+    if len(summaries) == 2 and summaries[0]['mb_per_page']:
+        first, second = summaries
+        print(f"\n📉 Bandwidth: {1 - second['mb_per_page'] / first['mb_per_page']:.0%} saved per page")
+        if first['ready_median_s'] and second['ready_median_s']:
+            print(f"⏱️  Page ready: {1 - second['ready_median_s'] / first['ready_median_s']:.0%} faster")
+    print(f"{'='*80}")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2 or not all(Path(p).is_file() for p in sys.argv[1:]):
+        print("Usage: python3 lean_page.py STATS.json [STATS.json ...]")
+        sys.exit(1)
+    compare(sys.argv[1:])
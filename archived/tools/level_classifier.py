@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Header-only difficulty level classification for description files
+
+reorganize_by_level.py used to read each whole HTML file, unescape it and
+strip every tag just to find the level on the title line, and it tested
+'Elementary' and 'Intermediate' before 'Upper Intermediate' anywhere in the
+text (so a dialogue mentioning "elementary school" or an Upper
+Intermediate title could land in the wrong folder). fix_unknown_files.py
+had its own chain of substring checks on the filename.
+
+Here the title line ("EnglishPod 11 - Upper Intermediate - New Guy in
+Town") is found in the first HEADER_BYTES of the file with one compiled
+bytes regex, no decoding and no tag stripping. The level alternation lists
+"Upper Intermediate" first, so where a title says "Upper" it wins over
+plain "Intermediate". Files without a title line fall back to the same
+level alternation over the filename
+(video_011_EnglishPod_11_-_Upper_Intermediate_-_...). Folders are
+classified in a thread pool, since the work is reading file headers.
+
+    classified = classify_folders([Path('audio_source/Entry_01')])
+    plan = build_move_plan(classified, level_folders)
+
+    python3 level_classifier.py youtube_descriptions/Entry_01 youtube_descriptions/Entry_02
+"""
+
+import argparse
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+LEVELS = ['Elementary', 'Intermediate', 'Upper_Intermediate', 'Advanced']
+UNKNOWN = 'Unknown'
+
+# The title line sits right after the opening #expanded wrapper spans
+HEADER_BYTES = 4096
+
+# Separators seen in titles, filenames and escaped HTML
+_SEP = rb'(?:[\s_-]|&nbsp;|\xc2\xa0)+'
+
+_LEVELS = (
+    rb'(?<![a-z])(?:'
+    rb'(?P<Upper_Intermediate>upper' + _SEP + rb'intermediate)'
+    rb'|(?P<Intermediate>intermediate)'
+    rb'|(?P<Elementary>elementary)'
+    rb'|(?P<Advanced>advanced?)'
+    rb')(?![a-z])'
+)
+
+# Filenames: the first level word wins
+LEVEL_PATTERN = re.compile(_LEVELS, re.IGNORECASE)
+
+# File contents: only the "EnglishPod 11 - Upper Intermediate - ..." title
+# counts, since the dialogue itself can say "advance" or "elementary"
+TITLE_PATTERN = re.compile(rb'englishpod' + _SEP + rb'\d+' + _SEP + _LEVELS, re.IGNORECASE)
+
+
+def match_level(data: bytes, pattern: re.Pattern = LEVEL_PATTERN) -> str:
+    """Level named first in data, or 'Unknown'"""
+    match = pattern.search(data)
+    return match.lastgroup if match else UNKNOWN
+
+
+def classify_name(filename: str) -> str:
+    return match_level(filename.encode('utf-8'))
+
+
+def classify_file(path: Path, header_bytes: int = HEADER_BYTES) -> str:
+    """Level from the file's title line, falling back to its filename"""
+    try:
+        with open(path, 'rb') as f:
+            level = match_level(f.read(header_bytes), TITLE_PATTERN)
+    except OSError as e:
+        print(f"Error reading {path}: {e}")
+        level = UNKNOWN
+    return level if level != UNKNOWN else classify_name(path.name)
+
+
+def list_files(folder: Path, pattern: str = 'video_*.html') -> List[Path]:
+    """Matching files in a folder, from one scandir (sorted by name)"""
+    try:
+        with os.scandir(folder) as entries:
+            names = sorted(e.name for e in entries if fnmatch(e.name, pattern) and e.is_file())
+    except FileNotFoundError:
+        return []
+    return [folder / name for name in names]
+
+
+def classify_folders(folders: Iterable[Path], pattern: str = 'video_*.html',
+                     workers: int = 16) -> List[Tuple[Path, str]]:
+    """(file, level) for every matching file in the folders, classified in a thread pool"""
+    files = [path for folder in folders for path in list_files(Path(folder), pattern)]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(zip(files, pool.map(classify_file, files)))
+
+
+def build_move_plan(classified: List[Tuple[Path, str]],
+                    level_folders: Dict[str, Path]) -> Tuple[List[Tuple[Path, Path, str]], List[Path]]:
+    """
+    (source, target, level) for every file whose target does not exist yet,
+    plus the files skipped because it does. Existing targets come from one
+    scan per level folder.
+    """
+    existing = {level: {p.name for p in list_files(folder, '*')} for level, folder in level_folders.items()}
+    moves, skipped = [], []
+    for path, level in classified:
+        if level not in level_folders:
+            continue
+        if path.name in existing[level]:
+            skipped.append(path)
+            continue
+        existing[level].add(path.name)
+        moves.append((path, level_folders[level] / path.name, level))
+    return moves, skipped
+
+
+def count_levels(classified: List[Tuple[Path, str]]) -> Dict[str, int]:
+    counts = {level: 0 for level in LEVELS + [UNKNOWN]}
+    for _, level in classified:
+        counts[level] += 1
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Classify description files by difficulty level')
+    parser.add_argument('folders', nargs='+', type=str, help='Folders to classify')
+    parser.add_argument('--pattern', type=str, default='video_*.html', help='File glob (default: video_*.html)')
+    parser.add_argument('--workers', type=int, default=16, help='Reader threads (default: 16)')
+    parser.add_argument('--unknown', action='store_true', help='List files with no recognisable level')
+
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    classified = classify_folders([Path(f) for f in args.folders], args.pattern, args.workers)
+    elapsed = time.perf_counter() - started
+
+    print(f"\n{'='*80}")
+    print(f"🏷️  Classified {len(classified)} files in {elapsed:.2f}s")
+    print(f"{'='*80}")
+    for level, n in count_levels(classified).items():
+        print(f"   {level}: {n}")
+    if args.unknown:
+        for path, level in classified:
+            if level == UNKNOWN:
+                print(f"⚠️  {path}")
+    print(f"{'='*80}")
+
+
+if __name__ == '__main__':
+    main()
@@ -9,6 +9,8 @@ to rename the remaining files.
 import re
 from pathlib import Path
 
+from rename_plan import apply_renames
+
 # Mapping from the Playwright extraction output
 TITLE_MAPPING = {
     54: "EnglishPod 54 - Intermediate - I'm sorry I love you 5",
@@ -51,7 +53,7 @@ def rename_remaining_files():
     
     print("📁 Renaming files with manual title mapping...\n")
     
-    renamed = 0
+    mapping = {}
     skipped = 0
     
     for video_num, title in TITLE_MAPPING.items():
@@ -66,17 +68,12 @@ def rename_remaining_files():
         # Create new filename
         safe_title = sanitize_filename(title)
         new_filename = f"video_{video_num:03d}_{safe_title}.html"
-        new_path = descriptions_dir / new_filename
-        
-        # Rename the file
-        try:
-            old_path.rename(new_path)
-            print(f"✅ Renamed: {old_filename}")
-            print(f"   → {new_filename}")
-            renamed += 1
-        except Exception as e:
-            print(f"❌ Error renaming {old_filename}: {e}")
-            skipped += 1
+        mapping[old_path] = descriptions_dir / new_filename
+    
+    # Rename everything in one planned, journaled pass
+    plan = apply_renames(mapping)
+    renamed = len(plan) if plan.completed else 0
+    skipped += len(plan.skipped)
     
     # Summary
     print("\n" + "="*80)
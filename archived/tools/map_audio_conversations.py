@@ -7,13 +7,26 @@ This script:
 2. Maps audio files to their corresponding conversation HTML files
 3. Parses HTML to extract dialogue and vocabulary
 4. Generates a unified JSON structure for the app
+
+With --watch it keeps running: edited conversation (or audio) files are
+re-parsed on their own (see watch.py) and only the affected episode
+records are re-serialized into the output file.
 """
 
 import json
 import re
+import time
 from pathlib import Path
 from bs4 import BeautifulSoup
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Set
+from instrumentation import add_instrumentation_arguments, start_instrumentation, timer, observe
+from episode_model import SchemaError, decode_episodes
+from episode_modules import write_if_changed
+from vocab_table import write_vocab_table
+from watch import Watcher
+
+AUDIO_ROOT = Path('resources/audio')
+CONVERSATION_ROOT = Path('resources/conversation')
 
 # Folder mappings (now they match!)
 FOLDER_MAPPINGS = {
@@ -115,16 +128,96 @@ def parse_conversation_html(html_path: Path) -> Dict:
     }
 
 
+def build_episode(audio_file: Path, audio_folder: str, conv_dir: Path, conv_folder: str) -> Optional[Dict]:
+    """Episode for one audio file (with its conversation, if any), or None if the name is unparseable"""
+    # Try new filename format first: 001_Elementary_Difficult_Customer.m4a
+    match = re.match(r'^(\d{3})_(.*)\.m4a$', audio_file.name)
+    
+    if match:
+        # New format
+        episode_num = int(match.group(1))
+        rest = match.group(2)  # Level_Topic
+        
+        # Split level and topic
+        parts = rest.split('_', 1)
+        if len(parts) >= 2:
+            level = parts[0].replace('_', ' ')
+            topic = parts[1].replace('_', ' ')
+        else:
+            level = "Unknown"
+            topic = rest.replace('_', ' ')
+    else:
+        # Try old format: 01 - Topic.m4a or 001 - Topic.m4a
+        match_old = re.match(r'^(\d{1,3})\s*-\s*(.*)\.m4a$', audio_file.name)
+        if not match_old:
+            print(f"  ⚠️  Could not parse audio file: {audio_file.name}")
+            return None
+        
+        episode_num = int(match_old.group(1))
+        topic = match_old.group(2).strip()
+        level = "Unknown"  # Will try to get from conversation file
+    
+    # Find matching conversation file
+    conv_file = None
+    
+    # Try exact match first (same base name)
+    conv_file_name = audio_file.stem + '.html'
+    conv_file_path = conv_dir / conv_file_name
+    
+    if conv_file_path.exists():
+        conv_file = conv_file_path
+    else:
+        # Try to find by episode number (for old format files)
+        conv_files = sorted(conv_dir.glob(f'{episode_num:03d}_*.html'))
+        if conv_files:
+            conv_file = conv_files[0]
+            # Extract level from conversation filename if we don't have it
+            if level == "Unknown":
+                conv_match = re.match(r'^\d{3}_([^_]+)_', conv_file.name)
+                if conv_match:
+                    level = conv_match.group(1)
+    
+    # Parse conversation if it exists, otherwise create empty transcript
+    conv_data = {
+        'dialogue': [],
+        'vocabulary': [],
+        'supplementaryVocabulary': []
+    }
+    
+    if conv_file and conv_file.exists():
+        try:
+            parse_started = time.perf_counter()
+            conv_data = parse_conversation_html(conv_file)
+            observe('parse_conversation_html', time.perf_counter() - parse_started)
+        except Exception as e:
+            print(f"  ⚠️  Error parsing conversation for episode {episode_num}: {e}")
+    else:
+        print(f"  ℹ️  No conversation for episode {episode_num} (audio only)")
+    
+    episode = {
+        'id': episode_num,
+        'title': f"{level} - {topic}",
+        'level': level,
+        'folder': conv_folder,
+        'description': f"Learn {topic.lower()} through this lesson.",
+        'audioUrl': f"/resources/audio/{audio_folder}/{audio_file.name}",
+        'transcript': {
+            'dialogue': conv_data['dialogue'],
+            'vocabulary': conv_data['vocabulary'],
+            'supplementaryVocabulary': conv_data['supplementaryVocabulary']
+        }
+    }
+    print(f"  ✅ Episode {episode_num}: {topic}")
+    return episode
+
+
 def map_audio_to_conversations() -> List[Dict]:
     """Map audio files to their conversations and create unified structure"""
     episodes = []
     
-    audio_base = Path('resources/audio')
-    conv_base = Path('resources/conversation')
-    
     for audio_folder, conv_folder in FOLDER_MAPPINGS.items():
-        audio_dir = audio_base / audio_folder
-        conv_dir = conv_base / conv_folder
+        audio_dir = AUDIO_ROOT / audio_folder
+        conv_dir = CONVERSATION_ROOT / conv_folder
         
         if not audio_dir.exists() or not conv_dir.exists():
             print(f"⚠️  Skipping {audio_folder}: folder not found")
@@ -136,90 +229,174 @@ def map_audio_to_conversations() -> List[Dict]:
         audio_files = sorted(audio_dir.glob('*.m4a'))
         
         for audio_file in audio_files:
-            # Try new filename format first: 001_Elementary_Difficult_Customer.m4a
-            match = re.match(r'^(\d{3})_(.*)\.m4a$', audio_file.name)
-            
-            if match:
-                # New format
-                episode_num = int(match.group(1))
-                rest = match.group(2)  # Level_Topic
+            episode = build_episode(audio_file, audio_folder, conv_dir, conv_folder)
+            if episode:
+                episodes.append(episode)
+    
+    return episodes
+
+
+def assign_unique_ids(episodes: List[Dict]) -> List[Dict]:
+    """Sort by folder and episode number, then assign globally unique IDs"""
+    episodes.sort(key=lambda x: (x['folder'], x['id']))
+    
+    for idx, episode in enumerate(episodes, 1):
+        episode['originalId'] = episode['id']  # Keep original for reference
+        episode['id'] = idx  # Assign new unique ID
+    
+    return episodes
+
+
+class CatalogueOutput:
+    """
+    The catalogue file being generated. The inline format keeps one
+    serialized chunk per episode (the same bytes json.dump(indent=2) writes),
+    so a --watch patch re-serializes only the episodes that changed.
+    """
+
+    def __init__(self, path: Path, vocab_table: bool = False):
+        self.path = Path(path)
+        self.vocab_table = vocab_table
+        self.document: Optional[Dict] = None
+        self._chunks: List[str] = []
+
+    @staticmethod
+    def _render(episode: Dict) -> str:
+        return '  ' + json.dumps(episode, indent=2, ensure_ascii=False).replace('\n', '\n  ')
+
+    def write(self, episodes: List[Dict], changed: Optional[Iterable[int]] = None) -> bool:
+        """Write the catalogue; `changed` lists the positions patched since the last write"""
+        if self.vocab_table:
+            self.document = write_vocab_table(episodes, self.path)
+            return True
+        if changed is None or len(self._chunks) != len(episodes):
+            self._chunks = [self._render(episode) for episode in episodes]
+        else:
+            for index in changed:
+                self._chunks[index] = self._render(episodes[index])
+        text = '[\n' + ',\n'.join(self._chunks) + '\n]' if self._chunks else '[]'
+        return write_if_changed(self.path, text)
+
+
+def validate(episodes: Iterable[Dict]) -> bool:
+    """Catch schema problems here rather than in the React app"""
+    try:
+        with timer('validate'):
+            for _ in decode_episodes(episodes):
+                pass
+    except SchemaError as e:
+        print(f"❌ Schema error, not writing the catalogue: {e}")
+        return False
+    return True
+
+
+def affected_episodes(episodes: List[Dict], paths: Iterable[Path]) -> Optional[Set[int]]:
+    """
+    Positions of the episodes built from the touched audio/conversation
+    files, or None if audio files were added or removed (every id after
+    them shifts, so only a full rebuild is correct).
+    """
+    audio_index = {}
+    for position, episode in enumerate(episodes):
+        _, _, _, audio_folder, name = episode['audioUrl'].split('/', 4)
+        audio_index[AUDIO_ROOT / audio_folder / name] = position
+    
+    changed = set()
+    for path in paths:
+        if path.suffix == '.m4a':
+            if path.exists() != (path in audio_index):
+                return None
+            if path in audio_index:
+                changed.add(audio_index[path])
+        elif path.suffix == '.html':
+            # Same matching as build_episode: same stem, or the episode number prefix
+            for position, episode in enumerate(episodes):
+                if episode['folder'] != path.parent.name:
+                    continue
+                audio_stem = Path(episode['audioUrl']).stem
+                if path.stem == audio_stem or path.name.startswith(f"{episode['originalId']:03d}_"):
+                    changed.add(position)
+    return changed
+
+
+def rebuild_episode(episode: Dict) -> Optional[Dict]:
+    """Re-parse one episode from its audio file and conversation, keeping its id"""
+    _, _, _, audio_folder, name = episode['audioUrl'].split('/', 4)
+    conv_folder = FOLDER_MAPPINGS.get(audio_folder, episode['folder'])
+    rebuilt = build_episode(AUDIO_ROOT / audio_folder / name, audio_folder, CONVERSATION_ROOT / conv_folder,
+                            conv_folder)
+    if rebuilt is None:
+        return None
+    rebuilt['originalId'] = rebuilt['id']
+    rebuilt['id'] = episode['id']
+    return rebuilt
+
+
+def watch_sources(episodes: List[Dict], output: CatalogueOutput, debounce: float = 0.15,
+                  force_poll: bool = False):
+    """
+    Re-parse the audio/conversation files that change and patch only the
+    affected episode records, until interrupted. Adding or removing an
+    audio file renumbers the catalogue, so that triggers a full rebuild.
+    """
+    roots = [AUDIO_ROOT / folder for folder in FOLDER_MAPPINGS]
+    roots += [CONVERSATION_ROOT / folder for folder in FOLDER_MAPPINGS.values()]
+    with Watcher(roots, suffixes=('.m4a', '.html'), debounce=debounce, force_poll=force_poll) as watcher:
+        print(f"\n👀 Watching {AUDIO_ROOT}/ and {CONVERSATION_ROOT}/ ({watcher.backend}), Ctrl+C to stop")
+        try:
+            for batch in watcher:
+                started = time.perf_counter()
+                changed = affected_episodes(episodes, batch)
+                if changed is not None and not changed:
+                    continue
                 
-                # Split level and topic
-                parts = rest.split('_', 1)
-                if len(parts) >= 2:
-                    level = parts[0].replace('_', ' ')
-                    topic = parts[1].replace('_', ' ')
+                if changed is not None:
+                    candidate = list(episodes)
+                    for position in changed:
+                        candidate[position] = rebuild_episode(episodes[position])
+                    if any(candidate[position] is None for position in changed):
+                        print("   ⚠️  An audio file no longer parses, rebuilding")
+                        changed = None
                 else:
-                    level = "Unknown"
-                    topic = rest.replace('_', ' ')
-            else:
-                # Try old format: 01 - Topic.m4a or 001 - Topic.m4a
-                match_old = re.match(r'^(\d{1,3})\s*-\s*(.*)\.m4a$', audio_file.name)
-                if not match_old:
-                    print(f"  ⚠️  Could not parse audio file: {audio_file.name}")
-                    continue
+                    print("   🔁 Audio files added or removed, rebuilding (ids change)")
                 
-                episode_num = int(match_old.group(1))
-                topic = match_old.group(2).strip()
-                level = "Unknown"  # Will try to get from conversation file
-            
-            # Find matching conversation file
-            conv_file = None
-            
-            # Try exact match first (same base name)
-            conv_file_name = audio_file.stem + '.html'
-            conv_file_path = conv_dir / conv_file_name
-            
-            if conv_file_path.exists():
-                conv_file = conv_file_path
-            else:
-                # Try to find by episode number (for old format files)
-                conv_files = list(conv_dir.glob(f'{episode_num:03d}_*.html'))
-                if conv_files:
-                    conv_file = conv_files[0]
-                    # Extract level from conversation filename if we don't have it
-                    if level == "Unknown":
-                        conv_match = re.match(r'^\d{3}_([^_]+)_', conv_file.name)
-                        if conv_match:
-                            level = conv_match.group(1)
-            
-            # Parse conversation if it exists, otherwise create empty transcript
-            conv_data = {
-                'dialogue': [],
-                'vocabulary': [],
-                'supplementaryVocabulary': []
-            }
-            
-            if conv_file and conv_file.exists():
-                try:
-                    conv_data = parse_conversation_html(conv_file)
-                except Exception as e:
-                    print(f"  ⚠️  Error parsing conversation for episode {episode_num}: {e}")
-            else:
-                print(f"  ℹ️  No conversation for episode {episode_num} (audio only)")
-            
-            episode = {
-                'id': episode_num,
-                'title': f"{level} - {topic}",
-                'level': level,
-                'folder': conv_folder,
-                'description': f"Learn {topic.lower()} through this lesson.",
-                'audioUrl': f"/resources/audio/{audio_folder}/{audio_file.name}",
-                'transcript': {
-                    'dialogue': conv_data['dialogue'],
-                    'vocabulary': conv_data['vocabulary'],
-                    'supplementaryVocabulary': conv_data['supplementaryVocabulary']
-                }
-            }
-            
-            episodes.append(episode)
-            print(f"  ✅ Episode {episode_num}: {topic}")
-    
-    return episodes
+                if changed is None:
+                    candidate = assign_unique_ids(map_audio_to_conversations())
+                    patched = candidate
+                else:
+                    patched = [candidate[position] for position in sorted(changed)]
+                
+                if not validate(patched):
+                    continue
+                episodes = candidate
+                written = output.write(episodes, changed)
+                elapsed = (time.perf_counter() - started) * 1000
+                what = 'all episodes' if changed is None else f"{len(changed)} episode(s)"
+                print(f"[{time.strftime('%H:%M:%S')}] ✅ {len(batch)} file(s) changed, {what} rebuilt, "
+                      f"{output.path.name} {'rewritten' if written else 'unchanged'} ({elapsed:.0f} ms)")
+        except KeyboardInterrupt:
+            print("\n👋 Stopped watching")
 
 
 def main():
     """Main function"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Map audio files to conversations')
+    parser.add_argument('--vocab-table', nargs='?', const='src/data/all-episodes-vocab.json', default=None,
+                        metavar='PATH',
+                        help='Write the vocab-table format (each distinct vocabulary item stored once) to PATH '
+                             '(default: src/data/all-episodes-vocab.json) instead of the inline catalogue')
+    parser.add_argument('--watch', action='store_true',
+                        help='After the build, re-parse changed audio/conversation files and patch only '
+                             'the affected episodes')
+    parser.add_argument('--debounce', type=float, default=0.15,
+                        help='--watch: seconds of quiet before a batch of edits is processed (default: 0.15)')
+    parser.add_argument('--poll', action='store_true', help='--watch: poll mtimes instead of using inotify')
+    add_instrumentation_arguments(parser)
+    args = parser.parse_args()
+    start_instrumentation(args)
+    
     print("""
 ╔══════════════════════════════════════════════════════════════════════════════╗
 ║           AUDIO-CONVERSATION MAPPER                                          ║
@@ -228,22 +405,23 @@ def main():
     """)
     
     # Map audio to conversations
-    episodes = map_audio_to_conversations()
+    with timer('map_audio_to_conversations'):
+        episodes = assign_unique_ids(map_audio_to_conversations())
     
-    # Sort by folder and episode number within folder
-    episodes.sort(key=lambda x: (x['folder'], x['id']))
-    
-    # Assign globally unique IDs
-    for idx, episode in enumerate(episodes, 1):
-        episode['originalId'] = episode['id']  # Keep original for reference
-        episode['id'] = idx  # Assign new unique ID
+    if not validate(episodes):
+        return
     
     # Save to JSON
-    output_file = Path('src/data/all-episodes-mapped.json')
-    output_file.parent.mkdir(parents=True, exist_ok=True)
-    
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(episodes, f, indent=2, ensure_ascii=False)
+    if args.vocab_table:
+        output = CatalogueOutput(Path(args.vocab_table), vocab_table=True)
+        with timer('write_vocab_table'):
+            output.write(episodes)
+        print(f"\n📚 Vocabulary table: {len(output.document['vocabulary'])} distinct items")
+    else:
+        output = CatalogueOutput(Path('src/data/all-episodes-mapped.json'))
+        with timer('write_json'):
+            output.write(episodes)
+    output_file = output.path
     
     print(f"\n{'='*80}")
     print(f"📊 MAPPING SUMMARY")
@@ -265,6 +443,9 @@ def main():
     print(f"✅ Mapping complete!")
     print(f"✅ All episodes have unique IDs (1-{len(episodes)})")
     print(f"{'='*80}")
+    
+    if args.watch:
+        watch_sources(episodes, output, args.debounce, args.poll)
 
 
 if __name__ == '__main__':
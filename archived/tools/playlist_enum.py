@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Scroll-until-stable playlist enumeration for the browser extractors
+
+The per-script get_playlist_videos() scrolled a fixed 10-25 times with a
+1-2 s sleep each, then read every link one get_attribute() round trip at a
+time and de-duplicated with `if url not in list` (O(n²)). Short playlists
+paid for scrolls they did not need; long ones could stop before the end.
+
+enumerate_playlist() instead:
+- reads the playlist's advertised size ("100 videos") from the header
+- after each scroll, waits only until the next batch of rows renders
+  (wait_for_function on the row count) rather than a fixed sleep
+- collects just the newly rendered links, in one evaluate() per batch
+- de-duplicates with an insertion-ordered dict (an ordered set)
+- stops as soon as it has the advertised count (or `limit`), or when a
+  couple of scrolls in a row bring nothing new
+
+    from playlist_enum import enumerate_playlist
+    video_urls = await enumerate_playlist(page, PLAYLIST_URL)
+
+Selenium scripts use enumerate_playlist_selenium(driver, url) instead.
+"""
+
+import re
+import time
+from typing import Dict, Iterable, List, Optional
+
+from playlists import watch_url
+
+ROW_SELECTOR = 'a#video-title'
+
+VIDEO_ID = re.compile(r'[?&]v=([\w-]{11})')
+
+# hrefs of rows rendered since `start`
+COLLECT_JS = f"""start => Array.from(document.querySelectorAll('{ROW_SELECTOR}'))
+    .slice(start).map(a => a.getAttribute('href'))"""
+
+ROW_COUNT_JS = f"document.querySelectorAll('{ROW_SELECTOR}').length"
+
+GROWN_JS = f"n => document.querySelectorAll('{ROW_SELECTOR}').length > n"
+
+SCROLL_JS = "window.scrollTo(0, document.documentElement.scrollHeight)"
+
+# "100 videos" / "1,234 videos" from whichever header variant is rendered
+EXPECTED_COUNT_JS = """() => {
+    const selectors = ['ytd-playlist-header-renderer', 'ytd-playlist-byline-renderer',
+                       'yt-content-metadata-view-model', 'ytd-playlist-sidebar-primary-info-renderer'];
+    for (const selector of selectors) {
+        for (const el of document.querySelectorAll(selector)) {
+            const match = (el.innerText || '').match(/([\\d,.]+)\\s+videos?/i);
+            if (match) return parseInt(match[1].replace(/[,.]/g, ''), 10);
+        }
+    }
+    return null;
+}"""
+
+
+def add_video_ids(seen: Dict[str, None], hrefs: Iterable[Optional[str]]) -> int:
+    """Add the video ids found in hrefs to the ordered set; returns how many were new"""
+    before = len(seen)
+    for href in hrefs:
+        match = VIDEO_ID.search(href or '')
+        if match:
+            seen.setdefault(match.group(1))
+    return len(seen) - before
+
+
+def _complete(seen: Dict[str, None], rendered: int, expected: Optional[int], limit: Optional[int]) -> bool:
+    # The advertised size counts rows, which may repeat a video
+    return bool((limit and len(seen) >= limit) or (expected and rendered >= expected))
+
+
+def _report(seen: Dict[str, None], rendered: int, expected: Optional[int], limit: Optional[int], rounds: int,
+            started: float) -> List[str]:
+    print(f"✅ Found {len(seen)} videos in playlist ({rounds} batches, {time.perf_counter() - started:.1f}s)")
+    if expected and rendered < expected and not (limit and len(seen) >= limit):
+        print(f"⚠️  Playlist advertises {expected} videos; the rest may be private or unavailable")
+    return [watch_url(video_id) for video_id in seen]
+
+
+async def enumerate_playlist(page, playlist_url: str, limit: Optional[int] = None, stable_rounds: int = 2,
+                             batch_timeout: float = 4.0, max_rounds: int = 300,
+                             goto_timeout: float = 60000) -> List[str]:
+    """Clean watch URLs for every video in a playlist, in playlist order (Playwright)"""
+    from playwright.async_api import TimeoutError as PlaywrightTimeout
+
+    print(f"📋 Loading playlist: {playlist_url}")
+    started = time.perf_counter()
+    await page.goto(playlist_url, wait_until="domcontentloaded", timeout=goto_timeout)
+    await page.wait_for_selector("ytd-playlist-video-renderer", timeout=20000)
+
+    expected = await page.evaluate(EXPECTED_COUNT_JS)
+    print(f"📜 Collecting videos{f' (expecting {expected})' if expected else ''}...")
+
+    seen: Dict[str, None] = {}
+    rendered = 0
+    unchanged = 0
+    rounds = 0
+    while rounds < max_rounds:
+        rounds += 1
+        hrefs = await page.evaluate(COLLECT_JS, rendered)
+        rendered += len(hrefs)
+        new = add_video_ids(seen, hrefs)
+        if _complete(seen, rendered, expected, limit):
+            break
+        unchanged = unchanged + 1 if not new else 0
+        if unchanged >= stable_rounds:
+            break
+        await page.evaluate(SCROLL_JS)
+        try:
+            await page.wait_for_function(GROWN_JS, arg=rendered, timeout=batch_timeout * 1000)
+        except PlaywrightTimeout:
+            pass
+
+    urls = _report(seen, rendered, expected, limit, rounds, started)
+    return urls[:limit] if limit else urls
+
+
+def enumerate_playlist_selenium(driver, playlist_url: str, limit: Optional[int] = None, stable_rounds: int = 2,
+                                batch_timeout: float = 4.0, max_rounds: int = 300) -> List[str]:
+    """Selenium counterpart of enumerate_playlist()"""
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    print(f"📋 Loading playlist: {playlist_url}")
+    started = time.perf_counter()
+    driver.get(playlist_url)
+    WebDriverWait(driver, 20).until(
+        EC.presence_of_element_located((By.CSS_SELECTOR, "ytd-playlist-video-renderer")))
+
+    expected = driver.execute_script(f"return ({EXPECTED_COUNT_JS})()")
+    print(f"📜 Collecting videos{f' (expecting {expected})' if expected else ''}...")
+
+    seen: Dict[str, None] = {}
+    rendered = 0
+    unchanged = 0
+    rounds = 0
+    while rounds < max_rounds:
+        rounds += 1
+        hrefs = driver.execute_script(f"return ({COLLECT_JS})(arguments[0])", rendered)
+        rendered += len(hrefs)
+        new = add_video_ids(seen, hrefs)
+        if _complete(seen, rendered, expected, limit):
+            break
+        unchanged = unchanged + 1 if not new else 0
+        if unchanged >= stable_rounds:
+            break
+        driver.execute_script(SCROLL_JS)
+        try:
+            WebDriverWait(driver, batch_timeout, poll_frequency=0.2).until(
+                lambda d: d.execute_script(f"return {ROW_COUNT_JS}") > rendered)
+        except TimeoutException:
+            pass
+
+    urls = _report(seen, rendered, expected, limit, rounds, started)
+    return urls[:limit] if limit else urls
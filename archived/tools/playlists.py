@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+EnglishPod playlist table and small helpers shared by the extractors
+
+Each entry maps a playlist name to its YouTube URL and the folder the
+per-level extract_*.py scripts save descriptions into.
+"""
+
+import re
+from pathlib import Path
+from typing import Optional
+
+PLAYLISTS = {
+    'Entry_01': {
+        'url': 'https://www.youtube.com/playlist?list=PL6vHaAQyQlk9RH8F_1lsI_z9wn3SLZHDi',
+        'output_dir': Path('youtube_descriptions/Entry_01'),
+    },
+    'Entry_02': {
+        'url': 'https://www.youtube.com/playlist?list=PL6vHaAQyQlk-yppqqQpxRkhPpNiLTAhmh',
+        'output_dir': Path('audio_source/Entry_02'),
+    },
+    'Entry_03': {
+        'url': 'https://www.youtube.com/playlist?list=PL6vHaAQyQlk8kP1SPJ9uvDcNA4Ujb6hue',
+        'output_dir': Path('audio_source/Entry_03'),
+    },
+    'Elementary': {
+        'url': 'https://www.youtube.com/playlist?list=PL6vHaAQyQlk9L_lA9O4O-tRqT_zljx-lb',
+        'output_dir': Path('youtube_descriptions/Elementary'),
+    },
+    'Intermediate': {
+        'url': 'https://www.youtube.com/playlist?list=PL6vHaAQyQlk9IInEy2bLpkaNlEt8JMCNB',
+        'output_dir': Path('youtube_descriptions/Intermediate'),
+    },
+    'Upper_Intermediate': {
+        'url': 'https://www.youtube.com/playlist?list=PL6vHaAQyQlk9XWaNN0HcA5-QnkvrSJi9w',
+        'output_dir': Path('youtube_descriptions/Upper_Intermediate'),
+    },
+    'Advanced': {
+        'url': 'https://www.youtube.com/playlist?list=PL6vHaAQyQlk9G-4w1grcLPvjBdhOQC6Ma',
+        'output_dir': Path('youtube_descriptions/Advanced'),
+    },
+}
+
+_VIDEO_ID = re.compile(r'[?&]v=([\w-]{11})')
+
+
+def sanitize_filename(title):
+    """Convert title to safe filename"""
+    safe = re.sub(r'[^\w\s-]', '', title)
+    safe = re.sub(r'\s+', '_', safe)
+    safe = re.sub(r'_+', '_', safe)
+    return safe.strip('_')
+
+
+def video_id_from_url(url: str) -> Optional[str]:
+    """'https://www.youtube.com/watch?v=z2jPY6CJZjs&list=...' -> 'z2jPY6CJZjs'"""
+    match = _VIDEO_ID.search(url or '')
+    return match.group(1) if match else None
+
+
+def watch_url(video_id: str, base_url: str = 'https://www.youtube.com') -> str:
+    return f"{base_url.rstrip('/')}/watch?v={video_id}"
@@ -11,6 +11,7 @@ Requirements:
 
 Usage:
     python3 playwright_extractor_v2.py
+    python3 playwright_extractor_v2.py --lean --stats lean.json   # headless, media/images/trackers blocked
 """
 
 import asyncio
@@ -18,6 +19,10 @@ import re
 from pathlib import Path
 from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeout
 
+from lean_page import (PageStats, add_lean_arguments, block_requests, lean_context_options,
+                       lean_launch_options, track_page)
+from playlist_enum import enumerate_playlist
+
 # Playlist URL
 PLAYLIST_URL = "https://www.youtube.com/playlist?list=PL6vHaAQyQlk9RH8F_1lsI_z9wn3SLZHDi"
 OUTPUT_DIR = Path("youtube_descriptions")
@@ -36,38 +41,18 @@ def sanitize_filename(title):
 
 async def get_playlist_videos(page):
     """Get all video URLs from the playlist"""
-    print(f"📋 Loading playlist: {PLAYLIST_URL}")
-    await page.goto(PLAYLIST_URL, wait_until="networkidle")
-    
-    await page.wait_for_selector("ytd-playlist-video-renderer", timeout=10000)
-    
-    print("📜 Scrolling to load all videos...")
-    
-    for i in range(15):
-        await page.evaluate("window.scrollTo(0, document.documentElement.scrollHeight)")
-        await asyncio.sleep(1)
-    
-    video_elements = await page.query_selector_all("a#video-title")
-    video_urls = []
-    
-    for elem in video_elements:
-        url = await elem.get_attribute("href")
-        if url and "/watch?v=" in url:
-            video_id = url.split("/watch?v=")[1].split("&")[0]
-            clean_url = f"https://www.youtube.com/watch?v={video_id}"
-            if clean_url not in video_urls:
-                video_urls.append(clean_url)
-    
-    print(f"✅ Found {len(video_urls)} videos in playlist")
-    return video_urls
+    return await enumerate_playlist(page, PLAYLIST_URL)
 
 
-async def extract_video_description(page, video_url, video_number):
+async def extract_video_description(page, video_url, video_number, stats=None):
     """Extract description from a single video"""
     print(f"\n{'='*80}")
     print(f"📹 Processing Video {video_number}: {video_url}")
     print(f"{'='*80}")
     
+    if stats:
+        stats.start_page(video_url)
+    
     try:
         await page.goto(video_url, wait_until="networkidle")
         await asyncio.sleep(2)
@@ -102,6 +87,8 @@ async def extract_video_description(page, video_url, video_number):
             expanded_desc = await page.wait_for_selector("#expanded", timeout=10000)
             html_content = await expanded_desc.evaluate("el => el.outerHTML")
             print(f"✅ Extracted description HTML ({len(html_content)} characters)")
+            if stats:
+                stats.page_ready()
             
             # Create filename with number and title
             safe_title = sanitize_filename(video_title)
@@ -123,7 +110,7 @@ async def extract_video_description(page, video_url, video_number):
         return False
 
 
-async def main():
+async def main(lean=False, stats_path=None):
     """Main function"""
     print("""
 ╔══════════════════════════════════════════════════════════════════════════════╗
@@ -137,15 +124,14 @@ async def main():
     
     async with async_playwright() as p:
         print("🚀 Launching browser...")
-        browser = await p.chromium.launch(
-            headless=False,
-            args=['--start-maximized']
-        )
-        
-        context = await browser.new_context(
-            viewport={'width': 1920, 'height': 1080}
-        )
+        browser = await p.chromium.launch(**lean_launch_options(lean))
+        context = await browser.new_context(**lean_context_options(lean))
+        stats = PageStats('lean' if lean else 'full')
+        if lean:
+            print("🪶 Lean page mode: headless, 800x600, media/images/fonts/trackers blocked")
+            await block_requests(context, stats)
         page = await context.new_page()
+        await track_page(page, stats)
         
         try:
             video_urls = await get_playlist_videos(page)
@@ -163,7 +149,7 @@ async def main():
             failed = 0
             
             for i, video_url in enumerate(video_urls[:num_videos], 1):
-                if await extract_video_description(page, video_url, i):
+                if await extract_video_description(page, video_url, i, stats):
                     successful += 1
                 else:
                     failed += 1
@@ -179,6 +165,10 @@ async def main():
             print(f"📁 Files saved in: {OUTPUT_DIR.absolute()}")
             print("="*80)
             
+            stats.print_report()
+            if stats_path:
+                stats.save(stats_path)
+            
             if successful > 0:
                 print("\n🎉 NEXT STEP:")
                 print("   Run: python3 process_descriptions.py")
@@ -199,4 +189,9 @@ async def main():
 
 
 if __name__ == '__main__':
-    asyncio.run(main())
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Extract playlist descriptions with Playwright')
+    add_lean_arguments(parser)
+    args = parser.parse_args()
+    asyncio.run(main(args.lean, args.stats))
@@ -11,13 +11,30 @@ This script processes HTML files from all 7 folders in the correct order:
 6. Upper_Intermediate
 7. Advanced
 
-Generates: src/data/all-episodes-generated.ts
+Generates one TypeScript module per folder plus an index that loads them
+with dynamic import() (see episode_modules.py):
+  src/data/episodes/<Folder>.ts, src/data/episodes/index.ts
+Only modules whose content changed are rewritten.
+
+--single-file writes the old src/data/all-episodes-generated.ts instead.
+
+--watch keeps running after the build: edited description files are
+re-parsed on their own (see watch.py) and only the affected modules are
+rewritten.
 """
 
 import re
 import json
+import time
 from pathlib import Path
-from extract_youtube_data import parse_description, generate_typescript_episode
+from typing import Dict, List, Optional, Tuple
+from episode_modules import (FOLDERS, MODULES_DIR, render_single_module, write_episode_modules,
+                             write_if_changed)
+from extract_youtube_data import parse_description
+from instrumentation import add_instrumentation_arguments, start_instrumentation, timer, observe
+from watch import Watcher
+
+DESCRIPTIONS_ROOT = Path('youtube_descriptions')
 
 
 def extract_video_id_from_filename(filename: str) -> str:
@@ -28,10 +45,59 @@ def extract_video_id_from_filename(filename: str) -> str:
     return filename.replace('.html', '')
 
 
-def process_folder(folder_name: str, start_id: int):
-    """Process all HTML files in a specific folder"""
+def parse_html_file(html_file: Path, folder_name: str) -> Optional[Dict]:
+    """Parse one description file (without an id), or None if it has no episode"""
+    parse_started = time.perf_counter()
+    with open(html_file, 'r', encoding='utf-8') as f:
+        html_content = f.read()
+    
+    episode_data = parse_description(html_content)
+    observe('parse_file', time.perf_counter() - parse_started)
+    
+    if not episode_data:
+        return None
+    
+    episode_data['folder'] = folder_name
+    
+    # Fallback: validation of title
+    if not episode_data['title']:
+        # Try to extract from filename
+        # Filename: video_083_EnglishPod_83_-_... .html
+        clean_name = html_file.stem  # video_083_EnglishPod...
+        # Remove video_XXX_ prefix
+        if re.match(r'video_\d+_', clean_name):
+            clean_name = re.sub(r'video_\d+_', '', clean_name)
+        
+        # Replace underscores with spaces
+        clean_name = clean_name.replace('_', ' ')
+        
+        # If it looks like a valid title, use it
+        if len(clean_name) > 5:
+            print(f"   ⚠️  Recovered title from filename: {clean_name}")
+            episode_data['title'] = clean_name
+            
+            # Try to extract level from filename if missing
+            if not episode_data['level']:
+                if 'Elementary' in clean_name:
+                    episode_data['level'] = 'Elementary'
+                elif 'Intermediate' in clean_name:  # Covers Upper Intermediate too if we check simplistic
+                    if 'Upper Intermediate' in clean_name:
+                        episode_data['level'] = 'Upper Intermediate'
+                    else:
+                        episode_data['level'] = 'Intermediate'
+                elif 'Advanced' in clean_name:
+                    episode_data['level'] = 'Advanced'
+    
+    return episode_data
+
+
+def process_folder(folder_name: str, start_id: int, parsed: Optional[Dict[Path, Optional[Dict]]] = None):
+    """
+    Process all HTML files in a specific folder. If `parsed` is given, each
+    file's parse result is also recorded there (for --watch).
+    """
     
-    folder_path = Path(f'youtube_descriptions/{folder_name}')
+    folder_path = DESCRIPTIONS_ROOT / folder_name
     
     if not folder_path.exists():
         print(f"⚠️  {folder_name} folder not found, skipping...")
@@ -51,54 +117,119 @@ def process_folder(folder_name: str, start_id: int):
     
     for html_file in html_files:
         try:
-            with open(html_file, 'r', encoding='utf-8') as f:
-                html_content = f.read()
-            
-            episode_data = parse_description(html_content)
-            
-            if episode_data:
-                episode_data['id'] = current_id
-                episode_data['folder'] = folder_name
-                
-                # Fallback: validation of title
-                if not episode_data['title']:
-                    # Try to extract from filename
-                    # Filename: video_083_EnglishPod_83_-_... .html
-                    clean_name = html_file.stem  # video_083_EnglishPod...
-                    # Remove video_XXX_ prefix
-                    if re.match(r'video_\d+_', clean_name):
-                        clean_name = re.sub(r'video_\d+_', '', clean_name)
-                    
-                    # Replace underscores with spaces
-                    clean_name = clean_name.replace('_', ' ')
-                    
-                    # If it looks like a valid title, use it
-                    if len(clean_name) > 5:
-                        print(f"   ⚠️  Recovered title from filename: {clean_name}")
-                        episode_data['title'] = clean_name
-                        
-                        # Try to extract level from filename if missing
-                        if not episode_data['level']:
-                            if 'Elementary' in clean_name:
-                                episode_data['level'] = 'Elementary'
-                            elif 'Intermediate' in clean_name:  # Covers Upper Intermediate too if we check simplistic
-                                if 'Upper Intermediate' in clean_name:
-                                    episode_data['level'] = 'Upper Intermediate'
-                                else:
-                                    episode_data['level'] = 'Intermediate'
-                            elif 'Advanced' in clean_name:
-                                episode_data['level'] = 'Advanced'
-
-                episodes.append(episode_data)
-                current_id += 1
+            episode_data = parse_html_file(html_file, folder_name)
         except Exception as e:
             print(f"   ❌ Error processing {html_file.name}: {e}")
+            continue
+        if parsed is not None:
+            parsed[html_file] = episode_data
+        if episode_data:
+            episode_data['id'] = current_id
+            episodes.append(episode_data)
+            current_id += 1
     
     print(f"   ✅ Processed {len(episodes)} episodes")
     return episodes, current_id
 
 
-def process_all_folders():
+def number_episodes(parsed: Dict[str, Dict[Path, Optional[Dict]]], folders: List[str]) -> List[Dict]:
+    """Episodes of every folder in order (files sorted by name), numbered from 1"""
+    all_episodes = []
+    for folder in folders:
+        files = parsed.get(folder, {})
+        for html_file in sorted(files):
+            if files[html_file]:
+                files[html_file]['id'] = len(all_episodes) + 1
+                all_episodes.append(files[html_file])
+    return all_episodes
+
+
+def write_outputs(all_episodes: List[Dict], folders: List[str], single_file: bool = False,
+                  verbose: bool = True) -> Tuple[Path, List[str]]:
+    """Write the TypeScript output and the JSON backup; returns (output path, files rewritten)"""
+    written_files = []
+    
+    if single_file:
+        # Legacy layout: every episode in one array
+        output_file = Path('src/data/all-episodes-generated.ts')
+        if verbose:
+            print(f"\n📝 Generating TypeScript file...")
+        with timer('write_typescript'):
+            written = write_if_changed(output_file, render_single_module(all_episodes, folders))
+        if written:
+            written_files.append(output_file.name)
+        if verbose:
+            print(f"{'✅ Generated' if written else '⏭️  Unchanged'}: {output_file}")
+    else:
+        # One module per folder plus an index with dynamic import()
+        output_file = MODULES_DIR
+        by_folder = {}
+        for episode in all_episodes:
+            by_folder.setdefault(episode['folder'], []).append(episode)
+        
+        if verbose:
+            print(f"\n📝 Generating TypeScript modules in {output_file}/...")
+        with timer('write_typescript'):
+            results = write_episode_modules(by_folder, output_file, folders)
+        written_files.extend(name for name, written in results.items() if written)
+        if verbose:
+            for name, written in results.items():
+                print(f"   {'✅ Written' if written else '⏭️  Unchanged'}: {name}")
+            print(f"✅ {sum(results.values())} of {len(results)} modules rewritten")
+    
+    # Also save JSON backup
+    json_file = Path('all_episodes_data.json')
+    if write_if_changed(json_file, json.dumps(all_episodes, indent=2, ensure_ascii=False)):
+        written_files.append(json_file.name)
+    
+    if verbose:
+        print(f"✅ JSON backup: {json_file}")
+    return output_file, written_files
+
+
+def watch_folders(parsed: Dict[str, Dict[Path, Optional[Dict]]], folders: List[str],
+                  single_file: bool = False, debounce: float = 0.15, force_poll: bool = False):
+    """
+    Re-parse only the description files that change and rewrite only the
+    modules whose content changed, until interrupted.
+    """
+    roots = [DESCRIPTIONS_ROOT / folder for folder in folders]
+    with Watcher(roots, suffixes=('.html',), debounce=debounce, force_poll=force_poll) as watcher:
+        print(f"\n👀 Watching {DESCRIPTIONS_ROOT}/ ({watcher.backend}), Ctrl+C to stop")
+        try:
+            for batch in watcher:
+                started = time.perf_counter()
+                touched = 0
+                for path in sorted(batch):
+                    folder = path.parent.name
+                    if folder not in parsed and folder in folders:
+                        parsed[folder] = {}
+                    if folder not in parsed or path.parent != DESCRIPTIONS_ROOT / folder:
+                        continue
+                    touched += 1
+                    if not path.exists():
+                        parsed[folder].pop(path, None)
+                        print(f"   🗑️  {folder}/{path.name}")
+                        continue
+                    try:
+                        parsed[folder][path] = parse_html_file(path, folder)
+                        print(f"   🔄 {folder}/{path.name}")
+                    except Exception as e:
+                        print(f"   ❌ Error processing {path.name}: {e}")
+                if not touched:
+                    continue
+                
+                all_episodes = number_episodes(parsed, folders)
+                _, written_files = write_outputs(all_episodes, folders, single_file, verbose=False)
+                elapsed = (time.perf_counter() - started) * 1000
+                print(f"[{time.strftime('%H:%M:%S')}] ✅ {touched} file(s) changed, "
+                      f"rewrote {', '.join(written_files) or 'nothing'} ({elapsed:.0f} ms)")
+        except KeyboardInterrupt:
+            print("\n👋 Stopped watching")
+
+
+def process_all_folders(single_file: bool = False, watch: bool = False, debounce: float = 0.15,
+                        force_poll: bool = False):
     """Process all 7 folders in the correct order"""
     
     print("""
@@ -108,25 +239,20 @@ def process_all_folders():
     """)
     
     # Folders in the correct order
-    folders = [
-        'Entry_01',
-        'Entry_02',
-        'Entry_03',
-        'Elementary',
-        'Intermediate',
-        'Upper_Intermediate',
-        'Advanced'
-    ]
+    folders = FOLDERS
     
     all_episodes = []
     current_id = 1
+    parsed = {}
     
     # Process each folder
     for folder in folders:
-        episodes, current_id = process_folder(folder, current_id)
+        with timer('process_folder', folder=folder):
+            parsed[folder] = {}
+            episodes, current_id = process_folder(folder, current_id, parsed[folder])
         all_episodes.extend(episodes)
     
-    if not all_episodes:
+    if not all_episodes and not watch:
         print("\n❌ No episodes were processed!")
         return
     
@@ -135,57 +261,7 @@ def process_all_folders():
     print("="*80)
     print(f"✅ Total episodes processed: {len(all_episodes)}")
     
-    # Generate TypeScript file
-    output_file = Path('src/data/all-episodes-generated.ts')
-    output_file.parent.mkdir(parents=True, exist_ok=True)
-    
-    print(f"\n📝 Generating TypeScript file...")
-    
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write("import type { Episode } from '../types';\n\n")
-        f.write("// Auto-generated from YouTube descriptions\n")
-        f.write(f"// Total episodes: {len(all_episodes)}\n")
-        f.write("// Generated from 7 folders in order:\n")
-        f.write("// 1. Entry_01, 2. Entry_02, 3. Entry_03\n")
-        f.write("// 4. Elementary, 5. Intermediate, 6. Upper_Intermediate, 7. Advanced\n\n")
-        f.write("const allEpisodes: Episode[] = [\n")
-        
-        for idx, episode in enumerate(all_episodes):
-            video_id = f"ep{episode['id']}"
-            episode_num = episode['id']
-            folder = episode.get('folder', 'Unknown')
-            
-            # Generate TypeScript with folder field
-            ts_code = generate_typescript_episode(episode, video_id, episode_num)
-            
-            # Insert folder field after level field
-            # Find the level line and add folder after it
-            lines = ts_code.split('\n')
-            new_lines = []
-            for line in lines:
-                new_lines.append(line)
-                if 'level:' in line:
-                    # Add folder field right after level
-                    indent = '    '
-                    new_lines.append(f'{indent}folder: "{folder}",')
-            
-            ts_code = '\n'.join(new_lines)
-            f.write(ts_code)
-            if idx < len(all_episodes) - 1:
-                f.write(',\n')
-        
-        
-        f.write("\n];\n\n")
-        f.write("export default allEpisodes;\n")
-    
-    print(f"✅ Generated: {output_file}")
-    
-    # Also save JSON backup
-    json_file = Path('all_episodes_data.json')
-    with open(json_file, 'w', encoding='utf-8') as f:
-        json.dump(all_episodes, f, indent=2, ensure_ascii=False)
-    
-    print(f"✅ JSON backup: {json_file}")
+    output_file, _ = write_outputs(all_episodes, folders, single_file)
     
     # Summary by folder
     print("\n" + "="*80)
@@ -202,6 +278,10 @@ def process_all_folders():
         if count > 0:
             print(f"   {folder}: {count} episodes")
     
+    if watch:
+        watch_folders(parsed, folders, single_file, debounce, force_poll)
+        return
+    
     print("\n" + "="*80)
     print("✅ COMPLETE!")
     print("="*80)
@@ -210,7 +290,8 @@ All {len(all_episodes)} episodes have been processed and saved to:
   {output_file}
 
 Next steps:
-1. Update src/App.tsx to import from './data/all-episodes-generated'
+1. Load episodes in src/App.tsx with loadAllEpisodes() from './data/episodes'
+   (or loadFolder('Entry_01') for a single folder)
 2. Run 'npm run dev' to test
 3. Check the app in your browser
 
@@ -219,4 +300,19 @@ Next steps:
 
 
 if __name__ == '__main__':
-    process_all_folders()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Process YouTube descriptions from all 7 folders')
+    parser.add_argument('--single-file', action='store_true',
+                        help='Write one src/data/all-episodes-generated.ts instead of per-folder modules')
+    parser.add_argument('--watch', action='store_true',
+                        help='After the build, re-parse changed description files and rewrite only what changed')
+    parser.add_argument('--debounce', type=float, default=0.15,
+                        help='--watch: seconds of quiet before a batch of edits is processed (default: 0.15)')
+    parser.add_argument('--poll', action='store_true', help='--watch: poll mtimes instead of using inotify')
+    add_instrumentation_arguments(parser)
+    args = parser.parse_args()
+    start_instrumentation(args)
+    
+    process_all_folders(single_file=args.single_file, watch=args.watch, debounce=args.debounce,
+                        force_poll=args.poll)
@@ -0,0 +1,537 @@
+#!/usr/bin/env python3
+"""
+Pronunciation clip harvester
+
+The Free Dictionary API responses add_pronunciations.py parses carry a
+recording per word (phonetics[].audio), which it throws away, so the only
+way the flashcards could play a word was to hotlink a third party. This
+downloads those recordings once into resources/pronunciations/ (served by
+nginx as static files) and points each vocabulary item at its local copy:
+
+    "pronunciationAudio": "/resources/pronunciations/3f/3f9a0c1e27b4d5a6f801.mp3"
+
+- Dictionary lookups and downloads share a pooled aiohttp session, at most
+  --concurrency in flight and at most --rate requests per second overall
+  (token bucket), with retry_policy.Retrier handling 429/5xx/timeouts.
+- Clips are content-addressed: the file name is the start of the SHA-256
+  of the bytes, so the same recording reached through different URLs or
+  words is stored once. Files are sharded into one directory per first
+  two hex digits (at most 256 directories, a few hundred files in each).
+- resources/pronunciations/index.json remembers word -> clip (null when
+  the dictionary has no recording) and URL -> clip, so reruns only look up
+  words that are new to the catalogue.
+
+Only single words are harvested: the dictionary has no entries for
+phrases. Both the inline catalogue and vocab-table files are updated.
+
+Requirements:
+    pip install aiohttp
+
+Usage:
+    python3 pronunciation_clips.py                        # dry run: harvest, don't touch the catalogue
+    python3 pronunciation_clips.py --live                 # harvest and update the catalogue
+    python3 pronunciation_clips.py --rate 1 --concurrency 2
+
+    # Offline, against a local stub of the dictionary API and its media host
+    python3 pronunciation_clips.py --stub --rate 0 --output-dir /tmp/clips --file /tmp/catalogue.json --live
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import quote, unquote, urlparse
+
+from add_pronunciations import DICTIONARY_API, clean_word
+from aggregate_visitors import write_json_atomic
+from catalogue_stream import CatalogueWriter, iter_episodes
+from instrumentation import add_instrumentation_arguments, count, observe, start_instrumentation, timer
+from retry_policy import PermanentError, Retrier, RetryExhausted, RetryPolicy, with_max_attempts
+from vocab_table import VOCAB_KEYS, is_vocab_table, save_document
+
+PRONUNCIATIONS_DIR = 'resources/pronunciations'
+URL_PREFIX = '/resources/pronunciations'
+INDEX_NAME = 'index.json'
+INDEX_VERSION = 1
+
+# 80 bits of SHA-256: collisions are out of reach for a few thousand clips
+HASH_CHARS = 20
+SHARD_CHARS = 2
+AUDIO_SUFFIXES = ('.mp3', '.ogg', '.oga', '.wav', '.m4a')
+
+HEADERS = {'User-Agent': 'english-podcast-pronunciation-clips/1.0'}
+
+
+def pick_audio(entries) -> Optional[str]:
+    """Recording URL from a dictionary response: a US one if there is one, else the first"""
+    urls = []
+    if not isinstance(entries, list):
+        return None
+    for entry in entries:
+        if not isinstance(entry, dict):
+            continue
+        for phonetic in entry.get('phonetics') or []:
+            url = phonetic.get('audio') if isinstance(phonetic, dict) else None
+            if url:
+                # Older responses use protocol-relative URLs
+                urls.append('https:' + url if url.startswith('//') else url)
+    for url in urls:
+        if '-us.' in url.lower():
+            return url
+    return urls[0] if urls else None
+
+
+def audio_suffix(url: str) -> str:
+    suffix = os.path.splitext(urlparse(url).path)[1].lower()
+    return suffix if suffix in AUDIO_SUFFIXES else '.mp3'
+
+
+class ClipStore:
+    """
+    Content-addressed clips under root/<shard>/<hash><suffix>, plus the
+    word and URL index that lets later runs skip work already done.
+    """
+
+    def __init__(self, root: Path, url_prefix: str = URL_PREFIX):
+        self.root = Path(root)
+        self.url_prefix = url_prefix.rstrip('/')
+        self.index_path = self.root / INDEX_NAME
+        self.index = self._load_index()
+
+    def _load_index(self) -> Dict:
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            if index.get('version') == INDEX_VERSION:
+                return index
+            print(f"⚠️  {self.index_path} has an unknown version, starting a new index")
+        except FileNotFoundError:
+            pass
+        except ValueError as e:
+            print(f"⚠️  {self.index_path} is unreadable ({e}), starting a new index")
+        return {'version': INDEX_VERSION, 'words': {}, 'urls': {}}
+
+    def has(self, relative: Optional[str]) -> bool:
+        return relative is not None and (self.root / relative).is_file()
+
+    def put(self, body: bytes, suffix: str) -> Tuple[str, bool]:
+        """Store body under its content hash; returns (relative path, whether it was new)"""
+        digest = hashlib.sha256(body).hexdigest()[:HASH_CHARS]
+        relative = f"{digest[:SHARD_CHARS]}/{digest}{suffix}"
+        path = self.root / relative
+        if path.is_file():
+            return relative, False
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(body)
+            os.replace(tmp_path, path)
+        finally:
+            # Only left behind when the write or rename failed
+            tmp_path.unlink(missing_ok=True)
+        return relative, True
+
+    def url(self, relative: str) -> str:
+        return f"{self.url_prefix}/{relative}"
+
+    def save(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        write_json_atomic(self.index_path, self.index, indent=1)
+
+
+class RateLimiter:
+    """Token bucket shared by every request: `rate` per second on average, bursts of up to `burst`"""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.waited = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        if self.rate <= 0:
+            return
+        # Waiters queue on the lock, so tokens are handed out in arrival order
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                delay = (1 - self.tokens) / self.rate
+                self.waited += delay
+                await asyncio.sleep(delay)
+
+
+class ClipHarvester:
+    """Looks words up, downloads their recordings once each and files them in a ClipStore"""
+
+    def __init__(self, store: ClipStore, api: str = DICTIONARY_API, concurrency: int = 4,
+                 rate: float = 2.0, timeout: float = 15.0, retrier: Optional[Retrier] = None,
+                 refresh: bool = False):
+        self.store = store
+        self.api = api
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.retrier = retrier
+        self.refresh = refresh
+        self.limiter = RateLimiter(rate, burst=concurrency)
+        self.session = None
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._downloads: Dict[str, asyncio.Task] = {}
+        self.stats = {
+            'words': 0, 'cached': 0, 'lookups': 0, 'not_found': 0, 'no_audio': 0,
+            'downloaded': 0, 'deduplicated': 0, 'reused': 0, 'bytes': 0, 'failed': 0,
+        }
+
+    async def __aenter__(self):
+        try:
+            import aiohttp
+        except ImportError:
+            print("❌ aiohttp is required: pip install aiohttp")
+            raise
+        connector = aiohttp.TCPConnector(limit=self.concurrency, ttl_dns_cache=300)
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            headers=HEADERS,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+        )
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.session.close()
+
+    async def _get(self, url: str) -> Tuple[bytes, str]:
+        async with self._semaphore:
+            await self.limiter.acquire()
+            started = time.perf_counter()
+            async with self.session.get(url) as response:
+                if response.status == 404 or (400 <= response.status < 500 and response.status != 429):
+                    raise PermanentError(f"HTTP {response.status} for {url}")
+                # 429 and 5xx raise ClientResponseError, which the retrier backs off on
+                response.raise_for_status()
+                body = await response.read()
+                content_type = response.headers.get('Content-Type', '')
+            observe('clip_http', time.perf_counter() - started)
+            count('clip_http_bytes', len(body))
+            return body, content_type
+
+    async def _fetch(self, url: str, label: str) -> Tuple[bytes, str]:
+        if self.retrier is None:
+            return await self._get(url)
+        try:
+            return await self.retrier.run(self._get, url, label=label)
+        except RetryExhausted as e:
+            if isinstance(e.last_error, PermanentError):
+                raise e.last_error
+            raise
+
+    async def _download(self, url: str) -> str:
+        body, content_type = await self._fetch(url, label=url.rsplit('/', 1)[-1])
+        if not body or content_type.startswith(('text/', 'application/json')):
+            raise PermanentError(f"not an audio file ({content_type or 'empty'}): {url}")
+        relative, new = self.store.put(body, audio_suffix(url))
+        self.stats['downloaded'] += 1
+        self.stats['bytes'] += len(body)
+        if not new:
+            self.stats['deduplicated'] += 1
+        count('clips.downloaded')
+        self.store.index['urls'][url] = relative
+        return relative
+
+    async def clip_url(self, url: str) -> str:
+        """Relative path of the clip at url; each URL is downloaded at most once"""
+        relative = self.store.index['urls'].get(url)
+        if self.store.has(relative):
+            self.stats['reused'] += 1
+            return relative
+        task = self._downloads.get(url)
+        if task is None:
+            task = self._downloads[url] = asyncio.ensure_future(self._download(url))
+        else:
+            self.stats['reused'] += 1
+        return await asyncio.shield(task)
+
+    async def clip_word(self, word: str) -> Optional[str]:
+        """Relative path of the word's clip, or None when the dictionary has no recording"""
+        self.stats['words'] += 1
+        words = self.store.index['words']
+        if not self.refresh and word in words and (words[word] is None or self.store.has(words[word])):
+            self.stats['cached'] += 1
+            return words[word]
+
+        self.stats['lookups'] += 1
+        try:
+            body, _ = await self._fetch(self.api.format(word=quote(word)), label=word)
+            url = pick_audio(json.loads(body))
+        except PermanentError:
+            self.stats['not_found'] += 1
+            words[word] = None
+            return None
+        if url is None:
+            self.stats['no_audio'] += 1
+            words[word] = None
+            return None
+        relative = await self.clip_url(url)
+        words[word] = relative
+        return relative
+
+    async def harvest(self, words: Iterable[str]) -> Dict[str, Optional[str]]:
+        """Clip (relative path or None) for every word that did not fail outright"""
+        clips: Dict[str, Optional[str]] = {}
+
+        async def one(word: str):
+            try:
+                clips[word] = await self.clip_word(word)
+            except Exception as e:
+                # Not recorded in the index, so the next run tries again
+                self.stats['failed'] += 1
+                print(f"❌ '{word}': {e}")
+                return
+            if clips[word]:
+                print(f"✅ {word} -> {clips[word]}")
+
+        await asyncio.gather(*(one(word) for word in words))
+        return clips
+
+
+def word_key(word: str) -> str:
+    return clean_word(word).lower()
+
+
+def wanted(key: str) -> bool:
+    # The dictionary only has single words (and no bare "(phrase)" labels)
+    return key[:1].isalpha() and ' ' not in key
+
+
+def _vocab_items(episode: Dict) -> Iterable[Dict]:
+    transcript = episode.get('transcript', {})
+    for key in VOCAB_KEYS:
+        yield from transcript.get(key) or []
+
+
+def collect_words(json_path: Path, refresh: bool = False) -> List[str]:
+    """Distinct single-word keys of vocabulary items without a clip, in catalogue order"""
+    if is_vocab_table(json_path):
+        with open(json_path, 'r', encoding='utf-8') as f:
+            items: Iterable[Dict] = json.load(f)['vocabulary']
+    else:
+        items = (item for episode in iter_episodes(json_path) for item in _vocab_items(episode))
+    words: Dict[str, None] = {}
+    for item in items:
+        key = word_key(item.get('word', ''))
+        if wanted(key) and (refresh or not item.get('pronunciationAudio')):
+            words[key] = None
+    return list(words)
+
+
+def apply_clips(items: Iterable[Dict], clips: Dict[str, Optional[str]], store: ClipStore) -> int:
+    """Point items at their local clips; returns how many changed"""
+    changed = 0
+    for item in items:
+        relative = clips.get(word_key(item.get('word', '')))
+        if relative and item.get('pronunciationAudio') != store.url(relative):
+            item['pronunciationAudio'] = store.url(relative)
+            changed += 1
+    return changed
+
+
+def update_catalogue(json_path: Path, clips: Dict[str, Optional[str]], store: ClipStore) -> int:
+    """
+    Write the clip paths into the catalogue (inline or vocab-table), keeping
+    a .backup. A catalogue that already points at every clip is left alone.
+    """
+    backup_path = json_path.with_suffix('.json.backup')
+
+    if is_vocab_table(json_path):
+        with open(json_path, 'r', encoding='utf-8') as f:
+            document = json.load(f)
+        changed = apply_clips(document['vocabulary'], clips, store)
+        if changed:
+            print(f"💾 Creating backup: {backup_path}")
+            shutil.copy2(json_path, backup_path)
+            save_document(document, json_path)
+        return changed
+
+    # A streaming pass first, so an up-to-date catalogue is not rewritten
+    if not any(apply_clips(_vocab_items(episode), clips, store) for episode in iter_episodes(json_path)):
+        return 0
+    print(f"💾 Creating backup: {backup_path}")
+    shutil.copy2(json_path, backup_path)
+    changed = 0
+    with CatalogueWriter(json_path) as writer:
+        for episode in iter_episodes(backup_path):
+            changed += apply_clips(_vocab_items(episode), clips, store)
+            writer.write(episode)
+    return changed
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """
+    Stand-in for the dictionary API and its media host, for offline runs.
+
+    /api/v2/entries/en/<word> answers like the real API, with audio URLs
+    pointing back at this server; /media/<word>-us.mp3 serves a small fake
+    recording. Responses are derived from a checksum of the word so runs
+    are repeatable: some words are unknown (404), some have no recording,
+    some fail once with 503 (exercising retries), and a plural gets the
+    same bytes as its singular under its own URL (exercising content
+    deduplication).
+    """
+
+    failed_once: set = set()
+    lock = threading.Lock()
+
+    def _send(self, status: int, body: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        path = unquote(urlparse(self.path).path)
+        if path.startswith('/api/v2/entries/en/'):
+            word = path.rsplit('/', 1)[-1]
+            checksum = zlib.crc32(word.encode('utf-8'))
+            if checksum % 11 == 0:
+                with self.lock:
+                    first = word not in self.failed_once
+                    self.failed_once.add(word)
+                if first:
+                    self.send_error(503)
+                    return
+            if checksum % 13 == 0:
+                self._send(404, b'{"title":"No Definitions Found"}', 'application/json')
+                return
+            audio = '' if checksum % 7 == 0 else f"http://{self.headers['Host']}/media/{quote(word)}-us.mp3"
+            entries = [{'word': word, 'phonetics': [{'text': f"/{word}/", 'audio': audio}]}]
+            self._send(200, json.dumps(entries).encode('utf-8'), 'application/json')
+        elif path.startswith('/media/') and path.endswith('-us.mp3'):
+            word = path[len('/media/'):-len('-us.mp3')]
+            stem = word[:-1] if word.endswith('s') and len(word) > 3 else word
+            self._send(200, b'ID3\x03\x00\x00\x00\x00\x00\x00' + stem.encode('utf-8') * 64, 'audio/mpeg')
+        else:
+            self.send_error(404)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_stub() -> ThreadingHTTPServer:
+    """Start the stub dictionary on a free port; returns the server"""
+    handler = type('StubHandler', (_StubHandler,), {'failed_once': set()})
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+async def run(args) -> int:
+    json_path = Path(args.file)
+    if not json_path.exists():
+        print(f"❌ Error: File not found: {json_path}")
+        return 1
+
+    api = args.api
+    policies = with_max_attempts(args.max_attempts)
+    server = None
+    if args.stub:
+        server = serve_stub()
+        api = f"http://127.0.0.1:{server.server_address[1]}/api/v2/entries/en/{{word}}"
+        # The stub's failures are instantaneous: don't wait seconds between attempts
+        policies = {name: RetryPolicy(policy.max_attempts, 0.01, 0.05) for name, policy in policies.items()}
+        print(f"🧪 Stub dictionary at {api.split('/api/')[0]}")
+    retrier = Retrier(policies)
+
+    print(f"\n{'='*60}")
+    print(f"Harvesting pronunciation clips for: {json_path}")
+    print(f"Clips: {args.output_dir} (served as {args.url_prefix}/)")
+    print(f"Mode: {'DRY RUN (catalogue will not be changed)' if not args.live else 'LIVE (will update file)'}")
+    print(f"{'='*60}\n")
+
+    store = ClipStore(Path(args.output_dir), args.url_prefix)
+    words = collect_words(json_path, args.refresh)
+    if args.limit:
+        words = words[:args.limit]
+    print(f"🔍 {len(words)} words without a local clip")
+
+    started = time.perf_counter()
+    try:
+        async with ClipHarvester(store, api, args.concurrency, args.rate, args.timeout, retrier,
+                                 args.refresh) as harvester:
+            with timer('harvest'):
+                clips = await harvester.harvest(words)
+    finally:
+        if server:
+            server.shutdown()
+        # Keep whatever was downloaded, even after Ctrl+C
+        store.save()
+    elapsed = time.perf_counter() - started
+
+    stats = harvester.stats
+    print(f"\n{'='*60}")
+    print("SUMMARY")
+    print(f"{'='*60}")
+    print(f"Words: {stats['words']} ({stats['cached']} already in the index)")
+    print(f"Dictionary lookups: {stats['lookups']} ({stats['not_found']} unknown, {stats['no_audio']} without audio)")
+    print(f"Clips downloaded: {stats['downloaded']} ({stats['bytes'] / 1024:.0f} KB), "
+          f"{stats['deduplicated']} duplicates of a stored clip, {stats['reused']} URLs reused")
+    print(f"Failed: {stats['failed']}")
+    print(f"Time: {elapsed:.1f}s (rate limit waits {harvester.limiter.waited:.1f}s)")
+    print(f"{'='*60}")
+    retrier.print_report()
+
+    with_clip = {word: relative for word, relative in store.index['words'].items() if relative}
+    if not args.live:
+        print("\nℹ️  DRY RUN - Catalogue not changed. Run with --live to point items at the clips.")
+        return 1 if stats['failed'] else 0
+
+    with timer('save'):
+        changed = update_catalogue(json_path, with_clip, store)
+    print(f"✅ {changed} vocabulary items now have a local pronunciationAudio")
+    return 1 if stats['failed'] else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Download dictionary pronunciation clips for local playback')
+    parser.add_argument('--file', type=str, default='src/data/all-episodes-mapped.json',
+                        help='Path to JSON file (default: src/data/all-episodes-mapped.json)')
+    parser.add_argument('--output-dir', type=str, default=PRONUNCIATIONS_DIR,
+                        help=f'Where clips are stored (default: {PRONUNCIATIONS_DIR})')
+    parser.add_argument('--url-prefix', type=str, default=URL_PREFIX,
+                        help=f'URL the output directory is served at (default: {URL_PREFIX})')
+    parser.add_argument('--live', action='store_true', help='Update the catalogue (default is dry-run)')
+    parser.add_argument('--concurrency', type=int, default=4, help='Requests in flight (default: 4)')
+    parser.add_argument('--rate', type=float, default=2.0,
+                        help='Requests per second across all workers, 0 for no limit (default: 2)')
+    parser.add_argument('--timeout', type=float, default=15.0, help='Per-request timeout in seconds')
+    parser.add_argument('--max-attempts', type=int, default=3, help='Attempts per request on 429/5xx/timeouts')
+    parser.add_argument('--limit', type=int, default=None, help='Only the first N words')
+    parser.add_argument('--refresh', action='store_true',
+                        help='Look every word up again, ignoring the index and existing clips')
+    parser.add_argument('--api', type=str, default=DICTIONARY_API, help='Dictionary URL template with {word}')
+    parser.add_argument('--stub', action='store_true',
+                        help='Harvest from a local stub of the dictionary instead of the real API')
+    add_instrumentation_arguments(parser)
+
+    args = parser.parse_args()
+    start_instrumentation(args)
+    return asyncio.run(run(args))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
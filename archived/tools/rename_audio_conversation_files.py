@@ -14,6 +14,8 @@ import re
 from pathlib import Path
 from typing import Dict, Optional, Tuple
 
+from rename_plan import apply_renames
+
 # Folder mappings
 FOLDER_MAPPINGS = {
     'Entry_Level_01': 'Entry_01',
@@ -103,7 +105,7 @@ def rename_files_in_folder(audio_dir: Path, conv_dir: Path, dry_run: bool = True
     
     print(f"📊 Found {len(audio_files)} audio files and {len(conv_files)} conversation files\n")
     
-    renamed_count = 0
+    mapping: Dict[Path, Path] = {}
     
     # Process audio files
     for audio_file in audio_files:
@@ -117,19 +119,8 @@ def rename_files_in_folder(audio_dir: Path, conv_dir: Path, dry_run: bool = True
         safe_topic = sanitize_filename(topic)
         
         new_name = f"{num:03d}_{safe_level}_{safe_topic}.m4a"
-        new_path = audio_dir / new_name
-        
         if audio_file.name != new_name:
-            if dry_run:
-                print(f"🔄 [DRY RUN] Audio: {audio_file.name}")
-                print(f"           → {new_name}\n")
-            else:
-                try:
-                    audio_file.rename(new_path)
-                    print(f"✅ Renamed audio: {audio_file.name} → {new_name}")
-                    renamed_count += 1
-                except Exception as e:
-                    print(f"❌ Error renaming {audio_file.name}: {e}")
+            mapping[audio_file] = audio_dir / new_name
     
     # Process conversation files
     for conv_file in conv_files:
@@ -143,22 +134,14 @@ def rename_files_in_folder(audio_dir: Path, conv_dir: Path, dry_run: bool = True
         safe_topic = sanitize_filename(topic)
         
         new_name = f"{num:03d}_{safe_level}_{safe_topic}.html"
-        new_path = conv_dir / new_name
-        
         if conv_file.name != new_name:
-            if dry_run:
-                print(f"🔄 [DRY RUN] Conv: {conv_file.name}")
-                print(f"           → {new_name}\n")
-            else:
-                try:
-                    conv_file.rename(new_path)
-                    print(f"✅ Renamed conv: {conv_file.name} → {new_name}")
-                    renamed_count += 1
-                except Exception as e:
-                    print(f"❌ Error renaming {conv_file.name}: {e}")
-    
-    if not dry_run:
-        print(f"\n✅ Renamed {renamed_count} files in {audio_dir.name}")
+            mapping[conv_file] = conv_dir / new_name
+    
+    # Both folders in one plan: collisions and swaps are resolved up front,
+    # and a failure rolls the whole pair back
+    plan = apply_renames(mapping, dry_run=dry_run, label=f"{audio_dir.name} <-> {conv_dir.name}")
+    if plan.completed:
+        print(f"\n✅ Renamed {len(plan)} files in {audio_dir.name}")
 
 
 def main():
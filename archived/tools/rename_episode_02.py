@@ -9,6 +9,7 @@ and renames files to include the title.
 import re
 from pathlib import Path
 from extract_youtube_data import parse_description
+from rename_plan import apply_renames
 
 
 def sanitize_filename(title):
@@ -37,7 +38,7 @@ def rename_episode_02_files():
     
     print(f"📁 Found {len(html_files)} files to rename\n")
     
-    renamed = 0
+    mapping = {}
     skipped = 0
     
     for html_file in html_files:
@@ -67,7 +68,6 @@ def rename_episode_02_files():
             # Create new filename
             safe_title = sanitize_filename(title)
             new_filename = f"video_{video_num:03d}_{safe_title}.html"
-            new_path = descriptions_dir / new_filename
             
             # Check if already renamed
             if html_file.name == new_filename:
@@ -75,16 +75,17 @@ def rename_episode_02_files():
                 skipped += 1
                 continue
             
-            # Rename the file
-            html_file.rename(new_path)
-            print(f"✅ Renamed: {html_file.name}")
-            print(f"   → {new_filename}")
-            renamed += 1
+            mapping[html_file] = descriptions_dir / new_filename
             
         except Exception as e:
-            print(f"❌ Error renaming {html_file.name}: {e}")
+            print(f"❌ Error reading {html_file.name}: {e}")
             skipped += 1
     
+    # Rename everything in one planned, journaled pass
+    plan = apply_renames(mapping, label='Episode_02')
+    renamed = len(plan) if plan.completed else 0
+    skipped += len(plan.skipped)
+    
     # Summary
     print("\n" + "="*80)
     print("📊 RENAME SUMMARY - Episode_02")
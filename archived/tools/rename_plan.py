@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Transactional bulk renames for the rename_* scripts
+
+The renaming scripts used to loop over files calling Path.rename() one at a
+time. A rename onto a name that another file still holds silently replaced
+that file (POSIX rename overwrites), swaps like 001<->002 were impossible,
+and a failure halfway left the folder half renamed with no record of what
+had moved. RenamePlan does it in four steps:
+
+1. plan    - turn an {old: new} mapping into a rename graph, after a single
+             scandir of every directory involved
+2. resolve - drop entries whose target is taken by a file that is not
+             moving, or claimed by several sources; order chains so every
+             target is vacated before it is reused, and break cycles
+             (a->b, b->a) through a temporary name
+3. execute - run the steps in batches; before each batch the steps are
+             appended to a journal (fsync'd once per batch) and each step
+             is marked done as it runs, so a failure, or a crash, can be
+             rolled back from the journal
+4. verify  - one scandir per directory confirms every target exists and
+             every vacated source is gone
+
+    plan = RenamePlan(mapping)
+    plan.print_plan()
+    if plan.execute():
+        plan.verify()
+
+    python3 rename_plan.py mapping.json            # dry run of {"old": "new"}
+    python3 rename_plan.py mapping.json --execute
+    python3 rename_plan.py --rollback .rename-journal/20250101-120000.jsonl
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+JOURNAL_DIR = Path('.rename-journal')
+TEMP_MARKER = '.renametmp-'
+
+Step = Tuple[Path, Path]
+
+
+class RenameConflict(Exception):
+    """Raised when a journal cannot be rolled back cleanly"""
+
+
+def scan_names(directories: Iterable[Path]) -> Dict[Path, Set[str]]:
+    """Entry names per directory, one scandir each (missing directories are empty)"""
+    listing = {}
+    for directory in set(directories):
+        try:
+            with os.scandir(directory) as entries:
+                listing[directory] = {entry.name for entry in entries}
+        except FileNotFoundError:
+            listing[directory] = set()
+    return listing
+
+
+class RenamePlan:
+    """Ordered, conflict-free rename steps for an {old path: new path} mapping"""
+
+    def __init__(self, mapping: Dict[Path, Path], label: str = ''):
+        self.label = label
+        self.skipped: List[Tuple[Path, Path, str]] = []
+        self.cycles = 0
+        self.journal_path: Optional[Path] = None
+        self.completed = False
+        self.renames = self._resolve({Path(src): Path(dst) for src, dst in mapping.items()})
+        self.steps = self._order(self.renames)
+
+    def __len__(self):
+        return len(self.renames)
+
+    def _skip(self, src: Path, dst: Path, reason: str):
+        self.skipped.append((src, dst, reason))
+
+    def _resolve(self, mapping: Dict[Path, Path]) -> Dict[Path, Path]:
+        listing = scan_names([p.parent for p in mapping] + [p.parent for p in mapping.values()])
+        self._listing = listing
+
+        def exists(path: Path) -> bool:
+            return path.name in listing[path.parent]
+
+        renames = {}
+        claimed = defaultdict(list)
+        for src, dst in mapping.items():
+            if src == dst:
+                continue
+            if not exists(src):
+                self._skip(src, dst, 'source not found')
+                continue
+            claimed[dst].append(src)
+            renames[src] = dst
+
+        for dst, sources in claimed.items():
+            if len(sources) > 1:
+                for src in sources:
+                    self._skip(src, dst, f'{len(sources)} files map to this name')
+                    del renames[src]
+
+        # A target is only free if nothing holds it or its holder moves away;
+        # dropping an entry keeps its source in place, which can block the
+        # entry pointing at it, so repeat until nothing changes
+        changed = True
+        while changed:
+            changed = False
+            for src, dst in list(renames.items()):
+                if exists(dst) and dst not in renames:
+                    self._skip(src, dst, 'target already exists')
+                    del renames[src]
+                    changed = True
+        return renames
+
+    def _temp_name(self, path: Path) -> Path:
+        taken = self._listing.setdefault(path.parent, set())
+        n = 0
+        while True:
+            candidate = path.with_name(f".{path.name}{TEMP_MARKER}{n}")
+            if candidate.name not in taken:
+                taken.add(candidate.name)
+                return candidate
+            n += 1
+
+    def _order(self, renames: Dict[Path, Path]) -> List[Step]:
+        """
+        Every source has one target and every target one source, so the graph
+        is a set of chains and cycles. A chain runs from its free end backwards
+        (c->d before b->c before a->b); a cycle first parks one file under a
+        temporary name, which turns it into a chain.
+        """
+        by_dst = {dst: src for src, dst in renames.items()}
+        steps: List[Step] = []
+        done: Set[Path] = set()
+
+        def unwind(src: Optional[Path]):
+            while src is not None and src not in done:
+                steps.append((src, renames[src]))
+                done.add(src)
+                src = by_dst.get(src)
+
+        for src, dst in renames.items():
+            if dst not in renames:
+                unwind(src)
+
+        for src in renames:
+            if src in done:
+                continue
+            self.cycles += 1
+            temp = self._temp_name(src)
+            steps.append((src, temp))
+            done.add(src)
+            unwind(by_dst[src])
+            steps.append((temp, renames[src]))
+        return steps
+
+    def print_plan(self, limit: Optional[int] = None):
+        title = f" - {self.label}" if self.label else ''
+        print(f"\n📋 Rename plan{title}: {len(self.renames)} files, {len(self.steps)} steps, "
+              f"{self.cycles} cycle(s) broken")
+        shown = self.steps if limit is None else self.steps[:limit]
+        for src, dst in shown:
+            print(f"   {src.name} → {dst.name}")
+        if limit is not None and len(self.steps) > limit:
+            print(f"   ... {len(self.steps) - limit} more")
+        for src, dst, reason in self.skipped:
+            print(f"⚠️  Skipping {src.name} → {dst.name}: {reason}")
+
+    def execute(self, batch_size: int = 500, journal_dir: Path = JOURNAL_DIR) -> bool:
+        """Run the steps; on any error roll back everything done so far"""
+        if not self.steps:
+            self.completed = True
+            return True
+        journal_dir.mkdir(parents=True, exist_ok=True)
+        self.journal_path = journal_dir / f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.jsonl"
+        started = time.perf_counter()
+        with open(self.journal_path, 'a', encoding='utf-8') as journal:
+            for first in range(0, len(self.steps), batch_size):
+                batch = self.steps[first:first + batch_size]
+                _journal_write(journal, {'batch': first // batch_size,
+                                         'steps': [[str(src), str(dst)] for src, dst in batch]})
+                for index, (src, dst) in enumerate(batch, first):
+                    try:
+                        os.rename(src, dst)
+                    except OSError as e:
+                        print(f"❌ {src.name} → {dst.name}: {e}")
+                        _journal_write(journal, {'failed': index})
+                        print("↩️  Rolling back...")
+                        try:
+                            rollback(self.journal_path)
+                        except RenameConflict as conflict:
+                            print(f"❌ Rollback stopped: {conflict} (journal: {self.journal_path})")
+                        return False
+                    # Flushed but not fsync'd: a process crash keeps it, and
+                    # rollback() can tell whether the last few steps ran anyway
+                    _journal_write(journal, {'done': index}, sync=False)
+                _journal_write(journal, {'committed': first // batch_size})
+            _journal_write(journal, {'status': 'complete'})
+        self.completed = True
+        print(f"✅ {len(self.renames)} files renamed in {time.perf_counter() - started:.2f}s "
+              f"(journal: {self.journal_path})")
+        return True
+
+    def verify(self) -> List[str]:
+        """Problems found by one scan of every affected directory (empty when all is well)"""
+        listing = scan_names([p.parent for p in self.renames] + [p.parent for p in self.renames.values()])
+        targets = set(self.renames.values())
+        problems = []
+        for src, dst in self.renames.items():
+            if dst.name not in listing[dst.parent]:
+                problems.append(f"missing {dst}")
+            if src not in targets and src.name in listing[src.parent]:
+                problems.append(f"still present {src}")
+        for directory, names in listing.items():
+            problems.extend(f"leftover {directory / name}" for name in names if TEMP_MARKER in name)
+        if problems:
+            print(f"❌ Verify found {len(problems)} problem(s):")
+            for problem in problems[:20]:
+                print(f"   {problem}")
+        else:
+            print(f"🔍 Verified {len(self.renames)} renames")
+        return problems
+
+
+def _journal_write(journal, record: Dict, sync: bool = True):
+    journal.write(json.dumps(record, ensure_ascii=False) + '\n')
+    journal.flush()
+    if sync:
+        os.fsync(journal.fileno())
+
+
+def rollback(journal_path: Path) -> int:
+    """
+    Undo every step recorded in a journal, newest first. Steps are known to
+    have run if their batch committed or they have a 'done' record; any
+    other step (the tail of a batch cut short by a crash) is undone only if
+    it actually happened (target present, source gone), and skipped when
+    both names exist because it never ran. Returns the number of files
+    moved back.
+    """
+    steps: List[Step] = []
+    done: Set[int] = set()
+    with open(journal_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if 'steps' in record:
+                steps.extend((Path(src), Path(dst)) for src, dst in record['steps'])
+            elif 'done' in record:
+                done.add(record['done'])
+            elif 'committed' in record:
+                done.update(range(len(steps)))
+
+    restored = 0
+    for index in reversed(range(len(steps))):
+        src, dst = steps[index]
+        if not os.path.lexists(dst):
+            continue
+        if not os.path.lexists(src):
+            os.rename(dst, src)
+            restored += 1
+        elif index in done:
+            raise RenameConflict(f"cannot restore {src}: both {src.name} and {dst.name} exist")
+    print(f"↩️  Restored {restored} file(s) from {journal_path}")
+    return restored
+
+
+def apply_renames(mapping: Dict[Path, Path], dry_run: bool = False, label: str = '',
+                  verbose: bool = True) -> RenamePlan:
+    """Plan, print and (unless dry_run) execute and verify a mapping; returns the plan"""
+    plan = RenamePlan(mapping, label)
+    plan.print_plan(limit=None if verbose else 20)
+    if dry_run:
+        print("🔄 [DRY RUN] Nothing renamed")
+    elif plan.execute():
+        plan.verify()
+    return plan
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Apply or roll back a bulk rename')
+    parser.add_argument('mapping', nargs='?', type=str, help='JSON file of {"old path": "new path"}')
+    parser.add_argument('--execute', action='store_true', help='Rename (default is a dry run)')
+    parser.add_argument('--batch-size', type=int, default=500, help='Steps per journal batch (default: 500)')
+    parser.add_argument('--rollback', type=str, default=None, metavar='JOURNAL',
+                        help='Undo the renames recorded in JOURNAL')
+
+    args = parser.parse_args()
+
+    if args.rollback:
+        try:
+            rollback(Path(args.rollback))
+        except RenameConflict as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        return
+    if not args.mapping:
+        parser.error('a mapping file or --rollback is required')
+
+    with open(args.mapping, 'r', encoding='utf-8') as f:
+        mapping = {Path(src): Path(dst) for src, dst in json.load(f).items()}
+
+    plan = RenamePlan(mapping, Path(args.mapping).name)
+    plan.print_plan()
+    if not args.execute:
+        print("\n🔄 [DRY RUN] Run with --execute to rename")
+        return
+    if not plan.execute(batch_size=args.batch_size) or plan.verify():
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -9,6 +9,8 @@ Entry_03: 001-063 -> 201-263
 from pathlib import Path
 import re
 
+from rename_plan import apply_renames
+
 def renumber_files(folder: Path, offset: int):
     """Renumber files in folder by adding offset to episode number"""
     print(f"\n📁 Processing: {folder.name}")
@@ -17,7 +19,7 @@ def renumber_files(folder: Path, offset: int):
     files = sorted(folder.glob('*.m4a'))
     print(f"   Found {len(files)} files")
     
-    renamed = 0
+    mapping = {}
     for file in files:
         # Extract episode number from filename
         match = re.match(r'^(\d{3})_(.*)\.m4a$', file.name)
@@ -27,16 +29,15 @@ def renumber_files(folder: Path, offset: int):
             new_num = old_num + offset
             
             new_name = f"{new_num:03d}_{rest}.m4a"
-            new_path = folder / new_name
-            
             if file.name != new_name:
-                file.rename(new_path)
-                print(f"   ✅ {file.name} → {new_name}")
-                renamed += 1
+                mapping[file] = folder / new_name
         else:
             print(f"   ⚠️  Could not parse: {file.name}")
     
-    print(f"   Renamed {renamed} files\n")
+    # Planned as a whole, so a new number still held by another file is
+    # renamed after that file moves instead of overwriting it
+    plan = apply_renames(mapping, label=folder.name, verbose=False)
+    print(f"   Renamed {len(plan) if plan.completed else 0} files\n")
 
 def main():
     print("""
@@ -4,8 +4,10 @@ Script to reorder and renumber episodes by difficulty level.
 Order: Elementary > Entry_01 > Entry_02 > Entry_03 > Advanced
 """
 
-import json
+import shutil
 from pathlib import Path
+from catalogue_stream import iter_episodes, CatalogueWriter, EpisodeSpool
+from instrumentation import add_instrumentation_arguments, start_instrumentation, timer, timed
 
 def get_level_order(episode):
     """Return sort order for difficulty levels based on folder."""
@@ -29,6 +31,26 @@ def get_level_order(episode):
     else:
         return 999  # Unknown goes last
 
+@timed('load')
+def spool_episodes(json_path):
+    """Copy episodes into a disk spool; return it with one sort row per episode"""
+    spool = EpisodeSpool()
+    rows = []
+    try:
+        for episode in iter_episodes(json_path):
+            index = spool.append(episode)
+            rows.append({
+                'index': index,
+                'id': episode.get('id', 0),
+                'order': get_level_order(episode),
+                'folder': episode.get('folder', 'Unknown'),
+                'title': episode.get('title', 'Unknown'),
+            })
+    except BaseException:
+        spool.close()
+        raise
+    return spool, rows
+
 def reorder_episodes(json_path, dry_run=True):
     """
     Reorder episodes by difficulty level and renumber them sequentially.
@@ -42,74 +64,70 @@ def reorder_episodes(json_path, dry_run=True):
     print(f"Mode: {'DRY RUN (no changes will be saved)' if dry_run else 'LIVE (will update file)'}")
     print(f"{'='*60}\n")
     
-    # Load JSON
-    with open(json_path, 'r', encoding='utf-8') as f:
-        episodes = json.load(f)
-    
-    print(f"📊 Total episodes: {len(episodes)}\n")
-    
-    # Show current order (first 10)
-    print("Current order (first 10):")
-    for i, ep in enumerate(episodes[:10], 1):
-        folder = ep.get('folder', 'Unknown')
-        print(f"  {i}. [{folder:12}] {ep.get('title', 'Unknown')}")
-    print()
-    
-    # Sort episodes by level, then by original ID
-    sorted_episodes = sorted(episodes, key=lambda ep: (
-        get_level_order(ep),
-        ep.get('id', 0)
-    ))
-    
-    # Renumber episodes
-    for new_id, episode in enumerate(sorted_episodes, start=1):
-        old_id = episode['id']
-        episode['id'] = new_id
-        folder = episode.get('folder', 'Unknown')
-        if new_id <= 10 or old_id != new_id:
-            print(f"  Episode {old_id:3d} → {new_id:3d}: [{folder:12}] {episode.get('title', 'Unknown')}")
-    
-    # Show new order (first 10)
-    print(f"\nNew order (first 10):")
-    for i, ep in enumerate(sorted_episodes[:10], 1):
-        folder = ep.get('folder', 'Unknown')
-        print(f"  {i}. [{folder:12}] {ep.get('title', 'Unknown')}")
-    
-    # Show last 10
-    print(f"\nNew order (last 10):")
-    for i, ep in enumerate(sorted_episodes[-10:], len(sorted_episodes) - 9):
-        folder = ep.get('folder', 'Unknown')
-        print(f"  {i}. [{folder:12}] {ep.get('title', 'Unknown')}")
-    
-    # Count by folder
-    print(f"\n{'='*60}")
-    print("Episodes by folder:")
-    print(f"{'='*60}")
-    folder_counts = {}
-    for ep in sorted_episodes:
-        folder = ep.get('folder', 'Unknown')
-        folder_counts[folder] = folder_counts.get(folder, 0) + 1
-    
-    for folder in ['Elementary', 'Entry_01', 'Entry_02', 'Entry_03', 'Advanced', 'Unknown']:
-        count = folder_counts.get(folder, 0)
-        if count > 0:
-            print(f"  {folder:12}: {count:3d} episodes")
-    print(f"{'='*60}\n")
-    
-    # Save if not dry run
-    if not dry_run:
-        backup_path = json_path.with_suffix('.json.backup-reorder')
-        print(f"💾 Creating backup: {backup_path}")
-        with open(backup_path, 'w', encoding='utf-8') as f:
-            json.dump(episodes, f, ensure_ascii=False, indent=2)
+    # Stream episodes into a disk-backed spool, keeping only the sort keys
+    # in memory; the sorted catalogue is then written back record by record
+    spool, rows = spool_episodes(json_path)
+    with spool:
+        print(f"📊 Total episodes: {len(rows)}\n")
+    
+        # Show current order (first 10)
+        print("Current order (first 10):")
+        for i, row in enumerate(rows[:10], 1):
+            print(f"  {i}. [{row['folder']:12}] {row['title']}")
+        print()
+    
+        # Sort episodes by level, then by original ID
+        with timer('sort'):
+            sorted_rows = sorted(rows, key=lambda row: (row['order'], row['id']))
+    
+        # Renumber episodes
+        for new_id, row in enumerate(sorted_rows, start=1):
+            old_id = row['id']
+            row['new_id'] = new_id
+            if new_id <= 10 or old_id != new_id:
+                print(f"  Episode {old_id:3d} → {new_id:3d}: [{row['folder']:12}] {row['title']}")
+    
+        # Show new order (first 10)
+        print(f"\nNew order (first 10):")
+        for i, row in enumerate(sorted_rows[:10], 1):
+            print(f"  {i}. [{row['folder']:12}] {row['title']}")
+    
+        # Show last 10
+        print(f"\nNew order (last 10):")
+        for i, row in enumerate(sorted_rows[-10:], len(sorted_rows) - 9):
+            print(f"  {i}. [{row['folder']:12}] {row['title']}")
+    
+        # Count by folder
+        print(f"\n{'='*60}")
+        print("Episodes by folder:")
+        print(f"{'='*60}")
+        folder_counts = {}
+        for row in sorted_rows:
+            folder = row['folder']
+            folder_counts[folder] = folder_counts.get(folder, 0) + 1
+    
+        for folder in ['Elementary', 'Entry_01', 'Entry_02', 'Entry_03', 'Advanced', 'Unknown']:
+            count = folder_counts.get(folder, 0)
+            if count > 0:
+                print(f"  {folder:12}: {count:3d} episodes")
+        print(f"{'='*60}\n")
+    
+        # Save if not dry run
+        if not dry_run:
+            backup_path = json_path.with_suffix('.json.backup-reorder')
+            print(f"💾 Creating backup: {backup_path}")
+            shutil.copy2(json_path, backup_path)
         
-        print(f"💾 Saving reordered JSON: {json_path}")
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(sorted_episodes, f, ensure_ascii=False, indent=2)
+            print(f"💾 Saving reordered JSON: {json_path}")
+            with timer('save'), CatalogueWriter(json_path) as writer:
+                for row in sorted_rows:
+                    episode = spool[row['index']]
+                    episode['id'] = row['new_id']
+                    writer.write(episode)
         
-        print("✅ File updated successfully!")
-    else:
-        print("ℹ️  DRY RUN - No changes saved. Run with --live to save changes.")
+            print("✅ File updated successfully!")
+        else:
+            print("ℹ️  DRY RUN - No changes saved. Run with --live to save changes.")
 
 def main():
     import argparse
@@ -119,7 +137,10 @@ def main():
     parser.add_argument('--file', type=str, default='src/data/all-episodes-mapped.json', 
                        help='Path to JSON file (default: src/data/all-episodes-mapped.json)')
     
+    add_instrumentation_arguments(parser)
+    
     args = parser.parse_args()
+    start_instrumentation(args)
     
     json_path = Path(args.file)
     
@@ -8,36 +8,15 @@ This script will:
 3. Copy files to appropriate level folders in youtube_descriptions/
 """
 
-import re
 from pathlib import Path
-from html import unescape
 import shutil
 
+from level_classifier import classify_file, classify_folders, build_move_plan
+
 
 def parse_level_from_html(html_file):
-    """Extract the difficulty level from HTML content"""
-    try:
-        with open(html_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Remove HTML tags but keep structure
-        text = unescape(content)
-        text = re.sub(r'<[^>]+>', '\n', text)
-        
-        # Look for level indicators
-        if 'Elementary' in text:
-            return 'Elementary'
-        elif 'Upper Intermediate' in text or 'Upper-Intermediate' in text:
-            return 'Upper_Intermediate'
-        elif 'Intermediate' in text:
-            return 'Intermediate'
-        elif 'Advanced' in text:
-            return 'Advanced'
-        else:
-            return 'Unknown'
-    except Exception as e:
-        print(f"Error parsing {html_file}: {e}")
-        return 'Unknown'
+    """Extract the difficulty level from the title line at the top of the file"""
+    return classify_file(Path(html_file))
 
 
 def reorganize_all_by_level():
@@ -76,46 +55,37 @@ def reorganize_all_by_level():
     }
     
     total_files = 0
-    skipped = 0
     
-    # Process each source folder
+    # Classify every file up front (header reads run in a thread pool)
+    source_folders_found = []
     for source_folder_name in source_folders:
         source_folder = source_base / source_folder_name
-        
         if not source_folder.exists():
             print(f"⚠️  {source_folder_name} not found, skipping...")
             continue
-        
-        print(f"\n📁 Processing audio_source/{source_folder_name}...")
-        
-        html_files = list(source_folder.glob("video_*.html"))
-        print(f"   Found {len(html_files)} files")
-        
-        for html_file in html_files:
-            level = parse_level_from_html(html_file)
-            
-            # Check if file already exists in target folder
-            target_folder = level_folders[level]
-            target_file = target_folder / html_file.name
-            
-            if target_file.exists():
-                skipped += 1
-                continue
+        source_folders_found.append(source_folder)
+    
+    classified = classify_folders(source_folders_found)
+    print(f"\n🏷️  Classified {len(classified)} files from {len(source_folders_found)} folders")
+    
+    moves, already_there = build_move_plan(classified, level_folders)
+    skipped = len(already_there)
+    
+    # Copy file to level folder
+    for html_file, target_file, level in moves:
+        try:
+            shutil.copy2(html_file, target_file)
+            stats[level] += 1
+            total_files += 1
             
-            # Copy file to level folder
-            try:
-                shutil.copy2(html_file, target_file)
-                stats[level] += 1
-                total_files += 1
-                
-                # Show first few files
-                if stats[level] <= 3:
-                    print(f"   ✅ {html_file.name} → {level}")
-            except Exception as e:
-                print(f"   ❌ Error copying {html_file.name}: {e}")
-        
-        if stats['Elementary'] + stats['Intermediate'] + stats['Upper_Intermediate'] + stats['Advanced'] > 3:
-            print(f"   ... and more files")
+            # Show first few files
+            if stats[level] <= 3:
+                print(f"   ✅ {html_file.parent.name}/{html_file.name} → {level}")
+        except Exception as e:
+            print(f"   ❌ Error copying {html_file.name}: {e}")
+    
+    if total_files > sum(min(count, 3) for count in stats.values()):
+        print(f"   ... and more files")
     
     # Summary
     print("\n" + "="*80)
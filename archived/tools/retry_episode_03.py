@@ -11,6 +11,9 @@ import re
 from pathlib import Path
 from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeout
 
+from http_cache import CacheSession, add_cache_arguments, pace
+from playlist_enum import enumerate_playlist
+
 PLAYLIST_URL = "https://www.youtube.com/playlist?list=PL6vHaAQyQlk8kP1SPJ9uvDcNA4Ujb6hue"
 OUTPUT_DIR = Path("youtube_descriptions/Episode_03")
 MISSING_VIDEOS = [143, 146, 147, 150, 155, 168, 170, 173, 178, 179, 184, 187, 188, 190, 198, 199, 201, 202]
@@ -27,35 +30,8 @@ def sanitize_filename(title):
 
 async def get_playlist_videos(page):
     """Get all video URLs from the playlist"""
-    print(f"📋 Loading Episode_03 playlist...")
-    
     try:
-        await page.goto(PLAYLIST_URL, wait_until="domcontentloaded", timeout=90000)
-        await asyncio.sleep(3)
-        
-        await page.wait_for_selector("ytd-playlist-video-renderer", timeout=20000)
-        
-        print("📜 Scrolling to load all videos...")
-        for i in range(25):
-            await page.evaluate("window.scrollTo(0, document.documentElement.scrollHeight)")
-            await asyncio.sleep(1.5)
-        
-        await asyncio.sleep(2)
-        
-        video_elements = await page.query_selector_all("a#video-title")
-        video_urls = []
-        
-        for elem in video_elements:
-            url = await elem.get_attribute("href")
-            if url and "/watch?v=" in url:
-                video_id = url.split("/watch?v=")[1].split("&")[0]
-                clean_url = f"https://www.youtube.com/watch?v={video_id}"
-                if clean_url not in video_urls:
-                    video_urls.append(clean_url)
-        
-        print(f"✅ Found {len(video_urls)} videos in playlist")
-        return video_urls
-        
+        return await enumerate_playlist(page, PLAYLIST_URL, goto_timeout=90000)
     except Exception as e:
         print(f"❌ Error loading playlist: {e}")
         return []
@@ -71,7 +47,7 @@ async def extract_video_description(page, video_url, video_number, retry_count=0
     
     try:
         await page.goto(video_url, wait_until="domcontentloaded", timeout=90000)
-        await asyncio.sleep(4)
+        await pace(4)
         
         try:
             title_elem = await page.wait_for_selector("h1.ytd-watch-metadata yt-formatted-string", timeout=15000)
@@ -87,7 +63,7 @@ async def extract_video_description(page, video_url, video_number, retry_count=0
             if expand_button:
                 await expand_button.click()
                 print("✅ Clicked 'Show more'")
-                await asyncio.sleep(2.5)
+                await pace(2.5)
         except:
             print("⚠️  'Show more' button not found")
         
@@ -111,7 +87,7 @@ async def extract_video_description(page, video_url, video_number, retry_count=0
         
         if retry_count < 2:
             print(f"🔄 Retrying video {video_number}...")
-            await asyncio.sleep(5)
+            await pace(5)
             return await extract_video_description(page, video_url, video_number, retry_count + 1)
         else:
             print(f"❌ Failed after {retry_count + 1} attempts")
@@ -150,7 +126,7 @@ def rename_files():
     print(f"\n✅ Renamed {renamed} files")
 
 
-async def main():
+async def main(cache: CacheSession = None):
     """Main function"""
     print("""
 ╔══════════════════════════════════════════════════════════════════════════════╗
@@ -168,6 +144,8 @@ async def main():
         print("🚀 Launching browser...")
         browser = await p.chromium.launch(headless=False, args=['--start-maximized'])
         context = await browser.new_context(viewport={'width': 1920, 'height': 1080})
+        if cache:
+            await cache.attach(context)
         page = await context.new_page()
         page.set_default_timeout(90000)
         
@@ -196,7 +174,7 @@ async def main():
                         failed += 1
                     
                     # Longer delay between videos to avoid rate limiting
-                    await asyncio.sleep(3)
+                    await pace(3)
                 else:
                     print(f"⚠️  Video {missing_num} not found in playlist")
                     failed += 1
@@ -228,8 +206,15 @@ async def main():
         finally:
             print("\n🔒 Closing browser...")
             await browser.close()
+            if cache:
+                cache.close()
             print("✅ Done!")
 
 
 if __name__ == '__main__':
-    asyncio.run(main())
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    add_cache_arguments(parser)
+    args = parser.parse_args()
+    asyncio.run(main(CacheSession.from_args(args)))
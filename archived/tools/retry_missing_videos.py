@@ -13,6 +13,9 @@ import re
 from pathlib import Path
 from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeout
 
+from playlist_enum import enumerate_playlist
+from retry_policy import MissingSelectorError, Retrier, RetryExhausted
+
 # Playlist URLs
 PLAYLISTS = {
     'Episode_03': {
@@ -46,91 +49,51 @@ def sanitize_filename(title):
 
 async def get_playlist_videos(page, playlist_url):
     """Get all video URLs from the playlist"""
-    print(f"📋 Loading playlist...")
-    await page.goto(playlist_url, wait_until="networkidle", timeout=60000)
-    await page.wait_for_selector("ytd-playlist-video-renderer", timeout=15000)
-    
-    print("📜 Scrolling to load all videos...")
-    for i in range(20):
-        await page.evaluate("window.scrollTo(0, document.documentElement.scrollHeight)")
-        await asyncio.sleep(1.5)
-    
-    video_elements = await page.query_selector_all("a#video-title")
-    video_urls = []
-    
-    for elem in video_elements:
-        url = await elem.get_attribute("href")
-        if url and "/watch?v=" in url:
-            video_id = url.split("/watch?v=")[1].split("&")[0]
-            clean_url = f"https://www.youtube.com/watch?v={video_id}"
-            if clean_url not in video_urls:
-                video_urls.append(clean_url)
-    
-    print(f"✅ Found {len(video_urls)} videos in playlist")
-    return video_urls
+    return await enumerate_playlist(page, playlist_url)
 
 
-async def extract_video_description(page, video_url, video_number, folder_name, retry_count=0):
-    """Extract description from a single video with retry logic"""
+async def extract_video_description(page, video_url, video_number, folder_name):
+    """Extract description from a single video (one attempt; raises on failure so the Retrier can retry)"""
     print(f"\n{'='*80}")
     print(f"📹 Processing {folder_name} Video {video_number}: {video_url}")
-    if retry_count > 0:
-        print(f"🔄 Retry attempt {retry_count}")
     print(f"{'='*80}")
     
     output_dir = Path(f"youtube_descriptions/{folder_name}")
     
+    await page.goto(video_url, wait_until="networkidle", timeout=60000)
+    await asyncio.sleep(3)
+    
     try:
-        await page.goto(video_url, wait_until="networkidle", timeout=60000)
-        await asyncio.sleep(3)
-        
-        try:
-            title_elem = await page.wait_for_selector("h1.ytd-watch-metadata yt-formatted-string", timeout=15000)
-            video_title = await title_elem.inner_text()
-            print(f"📝 Title: {video_title}")
-            VIDEO_TITLES[f"{folder_name}_{video_number}"] = (video_number, video_title, folder_name)
-        except:
-            video_title = "Unknown"
-            print("⚠️  Could not get video title")
-        
-        try:
-            expand_button = await page.wait_for_selector("tp-yt-paper-button#expand, button#expand", timeout=10000)
-            if expand_button:
-                await expand_button.click()
-                print("✅ Clicked 'Show more'")
-                await asyncio.sleep(2)
-        except:
-            print("⚠️  'Show more' button not found")
-        
-        try:
-            expanded_desc = await page.wait_for_selector("#expanded", timeout=15000)
-            html_content = await expanded_desc.evaluate("el => el.outerHTML")
-            print(f"✅ Extracted description HTML ({len(html_content)} characters)")
-            
-            output_file = output_dir / f"video_{video_number}.html"
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(html_content)
-            
-            print(f"💾 Saved to: {output_file}")
-            return True
-        except Exception as e:
-            print(f"❌ Error extracting description: {e}")
-            return False
-            
-    except PlaywrightTimeout as e:
-        print(f"⏱️  Timeout error: {e}")
-        
-        if retry_count < 2:
-            print(f"🔄 Retrying video {video_number}...")
-            await asyncio.sleep(3)
-            return await extract_video_description(page, video_url, video_number, folder_name, retry_count + 1)
-        else:
-            print(f"❌ Failed after {retry_count + 1} attempts")
-            return False
-            
-    except Exception as e:
-        print(f"❌ Error processing video: {e}")
-        return False
+        title_elem = await page.wait_for_selector("h1.ytd-watch-metadata yt-formatted-string", timeout=15000)
+        video_title = await title_elem.inner_text()
+        print(f"📝 Title: {video_title}")
+        VIDEO_TITLES[f"{folder_name}_{video_number}"] = (video_number, video_title, folder_name)
+    except:
+        video_title = "Unknown"
+        print("⚠️  Could not get video title")
+    
+    try:
+        expand_button = await page.wait_for_selector("tp-yt-paper-button#expand, button#expand", timeout=10000)
+        if expand_button:
+            await expand_button.click()
+            print("✅ Clicked 'Show more'")
+            await asyncio.sleep(2)
+    except:
+        print("⚠️  'Show more' button not found")
+    
+    try:
+        expanded_desc = await page.wait_for_selector("#expanded", timeout=15000)
+    except PlaywrightTimeout:
+        raise MissingSelectorError("#expanded not found")
+    html_content = await expanded_desc.evaluate("el => el.outerHTML")
+    print(f"✅ Extracted description HTML ({len(html_content)} characters)")
+    
+    output_file = output_dir / f"video_{video_number}.html"
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(html_content)
+    
+    print(f"💾 Saved to: {output_file}")
+    return True
 
 
 def rename_files():
@@ -180,6 +143,7 @@ async def main():
         context = await browser.new_context(viewport={'width': 1920, 'height': 1080})
         page = await context.new_page()
         page.set_default_timeout(60000)
+        retrier = Retrier()
         
         try:
             total_successful = 0
@@ -198,9 +162,12 @@ async def main():
                 for missing_num in playlist_info['missing']:
                     if missing_num <= len(video_urls):
                         video_url = video_urls[missing_num - 1]
-                        if await extract_video_description(page, video_url, missing_num, folder_name):
+                        try:
+                            await retrier.run(extract_video_description, page, video_url, missing_num, folder_name,
+                                              label=f"{folder_name} video {missing_num}")
                             total_successful += 1
-                        else:
+                        except RetryExhausted as e:
+                            print(f"❌ {e}")
                             total_failed += 1
                         
                         await asyncio.sleep(2)
@@ -211,6 +178,7 @@ async def main():
             print(f"✅ Successful: {total_successful} videos")
             print(f"❌ Failed: {total_failed} videos")
             print("="*80)
+            retrier.print_report()
             
             if total_successful > 0:
                 rename_files()
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Async retry scheduling for the extractors
+
+Replaces the copy-pasted "retry_count < 2 -> sleep(3) -> recurse" blocks with
+one layer:
+
+- jittered exponential backoff ("full jitter": a random delay up to
+  base * 2^(attempt-1), capped), so retries spread out instead of lining up
+- per-error-class policies: a page-load timeout is worth several patient
+  retries, a missing #expanded selector one quick retry, a removed video none
+- a circuit breaker shared by the whole run: when most recent attempts fail
+  (rate limiting, network down) every task pauses for a cooldown instead of
+  hammering YouTube, then a single trial call decides whether to resume
+- retry metrics (attempts, retries and backoff time per class, breaker trips)
+
+Healthy runs pay nothing: the first attempt runs immediately and the breaker
+only engages once failures dominate its window.
+
+    retrier = Retrier(sleep=pace)
+    try:
+        await retrier.run(extract_video_description, page, url, number, label=f"video {number}")
+    except RetryExhausted as e:
+        print(f"❌ {e}")
+    retrier.print_report()
+
+Attempt functions signal failures by raising: timeouts propagate as-is,
+MissingSelectorError for "page loaded but the element never appeared",
+PermanentError for anything retrying cannot fix.
+"""
+
+import asyncio
+import random
+import time
+from collections import deque
+from typing import Awaitable, Callable, Dict, Optional
+
+from instrumentation import count, observe
+
+
+class MissingSelectorError(Exception):
+    """The page loaded but an expected element never appeared"""
+
+
+class PermanentError(Exception):
+    """Retrying will not help (video removed, private, region-blocked)"""
+
+
+class RetryExhausted(Exception):
+    """All attempts allowed by the policy failed"""
+
+    def __init__(self, label: str, attempts: int, last_error: BaseException):
+        super().__init__(f"{label}: failed after {attempts} attempt(s) ({classify(last_error)}: {last_error})")
+        self.label = label
+        self.attempts = attempts
+        self.last_error = last_error
+
+
+class RetryPolicy:
+    """How often and how patiently to retry one class of error"""
+
+    def __init__(self, max_attempts: int, base_delay: float = 1.0, max_delay: float = 30.0,
+                 multiplier: float = 2.0):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+
+    def delay(self, attempt: int, rng: random.Random) -> float:
+        """Full-jitter backoff before retry number `attempt` (1-based)"""
+        ceiling = min(self.max_delay, self.base_delay * self.multiplier ** (attempt - 1))
+        return rng.uniform(0, ceiling)
+
+
+DEFAULT_POLICIES: Dict[str, RetryPolicy] = {
+    'timeout': RetryPolicy(max_attempts=4, base_delay=5, max_delay=60),
+    'missing_selector': RetryPolicy(max_attempts=2, base_delay=2, max_delay=10),
+    'error': RetryPolicy(max_attempts=3, base_delay=3, max_delay=30),
+    'permanent': RetryPolicy(max_attempts=1),
+}
+
+
+def classify(error: BaseException) -> str:
+    """Map an exception to a policy name"""
+    if isinstance(error, PermanentError):
+        return 'permanent'
+    if isinstance(error, MissingSelectorError):
+        return 'missing_selector'
+    # Playwright's TimeoutError is not a subclass of the builtin one
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError)) or 'Timeout' in type(error).__name__:
+        return 'timeout'
+    return 'error'
+
+
+def with_max_attempts(max_attempts: int, policies: Optional[Dict[str, RetryPolicy]] = None) -> Dict[str, RetryPolicy]:
+    """Copy of the policies with every retryable class capped at max_attempts"""
+    policies = policies or DEFAULT_POLICIES
+    return {
+        name: policy if name == 'permanent' else
+        RetryPolicy(max_attempts, policy.base_delay, policy.max_delay, policy.multiplier)
+        for name, policy in policies.items()
+    }
+
+
+class CircuitBreaker:
+    """
+    Closed -> open when the failure rate over the last `window` attempts
+    reaches `failure_rate` (after at least `min_calls`). While open every
+    caller waits out the cooldown; then one trial attempt runs (half-open).
+    Success closes the breaker, failure reopens it with a doubled cooldown.
+    A trial that ends without recording anything (cancelled) hands the
+    breaker back to open, so the next caller becomes the trial.
+    """
+
+    def __init__(self, window: int = 20, failure_rate: float = 0.5, min_calls: int = 10,
+                 cooldown: float = 60.0, max_cooldown: float = 600.0):
+        self.window = deque(maxlen=window)
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.base_cooldown = cooldown
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.state = 'closed'
+        self.opened_until = 0.0
+        self.trips = 0
+        self.trial = 0
+        self.paused_seconds = 0.0
+
+    def _failure_rate(self) -> float:
+        return self.window.count(False) / len(self.window) if self.window else 0.0
+
+    def record(self, success: bool):
+        self.window.append(success)
+        if self.state == 'half_open':
+            if success:
+                self.state = 'closed'
+                self.cooldown = self.base_cooldown
+                self.window.clear()
+                print("🟢 Circuit closed - resuming at full speed")
+            else:
+                self.cooldown = min(self.cooldown * 2, self.max_cooldown)
+                self._open()
+        elif self.state == 'closed' and len(self.window) >= self.min_calls \
+                and self._failure_rate() >= self.failure_rate:
+            self._open()
+
+    def _open(self):
+        self.state = 'open'
+        self.trips += 1
+        self.opened_until = time.monotonic() + self.cooldown
+        count('retry.breaker_trips')
+        print(f"🔴 Circuit open ({self._failure_rate():.0%} of recent attempts failed) - "
+              f"pausing {self.cooldown:.0f}s")
+
+    async def before_attempt(self, sleep: Callable[[float], Awaitable] = asyncio.sleep) -> int:
+        """
+        Wait while open; let exactly one caller through as the half-open
+        trial. Returns the trial's number (0 for everyone else), which the
+        trial passes to end_trial() once its attempt is over.
+        """
+        while self.state != 'closed':
+            if self.state == 'open':
+                remaining = self.opened_until - time.monotonic()
+                if remaining > 0:
+                    started = time.monotonic()
+                    # sleep may be shortened (pace() while replaying), so
+                    # the cooldown counts as over once it returns
+                    await sleep(remaining)
+                    self.paused_seconds += time.monotonic() - started
+                if self.state == 'open':
+                    self.state = 'half_open'
+                    self.trial += 1
+                    print("🟡 Circuit half-open - trying one request")
+                    return self.trial
+                continue
+            # half_open: another task is running the trial
+            await asyncio.sleep(0.5)
+        return 0
+
+    def end_trial(self, trial: int):
+        """No-op if the trial recorded an outcome; otherwise reopen so another caller can try"""
+        if self.state == 'half_open' and self.trial == trial:
+            # A cancelled attempt is not evidence either way: no extra cooldown
+            self.state = 'open'
+            self.opened_until = time.monotonic()
+
+
+class Retrier:
+    """Runs attempt coroutines under the policies and a shared circuit breaker"""
+
+    def __init__(self, policies: Optional[Dict[str, RetryPolicy]] = None,
+                 breaker: Optional[CircuitBreaker] = None,
+                 sleep: Callable[[float], Awaitable] = asyncio.sleep, seed: Optional[int] = None):
+        self.policies = policies or DEFAULT_POLICIES
+        self.breaker = breaker if breaker is not None else CircuitBreaker()
+        self.sleep = sleep
+        self.rng = random.Random(seed)
+        self.stats = {
+            'calls': 0, 'succeeded': 0, 'exhausted': 0, 'attempts': 0,
+            'retries': {}, 'backoff_s': 0.0,
+        }
+
+    async def run(self, func: Callable[..., Awaitable], *args, label: str = '', **kwargs):
+        """Await func(*args, **kwargs) until it succeeds or its error's policy gives up"""
+        self.stats['calls'] += 1
+        attempt = 0
+        while True:
+            attempt += 1
+            trial = await self.breaker.before_attempt(self.sleep)
+            self.stats['attempts'] += 1
+            count('retry.attempts')
+            started = time.perf_counter()
+            try:
+                result = await func(*args, **kwargs)
+            except Exception as e:
+                observe('retry.attempt', time.perf_counter() - started)
+                kind = classify(e)
+                # A permanent error still means the site answered, so it is
+                # not evidence of rate limiting or an outage
+                self.breaker.record(kind == 'permanent')
+                policy = self.policies.get(kind, self.policies['error'])
+                if attempt >= policy.max_attempts:
+                    self.stats['exhausted'] += 1
+                    count('retry.exhausted')
+                    raise RetryExhausted(label or getattr(func, '__name__', 'call'), attempt, e) from e
+                delay = policy.delay(attempt, self.rng)
+                self.stats['retries'][kind] = self.stats['retries'].get(kind, 0) + 1
+                self.stats['backoff_s'] += delay
+                count(f'retry.retries[{kind}]')
+                print(f"🔄 {label}: {kind} on attempt {attempt}/{policy.max_attempts} ({e}) - "
+                      f"retrying in {delay:.1f}s")
+                await self.sleep(delay)
+            else:
+                observe('retry.attempt', time.perf_counter() - started)
+                self.breaker.record(True)
+                self.stats['succeeded'] += 1
+                return result
+            finally:
+                if trial:
+                    self.breaker.end_trial(trial)
+
+    def report(self) -> Dict:
+        return {
+            **self.stats,
+            'backoff_s': round(self.stats['backoff_s'], 3),
+            'breaker_trips': self.breaker.trips,
+            'paused_s': round(self.breaker.paused_seconds, 3),
+        }
+
+    def print_report(self):
+        r = self.report()
+        print(f"\n{'='*80}")
+        print("🔁 RETRY STATS")
+        print(f"{'='*80}")
+        print(f"✅ Succeeded: {r['succeeded']}/{r['calls']} ({r['attempts']} attempts)")
+        print(f"❌ Gave up: {r['exhausted']}")
+        for kind, retries in sorted(r['retries'].items()):
+            print(f"🔄 Retries after {kind}: {retries}")
+        print(f"⏳ Backoff: {r['backoff_s']:.1f}s   🔴 Breaker trips: {r['breaker_trips']} "
+              f"(paused {r['paused_s']:.0f}s)")
+        print(f"{'='*80}")
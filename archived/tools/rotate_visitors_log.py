@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Rotate and Archive the nginx Visitors Log
+
+nginx appends every request to resources/visitors.log forever. This tool
+moves the accumulated lines into per-day gzip segments and keeps a tiny
+index so historical queries only open the days they need:
+
+    resources/visitors-archive/
+    ├── index.json                  day → file, time range, line count
+    ├── visitors-2025-12-13.log.gz
+    └── visitors-2025-12-14.log.gz
+
+Rotation renames the live log to visitors.log.rotating and asks nginx to
+reopen its logs (`nginx -s reopen`, i.e. SIGUSR1; --reopen-command). Until
+it does, nginx keeps appending to the renamed file through its open handle,
+so no line is lost: each one lands either in the renamed file, which is
+then streamed into the segments, aggregated and deleted, or in the fresh
+visitors.log nginx creates. A rotation interrupted half way is finished by
+the next run; the index remembers the inode, size and first line of the
+last archived file so a crash before its delete can't archive it twice. A
+final line nginx never finished is archived as it is rather than dropped.
+Segments older than --keep-days (default 365) are deleted. A segment that receives lines in several rotations becomes a
+multi-member gzip file, which gzip readers handle transparently.
+
+Usage:
+    python3 rotate_visitors_log.py                      # rotate + aggregate first
+    python3 rotate_visitors_log.py --keep-days 0        # keep every segment
+    python3 rotate_visitors_log.py --reopen-command 'kill -USR1 1234'
+    python3 rotate_visitors_log.py --query --since 2025-12-01 --until 2025-12-07
+    python3 rotate_visitors_log.py --query --since 2025-12-01 --path /resources/audio
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import shlex
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from aggregate_visitors import write_json_atomic, run_once as aggregate_once
+from visitor_sessions import SESSIONS_STATE, VISITOR_SESSIONS, DEFAULT_TIMEOUT_MINUTES, run_once as sessions_once
+from visitor_sketches import SKETCH_STATE, SKETCH_STATS, run_once as sketches_once
+from visitor_log import VISITORS_LOG, VISITOR_STATS, parse_log_line, entry_day
+
+ARCHIVE_DIR = 'resources/visitors-archive'
+INDEX_NAME = 'index.json'
+ROTATING_SUFFIX = '.rotating'
+# The nginx container from docker-compose.yml
+REOPEN_COMMAND = 'docker exec better-english-everyday nginx -s reopen'
+KEEP_DAYS = 365
+
+
+def parse_time(value: str) -> Optional[datetime]:
+    """Parse an ISO date/datetime; naive values are taken as UTC"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def load_index(archive_dir: Path) -> Dict:
+    index_path = archive_dir / INDEX_NAME
+    if index_path.exists():
+        with open(index_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {'segments': {}}
+
+
+def segment_name(day: str) -> str:
+    return f"visitors-{day}.log.gz"
+
+
+def rotating_path(log_path: Path) -> Path:
+    return log_path.with_name(log_path.name + ROTATING_SUFFIX)
+
+
+def fingerprint(path: Path) -> Dict:
+    """Identifies a rotated file even if its inode number is reused later"""
+    with open(path, 'rb') as f:
+        first_line = f.readline()
+    stat = path.stat()
+    return {'inode': stat.st_ino, 'size': stat.st_size, 'head': hashlib.sha256(first_line).hexdigest()[:16]}
+
+
+def reopen_nginx(command: str, log_path: Path, timeout: float = 10.0, grace: float = 1.0) -> bool:
+    """Ask nginx to reopen its logs and wait until it has created a fresh log_path"""
+    try:
+        result = subprocess.run(shlex.split(command))
+    except OSError as e:
+        print(f"❌ Could not run '{command}': {e}")
+        return False
+    if result.returncode != 0:
+        print(f"❌ '{command}' exited with {result.returncode}")
+        return False
+    deadline = time.monotonic() + timeout
+    while not log_path.exists():
+        if time.monotonic() > deadline:
+            print(f"❌ nginx did not recreate {log_path} within {timeout:.0f}s")
+            return False
+        time.sleep(0.1)
+    # Workers reopen on their next event loop turn; let in-flight writes land
+    time.sleep(grace)
+    return True
+
+
+def archive_lines(source: Path, archive_dir: Path, index: Dict, write: bool = True) -> Dict[str, int]:
+    """
+    Stream the lines of source into their day segments; returns lines per day.
+    In a dry run a final line without newline is still being written and
+    is left out; a rotated file is finished, so its cut-off line is
+    archived (newline added) with the day it names or else the line before.
+    """
+    counts: Dict[str, int] = {}
+    ranges: Dict[str, Tuple[str, str]] = {}
+    segments = {}
+    day = 'unknown'
+    try:
+        with open(source, 'rb') as f:
+            for raw in f:
+                complete = raw.endswith(b'\n')
+                if not complete and not write:
+                    break
+                entry = parse_log_line(raw.decode('utf-8', errors='replace'))
+                if entry and entry.get('timestamp'):
+                    day = entry_day(entry)
+                elif complete:
+                    day = 'unknown'
+                if not complete:
+                    # Cut off for good; without a readable day it joins the line before
+                    raw += b'\n'
+                counts[day] = counts.get(day, 0) + 1
+                if entry and entry.get('timestamp'):
+                    first, last = ranges.get(day, (entry['timestamp'], entry['timestamp']))
+                    ranges[day] = (min(first, entry['timestamp']), max(last, entry['timestamp']))
+                if write:
+                    gz = segments.get(day)
+                    if gz is None:
+                        # Appending adds a new gzip member; readers see one continuous stream
+                        gz = segments[day] = gzip.open(archive_dir / segment_name(day), 'ab', compresslevel=9)
+                    gz.write(raw)
+    finally:
+        for gz in segments.values():
+            gz.close()
+
+    if write:
+        for day, lines in counts.items():
+            segment = archive_dir / segment_name(day)
+            info = index['segments'].setdefault(day, {'file': segment.name, 'first': None, 'last': None, 'lines': 0})
+            info['lines'] += lines
+            info['bytes'] = segment.stat().st_size
+            if day in ranges:
+                first, last = ranges[day]
+                info['first'] = min(filter(None, [info['first'], first]))
+                info['last'] = max(filter(None, [info['last'], last]))
+    return counts
+
+
+def rotate(log_path: Path, archive_dir: Path, dry_run: bool = False, reopen: str = REOPEN_COMMAND,
+           before_archive: Optional[Callable[[Path], None]] = None) -> Optional[Dict[str, int]]:
+    """
+    Move every line of the live log into its day segment; returns lines per
+    day, or None if nginx could not be made to reopen its log.
+    before_archive(path) sees the rotated file before it is deleted.
+    """
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    index = load_index(archive_dir)
+    rotating = rotating_path(log_path)
+    if dry_run:
+        # An interrupted rotation leaves lines in the renamed file, maybe only there
+        counts: Dict[str, int] = {}
+        for source in (rotating, log_path):
+            if not source.exists() or (source == rotating and index.get('rotated') == fingerprint(rotating)):
+                continue
+            for day, lines in archive_lines(source, archive_dir, index, write=False).items():
+                counts[day] = counts.get(day, 0) + lines
+        return counts
+
+    if rotating.exists():
+        print(f"⚠️  Finishing an interrupted rotation: {rotating}")
+        if index.get('rotated') == fingerprint(rotating):
+            # Archived already, only the delete was missed
+            rotating.unlink()
+            return {}
+    else:
+        os.rename(log_path, rotating)
+    if not log_path.exists() and not reopen_nginx(reopen, log_path):
+        if not log_path.exists():
+            # nginx still writes to this inode, so moving it back loses nothing
+            os.rename(rotating, log_path)
+        return None
+
+    if before_archive:
+        before_archive(rotating)
+    counts = archive_lines(rotating, archive_dir, index)
+    # Recorded with the segments, so a crash before the unlink can't archive twice
+    index['rotated'] = fingerprint(rotating)
+    write_json_atomic(archive_dir / INDEX_NAME, index, indent=2)
+    rotating.unlink()
+    return counts
+
+
+def prune(archive_dir: Path, keep_days: int) -> List[str]:
+    """Delete segments older than keep_days; returns removed days"""
+    index = load_index(archive_dir)
+    cutoff = (datetime.now(timezone.utc) - timedelta(days=keep_days)).strftime('%Y-%m-%d')
+    removed = [day for day in index['segments'] if day != 'unknown' and day < cutoff]
+    for day in removed:
+        (archive_dir / index['segments'].pop(day)['file']).unlink(missing_ok=True)
+    if removed:
+        write_json_atomic(archive_dir / INDEX_NAME, index, indent=2)
+    return removed
+
+
+def query(archive_dir: Path, log_path: Optional[Path], since: Optional[datetime],
+          until: Optional[datetime], path_prefix: str = '') -> Iterator[Dict]:
+    """Yield entries in [since, until], opening only overlapping segments"""
+    index = load_index(archive_dir)
+    sources: List[Path] = []
+    for day, info in sorted(index['segments'].items()):
+        first, last = parse_time(info.get('first')), parse_time(info.get('last'))
+        if first is None or last is None:
+            continue
+        if (since and last < since) or (until and first > until):
+            continue
+        sources.append(archive_dir / info['file'])
+    if log_path:
+        # Mid-rotation, the newest lines are still in the renamed file
+        sources.extend(p for p in (rotating_path(log_path), log_path) if p.exists())
+
+    for source in sources:
+        opener = gzip.open if source.suffix == '.gz' else open
+        with opener(source, 'rt', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                entry = parse_log_line(line)
+                if entry is None:
+                    continue
+                stamp = parse_time(entry.get('timestamp', ''))
+                if stamp is None or (since and stamp < since) or (until and stamp > until):
+                    continue
+                if path_prefix and not entry.get('path', '').startswith(path_prefix):
+                    continue
+                yield entry
+
+
+def main(argv: Optional[List[str]] = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Rotate visitors.log into indexed gzip day segments')
+    parser.add_argument('--log', type=str, default=VISITORS_LOG, help=f'Live log file (default: {VISITORS_LOG})')
+    parser.add_argument('--archive', type=str, default=ARCHIVE_DIR, help=f'Archive folder (default: {ARCHIVE_DIR})')
+    parser.add_argument('--keep-days', type=int, default=KEEP_DAYS,
+                        help=f'Delete segments older than N days, 0 keeps all (default: {KEEP_DAYS})')
+    parser.add_argument('--no-aggregate', action='store_true',
+                        help='Skip draining the rotated lines into the visitor stats, sketches and sessions')
+    parser.add_argument('--reopen-command', type=str, default=REOPEN_COMMAND,
+                        help=f'Makes nginx reopen its log (default: {REOPEN_COMMAND})')
+    parser.add_argument('--dry-run', action='store_true', help='Only report what would be archived')
+    parser.add_argument('--query', action='store_true', help='Query archived + live entries instead of rotating')
+    parser.add_argument('--since', type=str, default=None, help='Query start (ISO date or datetime)')
+    parser.add_argument('--until', type=str, default=None, help='Query end (ISO date or datetime)')
+    parser.add_argument('--path', type=str, default='', help='Only entries whose path starts with this')
+    parser.add_argument('--print', action='store_true', dest='print_lines', help='Print matching entries')
+
+    args = parser.parse_args(argv)
+
+    log_path = Path(args.log)
+    archive_dir = Path(args.archive)
+
+    if args.query:
+        since = parse_time(args.since) if args.since else None
+        until = parse_time(args.until) if args.until else None
+        if args.since and since is None:
+            parser.error(f"--since: not an ISO date or datetime: {args.since}")
+        if args.until and until is None:
+            parser.error(f"--until: not an ISO date or datetime: {args.until}")
+        if args.until and len(args.until) == 10:
+            until += timedelta(days=1) - timedelta(microseconds=1)  # whole day
+        total = 0
+        for entry in query(archive_dir, log_path, since, until, args.path):
+            total += 1
+            if args.print_lines:
+                print(json.dumps(entry, ensure_ascii=False))
+        print(f"📊 {total} matching requests")
+        return 0
+
+    if not log_path.exists() and not rotating_path(log_path).exists():
+        print(f"❌ Error: Log file not found: {log_path}")
+        return 1
+
+    stats_path = log_path.parent / Path(VISITOR_STATS).name
+    state_path = stats_path.with_suffix('.state.json')
+    sketch_state = log_path.parent / Path(SKETCH_STATE).name
+    sessions_state = log_path.parent / Path(SESSIONS_STATE).name
+    before_archive = None
+    if not args.no_aggregate and not args.dry_run:
+        # Fold the rotated lines into the running stats before they are deleted.
+        # Every log reader's state follows the inode: it resumes at its offset
+        # in the rotated file, and starts the new live log from 0 on its next
+        # run. Readers that have never run (no state file) are left alone.
+        def before_archive(rotated: Path):
+            aggregate_once(rotated, stats_path, state_path)
+            if sketch_state.exists():
+                sketches_once(rotated, log_path.parent / Path(SKETCH_STATS).name, sketch_state)
+            if sessions_state.exists():
+                # Another timeout would make the sessionizer rebuild from this file alone
+                with open(sessions_state, 'r', encoding='utf-8') as f:
+                    timeout = json.load(f).get('timeoutMinutes', DEFAULT_TIMEOUT_MINUTES)
+                sessions_once(rotated, log_path.parent / Path(VISITOR_SESSIONS).name, sessions_state, timeout)
+
+    counts = rotate(log_path, archive_dir, args.dry_run, args.reopen_command, before_archive)
+    if counts is None:
+        print("❌ Rotation abandoned, the live log is unchanged")
+        return 1
+
+    print(f"\n{'='*60}")
+    print(f"{'Would archive' if args.dry_run else 'Archived'} {sum(counts.values())} lines into {len(counts)} day segment(s)")
+    for day, count in sorted(counts.items()):
+        print(f"  {day}: {count} lines")
+
+    if args.keep_days and not args.dry_run:
+        removed = prune(archive_dir, args.keep_days)
+        if removed:
+            print(f"🗑️  Removed {len(removed)} segment(s) older than {args.keep_days} days")
+
+    total_bytes = sum(p.stat().st_size for p in archive_dir.glob('*.log.gz')) if archive_dir.exists() else 0
+    print(f"📦 Archive size: {total_bytes / 1024:.1f} KB in {archive_dir}")
+    print(f"{'='*60}\n")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
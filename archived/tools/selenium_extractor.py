@@ -14,6 +14,7 @@ Requirements:
 
 Usage:
     python3 selenium_extractor.py
+    python3 selenium_extractor.py --lean --stats lean.json   # headless, media/images/trackers blocked
 """
 
 import time
@@ -27,69 +28,53 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from webdriver_manager.chrome import ChromeDriverManager
 
+from lean_page import (PageStats, add_lean_arguments, apply_lean_options, enable_performance_log,
+                       enable_selenium_blocking)
+from playlist_enum import enumerate_playlist_selenium
+
 # Playlist URL
 PLAYLIST_URL = "https://www.youtube.com/playlist?list=PL6vHaAQyQlk9RH8F_1lsI_z9wn3SLZHDi"
 OUTPUT_DIR = Path("youtube_descriptions")
 
 
-def setup_driver():
+def setup_driver(lean=False):
     """Setup Chrome driver with options"""
     chrome_options = Options()
-    # Remove headless mode so you can see what's happening
-    # chrome_options.add_argument("--headless")
     chrome_options.add_argument("--no-sandbox")
     chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--window-size=1920,1080")
+    if lean:
+        # Headless, small window, media/images/fonts/trackers blocked
+        apply_lean_options(chrome_options)
+    else:
+        # Visible so you can see what's happening
+        chrome_options.add_argument("--window-size=1920,1080")
+    # Performance log feeds the bandwidth stats
+    enable_performance_log(chrome_options)
     
     # Automatically download and setup ChromeDriver
     service = Service(ChromeDriverManager().install())
     driver = webdriver.Chrome(service=service, options=chrome_options)
+    if lean:
+        enable_selenium_blocking(driver)
     return driver
 
 
 def get_playlist_videos(driver, playlist_url):
     """Get all video URLs from the playlist"""
-    print(f"📋 Loading playlist: {playlist_url}")
-    driver.get(playlist_url)
-    
-    # Wait for playlist to load
-    time.sleep(3)
-    
-    # Scroll to load all videos
-    print("📜 Scrolling to load all videos...")
-    last_height = driver.execute_script("return document.documentElement.scrollHeight")
-    
-    for _ in range(10):  # Scroll multiple times to load all videos
-        driver.execute_script("window.scrollTo(0, document.documentElement.scrollHeight);")
-        time.sleep(2)
-        new_height = driver.execute_script("return document.documentElement.scrollHeight")
-        if new_height == last_height:
-            break
-        last_height = new_height
-    
-    # Get all video links
-    video_elements = driver.find_elements(By.CSS_SELECTOR, "a#video-title")
-    video_urls = []
-    
-    for elem in video_elements:
-        url = elem.get_attribute("href")
-        if url and "/watch?v=" in url:
-            # Clean URL (remove playlist parameter)
-            video_id = url.split("/watch?v=")[1].split("&")[0]
-            clean_url = f"https://www.youtube.com/watch?v={video_id}"
-            if clean_url not in video_urls:
-                video_urls.append(clean_url)
-    
-    print(f"✅ Found {len(video_urls)} videos in playlist")
-    return video_urls
+    return enumerate_playlist_selenium(driver, playlist_url)
 
 
-def extract_video_description(driver, video_url, video_number):
+def extract_video_description(driver, video_url, video_number, stats=None):
     """Extract description from a single video"""
     print(f"\n{'='*80}")
     print(f"📹 Processing Video {video_number}: {video_url}")
     print(f"{'='*80}")
     
+    if stats:
+        # Late requests from the previous page still count towards it
+        stats.collect_selenium_log(driver)
+        stats.start_page(video_url)
+    
     try:
         # Open video
         driver.get(video_url)
@@ -143,6 +128,8 @@ def extract_video_description(driver, video_url, video_number):
             )
             html_content = expanded_desc.get_attribute("outerHTML")
             print(f"✅ Extracted description HTML ({len(html_content)} characters)")
+            if stats:
+                stats.page_ready()
             
             # Save to file
             output_file = OUTPUT_DIR / f"video_{video_number}.html"
@@ -161,7 +148,7 @@ def extract_video_description(driver, video_url, video_number):
         return False
 
 
-def main():
+def main(lean=False, stats_path=None):
     """Main function"""
     print("""
 ╔══════════════════════════════════════════════════════════════════════════════╗
@@ -177,7 +164,7 @@ def main():
     # Setup driver
     print("🚀 Setting up Chrome WebDriver...")
     try:
-        driver = setup_driver()
+        driver = setup_driver(lean)
         print("✅ WebDriver ready!\n")
     except Exception as e:
         print(f"❌ Error setting up WebDriver: {e}")
@@ -210,11 +197,12 @@ def main():
         print(f"\n🎬 Processing {num_videos} videos...\n")
         
         # Process each video
+        stats = PageStats('lean' if lean else 'full')
         successful = 0
         failed = 0
         
         for i, video_url in enumerate(video_urls[:num_videos], 1):
-            if extract_video_description(driver, video_url, i):
+            if extract_video_description(driver, video_url, i, stats):
                 successful += 1
             else:
                 failed += 1
@@ -232,6 +220,11 @@ def main():
         print(f"📁 Files saved in: {OUTPUT_DIR.absolute()}")
         print("="*80)
         
+        stats.collect_selenium_log(driver)
+        stats.print_report()
+        if stats_path:
+            stats.save(stats_path)
+        
         if successful > 0:
             print("\n🎉 NEXT STEP:")
             print("   Run: python3 process_descriptions.py")
@@ -250,4 +243,9 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Extract playlist descriptions with Selenium')
+    add_lean_arguments(parser)
+    args = parser.parse_args()
+    main(args.lean, args.stats)
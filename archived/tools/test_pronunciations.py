@@ -3,10 +3,11 @@
 Quick test script to add pronunciations to just the first 10 episodes
 """
 
-import json
 import requests
+import shutil
 import time
 from pathlib import Path
+from catalogue_stream import iter_episodes, CatalogueWriter
 
 DICTIONARY_API = "https://api.dictionaryapi.dev/api/v2/entries/en/{word}"
 
@@ -35,36 +36,33 @@ def get_pronunciation(word):
     except:
         return None
 
-# Load JSON
 json_path = Path('src/data/all-episodes-mapped.json')
-with open(json_path, 'r', encoding='utf-8') as f:
-    data = json.load(f)
 
 print("Adding pronunciations to first 10 episodes...\n")
 
-# Process only first 10 episodes
-for episode_idx, episode in enumerate(data[:10]):
-    print(f"Episode {episode.get('id')}: {episode.get('title')}")
-    
-    if 'transcript' in episode and 'vocabulary' in episode['transcript']:
-        for vocab_item in episode['transcript']['vocabulary'][:5]:  # Only first 5 words per episode
-            word = vocab_item.get('word', '')
-            if 'pronunciation' not in vocab_item:
-                print(f"  Fetching: {clean_word(word)}...", end=' ')
-                pronunciation = get_pronunciation(word)
-                if pronunciation:
-                    vocab_item['pronunciation'] = pronunciation
-                    print(f"✓ /{pronunciation}/")
-                else:
-                    print("✗")
-                time.sleep(0.3)
-
-# Save
+# Backup before streaming the updated catalogue back into place
 backup_path = json_path.with_suffix('.json.backup-test')
-with open(backup_path, 'w', encoding='utf-8') as f:
-    json.dump(data, f, ensure_ascii=False, indent=2)
+shutil.copy2(json_path, backup_path)
 
-with open(json_path, 'w', encoding='utf-8') as f:
-    json.dump(data, f, ensure_ascii=False, indent=2)
+with CatalogueWriter(json_path) as writer:
+    for episode_idx, episode in enumerate(iter_episodes(json_path)):
+        # Process only first 10 episodes, pass the rest through unchanged
+        if episode_idx < 10:
+            print(f"Episode {episode.get('id')}: {episode.get('title')}")
+            
+            if 'transcript' in episode and 'vocabulary' in episode['transcript']:
+                for vocab_item in episode['transcript']['vocabulary'][:5]:  # Only first 5 words per episode
+                    word = vocab_item.get('word', '')
+                    if 'pronunciation' not in vocab_item:
+                        print(f"  Fetching: {clean_word(word)}...", end=' ')
+                        pronunciation = get_pronunciation(word)
+                        if pronunciation:
+                            vocab_item['pronunciation'] = pronunciation
+                            print(f"✓ /{pronunciation}/")
+                        else:
+                            print("✗")
+                        time.sleep(0.3)
+        
+        writer.write(episode)
 
 print("\n✅ Done! Check the app to see IPA pronunciations.")
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Helpers for the nginx json_analytics access log (resources/visitors.log)
+
+nginx writes one JSON object per line with a trailing comma:
+    {"timestamp": "2025-12-14T10:00:00+00:00","ip": "...","path": "/",...},
+
+These helpers are shared by the log aggregation and rotation tools.
+"""
+
+import functools
+import json
+import re
+from typing import Dict, Optional
+
+# Default locations, relative to the repository root
+VISITORS_LOG = 'resources/visitors.log'
+VISITOR_STATS = 'resources/visitor-stats.json'
+
+# Ordered: the first matching family wins (Edge and Opera also say "Chrome",
+# Chrome also says "Safari")
+UA_FAMILIES = [
+    ('Bot', re.compile(r'bot|crawl|spider|slurp|curl|wget|python-requests|httpclient|monitor|uptime', re.I)),
+    ('Edge', re.compile(r'Edg(e|A|iOS)?/')),
+    ('Opera', re.compile(r'OPR/|Opera')),
+    ('Samsung Internet', re.compile(r'SamsungBrowser/')),
+    ('Firefox', re.compile(r'Firefox/|FxiOS/')),
+    ('Chrome', re.compile(r'Chrome/|CriOS/')),
+    ('Safari', re.compile(r'Safari/')),
+]
+
+# Who is behind a user agent, most specific class first. Each alternative
+# looks ahead over the whole string, so the first class with a match wins
+# wherever the match is: "Mozilla/5.0 (compatible; Googlebot/2.1)" is a bot
+# and "UptimeRobot/2.0" a monitor, not a bot.
+AGENT_CLASSES = [
+    ('monitor', r'uptime|pingdom|statuscake|site24x7|health.?check|kube-probe|elb-health|nagios|zabbix'
+                r'|prometheus|blackbox|datadog|newrelicpinger|better ?stack|freshping|hetrixtools'),
+    # Only WhatsApp's link-preview fetcher starts with its name; in-app
+    # browsers (Telegram-Android, Slack desktop) are people, and the real
+    # TelegramBot/Slackbot/Discordbot match bot, Slack-ImgProxy imgproxy
+    ('bot', r'bot\b|bot/|crawl|spider|slurp|archiver|preview|imgproxy|facebookexternalhit|embedly'
+            r'|^whatsapp/|headless|lighthouse|phantomjs|semrush|ahrefs|yandex|baidu'
+            r'|bytespider|petalbot|ccbot|gptbot|chatgpt|claude|perplexity'),
+    ('tool', r'curl|wget|python-|python/|aiohttp|httpie|go-http-client|java/|okhttp|axios|node-fetch'
+             r'|undici|libwww|httpclient|powershell|postman|insomnia'),
+    ('browser', r'mozilla/|opera/'),
+]
+AGENT_PATTERN = re.compile(
+    '^(?:' + '|'.join(f'(?=.*?(?:{terms}))(?P<{name}>)' for name, terms in AGENT_CLASSES) + ')',
+    re.I | re.S,
+)
+
+# A JSON string body: runs of plain bytes with escapes in between. Unrolled
+# and possessive, this is ~5x faster than (?:[^"\\]|\\.)*
+_STR = rb'([^"\\]*+(?:\\.[^"\\]*+)*+)'
+
+# One json_analytics line as nginx writes it (see nginx.conf log_format)
+LINE_PATTERN = re.compile(
+    rb'\{"timestamp": "((\d{4}-\d\d-\d\d)[^"]*+)",'
+    rb'"ip": "([^"]*+)",'
+    rb'"forwarded_for": "([^"]*+)",'
+    rb'"method": "[^"]*+",'
+    rb'"path": "' + _STR + rb'",'
+    rb'"status": "(\d*+)",'
+    rb'"ua": "' + _STR + rb'"\},?+[ \t\r]*+\n'
+)
+
+
+def parse_log_line(line: str) -> Optional[Dict]:
+    """Parse one log line, tolerating the trailing comma; None if invalid"""
+    line = line.strip().rstrip(',')
+    if not line:
+        return None
+    try:
+        entry = json.loads(line)
+    except json.JSONDecodeError:
+        return None
+    return entry if isinstance(entry, dict) else None
+
+
+def client_ip(entry: Dict) -> str:
+    """Real client IP: first X-Forwarded-For hop if present, else remote_addr"""
+    forwarded = entry.get('forwarded_for') or ''
+    if forwarded and forwarded != '-':
+        return forwarded.split(',')[0].strip()
+    return entry.get('ip', '')
+
+
+def ua_family(ua: str) -> str:
+    """Coarse browser family of a user agent string"""
+    if not ua or ua == '-':
+        return 'Unknown'
+    for family, pattern in UA_FAMILIES:
+        if pattern.search(ua):
+            return family
+    return 'Other'
+
+
+def field_text(value: bytes) -> str:
+    """A json_analytics field value as text (nginx escape=json escapes quotes and control chars)"""
+    if b'\\' in value:
+        try:
+            return json.loads(b'"' + value + b'"')
+        except ValueError:
+            pass
+    return value.decode('utf-8', errors='replace')
+
+
+@functools.lru_cache(maxsize=4096)
+def agent_class(ua: str) -> str:
+    """
+    monitor, bot, tool, browser or unknown. A handful of user agents make
+    up nearly all requests, so recent results are cached.
+    """
+    if not ua or ua == '-':
+        return 'unknown'
+    match = AGENT_PATTERN.match(ua)
+    return match.lastgroup if match else 'unknown'
+
+
+def entry_day(entry: Dict) -> str:
+    """YYYY-MM-DD of an entry's ISO-8601 timestamp"""
+    return (entry.get('timestamp') or '')[:10] or 'unknown'
@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+Visitor Sessions: separate learners from crawlers and health checks
+
+resources/visitors.log mixes people using the site with search engine
+crawlers, link-preview fetchers, uptime monitors and scripts. This stage
+tails the log (like aggregate_visitors.py, from the offset reached on the
+previous run) and
+
+1. classifies every user agent as browser, bot, monitor, tool or unknown
+   with one precompiled pattern (visitor_log.agent_class, LRU-cached - a
+   few hundred distinct user agents make up nearly every request), and
+2. groups requests into sessions per client IP + user agent. A session ends
+   after `timeout` minutes without a request; open sessions sit in a heap
+   ordered by expiry, so each line only pops the sessions that have gone
+   quiet instead of scanning all of them.
+
+Closed sessions are rolled up into resources/visitor-sessions.json, a small
+summary the admin page can load directly:
+
+    {"generatedAt": ..., "timeoutMinutes": 30, "active": 3,
+     "classes": [{"key": "browser", "sessions": 812, "requests": 9120}, ...],
+     "human": {"sessions": 812, "avgDurationSeconds": 341, "avgRequests": 11.2,
+               "bounceRate": 0.31, "audioPlays": 1904},
+     "days": [{"day": "2025-12-14", "browser": 40, "bot": 210, ...}, ...],
+     "entryPaths": [{"key": "/", "count": 530}, ...],
+     "recent": [{"ip": ..., "family": "Chrome", "start": ..., "end": ...,
+                 "durationSeconds": 312, "requests": 14, "entry": "/", "exit": ...}, ...],
+     "recentAutomated": [...]}
+
+Sessions still open at the end of a run are kept in the state file
+(resources/visitor-sessions.state.json) and continue on the next run.
+
+Usage:
+    python3 visitor_sessions.py                   # one incremental pass
+    python3 visitor_sessions.py --interval 60     # keep running, every 60 s
+    python3 visitor_sessions.py --timeout 20      # 20 minutes of inactivity ends a session
+    python3 visitor_sessions.py --rebuild         # forget state, start over
+"""
+
+import argparse
+import heapq
+import json
+import sys
+import time
+from collections import deque
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from aggregate_visitors import bump, top, write_json_atomic
+from visitor_log import (LINE_PATTERN, VISITORS_LOG, agent_class, client_ip, field_text,
+                         parse_log_line, ua_family)
+
+VISITOR_SESSIONS = 'resources/visitor-sessions.json'
+SESSIONS_STATE = 'resources/visitor-sessions.state.json'
+STATE_VERSION = 1
+DEFAULT_TIMEOUT_MINUTES = 30
+RECENT_LIMIT = 50
+TOP_LIMIT = 20
+AGENT_CLASSES = ('browser', 'bot', 'monitor', 'tool', 'unknown')
+# Episode audio (catalogue audioUrl); pronunciation clips live elsewhere
+EPISODE_AUDIO = '/resources/audio/'
+
+SessionKey = Tuple[str, str]
+
+
+class Sessionizer:
+    """
+    Streaming sessionization keyed by (ip, user agent).
+
+    Every request pushes (last request + timeout, key) onto a heap. Entries
+    are never updated in place: when one is popped, it only closes the
+    session if it still matches the session's last request, otherwise it is
+    stale and dropped. The heap is compacted when stale entries pile up.
+
+    Time only moves forward with the newest timestamp seen, so the few
+    lines nginx writes slightly out of order still land in their session.
+    """
+
+    def __init__(self, timeout: float, on_close: Callable[[Dict], None]):
+        self.timeout = timeout
+        self.on_close = on_close
+        self.active: Dict[SessionKey, Dict] = {}
+        self.watermark = 0.0
+        self._heap: List[Tuple[float, SessionKey]] = []
+
+    def restore(self, sessions: List[Dict]):
+        """Reopen sessions saved by a previous run"""
+        for session in sessions:
+            key = (session['ip'], session['ua'])
+            self.active[key] = session
+            self.watermark = max(self.watermark, session['end'])
+        self._compact()
+
+    def _compact(self):
+        self._heap = [(s['end'] + self.timeout, key) for key, s in self.active.items()]
+        heapq.heapify(self._heap)
+
+    def expire(self, now: float) -> int:
+        """Close every session idle for longer than timeout at `now`"""
+        closed = 0
+        heap = self._heap
+        while heap and heap[0][0] < now:
+            expiry, key = heapq.heappop(heap)
+            session = self.active.get(key)
+            if session is not None and session['end'] + self.timeout == expiry:
+                del self.active[key]
+                self.on_close(session)
+                closed += 1
+        return closed
+
+    def add(self, ts: float, ip: str, ua: str, path: str, status: str):
+        if ts > self.watermark:
+            self.watermark = ts
+            self.expire(ts)
+
+        key = (ip, ua)
+        session = self.active.get(key)
+        if session is None:
+            session = self.active[key] = {
+                'ip': ip, 'ua': ua, 'agent': agent_class(ua),
+                'start': ts, 'end': ts, 'requests': 0, 'audio': 0, 'errors': 0,
+                'entry': path, 'exit': path,
+            }
+        elif ts < session['start']:
+            session['start'] = ts
+            session['entry'] = path
+
+        session['requests'] += 1
+        if path.startswith(EPISODE_AUDIO):
+            session['audio'] += 1
+        if status[:1] in ('4', '5'):
+            session['errors'] += 1
+        if ts >= session['end']:
+            session['end'] = ts
+            session['exit'] = path
+            heapq.heappush(self._heap, (ts + self.timeout, key))
+            if len(self._heap) > 4 * len(self.active) + 1024:
+                self._compact()
+
+    def close_all(self):
+        for session in sorted(self.active.values(), key=lambda s: s['end']):
+            self.on_close(session)
+        self.active.clear()
+        self._heap.clear()
+
+
+def empty_state(timeout_minutes: float) -> Dict:
+    return {
+        'version': STATE_VERSION,
+        'timeoutMinutes': timeout_minutes,
+        'offset': 0,
+        'inode': None,
+        'invalid': 0,
+        'open': [],          # sessions still running at the end of the last run
+        'classes': {},       # agent class -> {'sessions': n, 'requests': n}
+        'days': {},          # day -> {agent class: sessions}
+        'human': {'sessions': 0, 'requests': 0, 'duration': 0.0, 'bounces': 0, 'audio': 0},
+        'entryPaths': {},
+        'recent': [],
+        'recentAutomated': [],
+    }
+
+
+def load_state(state_path: Path, timeout_minutes: float) -> Dict:
+    if state_path.exists():
+        with open(state_path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        if state.get('version') != STATE_VERSION:
+            print("⚠️  State file has an old format, rebuilding from scratch")
+        elif state.get('timeoutMinutes') != timeout_minutes:
+            print(f"⚠️  Session timeout changed ({state.get('timeoutMinutes')} → {timeout_minutes} min), "
+                  "rebuilding from scratch")
+        else:
+            return state
+    return empty_state(timeout_minutes)
+
+
+def _iso(ts: float) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat(timespec='seconds')
+
+
+def session_summary(session: Dict) -> Dict:
+    """What the admin page shows for one session (no raw user agent string)"""
+    summary = {
+        'ip': session['ip'],
+        'agent': session['agent'],
+        'family': ua_family(session['ua']),
+        'start': _iso(session['start']),
+        'end': _iso(session['end']),
+        'durationSeconds': round(session['end'] - session['start']),
+        'requests': session['requests'],
+        'entry': session['entry'],
+        'exit': session['exit'],
+    }
+    if session['audio']:
+        summary['audioPlays'] = session['audio']
+    if session['errors']:
+        summary['errors'] = session['errors']
+    return summary
+
+
+def make_folder(state: Dict) -> Callable[[Dict], None]:
+    """on_close callback rolling a finished session into the state counters"""
+    recent = deque(state['recent'], maxlen=RECENT_LIMIT)
+    automated = deque(state['recentAutomated'], maxlen=RECENT_LIMIT)
+    state['recent'], state['recentAutomated'] = recent, automated
+
+    def fold(session: Dict):
+        agent = session['agent']
+        totals = state['classes'].setdefault(agent, {'sessions': 0, 'requests': 0})
+        totals['sessions'] += 1
+        totals['requests'] += session['requests']
+        bump(state['days'].setdefault(_iso(session['start'])[:10], {}), agent)
+
+        if agent == 'browser':
+            human = state['human']
+            human['sessions'] += 1
+            human['requests'] += session['requests']
+            human['duration'] += session['end'] - session['start']
+            human['audio'] += session['audio']
+            if session['requests'] == 1:
+                human['bounces'] += 1
+            bump(state['entryPaths'], session['entry'])
+            recent.append(session_summary(session))
+        else:
+            automated.append(session_summary(session))
+
+    return fold
+
+
+def _parse_time(timestamp: str) -> Optional[float]:
+    try:
+        return datetime.fromisoformat(timestamp).timestamp()
+    except ValueError:
+        return None
+
+
+def sessionize(log_path: Path, state: Dict, sessionizer: Sessionizer) -> int:
+    """Feed new complete lines of the log to the sessionizer; returns lines read"""
+    stat = log_path.stat()
+    if state['inode'] != stat.st_ino or stat.st_size < state['offset']:
+        if state['offset']:
+            print("🔄 Log was rotated or truncated, reading new file from the start")
+        state['offset'] = 0
+        state['inode'] = stat.st_ino
+
+    lines = 0
+    add = sessionizer.add
+    with open(log_path, 'rb') as f:
+        f.seek(state['offset'])
+        for raw in f:
+            if not raw.endswith(b'\n'):
+                # nginx is mid-write; pick this line up on the next run
+                break
+            state['offset'] += len(raw)
+            lines += 1
+
+            match = LINE_PATTERN.fullmatch(raw)
+            if match:
+                timestamp, _day, ip, forwarded, path, status, ua = match.groups()
+                entry = {'timestamp': timestamp.decode('ascii', errors='replace'),
+                         'ip': ip.decode('ascii', errors='replace'),
+                         'forwarded_for': forwarded.decode('ascii', errors='replace'),
+                         'path': field_text(path), 'status': status.decode('ascii'), 'ua': field_text(ua)}
+            else:
+                entry = parse_log_line(raw.decode('utf-8', errors='replace'))
+            ts = _parse_time(str(entry.get('timestamp', ''))) if entry else None
+            if ts is None:
+                state['invalid'] += 1
+                continue
+            add(ts, client_ip(entry), str(entry.get('ua', '')), str(entry.get('path', '')),
+                str(entry.get('status', '')))
+    return lines
+
+
+def build_summary(state: Dict, active: int) -> Dict:
+    """The compact session summary the admin page loads"""
+    human = state['human']
+    sessions = human['sessions']
+    classes = [
+        {'key': agent, **state['classes'][agent]}
+        for agent in AGENT_CLASSES if agent in state['classes']
+    ]
+    days = [{'day': day, **counts} for day, counts in sorted(state['days'].items())]
+    return {
+        'generatedAt': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'timeoutMinutes': state['timeoutMinutes'],
+        'active': active,
+        'classes': classes,
+        'human': {
+            'sessions': sessions,
+            'avgDurationSeconds': round(human['duration'] / sessions) if sessions else 0,
+            'avgRequests': round(human['requests'] / sessions, 1) if sessions else 0,
+            'bounceRate': round(human['bounces'] / sessions, 3) if sessions else 0,
+            'audioPlays': human['audio'],
+        },
+        'days': days,
+        'entryPaths': top(state['entryPaths'], TOP_LIMIT),
+        'recent': list(reversed(state['recent'])),
+        'recentAutomated': list(reversed(state['recentAutomated'])),
+    }
+
+
+def run_once(log_path: Path, summary_path: Path, state_path: Path,
+             timeout_minutes: float = DEFAULT_TIMEOUT_MINUTES) -> bool:
+    if not log_path.exists():
+        print(f"❌ Error: Log file not found: {log_path}")
+        return False
+
+    started = time.perf_counter()
+    state = load_state(state_path, timeout_minutes)
+    sessionizer = Sessionizer(timeout_minutes * 60, make_folder(state))
+    sessionizer.restore(state['open'])
+    closed_before = sum(c['sessions'] for c in state['classes'].values())
+
+    lines = sessionize(log_path, state, sessionizer)
+    # Sessions whose visitor left after the last logged request also end
+    sessionizer.expire(time.time())
+
+    state['open'] = sorted(sessionizer.active.values(), key=lambda s: s['start'])
+    state['recent'] = list(state['recent'])
+    state['recentAutomated'] = list(state['recentAutomated'])
+    write_json_atomic(state_path, state)
+    write_json_atomic(summary_path, build_summary(state, len(sessionizer.active)), indent=2)
+    elapsed = time.perf_counter() - started
+
+    closed = sum(c['sessions'] for c in state['classes'].values()) - closed_before
+    print(f"✅ {lines} new lines in {elapsed:.3f}s: {closed} sessions closed, "
+          f"{len(sessionizer.active)} still active ({agent_class.cache_info().currsize} distinct user agents)")
+    return True
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='Group visitors.log requests into sessions by IP and user agent')
+    parser.add_argument('--log', default=VISITORS_LOG, help=f'nginx JSON access log (default: {VISITORS_LOG})')
+    parser.add_argument('--output', default=VISITOR_SESSIONS,
+                        help=f'Session summary to write (default: {VISITOR_SESSIONS})')
+    parser.add_argument('--state', default=SESSIONS_STATE, help=f'State file (default: {SESSIONS_STATE})')
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT_MINUTES,
+                        help=f'Minutes of inactivity that end a session (default: {DEFAULT_TIMEOUT_MINUTES})')
+    parser.add_argument('--interval', type=float, help='Keep running, sessionizing every N seconds')
+    parser.add_argument('--rebuild', action='store_true', help='Discard saved state and reprocess the whole log')
+    args = parser.parse_args(argv)
+
+    log_path, summary_path, state_path = Path(args.log), Path(args.output), Path(args.state)
+    if args.rebuild and state_path.exists():
+        print(f"🗑️  Removing state: {state_path}")
+        state_path.unlink()
+
+    if not args.interval:
+        return 0 if run_once(log_path, summary_path, state_path, args.timeout) else 1
+
+    print(f"👀 Sessionizing {log_path} every {args.interval:g}s (Ctrl+C to stop)")
+    try:
+        while True:
+            run_once(log_path, summary_path, state_path, args.timeout)
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        print("\n⚠️  Stopped by user")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
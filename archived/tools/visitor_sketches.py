@@ -0,0 +1,603 @@
+#!/usr/bin/env python3
+"""
+Constant-memory visitor log analysis with probabilistic sketches
+
+aggregate_visitors.py keeps exact counters: every IP seen per day and
+every distinct path and IP overall, so its state grows with the log. This
+analyzer keeps fixed-size sketches instead:
+
+    unique IPs per day     HyperLogLog (2^14 registers, ~0.8% standard error)
+    top paths / user agents count-min sketch (4 x 2048) plus a top-k table
+    status codes           exact (there are only a few dozen)
+
+Sketches merge (HLL by register max, count-min by addition): every IP
+also goes into an all-time HLL, and only the last --days daily HLLs are
+kept (default 90). Older days shrink to their request count and final
+unique IP estimate, so the state stays within a few MB however long the
+log runs, growing by a few bytes per day of history.
+
+Lines are read in large blocks and the json_analytics fields are pulled out
+of a whole block with one compiled bytes regex (no per-line json.loads);
+per block, only distinct IPs/paths/agents are hashed into the sketches.
+A backlog over 64 MB is split on line boundaries across --workers
+processes whose sketches are merged, so throughput scales with cores.
+Blocks with lines in any other shape (old formats, garbage, the trailing
+comma variants) fall back to visitor_log.parse_log_line line by line.
+
+Like aggregate_visitors.py it resumes from the byte offset of the previous
+run and restarts at 0 when the log is rotated or truncated. Sketches and
+offset persist in resources/visitor-sketches.json; the summary (same keys
+the admin page reads from visitor-stats.json, plus per-day estimates and
+top user agents) goes to resources/visitor-sketch-stats.json.
+
+Usage:
+    python3 visitor_sketches.py                    # one incremental pass
+    python3 visitor_sketches.py --rebuild          # forget state, start over
+    python3 visitor_sketches.py --interval 60      # keep running
+    python3 visitor_sketches.py --days 30          # keep daily sketches for 30 days
+    python3 visitor_sketches.py --benchmark 200    # throughput on a 200 MB synthetic log
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import math
+import os
+import sys
+import tempfile
+import time
+import zlib
+from array import array
+from collections import Counter, deque
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from visitor_log import LINE_PATTERN, VISITORS_LOG, client_ip, field_text, parse_log_line
+
+SKETCH_STATE = 'resources/visitor-sketches.json'
+SKETCH_STATS = 'resources/visitor-sketch-stats.json'
+STATE_VERSION = 1
+
+HLL_PRECISION = 14
+CM_WIDTH = 2048
+CM_DEPTH = 4
+TOP_K = 20
+RECENT_LIMIT = 50
+BLOCK_SIZE = 8 * 1024 * 1024
+# Backlogs at least this large are split across worker processes
+PARALLEL_MIN_BYTES = 64 * 1024 * 1024
+# Days whose HyperLogLog is kept; older days keep only their totals
+DAYS_KEPT = 90
+
+
+def _pack(data: bytes) -> str:
+    return base64.b64encode(zlib.compress(data, 6)).decode('ascii')
+
+
+def _unpack(text: str) -> bytes:
+    return zlib.decompress(base64.b64decode(text))
+
+
+class HyperLogLog:
+    """Distinct-count estimator in 2^p one-byte registers"""
+
+    def __init__(self, p: int = HLL_PRECISION, registers: Optional[bytearray] = None):
+        self.p = p
+        self.m = 1 << p
+        self.registers = registers if registers is not None else bytearray(self.m)
+
+    def add(self, value: bytes):
+        self.add_many((value,))
+
+    def add_many(self, values: Iterable[bytes]):
+        registers = self.registers
+        shift = 64 - self.p
+        mask = (1 << shift) - 1
+        blake2b = hashlib.blake2b
+        for value in values:
+            h = int.from_bytes(blake2b(value, digest_size=8).digest(), 'little')
+            rank = shift - (h & mask).bit_length() + 1
+            if rank > registers[h >> shift]:
+                registers[h >> shift] = rank
+
+    def merge(self, other: 'HyperLogLog'):
+        if other.p != self.p:
+            raise ValueError(f"cannot merge HyperLogLog p={other.p} into p={self.p}")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def estimate(self) -> int:
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if raw <= 2.5 * m and zeros:
+            # Small-range correction: linear counting
+            return round(m * math.log(m / zeros))
+        return round(raw)
+
+    def to_json(self) -> Dict:
+        return {'p': self.p, 'registers': _pack(bytes(self.registers))}
+
+    @classmethod
+    def from_json(cls, data: Dict) -> 'HyperLogLog':
+        return cls(data['p'], bytearray(_unpack(data['registers'])))
+
+
+class CountMinSketch:
+    """Frequency estimates that never undercount; overcount is at most ~e/width of the total"""
+
+    def __init__(self, width: int = CM_WIDTH, depth: int = CM_DEPTH, table: Optional[array] = None):
+        self.width = width
+        self.depth = depth
+        self.table = table if table is not None else array('Q', bytes(8 * width * depth))
+
+    def _cells(self, key: str) -> List[int]:
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [row * self.width + (h1 + row * h2) % self.width for row in range(self.depth)]
+
+    def add(self, key: str, count: int = 1) -> int:
+        """Add count for key; returns the new estimate"""
+        table = self.table
+        estimate = None
+        for cell in self._cells(key):
+            table[cell] += count
+            estimate = table[cell] if estimate is None else min(estimate, table[cell])
+        return estimate
+
+    def estimate(self, key: str) -> int:
+        return min(self.table[cell] for cell in self._cells(key))
+
+    def merge(self, other: 'CountMinSketch'):
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError('cannot merge count-min sketches of different shapes')
+        self.table = array('Q', map(sum, zip(self.table, other.table)))
+
+    def to_json(self) -> Dict:
+        return {'width': self.width, 'depth': self.depth, 'table': _pack(self.table.tobytes())}
+
+    @classmethod
+    def from_json(cls, data: Dict) -> 'CountMinSketch':
+        table = array('Q')
+        table.frombytes(_unpack(data['table']))
+        return cls(data['width'], data['depth'], table)
+
+
+class HeavyHitters:
+    """Count-min sketch plus the `capacity` keys with the highest estimates"""
+
+    def __init__(self, capacity: int = TOP_K * 4, sketch: Optional[CountMinSketch] = None,
+                 top: Optional[Dict[str, int]] = None):
+        self.capacity = capacity
+        self.sketch = sketch or CountMinSketch()
+        self.top: Dict[str, int] = top or {}
+        self._floor = min(self.top.values()) if len(self.top) >= capacity else 0
+
+    def update(self, counts: Dict[str, int]):
+        top = self.top
+        for key, count in counts.items():
+            estimate = self.sketch.add(key, count)
+            if key in top:
+                top[key] = estimate
+            elif len(top) < self.capacity:
+                top[key] = estimate
+            elif estimate > self._floor:
+                del top[min(top, key=top.get)]
+                top[key] = estimate
+            else:
+                continue
+            if len(top) >= self.capacity:
+                self._floor = min(top.values())
+
+    def merge(self, other: 'HeavyHitters'):
+        self.sketch.merge(other.sketch)
+        candidates = set(self.top) | set(other.top)
+        ranked = sorted(((self.sketch.estimate(k), k) for k in candidates), reverse=True)[:self.capacity]
+        self.top = {k: n for n, k in ranked}
+        self._floor = min(self.top.values()) if len(self.top) >= self.capacity else 0
+
+    def most_common(self, limit: int = TOP_K) -> List[Dict]:
+        ranked = sorted(self.top.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        return [{'key': key, 'count': count} for key, count in ranked]
+
+    def to_json(self) -> Dict:
+        return {'capacity': self.capacity, 'sketch': self.sketch.to_json(), 'top': self.top}
+
+    @classmethod
+    def from_json(cls, data: Dict) -> 'HeavyHitters':
+        return cls(data['capacity'], CountMinSketch.from_json(data['sketch']), data['top'])
+
+
+class SketchState:
+    """Everything persisted between runs: offset, totals and the sketches"""
+
+    def __init__(self):
+        self.offset = 0
+        self.inode: Optional[int] = None
+        self.total = 0
+        self.invalid = 0
+        self.days: Dict[str, Dict] = {}       # day -> {'requests': n, 'hll': HyperLogLog}
+        self.history: Dict[str, Dict] = {}    # day -> {'requests': n, 'uniqueIps': n}, past the window
+        self.all_time = HyperLogLog()         # IPs of the days folded into history
+        self.paths = HeavyHitters()
+        self.user_agents = HeavyHitters()
+        self.statuses: Counter = Counter()
+        self.recent: deque = deque(maxlen=RECENT_LIMIT)
+
+    def day(self, day: str) -> Dict:
+        info = self.days.get(day)
+        if info is None:
+            info = self.days[day] = {'requests': 0, 'hll': HyperLogLog()}
+        return info
+
+    def to_json(self) -> Dict:
+        return {
+            'version': STATE_VERSION,
+            'offset': self.offset,
+            'inode': self.inode,
+            'total': self.total,
+            'invalid': self.invalid,
+            'days': {day: {'requests': info['requests'], 'hll': info['hll'].to_json()}
+                     for day, info in sorted(self.days.items())},
+            'history': dict(sorted(self.history.items())),
+            'allTime': self.all_time.to_json(),
+            'paths': self.paths.to_json(),
+            'userAgents': self.user_agents.to_json(),
+            'statuses': dict(self.statuses),
+            'recent': list(self.recent),
+        }
+
+    @classmethod
+    def from_json(cls, data: Dict) -> 'SketchState':
+        state = cls()
+        state.offset = data['offset']
+        state.inode = data['inode']
+        state.total = data['total']
+        state.invalid = data['invalid']
+        state.days = {day: {'requests': info['requests'], 'hll': HyperLogLog.from_json(info['hll'])}
+                      for day, info in data['days'].items()}
+        # States saved before the window existed have no history yet
+        state.history = data.get('history', {})
+        if 'allTime' in data:
+            state.all_time = HyperLogLog.from_json(data['allTime'])
+        state.paths = HeavyHitters.from_json(data['paths'])
+        state.user_agents = HeavyHitters.from_json(data['userAgents'])
+        state.statuses = Counter(data['statuses'])
+        state.recent.extend(data['recent'])
+        return state
+
+    @classmethod
+    def load(cls, path: Path) -> 'SketchState':
+        if path.exists():
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == STATE_VERSION:
+                return cls.from_json(data)
+            print("⚠️  Sketch state has an old format, rebuilding from scratch")
+        return cls()
+
+    def merge(self, other: 'SketchState'):
+        """Fold in the sketches of a later part of the log"""
+        self.total += other.total
+        self.invalid += other.invalid
+        for day, info in other.days.items():
+            mine = self.day(day)
+            mine['requests'] += info['requests']
+            mine['hll'].merge(info['hll'])
+        for day, info in other.history.items():
+            self._retire(day, info)
+        self.all_time.merge(other.all_time)
+        self.paths.merge(other.paths)
+        self.user_agents.merge(other.user_agents)
+        self.statuses.update(other.statuses)
+        self.recent.extend(other.recent)
+
+    def _retire(self, day: str, info: Dict):
+        # A day can be retired twice when late lines for it arrive after the first time
+        old = self.history.get(day)
+        if old is not None:
+            info = {'requests': old['requests'] + info['requests'],
+                    'uniqueIps': max(old['uniqueIps'], info['uniqueIps'])}
+        self.history[day] = info
+
+    def prune(self, keep_days: int = DAYS_KEPT):
+        """Fold all but the newest keep_days daily sketches into all_time and history"""
+        days = sorted(self.days)
+        for day in days[:max(len(days) - keep_days, 0)]:
+            info = self.days.pop(day)
+            self.all_time.merge(info['hll'])
+            self._retire(day, {'requests': info['requests'], 'uniqueIps': info['hll'].estimate()})
+
+    def unique_ips(self) -> int:
+        merged = HyperLogLog()
+        merged.merge(self.all_time)
+        for info in self.days.values():
+            merged.merge(info['hll'])
+        return merged.estimate()
+
+
+def _fields(line: bytes) -> Optional[Tuple]:
+    """Fast-path tuple for a line in another shape, via the tolerant JSON parser"""
+    entry = parse_log_line(line.decode('utf-8', errors='replace'))
+    if entry is None:
+        return None
+    timestamp = str(entry.get('timestamp') or '')
+    ip = client_ip(entry)
+
+    def raw(value) -> bytes:
+        return json.dumps(str(value), ensure_ascii=False)[1:-1].encode('utf-8')
+
+    return (raw(timestamp), raw(timestamp[:10] or 'unknown'), raw(ip), b'', raw(entry.get('path', '')),
+            raw(entry.get('status', '')), raw(entry.get('ua', '')))
+
+
+def fold_block(block: bytes, state: SketchState):
+    """Fold a block of complete lines into the sketches"""
+    rows = LINE_PATTERN.findall(block)
+    lines = block.count(b'\n')
+    if len(rows) != lines:
+        rows = []
+        for line in block.splitlines(keepends=True):
+            match = LINE_PATTERN.fullmatch(line)
+            row = match.groups() if match else _fields(line)
+            if row is None:
+                if line.strip():
+                    state.invalid += 1
+                continue
+            rows.append(row)
+    if not rows:
+        return
+
+    timestamps, days, ips, forwarded, paths, statuses, uas = zip(*rows)
+    state.total += len(rows)
+
+    # Requests per day, and each distinct (day, client IP) hashed once
+    for day, count in Counter(days).items():
+        state.day(day.decode('ascii', errors='replace'))['requests'] += count
+    clients: Dict[bytes, set] = {}
+    for day, ip, fwd in set(zip(days, ips, forwarded)):
+        client = fwd.split(b',')[0].strip() if fwd and fwd != b'-' else ip
+        clients.setdefault(day, set()).add(client)
+    for day, values in clients.items():
+        state.day(day.decode('ascii', errors='replace'))['hll'].add_many(values)
+
+    state.paths.update({field_text(k): n for k, n in Counter(paths).items()})
+    state.user_agents.update({field_text(k): n for k, n in Counter(uas).items()})
+    for status, count in Counter(statuses).items():
+        state.statuses[status.decode('ascii', errors='replace')] += count
+
+    for row in rows[-RECENT_LIMIT:]:
+        timestamp, _, ip, fwd, path = row[:5]
+        client = fwd.split(b',')[0].strip() if fwd and fwd != b'-' else ip
+        state.recent.append({'timestamp': field_text(timestamp), 'ip': field_text(client), 'path': field_text(path)})
+
+
+def fold_range(log_path: Path, start: int, stop: int, state: Optional[SketchState] = None,
+               block_size: int = BLOCK_SIZE) -> Tuple[SketchState, int]:
+    """
+    Fold the complete lines in [start, stop) into state (a new one if None);
+    returns the state and the number of bytes consumed. An unterminated last
+    line is nginx mid-write and is left for the next run.
+    """
+    state = state if state is not None else SketchState()
+    consumed = 0
+    with open(log_path, 'rb') as f:
+        f.seek(start)
+        carry = b''
+        remaining = stop - start
+        while remaining > 0:
+            data = f.read(min(block_size, remaining))
+            if not data:
+                break
+            remaining -= len(data)
+            data = carry + data
+            end = data.rfind(b'\n') + 1
+            carry = data[end:]
+            if end:
+                fold_block(data[:end], state)
+                consumed += end
+    return state, consumed
+
+
+def _fold_range_worker(args) -> Tuple[SketchState, int]:
+    return fold_range(*args)
+
+
+def split_ranges(log_path: Path, start: int, stop: int, parts: int) -> List[Tuple[int, int]]:
+    """[start, stop) cut into `parts` ranges that each end on a line boundary"""
+    bounds = [start]
+    with open(log_path, 'rb') as f:
+        for n in range(1, parts):
+            f.seek(start + (stop - start) * n // parts)
+            f.readline()
+            position = min(f.tell(), stop)
+            if position > bounds[-1]:
+                bounds.append(position)
+    bounds.append(stop)
+    return [(a, b) for a, b in zip(bounds, bounds[1:]) if b > a]
+
+
+def analyze(log_path: Path, state: SketchState, workers: int = 1) -> int:
+    """Fold the complete lines added since state.offset; returns bytes read"""
+    stat = log_path.stat()
+    if state.inode != stat.st_ino or stat.st_size < state.offset:
+        if state.offset:
+            print("🔄 Log was rotated or truncated, reading new file from the start")
+        state.offset = 0
+        state.inode = stat.st_ino
+
+    start, stop = state.offset, stat.st_size
+    if workers > 1 and stop - start >= PARALLEL_MIN_BYTES:
+        # Sketches merge exactly, so ranges can be summarized independently
+        from concurrent.futures import ProcessPoolExecutor
+
+        ranges = split_ranges(log_path, start, stop, workers)
+        with ProcessPoolExecutor(max_workers=len(ranges)) as pool:
+            results = list(pool.map(_fold_range_worker, [(log_path, a, b) for a, b in ranges]))
+        for (a, b), (part, consumed) in zip(ranges, results):
+            state.merge(part)
+            state.offset += consumed
+            if a + consumed < b:
+                # Only the last range can end in a partial line
+                break
+    else:
+        _, consumed = fold_range(log_path, start, stop, state)
+        state.offset += consumed
+    return state.offset - start
+
+
+def build_stats(state: SketchState) -> Dict:
+    """Summary with the keys the admin page reads, plus the sketch-only extras"""
+    return {
+        'generatedAt': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'estimated': True,
+        'totalRequests': state.total,
+        'invalidLines': state.invalid,
+        'uniqueIps': state.unique_ips(),
+        'days': sorted([{'day': day, 'requests': info['requests'], 'uniqueIps': info['uniqueIps']}
+                        for day, info in state.history.items()] +
+                       [{'day': day, 'requests': info['requests'], 'uniqueIps': info['hll'].estimate()}
+                        for day, info in state.days.items()], key=lambda row: row['day']),
+        'topPaths': state.paths.most_common(),
+        'topUserAgents': state.user_agents.most_common(),
+        'statuses': [{'key': k, 'count': n} for k, n in state.statuses.most_common()],
+        'recent': list(reversed(state.recent)),
+    }
+
+
+def write_json_atomic(path: Path, data: Dict, indent: Optional[int] = None):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix='.tmp', dir=path.parent)
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=indent, separators=None if indent else (',', ':'))
+    os.replace(tmp, path)
+
+
+def run_once(log_path: Path, stats_path: Path, state_path: Path, workers: int = 1,
+             keep_days: int = DAYS_KEPT) -> bool:
+    if not log_path.exists():
+        print(f"❌ Error: Log file not found: {log_path}")
+        return False
+
+    started = time.perf_counter()
+    state = SketchState.load(state_path)
+    read = analyze(log_path, state, workers)
+    state.prune(keep_days)
+    elapsed = time.perf_counter() - started
+    write_json_atomic(state_path, state.to_json())
+    write_json_atomic(stats_path, build_stats(state), indent=2)
+
+    rate = read / elapsed / 1e6 if elapsed else 0
+    print(f"✅ {read / 1e6:.1f} MB analyzed in {elapsed:.2f}s ({rate:.0f} MB/s), "
+          f"{state.total:,} requests, ~{state.unique_ips():,} unique IPs, "
+          f"state {state_path.stat().st_size / 1024:.0f} KB")
+    return True
+
+
+def write_synthetic_log(path: Path, megabytes: int, seed: int = 7) -> int:
+    """A json_analytics log of roughly the given size with skewed paths/IPs; returns line count"""
+    import random
+
+    rng = random.Random(seed)
+    paths = ['/', '/index.html', '/assets/index.js', '/assets/index.css'] + \
+            [f"/resources/audio/Entry_01/{n:03d}_Elementary_Episode.m4a" for n in range(1, 400)]
+    uas = ['Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36',
+           'Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X) AppleWebKit/605.1.15 Version/17.0 Mobile Safari/604.1',
+           'Mozilla/5.0 (compatible; Googlebot/2.1; +http://www.google.com/bot.html)',
+           'curl/8.4.0'] + [f"Mozilla/5.0 Custom/{n}" for n in range(200)]
+    lines = 0
+    target = megabytes * 1024 * 1024
+    with open(path, 'w', encoding='utf-8') as f:
+        written = 0
+        while written < target:
+            day = 1 + lines // 200_000 % 28
+            ip = f"10.{rng.randrange(4)}.{rng.randrange(256)}.{int(rng.paretovariate(1.2)) % 256}"
+            line = (f'{{"timestamp": "2025-12-{day:02d}T10:{lines % 60:02d}:00+00:00","ip": "{ip}",'
+                    f'"forwarded_for": "-","method": "GET",'
+                    f'"path": "{paths[min(int(rng.paretovariate(1.0)) - 1, len(paths) - 1)]}",'
+                    f'"status": "200","ua": "{uas[min(int(rng.paretovariate(0.8)) - 1, len(uas) - 1)]}"}},\n')
+            f.write(line)
+            written += len(line)
+            lines += 1
+    return lines
+
+
+def run_benchmark(megabytes: int, workers: int = 1):
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = Path(tmp) / 'visitors.log'
+        lines = write_synthetic_log(log_path, megabytes)
+        size = log_path.stat().st_size
+
+        state = SketchState()
+        started = time.perf_counter()
+        analyze(log_path, state, workers)
+        elapsed = time.perf_counter() - started
+
+        # Exact answer for comparison, computed separately
+        exact_ips = set()
+        with open(log_path, 'rb') as f:
+            for row in LINE_PATTERN.finditer(f.read()):
+                exact_ips.add(row.group(3))
+
+        state_path = Path(tmp) / 'state.json'
+        write_json_atomic(state_path, state.to_json())
+        state_size = state_path.stat().st_size
+
+    estimate = state.unique_ips()
+    print(f"\n{'='*60}")
+    print(f"Sketch analyzer: {size / 1e6:.0f} MB, {lines:,} lines, {workers} worker(s)")
+    print(f"{'='*60}")
+    print(f"  Throughput:   {size / elapsed / 1e6:.0f} MB/s ({lines / elapsed:,.0f} lines/s)")
+    print(f"  Unique IPs:   ~{estimate:,} (exact {len(exact_ips):,}, "
+          f"error {abs(estimate - len(exact_ips)) / max(len(exact_ips), 1):.2%})")
+    print(f"  Top path:     {state.paths.most_common(1)[0]['key']}")
+    print(f"  State file:   {state_size / 1024:.0f} KB")
+    print(f"{'='*60}\n")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='Summarize the nginx visitors log with fixed-size sketches')
+    parser.add_argument('--log', type=str, default=VISITORS_LOG, help=f'Log file (default: {VISITORS_LOG})')
+    parser.add_argument('--stats', type=str, default=SKETCH_STATS, help=f'Summary output (default: {SKETCH_STATS})')
+    parser.add_argument('--state', type=str, default=SKETCH_STATE, help=f'Sketch state (default: {SKETCH_STATE})')
+    parser.add_argument('--interval', type=float, default=0, help='Repeat every N seconds (default: run once)')
+    parser.add_argument('--days', type=int, default=DAYS_KEPT,
+                        help=f'Days to keep per-day sketches for; older days keep totals only (default: {DAYS_KEPT})')
+    parser.add_argument('--rebuild', action='store_true', help='Discard saved sketches and re-read the whole log')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='Processes for backlogs over 64 MB (default: CPU count)')
+    parser.add_argument('--benchmark', type=int, metavar='MB', help='Measure throughput on a synthetic log')
+
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        run_benchmark(args.benchmark, args.workers)
+        return 0
+
+    if args.days < 1:
+        parser.error('--days must be at least 1')
+
+    log_path, stats_path, state_path = Path(args.log), Path(args.stats), Path(args.state)
+
+    if args.rebuild and state_path.exists():
+        print(f"🗑️  Removing sketch state: {state_path}")
+        state_path.unlink()
+
+    if not args.interval:
+        return 0 if run_once(log_path, stats_path, state_path, args.workers, args.days) else 1
+
+    print(f"👀 Analyzing {log_path} every {args.interval:g}s (Ctrl+C to stop)")
+    try:
+        while True:
+            run_once(log_path, stats_path, state_path, args.workers, args.days)
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        print("\n⚠️  Stopped by user")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
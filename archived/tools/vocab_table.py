@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Dictionary-encoded vocabulary for the episode catalogue
+
+In all-episodes-mapped.json every vocabulary item is written inline, so an
+entry like {"word": "Board (verb)", "definition": "Get on the plane"} is
+repeated in every episode that teaches it (4,035 items, 2,645 distinct).
+The vocab-table format stores each distinct item once and lets episodes
+refer to it by index:
+
+    {
+      "format": "vocab-table/1",
+      "vocabulary": [{"word": "Board (verb)", "definition": "Get on the plane"}, ...],
+      "episodes": [{..., "transcript": {"dialogue": [...], "vocabulary": [0, 7, 12],
+                                        "supplementaryVocabulary": [3]}}, ...]
+    }
+
+CompactCatalogue loads the file and rehydrates an episode's vocabulary only
+when that episode is accessed; records() shares one VocabularyItem object
+per table entry across all episodes. Pronunciation enrichment of a table
+(add_pronunciations.py on a vocab-table file) looks up each distinct word
+once.
+
+    python3 vocab_table.py --pack src/data/all-episodes-mapped.json src/data/all-episodes-vocab.json
+    python3 vocab_table.py --unpack src/data/all-episodes-vocab.json /tmp/inline.json
+    python3 vocab_table.py --stats src/data/all-episodes-mapped.json
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from catalogue_stream import CatalogueWriter, iter_episodes
+
+FORMAT = 'vocab-table/1'
+VOCAB_KEYS = ('vocabulary', 'supplementaryVocabulary')
+
+
+class VocabTable:
+    """Distinct vocabulary items in first-seen order, each with a stable index"""
+
+    def __init__(self, entries: Optional[List[Dict]] = None):
+        self.entries: List[Dict] = []
+        self._index: Dict[Tuple, int] = {}
+        for entry in entries or []:
+            self.add(entry)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def add(self, item: Dict) -> int:
+        # Key order is part of the key so unpacking reproduces the input exactly
+        key = tuple(item.items())
+        index = self._index.get(key)
+        if index is None:
+            index = self._index[key] = len(self.entries)
+            self.entries.append(item)
+        return index
+
+
+def pack_episode(episode: Dict, table: VocabTable) -> Dict:
+    """Copy of the episode with its vocabulary lists replaced by table indices"""
+    transcript = dict(episode.get('transcript') or {})
+    for key in VOCAB_KEYS:
+        if key in transcript:
+            transcript[key] = [table.add(item) for item in transcript[key]]
+    packed = dict(episode)
+    if 'transcript' in episode:
+        packed['transcript'] = transcript
+    return packed
+
+
+def unpack_episode(episode: Dict, entries: List[Dict]) -> Dict:
+    """Inline episode from a packed one (vocabulary items are fresh dicts)"""
+    transcript = dict(episode.get('transcript') or {})
+    for key in VOCAB_KEYS:
+        if key in transcript:
+            transcript[key] = [dict(entries[i]) for i in transcript[key]]
+    unpacked = dict(episode)
+    if 'transcript' in episode:
+        unpacked['transcript'] = transcript
+    return unpacked
+
+
+def pack(episodes: Iterable[Dict], table: Optional[VocabTable] = None) -> Dict:
+    table = table if table is not None else VocabTable()
+    packed = [pack_episode(episode, table) for episode in episodes]
+    return {'format': FORMAT, 'vocabulary': table.entries, 'episodes': packed}
+
+
+def write_vocab_table(episodes: Iterable[Dict], path, table: Optional[VocabTable] = None) -> Dict:
+    """Pack episodes and write them atomically; returns the packed document"""
+    document = pack(episodes, table)
+    save_document(document, path)
+    return document
+
+
+def save_document(document: Dict, path):
+    """
+    One table entry or episode per line: diffs stay readable while the
+    file carries none of the indent=2 whitespace.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    def dumps(value) -> str:
+        return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix='.tmp', dir=path.parent)
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.write('{"format":' + dumps(document['format']) + ',\n"vocabulary":[')
+        f.write(',\n'.join(dumps(entry) for entry in document['vocabulary']))
+        f.write('],\n"episodes":[')
+        f.write(',\n'.join(dumps(episode) for episode in document['episodes']))
+        f.write(']}\n')
+    os.replace(tmp, path)
+
+
+def is_vocab_table(path) -> bool:
+    """True if the file is a vocab-table document rather than an inline array"""
+    with open(path, 'rb') as f:
+        head = f.read(64).lstrip()
+    return head.startswith(b'{') and b'"format"' in head
+
+
+class CompactCatalogue:
+    """
+    A vocab-table file, rehydrated lazily.
+
+    Only the parsed document is held; catalogue[i] and iteration build the
+    inline form of one episode at a time.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, 'r', encoding='utf-8') as f:
+            document = json.load(f)
+        if document.get('format') != FORMAT:
+            raise ValueError(f"{self.path}: not a {FORMAT} document (format={document.get('format')!r})")
+        self.vocabulary: List[Dict] = document['vocabulary']
+        self.episodes: List[Dict] = document['episodes']
+        self._records = None
+
+    def __len__(self):
+        return len(self.episodes)
+
+    def __getitem__(self, index: int) -> Dict:
+        return unpack_episode(self.episodes[index], self.vocabulary)
+
+    def __iter__(self) -> Iterator[Dict]:
+        for episode in self.episodes:
+            yield unpack_episode(episode, self.vocabulary)
+
+    def records(self) -> Iterator:
+        """Episode records whose VocabularyItem objects are shared through the table"""
+        from episode_model import Episode, VocabularyItem
+
+        if self._records is None:
+            self._records = [None] * len(self.vocabulary)
+        items = self._records
+
+        def item(i: int, path: str):
+            if items[i] is None:
+                items[i] = VocabularyItem.decode(self.vocabulary[i], f"$.vocabulary[{i}]")
+            return items[i]
+
+        for n, episode in enumerate(self.episodes):
+            path = f"$.episodes[{n}]"
+            transcript = episode['transcript']
+            shell = dict(episode)
+            # Decode everything but the vocabulary, then attach the shared items
+            shell['transcript'] = {k: v for k, v in transcript.items() if k not in VOCAB_KEYS}
+            shell['transcript'].update({k: [] for k in VOCAB_KEYS if k in transcript})
+            record = Episode.decode(shell, path)
+            vocab = {k: tuple(item(i, path) for i in transcript[k]) for k in VOCAB_KEYS if k in transcript}
+            yield record.replace(transcript=record.transcript.replace(**vocab))
+
+
+def enrich_pronunciations(entries: List[Dict], lookup: Optional[Callable[[str], Optional[str]]],
+                          normalize: Callable[[str], str] = str.lower, delay: float = 0.0,
+                          estimate: Optional[Callable[[str], str]] = None) -> Dict[str, int]:
+    """
+    Fill missing 'pronunciation' fields, calling lookup once per distinct
+    normalized word across the whole table. Words the lookup cannot resolve
+    (or every word, with lookup=None) get estimate's guess instead, flagged
+    with 'pronunciationEstimated'. Earlier estimates are looked up again and
+    replaced when the lookup now resolves them.
+    """
+    cache: Dict[str, Optional[str]] = {
+        normalize(e['word']): e['pronunciation'] for e in entries
+        if e.get('pronunciation') and not e.get('pronunciationEstimated')
+    }
+    stats = {'entries': len(entries), 'already_had': 0, 'lookups': 0, 'added': 0, 'estimated': 0, 'failed': 0}
+    for entry in entries:
+        estimated = entry.get('pronunciationEstimated')
+        if entry.get('pronunciation') and not (estimated and lookup is not None):
+            stats['already_had'] += 1
+            continue
+        key = normalize(entry.get('word', ''))
+        if key not in cache and lookup is not None:
+            cache[key] = lookup(entry.get('word', ''))
+            stats['lookups'] += 1
+            if delay:
+                time.sleep(delay)
+        guess = estimate(entry.get('word', '')) if estimate and not cache.get(key) and not estimated else None
+        if cache.get(key):
+            entry['pronunciation'] = cache[key]
+            entry.pop('pronunciationEstimated', None)
+            stats['added'] += 1
+        elif estimated:
+            stats['already_had'] += 1
+        elif guess:
+            entry['pronunciation'] = guess
+            entry['pronunciationEstimated'] = True
+            stats['estimated'] += 1
+        else:
+            stats['failed'] += 1
+    return stats
+
+
+def print_stats(source: Path):
+    """Size and parse time of the inline catalogue vs its vocab-table form"""
+    episodes = list(iter_episodes(source))
+    inline_items = sum(len(e.get('transcript', {}).get(k) or []) for e in episodes for k in VOCAB_KEYS)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        packed_path = Path(tmp) / 'packed.json'
+        document = write_vocab_table(episodes, packed_path)
+
+        def parse_time(path: Path) -> float:
+            best = float('inf')
+            for _ in range(5):
+                started = time.perf_counter()
+                with open(path, 'r', encoding='utf-8') as f:
+                    json.load(f)
+                best = min(best, time.perf_counter() - started)
+            return best
+
+        minified = Path(tmp) / 'minified.json'
+        minified.write_text(json.dumps(episodes, ensure_ascii=False, separators=(',', ':')), encoding='utf-8')
+        sizes = {path: path.stat().st_size for path in (source, minified, packed_path)}
+        times = {path: parse_time(path) for path in sizes}
+
+    print(f"\n{'='*60}")
+    print(f"Vocabulary table: {source.name}")
+    print(f"{'='*60}")
+    print(f"  Vocabulary items: {inline_items} inline, {len(document['vocabulary'])} distinct")
+    for label, path in (('inline (indent=2)', source), ('inline (minified)', minified),
+                        ('vocab-table', packed_path)):
+        print(f"  {label:18} {sizes[path] / 1024:8.1f} KB   json.load {times[path] * 1000:6.1f} ms")
+    print(f"\n  📉 {1 - sizes[packed_path] / sizes[source]:.0%} smaller than the current catalogue, "
+          f"{1 - sizes[packed_path] / sizes[minified]:.0%} smaller than minified inline")
+    print(f"{'='*60}\n")
+
+
+def main(argv: Optional[List[str]] = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Convert the catalogue to and from the vocab-table format')
+    action = parser.add_mutually_exclusive_group(required=True)
+    action.add_argument('--pack', nargs=2, metavar=('INLINE', 'TABLE'), help='Write INLINE as a vocab-table file')
+    action.add_argument('--unpack', nargs=2, metavar=('TABLE', 'INLINE'),
+                        help='Write a vocab-table file back as the inline catalogue')
+    action.add_argument('--stats', metavar='INLINE', help='Compare size and parse time of both formats')
+
+    args = parser.parse_args(argv)
+
+    if args.pack:
+        source, target = map(Path, args.pack)
+        document = write_vocab_table(iter_episodes(source), target)
+        print(f"✅ {len(document['episodes'])} episodes, {len(document['vocabulary'])} distinct vocabulary "
+              f"items → {target} ({target.stat().st_size / 1024:.1f} KB)")
+    elif args.unpack:
+        source, target = map(Path, args.unpack)
+        with CatalogueWriter(target) as writer:
+            writer.write_all(CompactCatalogue(source))
+        print(f"✅ {writer.count} episodes → {target}")
+    else:
+        print_stats(Path(args.stats))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Debounced file watching for the --watch modes of the generators
+
+Watcher yields one batch of touched files per burst of edits. On Linux it
+uses inotify directly through ctypes (no third-party package); elsewhere,
+or when inotify is unavailable (limits reached, network mounts), it falls
+back to polling mtimes with os.scandir.
+
+An editor save is usually several events (write a temp file, rename it
+over the original, chmod); a git checkout is hundreds. Events are
+collected until the tree has been quiet for `debounce` seconds (or
+`max_wait` has passed since the first one), then the set of touched paths
+is yielded once:
+
+    with Watcher([Path('youtube_descriptions')], suffixes=('.html',)) as watcher:
+        for paths in watcher:
+            ...  # re-parse just these files
+
+If the kernel event queue overflows, the batch contains every matching
+file under the roots, so callers fall back to a full rebuild rather than
+miss a change.
+
+    python3 watch.py youtube_descriptions       # print batches as they arrive
+"""
+
+import argparse
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (IN_CLOSE_WRITE | IN_ATTRIB | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+              | IN_DELETE_SELF | IN_MOVE_SELF)
+
+_EVENT = struct.Struct('iIII')
+
+
+class _Inotify:
+    """Minimal inotify binding: recursive directory watches, raw event reads"""
+
+    def __init__(self):
+        libc_name = ctypes.util.find_library('c')
+        if not sys.platform.startswith('linux') or not libc_name:
+            raise OSError('inotify is only available on Linux')
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        self._dirs: Dict[int, Path] = {}
+
+    def add_tree(self, root: Path):
+        stack = [root]
+        while stack:
+            folder = stack.pop()
+            wd = self._libc.inotify_add_watch(self.fd, os.fsencode(folder), WATCH_MASK)
+            if wd < 0:
+                errno = ctypes.get_errno()
+                # The directory may have gone between the scan and the watch
+                if errno == 2:
+                    continue
+                raise OSError(errno, f"inotify_add_watch failed for {folder}: {os.strerror(errno)}")
+            self._dirs[wd] = folder
+            try:
+                with os.scandir(folder) as entries:
+                    stack.extend(Path(e.path) for e in entries if e.is_dir(follow_symlinks=False))
+            except FileNotFoundError:
+                pass
+
+    def read(self) -> Tuple[Set[Path], bool]:
+        """Paths touched since the last read, and whether the queue overflowed"""
+        paths: Set[Path] = set()
+        overflow = False
+        while True:
+            try:
+                data = os.read(self.fd, 65536)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _cookie, length = _EVENT.unpack_from(data, offset)
+                offset += _EVENT.size
+                name = data[offset:offset + length].rstrip(b'\0')
+                offset += length
+                if mask & IN_Q_OVERFLOW:
+                    overflow = True
+                    continue
+                folder = self._dirs.get(wd)
+                if mask & IN_IGNORED:
+                    self._dirs.pop(wd, None)
+                    continue
+                if folder is None:
+                    continue
+                path = folder / os.fsdecode(name) if name else folder
+                if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                    # New subdirectory: watch it and report what it already holds
+                    try:
+                        self.add_tree(path)
+                    except OSError as e:
+                        print(f"⚠️  Not watching {path}: {e}")
+                    paths.update(_scan(path))
+                paths.add(path)
+        return paths, overflow
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+def _scan(root: Path, suffixes: Optional[Tuple[str, ...]] = None) -> Dict[Path, Tuple[int, int]]:
+    """(mtime_ns, size) of every file under root, optionally filtered by suffix"""
+    found: Dict[Path, Tuple[int, int]] = {}
+    stack = [root]
+    while stack:
+        folder = stack.pop()
+        try:
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(Path(entry.path))
+                    elif not suffixes or entry.name.endswith(suffixes):
+                        st = entry.stat()
+                        found[Path(entry.path)] = (st.st_mtime_ns, st.st_size)
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+    return found
+
+
+class Watcher:
+    """
+    Iterate over debounced batches of touched files under the given roots.
+
+    A path in a batch may have been modified, created or deleted; callers
+    check path.exists(). Only files whose name ends with one of `suffixes`
+    are reported (editor swap files and the like are ignored).
+    """
+
+    def __init__(self, roots: Iterable[Path], suffixes: Optional[Iterable[str]] = None,
+                 debounce: float = 0.15, max_wait: float = 2.0, poll_interval: float = 0.5,
+                 force_poll: bool = False):
+        self.roots = [Path(root) for root in roots]
+        self.suffixes = tuple(suffixes) if suffixes else None
+        self.debounce = debounce
+        self.max_wait = max_wait
+        self.poll_interval = poll_interval
+        self._inotify: Optional[_Inotify] = None
+        self._snapshot: Dict[Path, Tuple[int, int]] = {}
+
+        if not force_poll:
+            try:
+                self._inotify = _Inotify()
+                for root in self.roots:
+                    if root.is_dir():
+                        self._inotify.add_tree(root)
+            except OSError as e:
+                print(f"⚠️  inotify unavailable ({e}), polling every {poll_interval}s")
+                if self._inotify:
+                    self._inotify.close()
+                self._inotify = None
+        if self._inotify is None:
+            self._snapshot = self._scan_all()
+
+    @property
+    def backend(self) -> str:
+        return 'inotify' if self._inotify else 'polling'
+
+    def _scan_all(self) -> Dict[Path, Tuple[int, int]]:
+        found: Dict[Path, Tuple[int, int]] = {}
+        for root in self.roots:
+            found.update(_scan(root, self.suffixes))
+        return found
+
+    def _wanted(self, path: Path) -> bool:
+        return not self.suffixes or path.name.endswith(self.suffixes)
+
+    def _poll(self, timeout: float) -> Set[Path]:
+        """Touched paths, waiting up to timeout for the first one"""
+        if self._inotify:
+            ready, _, _ = select.select([self._inotify.fd], [], [], timeout)
+            if not ready:
+                return set()
+            paths, overflow = self._inotify.read()
+            if overflow:
+                return set(self._scan_all())
+            return {p for p in paths if self._wanted(p)}
+
+        deadline = time.monotonic() + timeout
+        while True:
+            current = self._scan_all()
+            previous, self._snapshot = self._snapshot, current
+            changed = {p for p in current.keys() | previous.keys() if current.get(p) != previous.get(p)}
+            remaining = deadline - time.monotonic()
+            if changed or remaining <= 0:
+                return changed
+            time.sleep(min(self.poll_interval, remaining))
+
+    def next_batch(self, timeout: Optional[float] = None) -> Set[Path]:
+        """
+        Block until something changes (or timeout passes: empty set), then
+        keep collecting until the tree has been quiet for `debounce`.
+        """
+        started = time.monotonic()
+        batch: Set[Path] = set()
+        while not batch:
+            wait = self.poll_interval if timeout is None else timeout - (time.monotonic() - started)
+            if wait <= 0:
+                return batch
+            batch = self._poll(wait)
+
+        first = time.monotonic()
+        quiet = self.debounce if self._inotify else max(self.debounce, self.poll_interval)
+        while time.monotonic() - first < self.max_wait:
+            more = self._poll(quiet)
+            if not more:
+                break
+            batch |= more
+        return batch
+
+    def __iter__(self) -> Iterator[Set[Path]]:
+        while True:
+            yield self.next_batch()
+
+    def close(self):
+        if self._inotify:
+            self._inotify.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='Print debounced batches of changed files')
+    parser.add_argument('roots', nargs='+', type=Path, help='Directories to watch')
+    parser.add_argument('--suffix', action='append', help='Only report files ending with this (repeatable)')
+    parser.add_argument('--debounce', type=float, default=0.15, help='Quiet period in seconds (default: 0.15)')
+    parser.add_argument('--poll', action='store_true', help='Poll mtimes instead of using inotify')
+    args = parser.parse_args(argv)
+
+    with Watcher(args.roots, args.suffix, args.debounce, force_poll=args.poll) as watcher:
+        print(f"👀 Watching {', '.join(map(str, args.roots))} ({watcher.backend}), Ctrl+C to stop")
+        try:
+            for batch in watcher:
+                print(f"[{time.strftime('%H:%M:%S')}] {len(batch)} changed")
+                for path in sorted(batch):
+                    print(f"   {path}")
+        except KeyboardInterrupt:
+            print("\n👋 Stopped watching")
+
+
+if __name__ == '__main__':
+    main()
@@ -35,6 +35,14 @@ export const FlashcardModal = ({ isOpen, onClose, vocabulary }: FlashcardModalPr
         setCurrentIndex(prev => (prev - 1 + vocabulary.length) % vocabulary.length);
     };
 
+    const handlePlay = (e: React.MouseEvent) => {
+        // Don't flip the card; the clip is a local static file, so this starts right away
+        e.stopPropagation();
+        if (currentItem.pronunciationAudio) {
+            new Audio(currentItem.pronunciationAudio).play().catch(() => undefined);
+        }
+    };
+
     const handleFlip = () => {
         setIsFlipped(!isFlipped);
     };
@@ -57,7 +65,10 @@ export const FlashcardModal = ({ isOpen, onClose, vocabulary }: FlashcardModalPr
                                 <span className="category-badge">{currentItem.category || 'Word'}</span>
                                 <h2>{currentItem.word}</h2>
                                 {currentItem.pronunciation && (
-                                    <div className="pronunciation">/{currentItem.pronunciation}/</div>
+                                    <div className="pronunciation" title={currentItem.pronunciationEstimated ? 'Estimated pronunciation' : undefined}>/{currentItem.pronunciation}/</div>
+                                )}
+                                {currentItem.pronunciationAudio && (
+                                    <button className="play-pronunciation" onClick={handlePlay} aria-label="Play pronunciation">🔊</button>
                                 )}
                                 <p className="tap-hint">👆 Tap to flip</p>
                             </div>
@@ -152,6 +163,14 @@ export const FlashcardModal = ({ isOpen, onClose, vocabulary }: FlashcardModalPr
                     background: rgba(255,255,255,0.2);
                     padding: 0.2rem 1rem; border-radius: 20px;
                 }
+                .play-pronunciation {
+                    margin: -1rem 0 1rem;
+                    background: rgba(255,255,255,0.2); color: inherit;
+                    border: none; border-radius: 50%;
+                    width: 2.5rem; height: 2.5rem;
+                    font-size: 1.2rem; cursor: pointer;
+                }
+                .play-pronunciation:hover { background: rgba(255,255,255,0.35); }
                 .category-badge {
                     position: absolute; top: 1rem; right: 1rem;
                     background: rgba(0,0,0,0.2);
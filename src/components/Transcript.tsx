@@ -146,7 +146,7 @@ export const Transcript = ({ transcript }: TranscriptProps) => {
                                     <div key={index} className="vocabulary-item">
                                         <div className="vocabulary-word-header">
                                             <span className="vocabulary-word">{parsed.word}</span>
-                                            {item.pronunciation && <span style={{ fontSize: '0.875rem', color: 'white', fontStyle: 'normal', fontFamily: '"Segoe UI", Arial, sans-serif', fontWeight: '500', marginLeft: '10px', padding: '2px 8px', backgroundColor: '#3b82f6', borderRadius: '4px', whiteSpace: 'nowrap' }}>/{item.pronunciation}/</span>}
+                                            {item.pronunciation && <span title={item.pronunciationEstimated ? 'Estimated pronunciation' : undefined} style={{ fontSize: '0.875rem', color: 'white', fontStyle: 'normal', fontFamily: '"Segoe UI", Arial, sans-serif', fontWeight: '500', marginLeft: '10px', padding: '2px 8px', backgroundColor: '#3b82f6', borderRadius: '4px', whiteSpace: 'nowrap' }}>/{item.pronunciation}/</span>}
                                             <div style={{ display: 'flex', gap: '6px', flexWrap: 'wrap' }}>
                                                 {parsed.category && (
                                                     <span className="vocabulary-badge" style={{ ...getCategoryBadgeColor(parsed.category), padding: '2px 8px', borderRadius: '4px', fontSize: '0.75rem', fontWeight: '500' }}>
@@ -182,7 +182,7 @@ export const Transcript = ({ transcript }: TranscriptProps) => {
                                     <div key={index} className="vocabulary-item">
                                         <div className="vocabulary-word-header">
                                             <span className="vocabulary-word">{parsed.word}</span>
-                                            {item.pronunciation && <span style={{ fontSize: '0.875rem', color: 'white', fontStyle: 'normal', fontFamily: '"Segoe UI", Arial, sans-serif', fontWeight: '500', marginLeft: '10px', padding: '2px 8px', backgroundColor: '#3b82f6', borderRadius: '4px', whiteSpace: 'nowrap' }}>/{item.pronunciation}/</span>}
+                                            {item.pronunciation && <span title={item.pronunciationEstimated ? 'Estimated pronunciation' : undefined} style={{ fontSize: '0.875rem', color: 'white', fontStyle: 'normal', fontFamily: '"Segoe UI", Arial, sans-serif', fontWeight: '500', marginLeft: '10px', padding: '2px 8px', backgroundColor: '#3b82f6', borderRadius: '4px', whiteSpace: 'nowrap' }}>/{item.pronunciation}/</span>}
                                             <div style={{ display: 'flex', gap: '6px', flexWrap: 'wrap' }}>
                                                 {parsed.category && (
                                                     <span className="vocabulary-badge" style={{ ...getCategoryBadgeColor(parsed.category), padding: '2px 8px', borderRadius: '4px', fontSize: '0.75rem', fontWeight: '500' }}>
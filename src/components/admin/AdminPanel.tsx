@@ -8,35 +8,47 @@ interface AdminPanelProps {
     onExit: () => void;
 }
 
+interface VisitorStats {
+    generatedAt: string;
+    totalRequests: number;
+    uniqueIps: number;
+    topPaths: { key: string; count: number }[];
+    recent: { timestamp: string; ip: string; path: string }[];
+}
+
+// Summary regenerated by archived/tools/aggregate_visitors.py, so this stays
+// small no matter how large visitors.log grows
 const VisitorLogTable = () => {
-    const [logs, setLogs] = useState<any[]>([]);
+    const [stats, setStats] = useState<VisitorStats | null>(null);
     const [loading, setLoading] = useState(true);
 
     useEffect(() => {
-        fetch('/resources/visitors.log')
+        fetch('/resources/visitor-stats.json', { cache: 'no-store' })
             .then(res => {
-                if (!res.ok) throw new Error('No log file');
-                return res.text();
+                if (!res.ok) throw new Error('No stats file');
+                return res.json();
             })
-            .then(text => {
-                const lines = text.trim().split('\n');
-                const parsed = lines.map(line => {
-                    try {
-                        const clean = line.trim().replace(/,$/, '');
-                        return JSON.parse(clean);
-                    } catch (e) { return null; }
-                }).filter(Boolean).reverse().slice(0, 50);
-                setLogs(parsed);
+            .then((data: VisitorStats) => {
+                setStats(data);
                 setLoading(false);
             })
             .catch(() => setLoading(false));
     }, []);
 
+    const logs = stats ? stats.recent : [];
+
     if (loading) return <div style={{ padding: '1rem' }}>Loading logs...</div>;
     if (logs.length === 0) return <div style={{ padding: '1rem' }}>No logs found yet.</div>;
 
     return (
         <div style={{ overflowX: 'auto' }}>
+            {stats && (
+                <div style={{ padding: '8px', fontSize: '0.85rem', color: '#555' }}>
+                    {stats.totalRequests.toLocaleString()} requests from {stats.uniqueIps.toLocaleString()} IPs
+                    {stats.topPaths.length > 0 && <> · Top path: {stats.topPaths[0].key}</>}
+                    {' '}· Updated {new Date(stats.generatedAt).toLocaleString()}
+                </div>
+            )}
             <table style={{ width: '100%', minWidth: '400px', fontSize: '0.85rem', borderCollapse: 'collapse' }}>
                 <thead>
                     <tr style={{ background: '#eee', textAlign: 'left' }}>
@@ -46,17 +58,14 @@ const VisitorLogTable = () => {
                     </tr>
                 </thead>
                 <tbody>
-                    {logs.map((log, i) => {
-                        // Use forwarded_for (real client IP) if available, otherwise use direct IP
-                        const displayIp = log.forwarded_for || log.ip;
-                        return (
-                            <tr key={i} style={{ borderBottom: '1px solid #eee' }}>
-                                <td style={{ padding: '8px' }}>{new Date(log.timestamp).toLocaleString()}</td>
-                                <td style={{ padding: '8px', fontFamily: 'monospace' }}>{displayIp}</td>
-                                <td style={{ padding: '8px' }}>{log.path}</td>
-                            </tr>
-                        );
-                    })}
+                    {logs.map((log, i) => (
+                        // The aggregator already resolved forwarded_for to the real client IP
+                        <tr key={i} style={{ borderBottom: '1px solid #eee' }}>
+                            <td style={{ padding: '8px' }}>{new Date(log.timestamp).toLocaleString()}</td>
+                            <td style={{ padding: '8px', fontFamily: 'monospace' }}>{log.ip}</td>
+                            <td style={{ padding: '8px' }}>{log.path}</td>
+                        </tr>
+                    ))}
                 </tbody>
             </table>
         </div>
@@ -310,7 +319,7 @@ export const AdminPanel = ({ episodes, onUpdateEpisodes, onExit }: AdminPanelPro
 
                 {/* Visitor Log (Latest 50) */}
                 <div style={{ marginTop: '1.5rem' }}>
-                    <h3 style={{ fontSize: '1.1rem', marginBottom: '1rem', color: '#555' }}>Recent Visitors (Log File)</h3>
+                    <h3 style={{ fontSize: '1.1rem', marginBottom: '1rem', color: '#555' }}>Recent Visitors (Log Summary)</h3>
                     <div style={{ maxHeight: '300px', overflowY: 'auto', border: '1px solid #eee', borderRadius: '4px' }}>
                         <VisitorLogTable />
                     </div>
@@ -75,6 +75,8 @@ export interface VocabularyItem {
   subcategory?: VocabularySubcategory;
   example?: string;
   pronunciation?: string; // US IPA pronunciation
+  pronunciationEstimated?: boolean; // rule-based guess (archived/tools/g2p.py), not from a dictionary
+  pronunciationAudio?: string; // local clip, /resources/pronunciations/... (archived/tools/pronunciation_clips.py)
 }
 
 export type Theme = 'light' | 'dark' | 'system';